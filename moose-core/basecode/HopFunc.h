@@ -501,6 +501,41 @@ template < class A > class GetHopFunc: public OpFunc1Base< A* >
 				}
 			}
 		}
+
+		/**
+		 * Like opGetVec, but writes into a caller-owned buffer of
+		 * 'size' entries. When all the data is on this node the
+		 * values go straight into the buffer without an intermediate
+		 * vector. Returns the number of entries written.
+		 */
+		template< class B > unsigned int opGetVecInto( const Eref& e,
+				B* ret, unsigned int size,
+				const GetOpFuncBase< A >* op ) const
+		{
+			Element* elm = e.element();
+			unsigned int n = 0;
+			if ( elm->hasFields() ) {
+				if ( e.getNode() == mooseMyNode() ) {
+					unsigned int p = e.dataIndex();
+					unsigned int numField = elm->numField(
+							p - elm->localDataStart() );
+					for ( unsigned int q = 0; q < numField && n < size; ++q )
+						ret[n++] = op->returnOp( Eref( elm, p, q ) );
+					return n;
+				}
+			} else if ( mooseNumNodes() == 1 || elm->isGlobal() ) {
+				unsigned int start = elm->localDataStart();
+				unsigned int end = start + elm->numLocalData();
+				for ( unsigned int p = start; p < end && n < size; ++p )
+					ret[n++] = op->returnOp( Eref( elm, p, 0 ) );
+				return n;
+			}
+			vector< A > temp;
+			opGetVec( e, temp, op );
+			for ( ; n < temp.size() && n < size; ++n )
+				ret[n] = temp[n];
+			return n;
+		}
 	private:
 		HopIndex hopIndex_;
 };
@@ -367,6 +367,38 @@ public:
              dest.path() << endl;
     }
 
+    /**
+     * Fills a preallocated buffer of 'size' entries with the field
+     * values, converting each to B. This avoids building a vector
+     * when the caller already owns storage, e.g. a numpy array.
+     * Returns the number of entries written, 0 on error.
+     */
+    template< class B >
+    static unsigned int getVecInto( ObjId dest, const string& field,
+                                    B* buf, unsigned int size )
+    {
+        ObjId tgt( dest );
+        FuncId fid;
+        string fullFieldName = "get" + field;
+        fullFieldName[3] = std::toupper( fullFieldName[3] );
+        const OpFunc* func = SetGet::checkSet( fullFieldName, tgt, fid );
+        const GetOpFuncBase< A >* gof =
+            dynamic_cast< const GetOpFuncBase< A >* >( func );
+        if ( gof )
+        {
+            const OpFunc* op2 = gof->makeHopFunc(
+                                    HopIndex( gof->opIndex(), MooseGetVecHop ) );
+            const GetHopFunc< A >* hop =
+                dynamic_cast< const GetHopFunc< A >* >( op2 );
+            unsigned int n = hop->opGetVecInto( tgt.eref(), buf, size, gof );
+            delete op2;
+            return n;
+        }
+        cout << "Warning: Field::getVecInto conversion error for " <<
+             dest.path() << endl;
+        return 0;
+    }
+
     /**
      * Blocking call for finding a value and returning in a
      * string.
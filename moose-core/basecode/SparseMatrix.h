@@ -423,6 +423,27 @@ public:
                           colIndexArg.begin(), colIndexArg.end() );
         rowStart_[rowNum + 1] = N_.size();
     }
+    /**
+     * Assigns the entire matrix from compressed sparse row arrays.
+     * rowStart must have nrows + 1 non-decreasing entries ending at
+     * entry.size(), colIndex must be as long as entry, and the column
+     * indices within each row must be sorted. The caller checks this.
+     */
+    void csrFill( unsigned int nrows, unsigned int ncolumns,
+                  const vector< T >& entry,
+                  const vector< unsigned int >& colIndex,
+                  const vector< unsigned int >& rowStart )
+    {
+        assert( rowStart.size() == nrows + 1 );
+        assert( entry.size() == colIndex.size() );
+        assert( rowStart.back() == entry.size() );
+        nrows_ = nrows;
+        ncolumns_ = ncolumns;
+        N_ = entry;
+        colIndex_ = colIndex;
+        rowStart_ = rowStart;
+    }
+
 	/// Here we expose the sparse matrix for MOOSE use.
 	const vector< T >& matrixEntry() const
 	{
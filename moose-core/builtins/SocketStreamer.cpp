@@ -14,6 +14,8 @@
 #include <chrono>
 #include <thread>
 #include <unistd.h>
+#include <cstring>
+#include <cstdint>
 
 #include "../basecode/global.h"
 #include "../basecode/header.h"
@@ -181,10 +183,47 @@ SocketStreamer::~SocketStreamer()
     }
 }
 
-void SocketStreamer::addStringToDoubleVec(vector<double>&res, const string s)
+/* --------------------------------------------------------------------------*/
+/**
+ * @Synopsis  Append an unsigned integer of type T to buffer in little-endian
+ * byte order irrespective of the host byte order.
+ */
+/* ----------------------------------------------------------------------------*/
+template<typename T>
+static void appendLE(vector<char>& buf, T val)
+{
+    for(size_t i = 0; i < sizeof(T); i++)
+        buf.push_back((char)((val >> (8*i)) & 0xFF));
+}
+
+static bool hostIsLittleEndian( )
 {
-    for(char c : s)
-        res.push_back((double)c);
+    const uint16_t one = 1;
+    return *reinterpret_cast<const char*>(&one) == 1;
+}
+
+/* --------------------------------------------------------------------------*/
+/**
+ * @Synopsis  Append doubles to buffer as little-endian float64. On
+ * little-endian hosts this is a single memcpy.
+ */
+/* ----------------------------------------------------------------------------*/
+static void appendDoublesLE(vector<char>& buf, const double* vals, size_t n)
+{
+    static const bool isLE = hostIsLittleEndian();
+    if(isLE)
+    {
+        size_t start = buf.size();
+        buf.resize(start + n*sizeof(double));
+        memcpy(&buf[start], vals, n*sizeof(double));
+        return;
+    }
+    for(size_t i = 0; i < n; i++)
+    {
+        uint64_t bits;
+        memcpy(&bits, &vals[i], sizeof(double));
+        appendLE<uint64_t>(buf, bits);
+    }
 }
 
 /* --------------------------------------------------------------------------*/
@@ -307,19 +346,71 @@ void SocketStreamer::initTCPServer( void )
 
 /* --------------------------------------------------------------------------*/
 /**
- * @Synopsis  Convert data to JSON.
- *
- * @Returns JSON representation.
+ * @Synopsis  Collect (time, value) pairs not yet streamed from all tables,
+ * keyed by table index.
  */
 /* ----------------------------------------------------------------------------*/
-void SocketStreamer::dataToStream(map<string, vector<double>>& data)
+void SocketStreamer::dataToStream(map<size_t, vector<double>>& data)
 {
     for( size_t i = 0; i < tables_.size(); i++)
     {
         vector<double> vec;
         tables_[i]->collectData(vec, true, false);
         if( ! vec.empty() )
-            data[columns_[i+1]] = vec;
+            data[i] = vec;
+    }
+}
+
+void SocketStreamer::appendFrameHeader(unsigned short type, size_t size)
+{
+    const char magic[4] = { 'M', 'S', 'T', 'R' };
+    bytesToStream_.insert(bytesToStream_.end(), magic, magic+4);
+    appendLE<uint16_t>(bytesToStream_, SOCK_STREAM_VERSION);
+    appendLE<uint16_t>(bytesToStream_, type);
+    appendLE<uint64_t>(bytesToStream_, size);
+}
+
+/* --------------------------------------------------------------------------*/
+/**
+ * @Synopsis  Column dictionary: id, name and dt of every table. Sent once so
+ * that data frames need to carry only the column id.
+ */
+/* ----------------------------------------------------------------------------*/
+void SocketStreamer::appendColumnsFrame( )
+{
+    size_t size = 8;
+    for( size_t i = 0; i < tables_.size(); i++)
+        size += 16 + columns_[i+1].size();
+
+    appendFrameHeader(SOCK_FRAME_COLUMNS, size);
+    appendLE<uint32_t>(bytesToStream_, tables_.size());
+    appendLE<uint32_t>(bytesToStream_, 0);
+    for( size_t i = 0; i < tables_.size(); i++)
+    {
+        const string& name = columns_[i+1];
+        double dt = i < tableDt_.size() ? tableDt_[i] : 0.0;
+        appendLE<uint32_t>(bytesToStream_, i);
+        appendLE<uint32_t>(bytesToStream_, name.size());
+        appendDoublesLE(bytesToStream_, &dt, 1);
+        bytesToStream_.insert(bytesToStream_.end(), name.begin(), name.end());
+    }
+}
+
+void SocketStreamer::appendDataFrame(const map<size_t, vector<double>>& data)
+{
+    size_t size = 8;
+    for(auto& v: data)
+        size += 16 + v.second.size()*sizeof(double);
+
+    appendFrameHeader(SOCK_FRAME_DATA, size);
+    appendLE<uint32_t>(bytesToStream_, data.size());
+    appendLE<uint32_t>(bytesToStream_, 0);
+    for(auto& v: data)
+    {
+        appendLE<uint32_t>(bytesToStream_, v.first);
+        appendLE<uint32_t>(bytesToStream_, 0);
+        appendLE<uint64_t>(bytesToStream_, v.second.size()/2);
+        appendDoublesLE(bytesToStream_, v.second.data(), v.second.size());
     }
 }
 
@@ -327,45 +418,35 @@ void SocketStreamer::dataToStream(map<string, vector<double>>& data)
 /**
  * @Synopsis  Stream data over socket.
  *
- * @Returns True of success, false otherwise. It is callee job to clean up data_
- *          on a successful return from this function.
+ * @Returns 0 on success, errno otherwise. Bytes which could not be sent are
+ *          kept and sent with the next call.
  */
 /* ----------------------------------------------------------------------------*/
 int SocketStreamer::streamData( )
 {
-    map<string, vector<double>> data;
+    if(! columnsSent_)
+    {
+        appendColumnsFrame();
+        columnsSent_ = true;
+    }
+
+    map<size_t, vector<double>> data;
     dataToStream(data);
+    if(! data.empty())
+        appendDataFrame(data);
 
-    if(data.empty())
+    if(bytesToStream_.empty())
     {
         LOG(moose::debug, "No data in tables.");
         return 0;
     }
 
-    // Construct a void* array to send over the socket. Serialize the data.
-    // e.g. H 10 / a / t a b l e / a V 4 0.1 0.2 0.3 0.2
-    // H => Header start (chars)
-    // V => Value starts (double)
-    for(auto v: data)
-    {
-        // First header.
-        vecToStream_.push_back((double)'H');
-        vecToStream_.push_back(v.first.size());
-        addStringToDoubleVec(vecToStream_, v.first);
-
-        // Now data.
-        vecToStream_.push_back((double)'V');
-        vecToStream_.push_back(v.second.size());
-        vecToStream_.insert(vecToStream_.end(), v.second.begin(), v.second.end());
-    }
-
-    size_t dtypeSize = sizeof(double);
-    int sent = send(clientfd_, (void*) &vecToStream_[0], dtypeSize*vecToStream_.size(), MSG_MORE);
+    ssize_t sent = send(clientfd_, (void*) &bytesToStream_[0], bytesToStream_.size(), MSG_MORE);
     LOG(moose::debug, "Sent " << sent << " bytes." );
     if( sent < 0 )
         return errno;
 
-    vecToStream_.erase(vecToStream_.begin(), vecToStream_.begin()+(sent/dtypeSize));
+    bytesToStream_.erase(bytesToStream_.begin(), bytesToStream_.begin()+sent);
     return 0;
 }
 
@@ -443,6 +524,8 @@ void SocketStreamer::reinit(const Eref& e, ProcPtr p)
     thisDt_ = clk_->getTickDt( e.element()->getTick() );
 
     // Push each table dt_ into vector of dt
+    tableDt_.clear();
+    columnsSent_ = false;
     for( size_t i = 0; i < tables_.size(); i++)
     {
         Id tId = tableIds_[i];
@@ -498,6 +581,7 @@ void SocketStreamer::addTable( ObjId table )
         columns_.push_back( t->getColumnName( ) );
     else
         columns_.push_back( moose::moosePathToUserPath( table.path() ) );
+    columnsSent_ = false;
 }
 
 /**
@@ -535,7 +619,11 @@ void SocketStreamer::removeTable( ObjId table )
     {
         tableIds_.erase( tableIds_.begin() + matchIndex );
         tables_.erase( tables_.begin() + matchIndex );
-        columns_.erase( columns_.begin() + matchIndex );
+        // First column is time.
+        columns_.erase( columns_.begin() + matchIndex + 1 );
+        if( (size_t)matchIndex < tableDt_.size() )
+            tableDt_.erase( tableDt_.begin() + matchIndex );
+        columnsSent_ = false;
     }
 }
 
@@ -46,6 +46,35 @@
 
 using namespace std;
 
+/*-----------------------------------------------------------------------------
+ *  Wire format (version 2).
+ *
+ *  Data is sent as frames. Every frame starts with a fixed 16 byte header;
+ *  all numbers are little-endian.
+ *
+ *      char[4]  magic      "MSTR"
+ *      uint16   version    SOCK_STREAM_VERSION
+ *      uint16   type       SOCK_FRAME_COLUMNS or SOCK_FRAME_DATA
+ *      uint64   size       number of payload bytes following the header.
+ *
+ *  COLUMNS payload is sent once after a client connects (and again if the
+ *  set of tables changes):
+ *
+ *      uint32 ncols, uint32 reserved
+ *      ncols x { uint32 id, uint32 namelen, float64 dt, char[namelen] name }
+ *
+ *  DATA payload:
+ *
+ *      uint32 nblocks, uint32 reserved
+ *      nblocks x { uint32 id, uint32 reserved, uint64 n, float64[2*n] }
+ *
+ *  where each block holds n (time, value) pairs of column `id`.
+ *  python/moose/streamer_utils.py has the matching decoder.
+ *-----------------------------------------------------------------------------*/
+#define SOCK_STREAM_VERSION 2
+#define SOCK_FRAME_COLUMNS  1
+#define SOCK_FRAME_DATA     2
+
 
 class Clock;
 
@@ -105,9 +134,12 @@ public:
     void removeTable( ObjId table );
     void removeTables( vector<ObjId> table );
 
-    void dataToStream(map<string, vector<double>>& vec);
+    void dataToStream(map<size_t, vector<double>>& data);
 
-    static void addStringToDoubleVec(vector<double>&res, const string s);
+    // Serialization helpers for the wire format described above.
+    void appendFrameHeader(unsigned short type, size_t size);
+    void appendColumnsFrame( );
+    void appendDataFrame(const map<size_t, vector<double>>& data);
 
     /** Dest functions.
      * The process function called by scheduler on every tick
@@ -148,7 +180,8 @@ private:
     bool isValid_ = true;
     std::thread processThread_;
     string buffer_;
-    vector<double> vecToStream_;
+    vector<char> bytesToStream_;
+    bool columnsSent_ = false;
     double thisDt_;
 
     // We need clk_ pointer for handling
@@ -174,6 +174,7 @@ void Streamer::reinit(const Eref& e, ProcPtr p)
     }
 
     Clock* clk = reinterpret_cast<Clock*>( Id(1).eref().data() );
+    tableDt_.clear();
     for (size_t i = 0; i < tableIds_.size(); i++)
     {
         int tickNum = tableIds_[i].element()->getTick();
@@ -194,14 +195,6 @@ void Streamer::reinit(const Eref& e, ProcPtr p)
     }
 
 
-    // Push each table dt_ into vector of dt
-    for( size_t i = 0; i < tables_.size(); i++)
-    {
-        Id tId = tableIds_[i];
-        int tickNum = tId.element()->getTick();
-        tableDt_.push_back( clk->getTickDt(tickNum) );
-    }
-
     // Make sure all tables have same dt_ else disable the streamer.
     vector<unsigned int> invalidTables;
     for (size_t i = 1; i < tableTick_.size(); i++)
@@ -236,7 +229,8 @@ void Streamer::reinit(const Eref& e, ProcPtr p)
     // write now.
     currTime_ = 0.0;
     zipWithTime( );
-    StreamerBase::writeToOutFile(outfilePath_, format_, "w", data_, columns_);
+    StreamerBase::writeToOutFile( outfilePath_, format_, "w", data_, columns_
+            , columnDt() );
     data_.clear( );
 }
 
@@ -247,7 +241,8 @@ void Streamer::reinit(const Eref& e, ProcPtr p)
 void Streamer::cleanUp( )
 {
     zipWithTime( );
-    StreamerBase::writeToOutFile( outfilePath_, format_, "a", data_, columns_ );
+    StreamerBase::writeToOutFile( outfilePath_, format_, "a", data_, columns_
+            , columnDt() );
     data_.clear( );
 }
 
@@ -261,7 +256,8 @@ void Streamer::process(const Eref& e, ProcPtr p)
 {
     // LOG( moose::debug, "Writing Streamer data to file." );
     zipWithTime( );
-    StreamerBase::writeToOutFile( outfilePath_, format_, "a", data_, columns_ );
+    StreamerBase::writeToOutFile( outfilePath_, format_, "a", data_, columns_
+            , columnDt() );
     data_.clear();
     numWriteEvents_ += 1;
 }
@@ -395,6 +391,16 @@ string Streamer::getFormat( void ) const
     return format_;
 }
 
+/**
+ * @brief dt of each column. Time column has the dt of the first table.
+ */
+vector<double> Streamer::columnDt( ) const
+{
+    vector<double> dts( 1, tableDt_.size() > 0 ? tableDt_[0] : 0.0 );
+    dts.insert( dts.end(), tableDt_.begin(), tableDt_.end() );
+    return dts;
+}
+
 /**
  * @brief This function prepares data to be written to a file.
  */
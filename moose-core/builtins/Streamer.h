@@ -59,6 +59,8 @@ public:
 
     void zipWithTime( );
 
+    vector<double> columnDt( ) const;
+
     /** Dest functions.
      * The process function called by scheduler on every tick
      */
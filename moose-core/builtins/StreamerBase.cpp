@@ -25,6 +25,7 @@
 #include <algorithm>
 #include <sstream>
 #include <memory>
+#include <cstdint>
 
 // Class function definitions
 StreamerBase::StreamerBase()
@@ -60,8 +61,17 @@ void StreamerBase::writeToOutFile( const string& filepath
         , const string& openmode
         , const vector<double>& data
         , const vector<string>& columns
+        , const vector<double>& dts
         )
 {
+    // An mcol file gets its header even when there is no data yet so that
+    // readers can open it right after reinit.
+    if( "mcol" == outputFormat )
+    {
+        writeToMCOLFile( filepath, openmode, data, columns, dts );
+        return;
+    }
+
     if( data.size() == 0 )
         return;
 
@@ -72,7 +82,7 @@ void StreamerBase::writeToOutFile( const string& filepath
     else
     {
         LOG( moose::warning, "Unsupported format " << outputFormat
-                << ". Use npy or csv. Falling back to default csv"
+                << ". Use npy, mcol or csv. Falling back to default csv"
            );
         writeToCSVFile( filepath, openmode, data, columns );
     }
@@ -122,6 +132,56 @@ void StreamerBase::writeToNPYFile( const string& filepath, const string& openmod
     cnpy2::save_numpy<double>( filepath, data, columns, openmode );
 }
 
+/*  Write data to an append-only binary file. */
+void StreamerBase::writeToMCOLFile( const string& filepath, const string& openmode
+        , const vector<double>& data, const vector<string>& columns
+        , const vector<double>& dts )
+{
+    if( columns.size() == 0 )
+        return;
+
+    FILE* fp = fopen( filepath.c_str(), (openmode == "w") ? "wb" : "ab" );
+    if( NULL == fp )
+    {
+        LOG( moose::warning, "Failed to open " << filepath );
+        return;
+    }
+
+    // The header is written once when file is created. In mode "a", it is
+    // written if the file is empty.
+    fseek( fp, 0, SEEK_END );
+    if( ftell( fp ) == 0 )
+    {
+        uint32_t offset = 16;
+        for( size_t i = 0; i < columns.size(); i++ )
+            offset += sizeof( double ) + sizeof( uint32_t ) + columns[i].size();
+        offset += (8 - offset % 8) % 8;
+
+        // Version and byte order mark.
+        uint16_t version[2] = { 1, 1 };
+        uint32_t sizes[2] = { (uint32_t) columns.size(), offset };
+        fwrite( "MCOL", sizeof(char), 4, fp );
+        fwrite( version, sizeof(uint16_t), 2, fp );
+        fwrite( sizes, sizeof(uint32_t), 2, fp );
+        for( size_t i = 0; i < columns.size(); i++ )
+        {
+            double dt = i < dts.size() ? dts[i] : 0.0;
+            uint32_t len = columns[i].size();
+            fwrite( &dt, sizeof(double), 1, fp );
+            fwrite( &len, sizeof(uint32_t), 1, fp );
+            fwrite( columns[i].c_str(), sizeof(char), len, fp );
+        }
+        const char pad[8] = { 0 };
+        fwrite( pad, sizeof(char), offset - ftell( fp ), fp );
+    }
+
+    // Write only complete rows.
+    size_t nrows = data.size() / columns.size();
+    if( nrows > 0 )
+        fwrite( &data[0], sizeof(double), nrows * columns.size(), fp );
+    fclose( fp );
+}
+
 string StreamerBase::vectorToCSV( const vector<double>& ys, const string& fmt )
 {
     stringstream ss;
@@ -53,6 +53,8 @@ public:
      *
      *  npy : numpy binary format (version 1 and 2), version 1 is default.
      *  csv or dat: comma separated value (delimiter ' ' )
+     *  mcol : append-only binary format which can be memory-mapped while it
+     *  is being written. See writeToMCOLFile.
      *
      * @param  openmode (write or append)
      *
@@ -60,12 +62,15 @@ public:
      *
      * @param ncols (number of columns). Incoming data will be formatted into a
      * matrix with ncols.
+     *
+     * @param dts, dt of each column. Only used by mcol format.
      */
     static void writeToOutFile(
             const string& filepath, const string& format
             , const string& openmode
             , const vector<double>& data
             , const vector<string>& columns
+            , const vector<double>& dts = vector<double>()
             );
 
     /**
@@ -86,6 +91,36 @@ public:
             );
 
 
+    /**
+     * @brief Write to MCOL format.
+     *
+     * The file starts with a header which describes the columns, followed by
+     * rows of ncols float64 values. Rows are only ever appended, the header
+     * is never rewritten; therefore a reader can memory-map the data while
+     * the simulation is still writing to it. All numbers are in the native
+     * byte order of the writer, which the byte order mark records: it is 1
+     * read in the byte order of the file. Files written before the mark
+     * was added have 0 there, and are little-endian.
+     *
+     *  char[4]  magic "MCOL"
+     *  uint16   version
+     *  uint16   byte order mark
+     *  uint32   number of columns
+     *  uint32   offset of the data in bytes (a multiple of 8)
+     *  for each column:
+     *      float64 dt
+     *      uint32  length of name
+     *      char[]  name
+     *  zero padding upto offset of the data.
+     *
+     * See moose.streamer_utils.TableFile for the python reader.
+     */
+    static void writeToMCOLFile( const string& filepath, const string& openmode
+            , const vector<double>& data
+            , const vector<string>& columns
+            , const vector<double>& dts
+            );
+
     /* --------------------------------------------------------------------------*/
     /**
      * @Synopsis  Return a csv representation of a vector.
@@ -74,7 +74,9 @@ const Cinfo* Table::initCinfo()
 
     static ValueFinfo< Table, string > format(
         "format"
-        , "Data format for table: default csv"
+        , "Data format for table: csv (default) or mcol. mcol is an"
+        " append-only binary format which can be memory-mapped while the"
+        " simulation is running; see moose.streamer_utils.TableFile."
         , &Table::setFormat
         , &Table::getFormat
     );
@@ -228,7 +230,8 @@ Table::~Table( )
     if( useFileStreamer_ )
     {
         mergeWithTime( data_ );
-        StreamerBase::writeToOutFile( outfile_, format_, "a", data_, columns_ );
+        StreamerBase::writeToOutFile( outfile_, format_, "a", data_, columns_
+                , vector<double>( columns_.size(), dt_ ) );
         clearAllVecs();
     }
 }
@@ -269,7 +272,8 @@ void Table::process( const Eref& e, ProcPtr p )
         if( fmod(lastTime_, 5.0) == 0.0 || getVecSize() >= 10000 )
         {
             mergeWithTime( data_ );
-            StreamerBase::writeToOutFile( outfile_, format_, "a", data_, columns_ );
+            StreamerBase::writeToOutFile( outfile_, format_, "a", data_, columns_
+                , vector<double>( columns_.size(), dt_ ) );
             clearAllVecs();
         }
         }
@@ -301,6 +305,7 @@ void Table::reinit( const Eref& e, ProcPtr p )
     if( useFileStreamer_ )
     {
         // The first column is variable time.
+        columns_.clear();
         columns_.push_back( "time" );
         // And the second column name is the name of the table.
         columns_.push_back( moose::moosePathToUserPath( tablePath_ ) );
@@ -332,7 +337,8 @@ void Table::reinit( const Eref& e, ProcPtr p )
     if( useFileStreamer_ )
     {
         mergeWithTime( data_ );
-        StreamerBase::writeToOutFile( outfile_, format_, "w", data_, columns_);
+        StreamerBase::writeToOutFile( outfile_, format_, "w", data_, columns_
+                , vector<double>( columns_.size(), dt_ ) );
         clearAllVecs();
     }
 }
@@ -379,12 +385,12 @@ double Table::getThreshold() const
 // Set the format of table to which its data should be written.
 void Table::setFormat( string format )
 {
-    if( format == "csv" )
+    if( format == "csv" || format == "mcol" )
         format_ = format;
     else
         LOG( moose::warning
              , "Unsupported format " << format
-             << " only sv is supported"
+             << " only csv and mcol are supported"
            );
 }
 
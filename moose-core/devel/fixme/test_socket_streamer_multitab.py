@@ -131,7 +131,7 @@ def make_network():
 
     for tabPath in res:
         aWithTime = res[tabPath]
-        a = aWithTime[1::2]
+        a = aWithTime[:,1]
         b = moose.element(tabPath).vector
         print( tabPath, len(a), len(b) )
         if len(a) == len(b):
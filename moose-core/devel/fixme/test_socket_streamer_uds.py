@@ -92,7 +92,7 @@ def test():
         raise RuntimeWarning( 'Nothing was streamed')
     for k in res:
         aWithTime = res[k]
-        a = aWithTime[1::2]
+        a = aWithTime[:,1]
         b = moose.element(k).vector
         print(k, len(a), len(b))
         assert (a == b).all()
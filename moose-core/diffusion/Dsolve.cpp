@@ -33,7 +33,8 @@
 #include "../ksolve/ZombiePool.h"
 #include "../ksolve/ZombieBufPool.h"
 
-#include <thread>
+#include "../utility/utility.h"
+#include "../utility/ThreadPool.h"
 
 const Cinfo* Dsolve::initCinfo()
 {
@@ -70,6 +71,16 @@ const Cinfo* Dsolve::initCinfo()
             &Dsolve::getNumVoxels
             );
 
+    static ValueFinfo< Dsolve, unsigned int > numThreads (
+            "numThreads",
+            "Number of threads used to advance the diffusing species. Each "
+            "species is solved independently, so the results do not depend "
+            "on the number of threads. Default is the value of environment "
+            "variable MOOSE_NUM_THREADS, or 1.",
+            &Dsolve::setNumThreads,
+            &Dsolve::getNumThreads
+            );
+
     static LookupValueFinfo< Dsolve, unsigned int, vector< double > > nVec(
             "nVec",
             "vector of # of molecules along diffusion length, "
@@ -161,6 +172,7 @@ const Cinfo* Dsolve::initCinfo()
         &compartment,               // Value
         &numVoxels,                 // ReadOnlyValue
         &numAllVoxels,              // ReadOnlyValue
+        &numThreads,                // Value
         &nVec,                      // LookupValue
         &numPools,                  // Value
         &diffVol1,                  // LookupValue
@@ -191,8 +203,11 @@ Dsolve::Dsolve() :
     numTotPools_( 0 ),
     numLocalPools_( 0 ),
     poolStartIndex_( 0 ),
-    numVoxels_( 0 )
-{;}
+    numVoxels_( 0 ),
+    numThreads_( 1 )
+{
+    numThreads_ = moose::getEnvInt( "MOOSE_NUM_THREADS", 1 );
+}
 
 Dsolve::~Dsolve()
 {;}
@@ -201,6 +216,16 @@ Dsolve::~Dsolve()
 // Field access functions
 //////////////////////////////////////////////////////////////
 
+void Dsolve::setNumThreads( unsigned int x )
+{
+    numThreads_ = max( 1u, x );
+}
+
+unsigned int Dsolve::getNumThreads() const
+{
+    return numThreads_;
+}
+
 void Dsolve::setNvec( unsigned int pool, vector< double > vec )
 {
     if ( pool < pools_.size() )
@@ -325,14 +350,16 @@ void Dsolve::calcJnDiff( const DiffJunction& jn, Dsolve* other, double dt)
 {
     const double EPSILON = 1e-16;
     assert( jn.otherPools.size() == jn.myPools.size() );
-    for ( unsigned int i = 0; i < jn.myPools.size(); ++i )
+
+    // Each species diffuses across the junction on its own.
+    auto diffuse = [&]( size_t i )
     {
         DiffPoolVec& myDv = pools_[ jn.myPools[i] ];
         if ( myDv.getDiffConst() < EPSILON )
-            continue;
+            return;
         DiffPoolVec& otherDv = other->pools_[ jn.otherPools[i] ];
         if ( otherDv.getDiffConst() < EPSILON )
-            continue;
+            return;
         // This geom mean is used in case we have the odd situation of
         // different diffusion constants.
         double effectiveDiffConst =
@@ -361,7 +388,11 @@ void Dsolve::calcJnDiff( const DiffJunction& jn, Dsolve* other, double dt)
             myDv.setN( j->first, myN );
             otherDv.setN( j->second, otherN );
         }
-    }
+    };
+
+    // A junction onto itself may pair a pool with a different one.
+    unsigned int nt = ( other == this ) ? 1 : numThreads_;
+    moose::ThreadPool::instance().parallelFor( jn.myPools.size(), nt, diffuse );
 }
 
 void Dsolve::calcJnXfer( const DiffJunction& jn,
@@ -554,8 +585,10 @@ void Dsolve::calcJunction( const DiffJunction& jn, double dt )
 
 void Dsolve::process( const Eref& e, ProcPtr p )
 {
-    for ( auto i = pools_.begin(); i != pools_.end(); ++i )
-        i->advance( p->dt );
+    // The species are independent; each is advanced by a single thread.
+    moose::ThreadPool::instance().parallelFor( pools_.size(), numThreads_
+            , [this, p]( size_t i ) { pools_[i].advance( p->dt ); }
+            );
 }
 
 void Dsolve::reinit( const Eref& e, ProcPtr p )
@@ -573,14 +606,6 @@ void Dsolve::updateJunctions( double dt )
 }
 
 
-void Dsolve::calcJunction_chunk( const size_t begin, const size_t end, double dt )
-{
-    for (size_t i = begin; i < min(end, junctions_.size()); i++)
-        calcJunction( junctions_[i], dt );
-
-}
-
-
 //////////////////////////////////////////////////////////////
 // Solver coordination and setup functions
 //////////////////////////////////////////////////////////////
@@ -47,6 +47,10 @@ public:
     string getPath( const Eref& e ) const;
 
     unsigned int getNumVoxels() const;
+
+    void setNumThreads( unsigned int x );
+    unsigned int getNumThreads() const;
+
     /// Inherited virtual.
     void setNumAllVoxels( unsigned int numVoxels );
 
@@ -119,9 +123,6 @@ public:
      * across nodes.
      */
     void calcJunction( const DiffJunction& jn, double dt );
-    
-    /* Multithreaded version */
-    void calcJunction_chunk( const size_t begin, const size_t end, double dt );
 
     //////////////////////////////////////////////////////////////////
     // Inherited virtual funcs from ZombiePoolInterface
@@ -210,6 +211,9 @@ private:
     unsigned int poolStartIndex_;
     unsigned int numVoxels_;
 
+    /// Number of threads over which the species are distributed.
+    unsigned int numThreads_;
+
     /// Internal vector, one for each pool species managed by Dsolve.
     vector< DiffPoolVec > pools_;
     /// Internal vector, one for each ConcChan managed by Dsolve.
@@ -27,6 +27,8 @@
 #include "../biophysics/CaConc.h"
 #include "ZombieHHChannel.h"
 #include "../shell/Shell.h"
+#include "../utility/ThreadPool.h"
+#include "../utility/utility.h"
 
 #include <chrono>
 using namespace std::chrono;
@@ -34,6 +36,10 @@ using namespace std::chrono;
 // defined in global.h 
 extern map<string, double> solverProfMap;
 
+// HSolves with numThreads > 1, grouped by clock tick. All HSolves on a tick
+// are advanced together when the first of them is processed.
+static map< int, vector< HSolve* > > network_;
+
 const Cinfo* HSolve::initCinfo()
 {
     static DestFinfo process(
@@ -155,6 +161,18 @@ const Cinfo* HSolve::initCinfo()
         &HSolve::getCaMax
     );
 
+    static ValueFinfo< HSolve, unsigned int > numThreads(
+        "numThreads",
+        "Number of threads used to advance the HSolves of a network. HSolves "
+        "on the same clock tick which have numThreads > 1 are integrated "
+        "in parallel on the first process call of each step; their values "
+        "and spikes are then sent one HSolve at a time, so spike delivery is "
+        "synchronised at the tick boundary. Takes effect at reinit. Default "
+        "is the value of environment variable MOOSE_NUM_THREADS, or 1.",
+        &HSolve::setNumThreads,
+        &HSolve::getNumThreads
+    );
+
     static Finfo* hsolveFinfos[] =
     {
         &seed,              // Value
@@ -167,6 +185,7 @@ const Cinfo* HSolve::initCinfo()
         &caDiv,             // Value
         &caMin,             // Value
         &caMax,             // Value
+        &numThreads,        // Value
         &proc,              // Shared
     };
 
@@ -196,11 +215,16 @@ static const Cinfo* hsolveCinfo = HSolve::initCinfo();
 
 HSolve::HSolve()
     : dt_( 50e-6 )
+    , numThreads_( 1 )
+    , tick_( -1 )
+    , lastStep_( -1.0 )
 {
+    numThreads_ = moose::getEnvInt( "MOOSE_NUM_THREADS", 1 );
 }
 
 HSolve::~HSolve()
 {
+    leaveNetwork();
     unzombify();
 #if 0
     char* p = getenv( "MOOSE_SHOW_SOLVER_PERF" );
@@ -220,16 +244,76 @@ HSolve::~HSolve()
 
 void HSolve::process( const Eref& hsolve, ProcPtr p )
 {
-    t0_ = high_resolution_clock::now();
-    this->HSolveActive::step( p );
-    t1_ = high_resolution_clock::now();
-    addSolverProf( "HSolve", duration_cast<duration<double>>(t1_ - t0_).count(), 1 );
+    if ( tick_ < 0 )
+    {
+        t0_ = high_resolution_clock::now();
+        this->HSolveActive::step( p );
+        t1_ = high_resolution_clock::now();
+        addSolverProf( "HSolve", duration_cast<duration<double>>(t1_ - t0_).count(), 1 );
+        return;
+    }
+
+    if ( lastStep_ != p->currTime )
+        advanceNetwork( p );
+    this->HSolveActive::send( p );
 }
 
 void HSolve::reinit( const Eref& hsolve, ProcPtr p )
 {
     dt_ = p->dt;
     this->HSolveActive::reinit( p );
+
+    leaveNetwork();
+    lastStep_ = -1.0;
+    if ( numThreads_ > 1 && hsolve.element()->getTick() >= 0 )
+    {
+        tick_ = hsolve.element()->getTick();
+        network_[ tick_ ].push_back( this );
+    }
+}
+
+/**
+ * Advances all the HSolves on this solver's tick which have not yet been
+ * advanced to the current time. The cells are independent within a step.
+ */
+void HSolve::advanceNetwork( ProcPtr p )
+{
+    vector< HSolve* > cells;
+    unsigned int nt = 1;
+    for ( HSolve* h : network_[ tick_ ] )
+        if ( h->lastStep_ != p->currTime )
+        {
+            cells.push_back( h );
+            nt = max( nt, h->numThreads_ );
+        }
+
+    t0_ = high_resolution_clock::now();
+    moose::ThreadPool::instance().parallelFor( cells.size(), nt
+            , [&cells, p]( size_t i ) { cells[i]->HSolveActive::advance( p ); }
+            );
+    t1_ = high_resolution_clock::now();
+    addSolverProf( "HSolve", duration_cast<duration<double>>(t1_ - t0_).count(), cells.size() );
+
+    for ( HSolve* h : cells )
+        h->lastStep_ = p->currTime;
+
+    // A copy made after reinit is not in the network; advance it here.
+    if ( lastStep_ != p->currTime )
+    {
+        this->HSolveActive::advance( p );
+        lastStep_ = p->currTime;
+    }
+}
+
+void HSolve::leaveNetwork()
+{
+    if ( tick_ < 0 )
+        return;
+    vector< HSolve* >& cells = network_[ tick_ ];
+    cells.erase( std::remove( cells.begin(), cells.end(), this ), cells.end() );
+    if ( cells.empty() )
+        network_.erase( tick_ );
+    tick_ = -1;
 }
 
 void HSolve::zombify( Eref hsolve ) const
@@ -417,6 +501,16 @@ void HSolve::setDt( double dt )
     dt_ = dt;
 }
 
+void HSolve::setNumThreads( unsigned int numThreads )
+{
+    numThreads_ = max( 1u, numThreads );
+}
+
+unsigned int HSolve::getNumThreads() const
+{
+    return numThreads_;
+}
+
 double HSolve::getDt() const
 {
     return dt_;
@@ -37,6 +37,9 @@ public:
     void setDt( double dt );
     double getDt() const;
 
+    void setNumThreads( unsigned int numThreads );
+    unsigned int getNumThreads() const;
+
     void setCaAdvance( int caAdvance );
     int getCaAdvance() const;
 
@@ -164,6 +167,10 @@ private:
     void zombify( Eref hsolve ) const;
     void unzombify() const;
 
+    // Parallel stepping of the HSolves on a tick.
+    void advanceNetwork( ProcPtr p );
+    void leaveNetwork();
+
     // Mapping global Id to local index. Defined in HSolveInterface.cpp.
     void mapIds();
     void mapIds( vector< Id > id );
@@ -171,6 +178,9 @@ private:
     map< Id, unsigned int > localIndex_;
 
     double dt_;
+    unsigned int numThreads_;
+    int tick_;              ///< Tick of the network joined at reinit, or -1.
+    double lastStep_;       ///< Time upto which this cell has been advanced.
     string path_;
     Id seed_;
 
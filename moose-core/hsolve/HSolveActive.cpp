@@ -43,6 +43,16 @@ HSolveActive::HSolveActive()
 // Solving differential equations
 //////////////////////////////////////////////////////////////////////
 void HSolveActive::step( ProcPtr info )
+{
+    advance( info );
+    send( info );
+}
+
+/**
+ * Integrates the cell by one time-step. Only the solver's own data is touched,
+ * so cells can be advanced concurrently.
+ */
+void HSolveActive::advance( ProcPtr info )
 {
     if ( nCompt_ <= 0 )
         return;
@@ -59,12 +69,23 @@ void HSolveActive::step( ProcPtr info )
     HSolvePassive::backwardSubstitute();
     advanceCalcium();
     advanceSynChans( info );
-    sendValues( info );
-    sendSpikes( info );
     prevExtCurr_ = externalCurrent_;
     externalCurrent_.assign( externalCurrent_.size(), 0.0 );
 }
 
+/**
+ * Sends the values computed by advance() to other objects, and fires the
+ * spike generators.
+ */
+void HSolveActive::send( ProcPtr info )
+{
+    if ( nCompt_ <= 0 )
+        return;
+
+    sendValues( info );
+    sendSpikes( info );
+}
+
 void HSolveActive::calculateChannelCurrents()
 {
     vector< ChannelStruct >::iterator ichan;
@@ -35,6 +35,8 @@ public:
 
     void setup( Id seed, double dt );
     void step( ProcPtr info );			///< Equivalent to process
+    void advance( ProcPtr info );		///< Integrate, without sending messages
+    void send( ProcPtr info );			///< Send values computed by advance
     void reinit( ProcPtr info );
 
 protected:
@@ -6,6 +6,8 @@
 #include <vector>
 #include <string>
 #include <boost/numeric/odeint.hpp>
+#include <boost/numeric/odeint/stepper/rosenbrock4.hpp>
+#include <boost/numeric/odeint/stepper/rosenbrock4_controller.hpp>
 
 typedef double value_type_;
 typedef std::vector<value_type_> vector_type_;
@@ -21,6 +23,14 @@ typedef boost::numeric::odeint::modified_midpoint< vector_type_ > rk_midpoint_st
 typedef boost::numeric::odeint::runge_kutta_cash_karp54< vector_type_ > rk_karp_stepper_type_;
 typedef boost::numeric::odeint::runge_kutta_fehlberg78< vector_type_ > rk_felhberg_stepper_type_;
 
+/*-----------------------------------------------------------------------------
+ *  Implicit stepper for stiff systems. It needs the Jacobian, and works on
+ *  ublas vectors and matrices.
+ *-----------------------------------------------------------------------------*/
+typedef boost::numeric::ublas::vector< value_type_ > ublas_vector_type_;
+typedef boost::numeric::ublas::matrix< value_type_ > ublas_matrix_type_;
+typedef boost::numeric::odeint::rosenbrock4< value_type_ > rosenbrock_stepper_type_;
+
 #endif // USE_BOOST_ODE
 
 #endif /* end of include guard: BOOSTSYSTEM_H */
@@ -0,0 +1,260 @@
+/**********************************************************************
+** This program is part of 'MOOSE', the
+** Messaging Object Oriented Simulation Environment.
+**           Copyright (C) 2003-2014 Upinder S. Bhalla. and NCBS
+** It is made available under the terms of the
+** GNU Lesser General Public License version 2.1
+** See the file COPYING.LIB for the full notice.
+**********************************************************************/
+
+#include <typeinfo>
+#include "../basecode/header.h"
+#include "RateTerm.h"
+#include "FlatRateTerms.h"
+
+FlatRateTerms::FlatRateTerms()
+    : numRates_( 0 ), numVoxels_( 1 ), numPools_( 0 )
+{;}
+
+unsigned int FlatRateTerms::size() const
+{
+    return numRates_;
+}
+
+void FlatRateTerms::addMassAction( unsigned int r, const vector< double >& k,
+        const vector< unsigned int >& reactants )
+{
+    if ( reactants.size() == 0 )
+    {
+        zeroRate_.push_back( r );
+        zeroK_.insert( zeroK_.end(), k.begin(), k.end() );
+    }
+    else if ( reactants.size() == 1 )
+    {
+        firstRate_.push_back( r );
+        firstSub_.push_back( reactants[0] );
+        firstK_.insert( firstK_.end(), k.begin(), k.end() );
+    }
+    else if ( reactants.size() == 2 )
+    {
+        secondRate_.push_back( r );
+        secondSub1_.push_back( reactants[0] );
+        secondSub2_.push_back( reactants[1] );
+        secondK_.insert( secondK_.end(), k.begin(), k.end() );
+    }
+    else
+    {
+        nRate_.push_back( r );
+        nSub_.insert( nSub_.end(), reactants.begin(), reactants.end() );
+        nStart_.push_back( nSub_.size() );
+        nK_.insert( nK_.end(), k.begin(), k.end() );
+    }
+}
+
+/**
+ * Only the exact types whose operator() is k times the product of the
+ * reactants count as mass action. Derived types such as StochNOrder
+ * compute something else, so go in the list of other terms.
+ */
+static bool isMassAction( const RateTerm* term )
+{
+    const std::type_info& t = typeid( *term );
+    return t == typeid( ZeroOrder ) || t == typeid( FirstOrder ) ||
+           t == typeid( SecondOrder ) || t == typeid( NOrder );
+}
+
+enum TermKind { OTHER_TERM, MASS_ACTION, BIDIRECTIONAL, MM_ENZYME };
+
+/**
+ * Finds the group of a term, and fills reactants with its reactants, or
+ * for a BidirectionalReaction those of the forward term followed by those
+ * of the backward term, and numForward with the number of the former.
+ */
+static TermKind termKind( const RateTerm* term,
+        vector< unsigned int >& reactants, unsigned int& numForward )
+{
+    const BidirectionalReaction* bi =
+        dynamic_cast< const BidirectionalReaction* >( term );
+    if ( isMassAction( term ) || typeid( *term ) == typeid( MMEnzyme1 ) )
+    {
+        term->getReactants( reactants );
+        numForward = reactants.size();
+        return isMassAction( term ) ? MASS_ACTION : MM_ENZYME;
+    }
+    if ( bi && isMassAction( bi->getForward() ) &&
+         isMassAction( bi->getBackward() ) )
+    {
+        vector< unsigned int > backward;
+        bi->getForward()->getReactants( reactants );
+        bi->getBackward()->getReactants( backward );
+        numForward = reactants.size();
+        reactants.insert( reactants.end(), backward.begin(), backward.end() );
+        return BIDIRECTIONAL;
+    }
+    return OTHER_TERM;
+}
+
+void FlatRateTerms::build( const vector< RateTerm* >& rates )
+{
+    buildBlock( vector< const vector< RateTerm* >* >( 1, &rates ), 0 );
+}
+
+void FlatRateTerms::buildBlock(
+        const vector< const vector< RateTerm* >* >& rates,
+        unsigned int numPools )
+{
+    numVoxels_ = rates.size();
+    numRates_ = numVoxels_ > 0 ? rates[0]->size() : 0;
+    numPools_ = numPools;
+    zeroRate_.clear();
+    zeroK_.clear();
+    firstRate_.clear();
+    firstSub_.clear();
+    firstK_.clear();
+    secondRate_.clear();
+    secondSub1_.clear();
+    secondSub2_.clear();
+    secondK_.clear();
+    nRate_.clear();
+    nStart_.assign( 1, 0 );
+    nSub_.clear();
+    nK_.clear();
+    mmRate_.clear();
+    mmEnz_.clear();
+    mmSub_.clear();
+    mmKm_.clear();
+    mmKcat_.clear();
+    otherRate_.clear();
+    other_.clear();
+    work_.resize( numVoxels_ );
+    voxelS_.resize( numPools_ );
+
+    vector< unsigned int > reactants;
+    vector< unsigned int > voxelReactants;
+    vector< double > k1( numVoxels_ );
+    vector< double > k2( numVoxels_ );
+    for ( unsigned int r = 0; r < numRates_; ++r )
+    {
+        unsigned int numForward = 0;
+        unsigned int voxelNumForward = 0;
+        TermKind kind = termKind( (*rates[0])[r], reactants, numForward );
+        for ( unsigned int i = 1; i < numVoxels_ && kind != OTHER_TERM; ++i )
+        {
+            const RateTerm* term = (*rates[i])[r];
+            if ( termKind( term, voxelReactants, voxelNumForward ) != kind ||
+                 voxelNumForward != numForward || voxelReactants != reactants )
+                kind = OTHER_TERM;
+        }
+        for ( unsigned int i = 0; i < numVoxels_; ++i )
+        {
+            k1[i] = (*rates[i])[r]->getR1();
+            k2[i] = (*rates[i])[r]->getR2();
+        }
+
+        if ( kind == MASS_ACTION )
+        {
+            addMassAction( r, k1, reactants );
+        }
+        else if ( kind == BIDIRECTIONAL )
+        {
+            addMassAction( r, k1, vector< unsigned int >(
+                        reactants.begin(), reactants.begin() + numForward ) );
+            for ( unsigned int i = 0; i < numVoxels_; ++i )
+                k2[i] = -k2[i];
+            addMassAction( r, k2, vector< unsigned int >(
+                        reactants.begin() + numForward, reactants.end() ) );
+        }
+        else if ( kind == MM_ENZYME )
+        {
+            mmRate_.push_back( r );
+            mmEnz_.push_back( reactants[0] );
+            mmSub_.push_back( reactants[1] );
+            mmKm_.insert( mmKm_.end(), k1.begin(), k1.end() );
+            mmKcat_.insert( mmKcat_.end(), k2.begin(), k2.end() );
+        }
+        else
+        {
+            otherRate_.push_back( r );
+            for ( unsigned int i = 0; i < numVoxels_; ++i )
+                other_.push_back( (*rates[i])[r] );
+        }
+    }
+}
+
+void FlatRateTerms::eval( const double* s, double* v ) const
+{
+    const unsigned int nv = numVoxels_;
+    std::fill( v, v + numRates_ * nv, 0.0 );
+
+    for ( size_t i = 0; i < zeroRate_.size(); ++i )
+    {
+        double* vr = v + zeroRate_[i] * nv;
+        const double* k = &zeroK_[i * nv];
+        for ( unsigned int j = 0; j < nv; ++j )
+            vr[j] += k[j];
+    }
+
+    for ( size_t i = 0; i < firstRate_.size(); ++i )
+    {
+        double* vr = v + firstRate_[i] * nv;
+        const double* k = &firstK_[i * nv];
+        const double* x = s + firstSub_[i] * nv;
+        for ( unsigned int j = 0; j < nv; ++j )
+            vr[j] += k[j] * x[j];
+    }
+
+    for ( size_t i = 0; i < secondRate_.size(); ++i )
+    {
+        double* vr = v + secondRate_[i] * nv;
+        const double* k = &secondK_[i * nv];
+        const double* x = s + secondSub1_[i] * nv;
+        const double* y = s + secondSub2_[i] * nv;
+        for ( unsigned int j = 0; j < nv; ++j )
+            vr[j] += k[j] * x[j] * y[j];
+    }
+
+    for ( size_t i = 0; i < nRate_.size(); ++i )
+    {
+        double* vr = v + nRate_[i] * nv;
+        double* w = &work_[0];
+        const double* k = &nK_[i * nv];
+        for ( unsigned int j = 0; j < nv; ++j )
+            w[j] = k[j];
+        for ( unsigned int q = nStart_[i]; q < nStart_[i + 1]; ++q )
+        {
+            const double* x = s + nSub_[q] * nv;
+            for ( unsigned int j = 0; j < nv; ++j )
+                w[j] *= x[j];
+        }
+        for ( unsigned int j = 0; j < nv; ++j )
+            vr[j] += w[j];
+    }
+
+    for ( size_t i = 0; i < mmRate_.size(); ++i )
+    {
+        double* vr = v + mmRate_[i] * nv;
+        const double* km = &mmKm_[i * nv];
+        const double* kcat = &mmKcat_[i * nv];
+        const double* sub = s + mmSub_[i] * nv;
+        const double* enz = s + mmEnz_[i] * nv;
+        for ( unsigned int j = 0; j < nv; ++j )
+            vr[j] += ( kcat[j] * sub[j] * enz[j] ) / ( km[j] + sub[j] );
+    }
+
+    if ( otherRate_.size() == 0 )
+        return;
+    if ( nv == 1 )
+    {
+        for ( size_t i = 0; i < otherRate_.size(); ++i )
+            v[ otherRate_[i] ] = (*other_[i])( s );
+        return;
+    }
+    // The other terms read a voxel's pools from a contiguous vector.
+    for ( unsigned int j = 0; j < nv; ++j )
+    {
+        for ( unsigned int q = 0; q < numPools_; ++q )
+            voxelS_[q] = s[ q * nv + j ];
+        for ( size_t i = 0; i < otherRate_.size(); ++i )
+            v[ otherRate_[i] * nv + j ] = (*other_[ i * nv + j ])( &voxelS_[0] );
+    }
+}
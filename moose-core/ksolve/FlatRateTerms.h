@@ -0,0 +1,105 @@
+/**********************************************************************
+** This program is part of 'MOOSE', the
+** Messaging Object Oriented Simulation Environment.
+**           Copyright (C) 2003-2014 Upinder S. Bhalla. and NCBS
+** It is made available under the terms of the
+** GNU Lesser General Public License version 2.1
+** See the file COPYING.LIB for the full notice.
+**********************************************************************/
+
+#ifndef _FLAT_RATE_TERMS_H
+#define _FLAT_RATE_TERMS_H
+
+/**
+ * The rate terms of a voxel, compiled into flat arrays so that the
+ * velocities can be computed in tight loops instead of by a virtual call
+ * per reaction. The mass-action and single-substrate MM terms are sorted
+ * into groups by type, each held as arrays of rate constants and of
+ * reactant indices. A BidirectionalReaction is split into its forward
+ * term and its backward term with a negated rate constant, each going to
+ * the group of its order. Terms of any other type stay in a list that is
+ * computed through the virtual call.
+ *
+ * The arithmetic is that of the RateTerm operators, term by term, so the
+ * velocities are bitwise the same.
+ *
+ * The terms of a block of voxels with the same reactions can be compiled
+ * together. The pool numbers and the velocities are then laid out
+ * species-major and voxel-minor, s[ pool * numVoxels + voxel ], and each
+ * rate constant has an entry per voxel, so that the innermost loops run
+ * over the voxels. A term that is not of the same type and on the same
+ * reactants in every voxel of the block is computed through the virtual
+ * call, voxel by voxel.
+ */
+class FlatRateTerms
+{
+public:
+    FlatRateTerms();
+
+    /// Sorts the rates into the groups. Must be redone when they change.
+    void build( const vector< RateTerm* >& rates );
+
+    /**
+     * Sorts the rates of a block of voxels into the groups. The rates
+     * vectors must be of the same size. numPools is the number of pools
+     * in each voxel, all of which the terms may read.
+     */
+    void buildBlock( const vector< const vector< RateTerm* >* >& rates,
+            unsigned int numPools );
+
+    /// Fills v, of one entry per rate term and voxel, with the velocities.
+    void eval( const double* s, double* v ) const;
+
+    /// Number of rate terms compiled, which is zero until build.
+    unsigned int size() const;
+
+private:
+    /**
+     * Puts one mass-action term for rate r into the group of its order,
+     * with the rate constants k of each voxel.
+     */
+    void addMassAction( unsigned int r, const vector< double >& k,
+            const vector< unsigned int >& reactants );
+
+    unsigned int numRates_;
+    unsigned int numVoxels_;
+    unsigned int numPools_;
+
+    // v[r] = k
+    vector< unsigned int > zeroRate_;
+    vector< double > zeroK_;
+
+    // v[r] = k * s[sub]
+    vector< unsigned int > firstRate_;
+    vector< unsigned int > firstSub_;
+    vector< double > firstK_;
+
+    // v[r] = k * s[sub1] * s[sub2]
+    vector< unsigned int > secondRate_;
+    vector< unsigned int > secondSub1_;
+    vector< unsigned int > secondSub2_;
+    vector< double > secondK_;
+
+    // v[r] = k * s[sub0] * s[sub1] * ..., substrates from nStart_[i].
+    vector< unsigned int > nRate_;
+    vector< unsigned int > nStart_;
+    vector< unsigned int > nSub_;
+    vector< double > nK_;
+
+    // v[r] = kcat * s[sub] * s[enz] / ( Km + s[sub] )
+    vector< unsigned int > mmRate_;
+    vector< unsigned int > mmEnz_;
+    vector< unsigned int > mmSub_;
+    vector< double > mmKm_;
+    vector< double > mmKcat_;
+
+    // Everything else, through RateTerm::operator(), one per voxel.
+    vector< unsigned int > otherRate_;
+    vector< const RateTerm* > other_;
+
+    /// Scratch: products of the NOrder group, and one voxel of a block.
+    mutable vector< double > work_;
+    mutable vector< double > voxelS_;
+};
+
+#endif	// _FLAT_RATE_TERMS_H
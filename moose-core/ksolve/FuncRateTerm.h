@@ -76,6 +76,13 @@ class FuncRate: public ExternReac
             return ret;
         }
 
+        /// The rate depends on the function arguments, not the target.
+        void rateDerivs( const double* S,
+                vector< unsigned int >& molIndex, vector< double >& deriv ) const
+        {
+            numericDerivs( S, func_->getReactantIndex(), molIndex, deriv );
+        }
+
     protected:
         double k_;
         shared_ptr<FuncTerm> func_;
@@ -150,6 +157,15 @@ class FuncReac: public FuncRate
             return ret;
         }
 
+        void rateDerivs( const double* S,
+                vector< unsigned int >& molIndex, vector< double >& deriv ) const
+        {
+            vector< unsigned int > mols( v_ );
+            const vector< unsigned int >& args = func_->getReactantIndex();
+            mols.insert( mols.end(), args.begin(), args.end() );
+            numericDerivs( S, mols, molIndex, deriv );
+        }
+
     private:
         vector< unsigned int > v_;
         unsigned int numSubstrates_;
@@ -30,27 +30,12 @@
 #include <chrono>
 #include <algorithm>
 
-#ifdef USE_BOOST_ASYNC
-#define BOOST_THREAD_PROVIDES_FUTURE
-#include <boost/thread.hpp>
-#include <boost/thread/future.hpp>
-#endif
-
-#include <future>
-#include <atomic>
-#include <thread>
 #include <functional>
 
+#include "../utility/ThreadPool.h"
 
 #define SIMPLE_ROUNDING 0
 
-// When set use std::async rather than std::thread. This is slightly faster
-// (roughly 3% with gcc7).
-#define USING_ASYNC 1
-#if USING_ASYNC
-#define THREAD_LAUNCH_POLICY std::launch::async
-#endif
-
 const unsigned int OFFNODE = ~0;
 
 const Cinfo* Gsolve::initCinfo()
@@ -110,6 +95,14 @@ const Cinfo* Gsolve::initCinfo()
         &Gsolve::getNumThreads
     );
 
+    static ReadOnlyValueFinfo< Gsolve, vector< double > > threadBusyTime (
+        "threadBusyTime",
+        "Seconds each thread spent advancing voxels since reinit. Entry 0 is"
+        " the thread which runs the simulation, the rest are workers of the"
+        " thread pool shared by all solvers.",
+        &Gsolve::getThreadBusyTime
+    );
+
     static ValueFinfo< Gsolve, bool > useRandInit(
         "useRandInit",
         "Flag: True when using probabilistic (random) rounding.\n "
@@ -126,6 +119,74 @@ const Cinfo* Gsolve::initCinfo()
         &Gsolve::getRandInit
     );
 
+    static ValueFinfo< Gsolve, bool > useSumTree(
+        "useSumTree",
+        "Flag: True to pick each reaction to fire from a binary tree of "
+        "partial sums of the propensities.\n"
+        "Default: False.\n"
+        "The tree is updated only along the paths of the reactions "
+        "whose propensities change, so picking and updating take "
+        "log time in the number of reactions instead of the linear "
+        "scan used otherwise. Worth setting for systems with several "
+        "hundred reactions or more per voxel. Smaller systems, "
+        "particularly ones in which each reaction changes many "
+        "propensities, are faster with the scan. Takes effect at "
+        "reinit. ",
+        &Gsolve::setSumTree,
+        &Gsolve::getSumTree
+    );
+
+    static ValueFinfo< Gsolve, string > method(
+        "method",
+        "How the reactions are advanced. Options are:\n"
+        "gssa: The default. Gillespie's exact stochastic simulation "
+        "algorithm, which fires one reaction at a time.\n"
+        "tauLeap: Adaptive tau-leaping (Cao, Gillespie and Petzold "
+        "2006). Fires each reaction a Poisson number of times over "
+        "leaps in which no propensity is expected to change by more "
+        "than epsilon. Reactions that could exhaust a reactant within "
+        "numCritical firings are fired one at a time, and the method "
+        "reverts to exact steps when leaps would be too short to "
+        "pay.\n"
+        "hybrid: Reactions whose pools all hold at least "
+        "hybridThreshold molecules are integrated deterministically, "
+        "changing no pool by more than epsilon per step, and the rest "
+        "fire stochastically. Pools changed by the deterministic "
+        "reactions take fractional values.\n"
+        "Both approximate methods pay off for systems in which a few "
+        "abundant species make most of the events. ",
+        &Gsolve::setMethod,
+        &Gsolve::getMethod
+    );
+
+    static ValueFinfo< Gsolve, double > epsilon(
+        "epsilon",
+        "Error control for the tauLeap and hybrid methods: the largest "
+        "expected relative change of any propensity over a leap, or of "
+        "any deterministically integrated pool over a step.\n"
+        "Default: 0.03. ",
+        &Gsolve::setEpsilon,
+        &Gsolve::getEpsilon
+    );
+
+    static ValueFinfo< Gsolve, unsigned int > numCritical(
+        "numCritical",
+        "tauLeap method: reactions that would use up one of their "
+        "reactants within this many firings are fired one at a time.\n"
+        "Default: 10. ",
+        &Gsolve::setNumCritical,
+        &Gsolve::getNumCritical
+    );
+
+    static ValueFinfo< Gsolve, double > hybridThreshold(
+        "hybridThreshold",
+        "hybrid method: reactions whose pools all hold at least this "
+        "many molecules are integrated deterministically.\n"
+        "Default: 100. ",
+        &Gsolve::setHybridThreshold,
+        &Gsolve::getHybridThreshold
+    );
+
     static ValueFinfo< Gsolve, bool > useClockedUpdate(
         "useClockedUpdate",
         "Flag: True to cause all reaction propensities to be updated "
@@ -200,12 +261,18 @@ const Cinfo* Gsolve::initCinfo()
         &numAllVoxels,     // ReadOnlyValue
         &numPools,         // Value
         &numThreads,       // Value
+        &threadBusyTime,   // ReadOnlyValue
         &voxelVol,         // DestFinfo
         &proc,             // SharedFinfo
         &init,             // SharedFinfo
         // Here we put new fields that were not there in the Ksolve.
         &useRandInit,      // Value
         &useClockedUpdate, // Value
+        &useSumTree,       // Value
+        &method,           // Value
+        &epsilon,          // Value
+        &numCritical,      // Value
+        &hybridThreshold,  // Value
         &numFire,          // ReadOnlyLookupValue
     };
 
@@ -372,6 +439,81 @@ void Gsolve::setRandInit( bool val )
     sys_.useRandInit = val;
 }
 
+bool Gsolve::getSumTree() const
+{
+    return sys_.useSumTree;
+}
+
+void Gsolve::setSumTree( bool val )
+{
+    sys_.useSumTree = val;
+}
+
+string Gsolve::getMethod() const
+{
+    if ( sys_.method == GssaSystem::TAU_LEAP )
+        return "tauLeap";
+    if ( sys_.method == GssaSystem::HYBRID )
+        return "hybrid";
+    return "gssa";
+}
+
+void Gsolve::setMethod( string method )
+{
+    std::transform( method.begin(), method.end(), method.begin(), ::tolower );
+    if ( method == "gssa" || method == "gillespie" )
+        sys_.method = GssaSystem::EXACT;
+    else if ( method == "tauleap" )
+        sys_.method = GssaSystem::TAU_LEAP;
+    else if ( method == "hybrid" )
+        sys_.method = GssaSystem::HYBRID;
+    else
+    {
+        cout << "Warning: Gsolve::setMethod: '" << method <<
+             "' not known, using gssa\n";
+        sys_.method = GssaSystem::EXACT;
+    }
+    if ( sys_.isReady )
+        for ( auto i = pools_.begin(); i != pools_.end(); ++i )
+            i->refreshAtot( &sys_ );
+}
+
+double Gsolve::getEpsilon() const
+{
+    return sys_.epsilon;
+}
+
+void Gsolve::setEpsilon( double epsilon )
+{
+    if ( epsilon <= 0.0 || epsilon >= 1.0 )
+    {
+        cout << "Warning: Gsolve::setEpsilon: " << epsilon <<
+             " must be between 0 and 1\n";
+        return;
+    }
+    sys_.epsilon = epsilon;
+}
+
+unsigned int Gsolve::getNumCritical() const
+{
+    return sys_.numCritical;
+}
+
+void Gsolve::setNumCritical( unsigned int n )
+{
+    sys_.numCritical = n;
+}
+
+double Gsolve::getHybridThreshold() const
+{
+    return sys_.hybridThreshold;
+}
+
+void Gsolve::setHybridThreshold( double n )
+{
+    sys_.hybridThreshold = n;
+}
+
 bool Gsolve::getClockedUpdate() const
 {
     return useClockedUpdate_;
@@ -426,98 +568,26 @@ void Gsolve::process( const Eref& e, ProcPtr p )
             i->refreshAtot( &sys_ );
     }
 
-    if( 1 == numThreads_ || 1 == pools_.size())
+    if( numThreads_ > 1 && 1 == pools_.size() )
     {
-        if( numThreads_ > 1 )
-        {
-            cerr << "Warn: Not enough voxel. Reverting back to serial mode. " << endl;
-            numThreads_ = 1;
-        }
-
-        for ( size_t i = 0; i < pools_.size(); i++ )
-            pools_[i].advance( p, &sys_ );
+        cerr << "Warn: Not enough voxel. Reverting back to serial mode. " << endl;
+        numThreads_ = 1;
     }
-    else
-    {
-        /*-----------------------------------------------------------------------------
-         *  Somewhat complicated computation to compute the number of threads. 1
-         *  thread per (at least) voxel pool is ideal situation.
-         *-----------------------------------------------------------------------------*/
-#if USING_ASYNC
-        vector<std::future<size_t>> vecFutures;
-        for (size_t i = 0; i < numThreads_; i++) 
-            vecFutures.push_back( 
-                std::async( THREAD_LAUNCH_POLICY
-                    , [this, i, p](){ 
-                        return this->advance_chunk(i*this->grainSize_, (i+1)*this->grainSize_, p); 
-                    })
-                );
-        // Block in same order
-        size_t tot = 0;
-        for (auto& fut : vecFutures) tot += fut.get();
-        // We have processed all the pools.
-        assert( tot >= pools_.size() );
-#else
-        vector<std::thread> vecThreads;
-        for (size_t i = 0; i < numThreads_; i++)
-        {
-            // Use lambda. It is roughly 10% faster than std::bind and does not
-            // involve copying data.
-            vecThreads.push_back( 
-                std::thread( 
-                    [this, i, p](){ this->advance_chunk(i*this->grainSize_, (i+1)*this->grainSize_, p); }
-                    )
-                );
-        }
 
-        for( auto &v : vecThreads )
-            v.join();
-#endif
-
-    }
+    // Voxels are independent (each has its own RNG); advance them on the
+    // thread pool shared by all solvers.
+    moose::ThreadPool& pool = moose::ThreadPool::instance();
+    pool.parallelFor( pools_.size(), numThreads_
+            , [this, p]( size_t i ) { pools_[i].advance( p, &sys_ ); }
+            , &threadBusyTime_
+            );
 
     if ( useClockedUpdate_ )   // Check if a clocked stim is to be updated
     {
-        if(numThreads_ == 1)
-        {
-            for ( auto &v : pools_ )
-                v.recalcTime( &sys_, p->currTime );
-        }
-        else
-        {
-#if USING_ASYNC
-        vector<std::future<size_t>> vecFutures;
-        for (size_t i = 0; i < numThreads_; i++) 
-            vecFutures.push_back( 
-                std::async( THREAD_LAUNCH_POLICY
-                    , [this, i, p](){ 
-                        return this->recalcTimeChunk(i*this->grainSize_, (i+1)*this->grainSize_, p); 
-                    })
+        pool.parallelFor( pools_.size(), numThreads_
+                , [this, p]( size_t i ) { pools_[i].recalcTime( &sys_, p->currTime ); }
+                , &threadBusyTime_
                 );
-        // Block in same order
-        size_t tot = 0;
-        for (auto& fut : vecFutures) tot += fut.get();
-        assert( tot >= pools_.size() ); // We have processed all the pools.
-#else
-            vector<std::thread> vecThreads;
-
-            for (size_t i = 0; i < numThreads_; i++)
-            {
-                // Use lambda. It is roughly 10% faster than std::bind and does not
-                // involve copying data.
-                vecThreads.push_back( 
-                        std::thread( 
-                            [this, i, p](){ 
-                                this->recalcTimeChunk(i*this->grainSize_, (i+1)*this->grainSize_, p); 
-                            }
-                        )
-                    );
-            }
-            for( auto &v : vecThreads )
-                v.join();
-#endif
-
-        }
     }
 
     // Finally, assemble and send the integrated values off for the Dsolve.
@@ -538,30 +608,6 @@ void Gsolve::process( const Eref& e, ProcPtr p )
     }
 }
 
-size_t Gsolve::recalcTimeChunk( const size_t begin, const size_t end, ProcPtr p)
-{
-    assert( begin >= std::min(pools_.size(), end));
-
-    size_t tot = 0;
-    for (size_t i = begin; i < std::min(pools_.size(), end); i++)  {
-        tot += 1;
-        pools_[i].recalcTime( &sys_, p->currTime );
-    }
-    return tot;
-}
-
-size_t Gsolve::advance_chunk( const size_t begin, const size_t end, ProcPtr p )
-{
-    assert( begin <= std::min(end, pools_.size()) );
-    size_t tot = 0;
-    for (size_t i = begin; i < std::min(end, pools_.size() ); i++)
-    {
-        pools_[i].advance( p, &sys_ );
-        tot += 1;
-    }
-    return tot;
-}
-
 void Gsolve::reinit( const Eref& e, ProcPtr p )
 {
     if ( !stoichPtr_ )
@@ -571,25 +617,22 @@ void Gsolve::reinit( const Eref& e, ProcPtr p )
         rebuildGssaSystem();
 
     // First reinit concs.
-    for (auto i = pools_.begin(); i != pools_.end(); ++i )
-        i->reinit( &sys_ );
+    for ( unsigned int i = 0; i < pools_.size(); ++i )
+        pools_[i].reinit( &sys_, startVoxel_ + i );
 
     // Second, update the atots.
     for ( auto i = pools_.begin(); i != pools_.end(); ++i )
         i->refreshAtot( &sys_ );
 
 
-    // LoadBalancing. Recompute the optimal number of threads.
-    size_t nvPools = pools_.size( );
-    grainSize_ = (size_t) std::ceil((double)nvPools / (double)numThreads_);
-    assert( grainSize_ * numThreads_ >= nvPools);
-    numThreads_ = (size_t) std::ceil((double)nvPools / (double)grainSize_);
-    MOOSE_DEBUG( "Grain size is " << grainSize_ << ". Num threads " << numThreads_);
+    if(numThreads_ > pools_.size())
+        numThreads_ = pools_.size();
 
     if(1 < numThreads_)
         cout << "Info: Setting up threaded gsolve with " << getNumThreads( )
              << " threads. " << endl;
 
+    threadBusyTime_.assign( numThreads_, 0.0 );
 }
 
 //////////////////////////////////////////////////////////////
@@ -604,7 +647,7 @@ void Gsolve::initReinit( const Eref& e, ProcPtr p )
         return;
 
     for( size_t i = 0 ; i < pools_.size(); ++i )
-        pools_[i].reinit( &sys_ );
+        pools_[i].reinit( &sys_, startVoxel_ + i );
 }
 //////////////////////////////////////////////////////////////
 // Solver setup
@@ -626,6 +669,7 @@ void Gsolve::rebuildGssaSystem()
     fillPoolFuncDep();
     fillIncrementFuncDep();
     makeReacDepsUnique();
+    fillReactantOrders();
     for ( vector< GssaVoxelPools >::iterator
             i = pools_.begin(); i != pools_.end(); ++i )
     {
@@ -899,6 +943,41 @@ void Gsolve::makeReacDepsUnique()
     }
 }
 
+/**
+ * For each variable pool, finds the highest order of the reactions that
+ * have it as a substrate, and how many molecules of it the reactions of
+ * that order use. Tau-leaping needs these to bound how fast the
+ * propensities change.
+ */
+void Gsolve::fillReactantOrders()
+{
+    unsigned int numPools = stoichPtr_->getNumVarPools() +
+                            stoichPtr_->getNumProxyPools();
+    sys_.reactantOrder.assign( numPools, 0 );
+    sys_.reactantMultiplicity.assign( numPools, 0 );
+    const vector< RateTerm* >& rates = stoichPtr_->getRateTerms();
+    vector< unsigned int > molIndex;
+    for ( unsigned int i = 0; i < rates.size(); ++i )
+    {
+        unsigned int order = rates[i]->getReactants( molIndex );
+        for ( unsigned int j = 0; j < order && j < molIndex.size(); ++j )
+        {
+            unsigned int k = molIndex[j];
+            if ( k >= numPools )
+                continue;
+            unsigned int mult = count( molIndex.begin(),
+                                       molIndex.begin() + order, k );
+            if ( order > sys_.reactantOrder[k] ||
+                    ( order == sys_.reactantOrder[k] &&
+                      mult > sys_.reactantMultiplicity[k] ) )
+            {
+                sys_.reactantOrder[k] = order;
+                sys_.reactantMultiplicity[k] = mult;
+            }
+        }
+    }
+}
+
 //////////////////////////////////////////////////////////////
 // Solver ops
 //////////////////////////////////////////////////////////////
@@ -1132,6 +1211,11 @@ unsigned int Gsolve::getNumThreads( ) const
     return numThreads_;
 }
 
+vector< double > Gsolve::getThreadBusyTime( ) const
+{
+    return threadBusyTime_;
+}
+
 void Gsolve::setNumThreads( unsigned int x )
 {
     numThreads_ = x;
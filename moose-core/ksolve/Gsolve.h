@@ -77,6 +77,7 @@ public:
     void fillIncrementFuncDep();
     void insertMathDepReacs(unsigned int mathDepIndex, unsigned int firedReac);
     void makeReacDepsUnique();
+    void fillReactantOrders();
 
     //////////////////////////////////////////////////////////////////
     // Solver interface functions
@@ -112,9 +113,6 @@ public:
      */
     void updateRateTerms( unsigned int index );
 
-    // Function for multithreading.
-    size_t advance_chunk( const size_t begin, const size_t end, ProcPtr p );
-    size_t recalcTimeChunk( const size_t begin, const size_t end, ProcPtr p);
 
     //////////////////////////////////////////////////////////////////
     /// Flag: returns true if randomized round to integers is done.
@@ -122,12 +120,27 @@ public:
     /// Flag: set true if randomized round to integers is to be done.
     void setRandInit( bool val );
 
-    /// Flag: returns true if randomized round to integers is done.
+    /// Flag: true if reactions are picked from the tree of propensity sums.
+    bool getSumTree() const;
+    void setSumTree( bool val );
+
+    /// Method used to advance the reactions: gssa, tauLeap or hybrid.
+    string getMethod() const;
+    void setMethod( string method );
+
+    double getEpsilon() const;
+    void setEpsilon( double epsilon );
+    unsigned int getNumCritical() const;
+    void setNumCritical( unsigned int n );
+    double getHybridThreshold() const;
+    void setHybridThreshold( double n );
+
     bool getClockedUpdate() const;
     /// Flag: set true if randomized round to integers is to be done.
     void setClockedUpdate( bool val );
 
     unsigned int getNumThreads( ) const;
+    vector< double > getThreadBusyTime( ) const;
     void setNumThreads( unsigned int x );
 
     //////////////////////////////////////////////////////////////////
@@ -139,7 +152,9 @@ private:
      * used.
      */
     size_t numThreads_;
-    size_t grainSize_;
+
+    /* Seconds spent by each thread advancing voxels since reinit. */
+    vector< double > threadBusyTime_;
 
     GssaSystem sys_;
 
@@ -19,8 +19,13 @@ class Stoich;
 class GssaSystem
 {
 public:
+    /// Ways of advancing the reactions. See Gsolve::method.
+    enum Method { EXACT = 0, TAU_LEAP, HYBRID };
+
     GssaSystem()
-        : stoich(0), useRandInit(true), isReady(false), honorMassConservation(true)
+        : stoich(0), useRandInit(true), isReady(false), honorMassConservation(true),
+          useSumTree(false), method(EXACT), epsilon(0.03), numCritical(10),
+          hybridThreshold(100.0)
     {;}
     vector< vector< unsigned int > > dependency;
     vector< vector< unsigned int > > dependentMathExpn;
@@ -52,6 +57,44 @@ public:
      * the sum of molecules is does not differ more than 1.0 molecules.
      */
     bool honorMassConservation = true;
+
+    /**
+     * Flag: True to pick the reaction to fire by descending a binary tree
+     * of partial sums of the propensities, in log time. False to scan
+     * the propensities linearly, which is faster below a few hundred
+     * reactions.
+     */
+    bool useSumTree = false;
+
+    /// Exact SSA, tau-leaping, or hybrid SSA/deterministic.
+    Method method = EXACT;
+
+    /**
+     * Error control for tau-leaping and the hybrid method: the largest
+     * expected relative change in any propensity (tau-leaping) or in any
+     * continuously integrated pool (hybrid) over one step.
+     */
+    double epsilon = 0.03;
+
+    /**
+     * Tau-leaping: reactions that would exhaust a reactant within this
+     * many firings are critical, and are fired one at a time.
+     */
+    unsigned int numCritical = 10;
+
+    /**
+     * Hybrid: reactions whose pools all hold at least this many
+     * molecules are integrated deterministically.
+     */
+    double hybridThreshold = 100.0;
+
+    /**
+     * Highest order of any reaction that has each pool as a substrate,
+     * and the most molecules of the pool consumed by such a reaction.
+     * Used to bound the change in propensities for tau-leaping.
+     */
+    vector< unsigned int > reactantOrder;
+    vector< unsigned int > reactantMultiplicity;
 };
 
 #endif	// _GSSA_SYSTEM_H
@@ -39,9 +39,38 @@
  */
 const double SAFETY_FACTOR = 1.0 + 1.0e-9;
 
+/**
+ * Tau-leaping falls back to firing reactions one at a time, for
+ * EXACT_STEPS of them, when the leap it could take would hold fewer than
+ * LEAP_MIN_EVENTS events. Leaps that short cost more than they save.
+ * The hybrid method does the same when no reaction is fast.
+ */
+const double LEAP_MIN_EVENTS = 10.0;
+const unsigned int EXACT_STEPS = 100;
+
+/**
+ * The factor g_i of Cao, Gillespie and Petzold (J Chem Phys 124:044109,
+ * 2006), by which a relative change in pool i can scale up into a
+ * relative change of the propensities it is a reactant of, given the
+ * highest order of those reactions and how many molecules of i they use.
+ */
+static double propensityGain( unsigned int order, unsigned int mult, double x )
+{
+    double x1 = 1.0 / max( x - 1.0, 1.0 );
+    double x2 = 2.0 / max( x - 2.0, 1.0 );
+    if ( order <= 1 )
+        return 1.0;
+    if ( order == 2 )
+        return mult >= 2 ? 2.0 + x1 : 2.0;
+    if ( mult >= 3 )
+        return 3.0 + x1 + x2;
+    return mult == 2 ? 1.5 * ( 2.0 + x1 ) : 3.0;
+}
+
 
 // Class definitions
-GssaVoxelPools::GssaVoxelPools(): VoxelPoolsBase(), t_( 0.0 ), atot_( 0.0 )
+GssaVoxelPools::GssaVoxelPools(): VoxelPoolsBase(), t_( 0.0 ), atot_( 0.0 ),
+    useSumTree_( false ), sumTreeLeaf_( 1 ), jump_( 0.0 )
 {;}
 
 GssaVoxelPools::~GssaVoxelPools()
@@ -85,6 +114,15 @@ void GssaVoxelPools::updateDependentMathExpn(
 void GssaVoxelPools::updateDependentRates(
     const vector< unsigned int >& deps, const Stoich* stoich )
 {
+    if ( useSumTree_ )
+    {
+        for ( auto i = deps.cbegin(); i != deps.end(); ++i )
+            v_[ *i ] = getReacVelocity( *i, S() );
+        updateSumTree( deps );
+        // The root is summed afresh from the leaves, so it does not drift.
+        atot_ = sumTree_[1];
+        return;
+    }
     for ( auto i = deps.cbegin(); i != deps.end(); ++i )
     {
         atot_ -= fabs( v_[ *i ] );
@@ -92,9 +130,74 @@ void GssaVoxelPools::updateDependentRates(
     }
 }
 
+void GssaVoxelPools::buildSumTree()
+{
+    sumTreeLeaf_ = 1;
+    while ( sumTreeLeaf_ < v_.size() )
+        sumTreeLeaf_ *= 2;
+    sumTree_.assign( 2 * sumTreeLeaf_, 0.0 );
+    for ( unsigned int i = 0; i < v_.size(); ++i )
+        sumTree_[ sumTreeLeaf_ + i ] = fabs( v_[i] );
+    for ( unsigned int k = sumTreeLeaf_ - 1; k > 0; --k )
+        sumTree_[k] = sumTree_[ 2 * k ] + sumTree_[ 2 * k + 1 ];
+}
+
+void GssaVoxelPools::updateSumTree( const vector< unsigned int >& reacs )
+{
+    // All leaves are at the same depth, so the parents of a sorted list
+    // of nodes are sorted too, and duplicates are adjacent.
+    sumTreeNodes_.clear();
+    for ( auto r = reacs.cbegin(); r != reacs.cend(); ++r )
+    {
+        unsigned int k = sumTreeLeaf_ + *r;
+        sumTree_[k] = fabs( v_[ *r ] );
+        if ( sumTreeNodes_.empty() || sumTreeNodes_.back() != k / 2 )
+            sumTreeNodes_.push_back( k / 2 );
+    }
+    while ( !sumTreeNodes_.empty() && sumTreeNodes_[0] > 0 )
+    {
+        size_t n = 0;
+        for ( size_t j = 0; j < sumTreeNodes_.size(); ++j )
+        {
+            unsigned int k = sumTreeNodes_[j];
+            sumTree_[k] = sumTree_[ 2 * k ] + sumTree_[ 2 * k + 1 ];
+            if ( n == 0 || sumTreeNodes_[ n - 1 ] != k / 2 )
+                sumTreeNodes_[ n++ ] = k / 2;
+        }
+        sumTreeNodes_.resize( n );
+    }
+}
+
+/**
+ * Descends from the root, going left when r falls within the sum of the
+ * left subtree and right otherwise, after taking that sum off r. Returns
+ * v_.size() if roundoff leads to a leaf with no propensity, as pickReac
+ * does when it runs off the end.
+ */
+unsigned int GssaVoxelPools::pickReacFromSumTree()
+{
+    double r = rng_.uniform( ) * sumTree_[1];
+    unsigned int k = 1;
+    while ( k < sumTreeLeaf_ )
+    {
+        k *= 2;
+        if ( r >= sumTree_[k] )
+        {
+            r -= sumTree_[k];
+            ++k;
+        }
+    }
+    k -= sumTreeLeaf_;
+    if ( k >= v_.size() || v_[k] == 0.0 )
+        return v_.size();
+    return k;
+}
 
 unsigned int GssaVoxelPools::pickReac()
 {
+    if ( useSumTree_ )
+        return pickReacFromSumTree();
+
     double r = rng_.uniform( ) * atot_;
     double sum = 0.0;
 
@@ -121,6 +224,7 @@ void GssaVoxelPools::setNumReac( unsigned int n )
     v_.clear();
     v_.resize( n, 0.0 );
     numFire_.resize( n, 0 );
+    fireFrac_.resize( n, 0.0 );
 }
 
 /**
@@ -132,6 +236,13 @@ bool GssaVoxelPools::refreshAtot( const GssaSystem* g )
 {
     g->stoich->updateFuncs( varS(), t_ );
     updateReacVelocities( g, S(), v_ );
+    useSumTree_ = g->useSumTree;
+    if ( useSumTree_ )
+    {
+        buildSumTree();
+        atot_ = sumTree_[1];
+        return atot_ > 0.0;
+    }
     atot_ = 0;
     for ( auto i = v_.cbegin(); i != v_.cend(); ++i )
         atot_ += fabs(*i);
@@ -152,6 +263,10 @@ bool GssaVoxelPools::refreshAtot( const GssaSystem* g )
 void GssaVoxelPools::recalcTime( const GssaSystem* g, double currTime )
 {
     refreshAtot( g );
+    // The other methods keep t_ at the current state, and recompute all
+    // the propensities on every step anyway.
+    if ( g->method != GssaSystem::EXACT )
+        return;
     assert( t_ > currTime );
     t_ = currTime;
     double r = rng_.uniform( );
@@ -162,6 +277,16 @@ void GssaVoxelPools::recalcTime( const GssaSystem* g, double currTime )
 
 void GssaVoxelPools::advance( const ProcInfo* p, const GssaSystem* g )
 {
+    if ( g->method == GssaSystem::TAU_LEAP )
+    {
+        advanceTauLeap( p, g );
+        return;
+    }
+    if ( g->method == GssaSystem::HYBRID )
+    {
+        advanceHybrid( p, g );
+        return;
+    }
     double nextt = p->currTime;
     while ( t_ < nextt )
     {
@@ -183,9 +308,12 @@ void GssaVoxelPools::advance( const ProcInfo* p, const GssaSystem* g )
                 g->stoich->updateFuncs( varS(), t_ );
                 return;
             }
+            // The rebuilt tree has no roundoff, so just pick again.
+            if ( useSumTree_ )
+                rindex = pickReac();
             // We had a roundoff error, fixed it, but now need to be sure
             // we only fire a reaction where this is permissible.
-            for ( unsigned int i = v_.size(); i > 0; --i )
+            for ( unsigned int i = v_.size(); i > 0 && rindex >= v_.size(); --i )
             {
                 if ( fabs( v_[i-1] ) > 0.0 )
                 {
@@ -211,9 +339,311 @@ void GssaVoxelPools::advance( const ProcInfo* p, const GssaSystem* g )
     }
 }
 
-void GssaVoxelPools::reinit( const GssaSystem* g )
+void GssaVoxelPools::advanceExact( const GssaSystem* g, double nextt,
+        unsigned int numSteps )
+{
+    for ( unsigned int k = 0; k < numSteps; ++k )
+    {
+        if ( atot_ <= 0.0 )
+        {
+            t_ = nextt;
+            return;
+        }
+        double r = rng_.uniform();
+        while ( r <= 0.0 )
+            r = rng_.uniform();
+        t_ -= ( 1.0 / atot_ ) * log( r );
+        // The waiting time is memoryless, so an event past nextt can be
+        // discarded.
+        if ( t_ >= nextt )
+        {
+            t_ = nextt;
+            return;
+        }
+        unsigned int rindex = pickReac();
+        while ( rindex >= v_.size() )
+        {
+            if ( !refreshAtot( g ) )
+            {
+                t_ = nextt;
+                return;
+            }
+            rindex = pickReac();
+        }
+        double sign = std::copysign( 1, v_[rindex] );
+        g->transposeN.fireReac( rindex, Svec(), sign );
+        numFire_[rindex]++;
+        g->stoich->updateFuncs( varS(), t_ );
+        updateDependentRates( g->dependency[ rindex ], g->stoich );
+    }
+}
+
+/**
+ * Adaptive tau-leaping after Cao, Gillespie and Petzold (J Chem Phys
+ * 124:044109, 2006). Each leap fires every non-critical reaction a
+ * Poisson number of times, with the leap chosen so that no propensity is
+ * expected to change by more than epsilon. Critical reactions, which
+ * could exhaust a reactant, fire at most once per leap, at an
+ * exponentially distributed time. A leap that would drive a pool
+ * negative is halved and redrawn.
+ */
+void GssaVoxelPools::advanceTauLeap( const ProcInfo* p, const GssaSystem* g )
+{
+    const double nextt = p->currTime;
+    const unsigned int numReac = v_.size();
+    const unsigned int numPools = g->reactantOrder.size();
+    const double* s = S();
+    const int* entry;
+    const unsigned int* colIndex;
+    isCritical_.resize( numReac );
+    leapCount_.resize( numReac );
+
+    while ( t_ < nextt )
+    {
+        if ( !refreshAtot( g ) )   // Stuck state.
+        {
+            t_ = nextt;
+            break;
+        }
+        double a0 = 0.0;
+        double a0c = 0.0;
+        mu_.assign( numPools, 0.0 );
+        sigma2_.assign( numPools, 0.0 );
+        isReactant_.assign( numPools, 0 );
+        for ( unsigned int j = 0; j < numReac; ++j )
+        {
+            double a = fabs( v_[j] );
+            isCritical_[j] = 0;
+            if ( a == 0.0 )
+                continue;
+            a0 += a;
+            double sign = std::copysign( 1, v_[j] );
+            unsigned int n = g->transposeN.getVarRow( j, &entry, &colIndex );
+            double firings = numeric_limits< double >::infinity();
+            for ( unsigned int k = 0; k < n; ++k )
+                if ( entry[k] * sign < 0 )
+                    firings = min( firings,
+                            floor( s[ colIndex[k] ] / fabs( entry[k] ) ) );
+            if ( firings < g->numCritical )
+            {
+                isCritical_[j] = 1;
+                a0c += a;
+                continue;
+            }
+            for ( unsigned int k = 0; k < n; ++k )
+            {
+                double nu = entry[k] * sign;
+                mu_[ colIndex[k] ] += nu * a;
+                sigma2_[ colIndex[k] ] += nu * nu * a;
+                if ( nu < 0 )
+                    isReactant_[ colIndex[k] ] = 1;
+            }
+        }
+
+        double tau = numeric_limits< double >::infinity();
+        for ( unsigned int i = 0; i < numPools; ++i )
+        {
+            if ( !isReactant_[i] )
+                continue;
+            double bound = max( g->epsilon * s[i] / propensityGain(
+                        g->reactantOrder[i], g->reactantMultiplicity[i], s[i] ),
+                    1.0 );
+            if ( mu_[i] != 0.0 )
+                tau = min( tau, bound / fabs( mu_[i] ) );
+            if ( sigma2_[i] > 0.0 )
+                tau = min( tau, bound * bound / sigma2_[i] );
+        }
+        if ( tau < LEAP_MIN_EVENTS / a0 )
+        {
+            advanceExact( g, nextt, EXACT_STEPS );
+            continue;
+        }
+
+        bool fireCritical = false;
+        if ( a0c > 0.0 )
+        {
+            double r = rng_.uniform();
+            while ( r <= 0.0 )
+                r = rng_.uniform();
+            double tauCritical = -log( r ) / a0c;
+            if ( tauCritical < tau )
+            {
+                tau = tauCritical;
+                fireCritical = true;
+            }
+        }
+        if ( t_ + tau >= nextt )
+        {
+            tau = nextt - t_;
+            fireCritical = false;
+        }
+
+        while ( true )
+        {
+            dS_.assign( numPools, 0.0 );
+            for ( unsigned int j = 0; j < numReac; ++j )
+            {
+                leapCount_[j] = 0;
+                if ( isCritical_[j] || v_[j] == 0.0 )
+                    continue;
+                leapCount_[j] = rng_.poisson( fabs( v_[j] ) * tau );
+            }
+            if ( fireCritical )
+            {
+                double r = rng_.uniform() * a0c;
+                unsigned int last = numReac;
+                for ( unsigned int j = 0; j < numReac; ++j )
+                {
+                    if ( !isCritical_[j] )
+                        continue;
+                    last = j;
+                    if ( ( r -= fabs( v_[j] ) ) < 0.0 )
+                        break;
+                }
+                leapCount_[ last ] = 1;
+            }
+            for ( unsigned int j = 0; j < numReac; ++j )
+            {
+                if ( leapCount_[j] == 0 )
+                    continue;
+                double k = std::copysign( leapCount_[j], v_[j] );
+                unsigned int n = g->transposeN.getVarRow( j, &entry, &colIndex );
+                for ( unsigned int m = 0; m < n; ++m )
+                    dS_[ colIndex[m] ] += entry[m] * k;
+            }
+            bool negative = false;
+            for ( unsigned int i = 0; i < numPools && !negative; ++i )
+                negative = s[i] + dS_[i] < 0.0;
+            if ( !negative )
+                break;
+            tau *= 0.5;
+            fireCritical = false;
+        }
+
+        for ( unsigned int j = 0; j < numReac; ++j )
+        {
+            if ( leapCount_[j] == 0 )
+                continue;
+            g->transposeN.fireReac( j, Svec(),
+                    std::copysign( leapCount_[j], v_[j] ) );
+            numFire_[j] += leapCount_[j];
+        }
+        t_ += tau;
+    }
+    g->stoich->updateFuncs( varS(), t_ );
+}
+
+/**
+ * Hybrid method after Haseltine and Rawlings (J Chem Phys 117:6959,
+ * 2002). Reactions whose pools all hold at least hybridThreshold
+ * molecules are fast, and are integrated as deterministic fluxes in
+ * steps that change no pool by more than epsilon. The slow reactions
+ * fire stochastically: the next one fires when their propensity,
+ * integrated over time, reaches an exponentially distributed target.
+ * The pools changed by fast reactions take fractional values.
+ */
+void GssaVoxelPools::advanceHybrid( const ProcInfo* p, const GssaSystem* g )
+{
+    const double nextt = p->currTime;
+    const unsigned int numReac = v_.size();
+    const unsigned int numPools = g->reactantOrder.size();
+    const double* s = S();
+    const int* entry;
+    const unsigned int* colIndex;
+    isCritical_.resize( numReac );
+
+    while ( t_ < nextt )
+    {
+        if ( !refreshAtot( g ) )   // Stuck state.
+        {
+            t_ = nextt;
+            break;
+        }
+        double aSlow = 0.0;
+        bool anyFast = false;
+        dS_.assign( numPools, 0.0 );
+        for ( unsigned int j = 0; j < numReac; ++j )
+        {
+            double a = fabs( v_[j] );
+            isCritical_[j] = 0;
+            if ( a == 0.0 )
+                continue;
+            unsigned int n = g->transposeN.getVarRow( j, &entry, &colIndex );
+            bool fast = n > 0;
+            for ( unsigned int k = 0; k < n && fast; ++k )
+                fast = s[ colIndex[k] ] >= g->hybridThreshold;
+            if ( !fast )
+            {
+                aSlow += a;
+                continue;
+            }
+            isCritical_[j] = 1;
+            anyFast = true;
+            for ( unsigned int k = 0; k < n; ++k )
+                dS_[ colIndex[k] ] += entry[k] * v_[j];
+        }
+        if ( !anyFast )
+        {
+            advanceExact( g, nextt, EXACT_STEPS );
+            // Memoryless, so the slow clock may restart.
+            double r = rng_.uniform();
+            while ( r <= 0.0 )
+                r = rng_.uniform();
+            jump_ = -log( r );
+            continue;
+        }
+
+        double h = nextt - t_;
+        for ( unsigned int i = 0; i < numPools; ++i )
+            if ( dS_[i] != 0.0 )
+                h = min( h, g->epsilon * max( s[i], 1.0 ) / fabs( dS_[i] ) );
+        bool fireSlow = aSlow * h >= jump_;
+        if ( fireSlow )
+            h = jump_ / aSlow;
+        else
+            jump_ -= aSlow * h;
+
+        for ( unsigned int j = 0; j < numReac; ++j )
+        {
+            if ( !isCritical_[j] )
+                continue;
+            double x = fabs( v_[j] ) * h;
+            g->transposeN.fireReac( j, Svec(), std::copysign( x, v_[j] ) );
+            fireFrac_[j] += x;
+            unsigned int whole = static_cast< unsigned int >( fireFrac_[j] );
+            numFire_[j] += whole;
+            fireFrac_[j] -= whole;
+        }
+        t_ += h;
+
+        if ( fireSlow )
+        {
+            double r = rng_.uniform() * aSlow;
+            unsigned int last = numReac;
+            for ( unsigned int j = 0; j < numReac; ++j )
+            {
+                if ( isCritical_[j] || v_[j] == 0.0 )
+                    continue;
+                last = j;
+                if ( ( r -= fabs( v_[j] ) ) < 0.0 )
+                    break;
+            }
+            g->transposeN.fireReac( last, Svec(),
+                    std::copysign( 1, v_[last] ) );
+            numFire_[last]++;
+            r = rng_.uniform();
+            while ( r <= 0.0 )
+                r = rng_.uniform();
+            jump_ = -log( r );
+        }
+    }
+    g->stoich->updateFuncs( varS(), t_ );
+}
+
+void GssaVoxelPools::reinit( const GssaSystem* g, unsigned int voxel )
 {
-    rng_.setSeed( moose::getGlobalSeed() );
+    unsigned long seed = moose::getGlobalSeed();
+    rng_.setSeed( seed == 0 ? 0 : seed + voxel );
     VoxelPoolsBase::reinit(); // Assigns S = Sinit;
     unsigned int numVarPools = g->stoich->getNumVarPools();
     g->stoich->updateFuncs( varS(), 0 );
@@ -250,6 +680,11 @@ void GssaVoxelPools::reinit( const GssaSystem* g )
     t_ = 0.0;
     refreshAtot( g );
     numFire_.assign( v_.size(), 0 );
+    fireFrac_.assign( v_.size(), 0.0 );
+    double r = rng_.uniform();
+    while ( r <= 0.0 )
+        r = rng_.uniform();
+    jump_ = -log( r );
 }
 
 vector< unsigned int > GssaVoxelPools::numFire() const
@@ -268,6 +703,7 @@ void GssaVoxelPools::updateAllRateTerms( const vector< RateTerm* >& rates,
         delete( rates_[i] );
 
     rates_.resize( rates.size() );
+    ratesChanged();
 
     for ( unsigned int i = 0; i < numCoreRates; ++i )
         rates_[i] = rates[i]->copyWithVolScaling( getVolume(), 1, 1 );
@@ -286,6 +722,7 @@ void GssaVoxelPools::updateRateTerms( const vector< RateTerm* >& rates,
     if ( index >= rates_.size() )
         return;
     delete( rates_[index] );
+    ratesChanged();
     if ( index >= numCoreRates )
         rates_[index] = rates[index]->copyWithVolScaling(
                             getVolume(),
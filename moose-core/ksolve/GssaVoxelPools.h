@@ -46,9 +46,12 @@ public:
     bool refreshAtot( const GssaSystem* g );
 
     /**
-     * Builds the gssa system as needed.
+     * Builds the gssa system as needed. The random numbers of voxel #
+     * voxel are seeded with the global seed plus voxel, so that the
+     * voxels are independent; with no global seed each is seeded at
+     * random.
      */
-    void reinit( const GssaSystem* g );
+    void reinit( const GssaSystem* g, unsigned int voxel );
 
     void updateAllRateTerms( const vector< RateTerm* >& rates,
             unsigned int numCoreRates	);
@@ -75,6 +78,36 @@ public:
     void setStoich( const Stoich* stoichPtr );
 
 private:
+    /**
+     * Fires up to numSteps reactions one at a time, each at its own
+     * time, stopping at nextt. Used by the tau-leaping and hybrid
+     * methods, for which t_ is the time of the current state rather than
+     * of the next event.
+     */
+    void advanceExact( const GssaSystem* g, double nextt,
+            unsigned int numSteps );
+
+    /// Advances to p->currTime by adaptive tau-leaping.
+    void advanceTauLeap( const ProcInfo* p, const GssaSystem* g );
+
+    /**
+     * Advances to p->currTime integrating reactions among abundant pools
+     * deterministically, and firing the rest stochastically.
+     */
+    void advanceHybrid( const ProcInfo* p, const GssaSystem* g );
+
+    /// Rebuilds the tree of propensity sums from v_.
+    void buildSumTree();
+
+    /**
+     * Propagates changes in the propensities of reacs, which must be
+     * sorted, up the tree. Shared ancestors are summed only once.
+     */
+    void updateSumTree( const vector< unsigned int >& reacs );
+
+    /// Picks a reaction by descending the tree of propensity sums.
+    unsigned int pickReacFromSumTree();
+
     /// Time at which next event will occur.
     double t_;
 
@@ -93,6 +126,43 @@ private:
     // Count how many times each reaction has fired.
     vector< unsigned int > numFire_;
 
+    /// True when reactions are picked from sumTree_.
+    bool useSumTree_;
+
+    /**
+     * Complete binary tree of propensity sums, stored as an array with
+     * the root at 1 and the children of node k at 2k and 2k+1. The
+     * leaves, from sumTreeLeaf_ on, hold fabs( v_ ).
+     */
+    vector< double > sumTree_;
+    unsigned int sumTreeLeaf_;
+
+    /// Scratch list of the tree nodes to update, one level at a time.
+    vector< unsigned int > sumTreeNodes_;
+
+    /// Tau-leaping scratch: the drift and spread of each pool.
+    vector< double > mu_;
+    vector< double > sigma2_;
+
+    /// Change in each pool over a leap, or its rate of change (hybrid).
+    vector< double > dS_;
+
+    /// Firings of each reaction in a leap.
+    vector< unsigned long > leapCount_;
+
+    /// Flags each critical (tau-leaping) or fast (hybrid) reaction.
+    vector< char > isCritical_;
+
+    /// Flags the pools consumed by non-critical reactions.
+    vector< char > isReactant_;
+
+    /**
+     * Hybrid: integrated propensity left until the next stochastic
+     * event, and the fractional firings of the deterministic reactions.
+     */
+    double jump_;
+    vector< double > fireFrac_;
+
     /**
      * @brief RNG.
      */
@@ -125,6 +125,17 @@ const
     }
 }
 
+unsigned int KinSparseMatrix::getVarRow( unsigned int row,
+        const int** entry, const unsigned int** colIndex ) const
+{
+    if ( row >= rowTruncated_.size() )
+        return 0;
+    unsigned int rs = rowStart_[ row ];
+    *entry = N_.data() + rs;
+    *colIndex = colIndex_.data() + rs;
+    return rowTruncated_[ row ] - rs;
+}
+
 /**
  * This function generates a new internal list of rowEnds, such that
  * they are all less than the maxColumnIndex.
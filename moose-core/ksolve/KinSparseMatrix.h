@@ -51,6 +51,14 @@ public:
     void fireReac( unsigned int reacIndex, vector< double >& S,
                    double direction ) const;
 
+    /**
+     * Like getRow, but only passes back the entries for the variable
+     * molecules, which are the ones that fireReac changes. Returns the
+     * number of such entries.
+     */
+    unsigned int getVarRow( unsigned int row,
+                            const int** entry, const unsigned int** colIndex ) const;
+
     /**
     * This function generates a new internal list of rowEnds, such
     * that they are all less than the maxColumnIndex.
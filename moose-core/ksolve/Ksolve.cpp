@@ -20,6 +20,8 @@
 #include "OdeSystem.h"
 #include "VoxelPoolsBase.h"
 #include "VoxelPools.h"
+#include "FlatRateTerms.h"
+#include "VoxelBlock.h"
 #include "../mesh/VoxelJunction.h"
 #include "ZombiePoolInterface.h"
 
@@ -37,10 +39,9 @@
 #include <chrono>
 #include <algorithm>
 
-#include <future>
 #include <functional>
-#include <atomic>
-#include <thread>
+
+#include "../utility/ThreadPool.h"
 
 using namespace std::chrono;
 
@@ -53,14 +54,22 @@ const Cinfo* Ksolve::initCinfo()
     ///////////////////////////////////////////////////////
     static ValueFinfo< Ksolve, string > method (
         "method",
-        "Integration method, using GSL. So far only explict. Options are:"
+        "Integration method, using GSL. Options are:"
         "rk5: The default Runge-Kutta-Fehlberg 5th order adaptive dt method"
         "gsl: alias for the above"
         "rk4: The Runge-Kutta 4th order fixed dt method"
         "rk2: The Runge-Kutta 2,3 embedded fixed dt method"
         "rkck: The Runge-Kutta Cash-Karp (4,5) method"
         "rk8: The Runge-Kutta Prince-Dormand (8,9) method"
-        "lsoda: LSODA method",
+        "lsoda: LSODA method"
+        "Implicit methods for stiff models, which take large steps "
+        "using the analytic Jacobian of the reaction system:"
+        "msbdf: Variable order backward differentiation formulae"
+        "rk4imp: Implicit 4th order Gaussian Runge-Kutta"
+        "bsimp: Implicit Bulirsch-Stoer"
+        "rosenbrock4: Integrated with msbdf. When MOOSE is built with the "
+        "Boost ODE library instead of GSL, this is the 4th order "
+        "Rosenbrock method, which also stands in for the three above.",
         &Ksolve::setMethod,
         &Ksolve::getMethod
     );
@@ -79,6 +88,17 @@ const Cinfo* Ksolve::initCinfo()
         &Ksolve::getEpsRel
     );
 
+    static ValueFinfo< Ksolve, bool > useFlatRates (
+        "useFlatRates",
+        "Flag: True to compute the reaction velocities from the rate "
+        "terms compiled into flat arrays, grouped by type, instead of "
+        "through a virtual call for each reaction. The results are the "
+        "same either way; the flag is there to compare the speed.\n"
+        "Default: True.",
+        &Ksolve::setFlatRates,
+        &Ksolve::getFlatRates
+    );
+
 
     static ValueFinfo< Ksolve, Id > compartment(
         "compartment",
@@ -116,6 +136,32 @@ const Cinfo* Ksolve::initCinfo()
         &Ksolve::getNumThreads
     );
 
+    static ReadOnlyValueFinfo< Ksolve, vector< double > > threadBusyTime (
+        "threadBusyTime",
+        "Seconds each thread spent advancing voxels since reinit. Entry 0 is"
+        " the thread which runs the simulation, the rest are workers of the"
+        " thread pool shared by all solvers. The sum divided by numThreads"
+        " times the wall time is the parallel efficiency.",
+        &Ksolve::getThreadBusyTime
+    );
+
+    static ValueFinfo< Ksolve, unsigned int > voxelBlockSize (
+        "voxelBlockSize",
+        "Number of voxels integrated together, in lock step, as one ODE "
+        "system. Each rate term is then computed across the voxels of a "
+        "block in an inner loop, and a block has one stepper in place of "
+        "one per voxel. This pays off for many voxels with small reaction "
+        "systems, as on a dendrite. The step size of a block is set by its "
+        "least accurate voxel. Functions are evaluated in each voxel as "
+        "when it is integrated on its own. The blocks are shared out over "
+        "numThreads. "
+        "0 or 1 integrates each voxel on its own, which is also done for "
+        "the lsoda and implicit methods. Takes effect at reinit.\n"
+        "Default: 0.",
+        &Ksolve::setVoxelBlockSize,
+        &Ksolve::getVoxelBlockSize
+    );
+
     static ValueFinfo< Ksolve, unsigned int > numPools(
         "numPools",
         "Number of molecular pools in the entire reac-diff system, "
@@ -196,7 +242,10 @@ const Cinfo* Ksolve::initCinfo()
         &method,                         // Value
         &epsAbs,                         // Value
         &epsRel ,                        // Value
+        &useFlatRates,                   // Value
         &numThreads,                     // Value
+        &threadBusyTime,                 // ReadOnlyValue
+        &voxelBlockSize,                 // Value
         &compartment,                    // Value
         &numLocalVoxels,                 // ReadOnlyValue
         &nVec,                           // LookupValue
@@ -232,8 +281,10 @@ Ksolve::Ksolve()
     method_( "rk5" ),
     epsAbs_( 1e-7 ),
     epsRel_( 1e-7 ),
+    useFlatRates_( true ),
     numThreads_( 1 ),
     pools_( 1 ),
+    voxelBlockSize_( 0 ),
     startVoxel_( 0 ),
     dsolve_(),
     dsolvePtr_( nullptr )
@@ -277,7 +328,9 @@ void Ksolve::setMethod( string method )
         method_ = "rk5";
     }
     else if ( method == "rk4"  || method == "rk2" ||
-              method == "rk8" || method == "rkck" || method == "lsoda" )
+              method == "rk8" || method == "rkck" || method == "lsoda" ||
+              method == "msbdf" || method == "rk4imp" || method == "bsimp" ||
+              method == "rosenbrock4" )
     {
         method_ = method;
     }
@@ -324,6 +377,18 @@ void Ksolve::setEpsRel( double epsRel )
     }
 }
 
+bool Ksolve::getFlatRates() const
+{
+    return useFlatRates_;
+}
+
+void Ksolve::setFlatRates( bool val )
+{
+    useFlatRates_ = val;
+    for ( auto i = pools_.begin(); i != pools_.end(); ++i )
+        i->setFlatRates( val );
+}
+
 void Ksolve::setNumThreads( unsigned int x )
 {
     numThreads_ = x;
@@ -334,6 +399,22 @@ unsigned int Ksolve::getNumThreads(  ) const
     return numThreads_;
 }
 
+vector< double > Ksolve::getThreadBusyTime( ) const
+{
+    return threadBusyTime_;
+}
+
+void Ksolve::setVoxelBlockSize( unsigned int x )
+{
+    voxelBlockSize_ = x;
+    blocks_.clear();
+}
+
+unsigned int Ksolve::getVoxelBlockSize(  ) const
+{
+    return voxelBlockSize_;
+}
+
 Id Ksolve::getStoich() const
 {
     return stoich_;
@@ -363,6 +444,19 @@ void innerSetMethod( OdeSystem& ode, const string& method )
     {
         ode.gslStep = gsl_odeiv2_step_rk8pd;
     }
+    else if ( method == "msbdf" || method == "rosenbrock4" )
+    {
+        // GSL has no Rosenbrock stepper, msbdf stands in for it.
+        ode.gslStep = gsl_odeiv2_step_msbdf;
+    }
+    else if ( method == "rk4imp" )
+    {
+        ode.gslStep = gsl_odeiv2_step_rk4imp;
+    }
+    else if ( method == "bsimp" )
+    {
+        ode.gslStep = gsl_odeiv2_step_bsimp;
+    }
     else
     {
         ode.gslStep = gsl_odeiv2_step_rkf45;
@@ -381,6 +475,7 @@ void Ksolve::setStoich( Id stoich )
         OdeSystem ode;
         ode.epsAbs = epsAbs_;
         ode.epsRel = epsRel_;
+        ode.useFlatRates = useFlatRates_;
         // ode.initStepSize = getEstimatedDt();
         ode.initStepSize = 0.01; // This will be overridden at reinit.
         ode.method = method_;
@@ -394,7 +489,7 @@ void Ksolve::setStoich( Id stoich )
         }
         innerSetMethod( ode, method_ );
         ode.gslSys.function = &VoxelPools::gslFunc;
-        ode.gslSys.jacobian = 0;
+        ode.gslSys.jacobian = &VoxelPools::gslJacobian;
         innerSetMethod( ode, method_ );
         unsigned int numVoxels = pools_.size();
         for ( unsigned int i = 0 ; i < numVoxels; ++i )
@@ -460,6 +555,7 @@ void Ksolve::setNumAllVoxels( unsigned int numVoxels )
     {
         return;
     }
+    blocks_.clear();
     pools_.resize( numVoxels );
 }
 
@@ -535,39 +631,29 @@ void Ksolve::process( const Eref& e, ProcPtr p )
         setBlock( dvalues );
     }
 
-    if( 1 == numThreads_ || 1 == pools_.size() )
+    if( numThreads_ > 1 && 1 == pools_.size() )
     {
-        if( numThreads_ > 1 )
-        {
-            cerr << "Warn: Not enough voxels for multithreading. " 
-                << "Reverting to serial mode. " << endl;
-            numThreads_ = 1;
-        }
-
-        for ( unsigned int i = 0; i < pools_.size(); i++ )
-            pools_[i].advance( p );
+        cerr << "Warn: Not enough voxels for multithreading. " 
+            << "Reverting to serial mode. " << endl;
+        numThreads_ = 1;
     }
-    else
-    {
-        std::vector<std::future<size_t>> vecFutures;
 
-        // lambdas is faster than std::bind
-        for (auto interval : intervals_)
-        {
-            vecFutures.push_back( 
-                    std::async( std::launch::async
-                        , &Ksolve::advance_chunk
-                        , this
-                        , interval.first
-                        , interval.second, p 
-                        )
-                    );
-        }
-        size_t tot = 0;
-        for (auto &v : vecFutures )
-            tot += v.get();
-        assert(tot == pools_.size());
-    }
+    if ( voxelBlockSize_ > 1 && blocks_.empty() )
+        buildBlocks( p->dt );
+
+    // Voxels are independent; advance them on the shared thread pool,
+    // a voxel or a block of voxels at a time.
+    if ( blocks_.empty() )
+        moose::ThreadPool::instance().parallelFor( pools_.size(), numThreads_
+                , [this, p]( size_t i ) { pools_[i].advance( p ); }
+                , &threadBusyTime_
+                );
+    else
+        moose::ThreadPool::instance().parallelFor( blocks_.size()
+                , min( numThreads_, blocks_.size() )
+                , [this, p]( size_t i ) { blocks_[i].advance( p ); }
+                , &threadBusyTime_
+                );
 
     // Assemble and send the integrated values off for the Dsolve.
     if ( dsolvePtr_ )
@@ -589,23 +675,6 @@ void Ksolve::process( const Eref& e, ProcPtr p )
     //moose::addSolverProf( "Ksolve", duration_cast<duration<double>> (t1_ - t0_ ).count(), 1 );
 }
 
-void Ksolve::advance_pool( const size_t i, ProcPtr p )
-{
-    pools_[i].advance(p);
-}
-
-size_t Ksolve::advance_chunk( const size_t begin, const size_t end, ProcPtr p )
-{
-    size_t tot = 0;
-    for (size_t i = begin; i < std::min(end, pools_.size()); i++)
-    {
-        pools_[i].advance( p );
-        tot += 1;
-    }
-    return tot;
-}
-
-
 void Ksolve::reinit( const Eref& e, ProcPtr p )
 {
     if ( !stoichPtr_ )
@@ -629,9 +698,42 @@ void Ksolve::reinit( const Eref& e, ProcPtr p )
         cout << "Info: Multi-threaded Ksolve (" << numThreads_ << " threads)."
             << endl;
 
-    // Recompute the partition of interval.
-    intervals_.clear();
-    moose::splitIntervalInNParts(pools_.size(), numThreads_, intervals_);
+    threadBusyTime_.assign( numThreads_, 0.0 );
+    buildBlocks( p->dt );
+}
+
+/**
+ * Splits the voxels into runs of voxelBlockSize_ for lock-step
+ * integration, or leaves blocks_ empty to integrate them one by one.
+ */
+void Ksolve::buildBlocks( double dt )
+{
+    blocks_.clear();
+    if ( voxelBlockSize_ < 2 || pools_.size() < 2 ||
+         !VoxelBlock::isSupported( method_ ) )
+        return;
+
+    OdeSystem ode;
+    ode.epsAbs = epsAbs_;
+    ode.epsRel = epsRel_;
+    ode.initStepSize = dt / 10.0;
+#ifdef USE_GSL
+    innerSetMethod( ode, method_ );
+#else
+    ode.method = method_;
+#endif
+    unsigned int numBlocks = ( pools_.size() + voxelBlockSize_ - 1 ) /
+                             voxelBlockSize_;
+    // The blocks keep their own address for the GSL, so are made in place.
+    blocks_.resize( numBlocks );
+    for ( unsigned int i = 0; i < numBlocks; ++i )
+    {
+        unsigned int first = i * voxelBlockSize_;
+        unsigned int n = min( voxelBlockSize_,
+                              (unsigned int)pools_.size() - first );
+        blocks_[i].setVoxels( &pools_[first], n, stoichPtr_, ode );
+        blocks_[i].reinit( dt );
+    }
 }
 
 //////////////////////////////////////////////////////////////
@@ -37,6 +37,10 @@ public:
     double getEpsRel() const;
     void setEpsRel( double val );
 
+    /// Flag: True to compute the rates from the flat rate terms.
+    bool getFlatRates() const;
+    void setFlatRates( bool val );
+
     // To make API consistent with GssaVoxelPools
     double getRelativeAccuracy( ) const;
     double getAbsoluteAccuracy( ) const;
@@ -65,9 +69,12 @@ public:
     unsigned int getNumThreads( ) const;
     void setNumThreads( unsigned int x );
 
-    size_t advance_chunk( const size_t begin, const size_t end, ProcPtr p );
+    /// Seconds each thread spent advancing voxels since reinit.
+    vector< double > getThreadBusyTime( ) const;
 
-    void advance_pool( const size_t i, ProcPtr p );
+    /// Number of voxels integrated together as one system.
+    void setVoxelBlockSize( unsigned int x );
+    unsigned int getVoxelBlockSize( ) const;
 
     /**
      * This does a quick and dirty estimate of the timestep suitable
@@ -136,16 +143,18 @@ public:
     static const Cinfo* initCinfo();
 
 private:
+    /// Makes the blocks_ of voxels for lock-step integration.
+    void buildBlocks( double dt );
 
     string method_;
     double epsAbs_;
     double epsRel_;
+    bool useFlatRates_;
 
     /**
      * @brief Number of threads to use. Only applicable for deterministic case.
      */
     size_t numThreads_;
-    size_t grainSize_;
 
     /**
      * Each VoxelPools entry handles all the pools in a single voxel.
@@ -156,6 +165,10 @@ private:
      */
     vector< VoxelPools > pools_;
 
+    /// Voxels in lock step, voxelBlockSize_ of pools_ to each block.
+    unsigned int voxelBlockSize_;
+    vector< VoxelBlock > blocks_;
+
     /// First voxel indexed on the current node.
     unsigned int startVoxel_;
 
@@ -176,7 +189,8 @@ private:
     // Time taken in all process function in us.
     double totalTime_ = 0.0;
 
-    vector<std::pair<size_t, size_t>> intervals_;
+    // Seconds each thread spent in advancing voxels since reinit.
+    vector< double > threadBusyTime_;
 
     //high_resolution_clock::time_point t0_, t1_;
 
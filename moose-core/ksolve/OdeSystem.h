@@ -22,7 +22,8 @@ class OdeSystem {
             : method( "rk5" ),
             initStepSize( 0.001 ),
             epsAbs( 1e-6 ),
-            epsRel( 1e-6 )
+            epsRel( 1e-6 ),
+            useFlatRates( true )
     {;}
 
         std::string method;
@@ -30,6 +31,7 @@ class OdeSystem {
         double initStepSize;
         double epsAbs; // Absolute error
         double epsRel; // Relative error
+        bool useFlatRates; // Compute rates from the FlatRateTerms
 
 #ifdef USE_GSL
         // GSL stuff
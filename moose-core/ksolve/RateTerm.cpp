@@ -18,6 +18,41 @@ using namespace std;
 
 const double RateTerm::EPSILON = 1.0e-6;
 
+void RateTerm::rateDerivs( const double* S,
+        vector< unsigned int >& molIndex, vector< double >& deriv ) const
+{
+    vector< unsigned int > mols;
+    getReactants( mols );
+    numericDerivs( S, mols, molIndex, deriv );
+}
+
+/**
+ * Forward differences, with the step scaled to each molecule number.
+ * The term is evaluated on a copy of S up to the highest of the mols,
+ * which is perturbed in turn, so S itself is never written.
+ */
+void RateTerm::numericDerivs( const double* S, const vector< unsigned int >& mols,
+        vector< unsigned int >& molIndex, vector< double >& deriv ) const
+{
+    vector< unsigned int > m( mols );
+    sort( m.begin(), m.end() );
+    m.erase( unique( m.begin(), m.end() ), m.end() );
+    if ( m.empty() )
+        return;
+    vector< double > s( S, S + m.back() + 1 );
+    double v0 = (*this)( &s[0] );
+    for ( auto i = m.cbegin(); i != m.cend(); ++i )
+    {
+        double x = s[ *i ];
+        double h = 1.0e-7 * max( fabs( x ), 1.0 );
+        s[ *i ] = x + h;
+        double v1 = (*this)( &s[0] );
+        s[ *i ] = x;
+        molIndex.push_back( *i );
+        deriv.push_back( ( v1 - v0 ) / h );
+    }
+}
+
 StochNOrder::StochNOrder( double k, vector< unsigned int > v )
     : NOrder( k, v )
 {
@@ -74,6 +74,22 @@ public:
      */
     virtual RateTerm* copyWithVolScaling(
         double vol, double sub, double prd ) const = 0;
+
+    /**
+     * Appends the partial derivatives of the rate with respect to the
+     * molecules it depends on to deriv, and the indices of those
+     * molecules in S to molIndex. A molecule may come up more than
+     * once, in which case its terms add. Used to build the Jacobian for
+     * implicit integration. The default differentiates numerically with
+     * respect to the reactants.
+     */
+    virtual void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const;
+
+protected:
+    /// Differentiates the rate numerically with respect to mols.
+    void numericDerivs( const double* S, const vector< unsigned int >& mols,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const;
 };
 
 // Base class MMEnzme for the purposes of setting rates
@@ -176,6 +192,16 @@ public:
         return new MMEnzyme1( ratio * Km_, kcat_, enz_, sub_);
     }
 
+    void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const
+    {
+        double denom = Km_ + S[ sub_ ];
+        molIndex.push_back( enz_ );
+        deriv.push_back( kcat_ * S[ sub_ ] / denom );
+        molIndex.push_back( sub_ );
+        deriv.push_back( kcat_ * S[ enz_ ] * Km_ / ( denom * denom ) );
+    }
+
 private:
     unsigned int sub_;
 };
@@ -213,6 +239,21 @@ public:
         double ratio = sub * vol * NA;
         return new MMEnzyme( ratio * Km_, kcat_, enz_, substrates_ );
     }
+
+    void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const
+    {
+        double sub = (*substrates_)( S );
+        double denom = Km_ + sub;
+        molIndex.push_back( enz_ );
+        deriv.push_back( kcat_ * sub / denom );
+        // Chain rule through the substrate product.
+        unsigned int start = deriv.size();
+        substrates_->rateDerivs( S, molIndex, deriv );
+        double scale = kcat_ * S[ enz_ ] * Km_ / ( denom * denom );
+        for ( unsigned int i = start; i < deriv.size(); ++i )
+            deriv[i] *= scale;
+    }
 private:
     RateTerm* substrates_;
 };
@@ -378,6 +419,13 @@ public:
         return new Flux( k_, y_ );
     }
 
+    void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const
+    {
+        molIndex.push_back( y_ );
+        deriv.push_back( k_ );
+    }
+
 private:
     unsigned int y_;
 };
@@ -414,6 +462,13 @@ public:
         return new FirstOrder( k_ / sub, y_ );
     }
 
+    void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const
+    {
+        molIndex.push_back( y_ );
+        deriv.push_back( k_ );
+    }
+
 private:
     unsigned int y_;
 };
@@ -455,6 +510,15 @@ public:
         return new SecondOrder( k_ / ratio, y1_, y2_ );
     }
 
+    void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const
+    {
+        molIndex.push_back( y1_ );
+        deriv.push_back( k_ * S[ y2_ ] );
+        molIndex.push_back( y2_ );
+        deriv.push_back( k_ * S[ y1_ ] );
+    }
+
 private:
     unsigned int y1_;
     unsigned int y2_;
@@ -504,6 +568,13 @@ public:
         return new StochSecondOrderSingleSubstrate( k_ / ratio, y_ );
     }
 
+    void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const
+    {
+        molIndex.push_back( y_ );
+        deriv.push_back( k_ * ( 2.0 * S[ y_ ] - 1.0 ) );
+    }
+
 private:
     const unsigned int y_;
 };
@@ -551,6 +622,20 @@ public:
         return new NOrder( k_ / ratio, v_ );
     }
 
+    void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const
+    {
+        for ( unsigned int i = 0; i < v_.size(); ++i )
+        {
+            double d = k_;
+            for ( unsigned int j = 0; j < v_.size(); ++j )
+                if ( j != i )
+                    d *= S[ v_[j] ];
+            molIndex.push_back( v_[i] );
+            deriv.push_back( d );
+        }
+    }
+
 protected:
     vector< unsigned int > v_;
 };
@@ -576,6 +661,12 @@ public:
         double ratio = sub * pow( vol * NA, (int)( v_.size() ) -1);
         return new StochNOrder( k_ / ratio, v_ );
     }
+
+    void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const
+    {
+        RateTerm::rateDerivs( S, molIndex, deriv );
+    }
 };
 
 extern class ZeroOrder*
@@ -631,6 +722,16 @@ public:
         return backward_->getR1();
     }
 
+    const ZeroOrder* getForward() const
+    {
+        return forward_;
+    }
+
+    const ZeroOrder* getBackward() const
+    {
+        return backward_;
+    }
+
     unsigned int getReactants( vector< unsigned int >& molIndex ) const
     {
         forward_->getReactants( molIndex );
@@ -657,6 +758,16 @@ public:
         return new BidirectionalReaction( f, b );
     }
 
+    void rateDerivs( const double* S,
+            vector< unsigned int >& molIndex, vector< double >& deriv ) const
+    {
+        forward_->rateDerivs( S, molIndex, deriv );
+        unsigned int start = deriv.size();
+        backward_->rateDerivs( S, molIndex, deriv );
+        for ( unsigned int i = start; i < deriv.size(); ++i )
+            deriv[i] = -deriv[i];
+    }
+
 private:
     ZeroOrder* forward_;
     ZeroOrder* backward_;
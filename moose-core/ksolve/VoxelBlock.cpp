@@ -0,0 +1,239 @@
+/**********************************************************************
+** This program is part of 'MOOSE', the
+** Messaging Object Oriented Simulation Environment.
+**           Copyright (C) 2003-2014 Upinder S. Bhalla. and NCBS
+** It is made available under the terms of the
+** GNU Lesser General Public License version 2.1
+** See the file COPYING.LIB for the full notice.
+**********************************************************************/
+
+#include "../basecode/header.h"
+#include "../basecode/SparseMatrix.h"
+
+#ifdef USE_GSL
+#include <gsl/gsl_errno.h>
+#include <gsl/gsl_matrix.h>
+#include <gsl/gsl_odeiv2.h>
+#elif USE_BOOST_ODE
+#include <boost/numeric/odeint.hpp>
+using namespace boost::numeric;
+#endif
+
+#include "OdeSystem.h"
+#include "VoxelPoolsBase.h"
+#include "VoxelPools.h"
+#include "RateTerm.h"
+#include "KinSparseMatrix.h"
+#include "FlatRateTerms.h"
+#include "VoxelBlock.h"
+#include "ZombiePoolInterface.h"
+#include "Stoich.h"
+
+VoxelBlock::VoxelBlock()
+    : first_( nullptr ), numVoxels_( 0 ), stoichPtr_( nullptr ),
+      epsAbs_( 1e-6 ), epsRel_( 1e-6 ), method_( "rk5" )
+{
+#ifdef USE_GSL
+    driver_ = 0;
+#endif
+}
+
+VoxelBlock::~VoxelBlock()
+{
+#ifdef USE_GSL
+    if ( driver_ )
+        gsl_odeiv2_driver_free( driver_ );
+#endif
+}
+
+bool VoxelBlock::isSupported( const string& method )
+{
+    return !( method == "lsoda" || method == "rosenbrock4" ||
+              method == "msbdf" || method == "rk4imp" || method == "bsimp" );
+}
+
+void VoxelBlock::setVoxels( VoxelPools* first, unsigned int numVoxels,
+        const Stoich* stoich, const OdeSystem& ode )
+{
+    first_ = first;
+    numVoxels_ = numVoxels;
+    stoichPtr_ = stoich;
+    epsAbs_ = ode.epsAbs;
+    epsRel_ = ode.epsRel;
+    method_ = ode.method;
+    ratesVersions_.assign( numVoxels_, 0 );
+    y_.assign( stoichPtr_->getNumAllPools() * numVoxels_, 0.0 );
+
+#ifdef USE_GSL
+    sys_.function = &VoxelBlock::gslFunc;
+    sys_.jacobian = 0;
+    sys_.dimension = y_.size();
+    sys_.params = this;
+    if ( driver_ )
+        gsl_odeiv2_driver_free( driver_ );
+    driver_ = gsl_odeiv2_driver_alloc_y_new( &sys_, ode.gslStep,
+              ode.initStepSize, ode.epsAbs, ode.epsRel );
+#endif
+}
+
+unsigned int VoxelBlock::getNumVoxels() const
+{
+    return numVoxels_;
+}
+
+void VoxelBlock::reinit( double dt )
+{
+#ifdef USE_GSL
+    if ( !driver_ )
+        return;
+    gsl_odeiv2_driver_reset( driver_ );
+    gsl_odeiv2_driver_reset_hstart( driver_, dt / 10.0 );
+#endif
+}
+
+void VoxelBlock::advance( const ProcInfo* p )
+{
+    const unsigned int nv = numVoxels_;
+    const unsigned int numPools = stoichPtr_->getNumAllPools();
+    bool ratesCurrent = true;
+    for ( unsigned int j = 0; j < nv; ++j )
+        ratesCurrent &= ( first_[j].getRatesVersion() == ratesVersions_[j] );
+    if ( !ratesCurrent )
+    {
+        vector< const vector< RateTerm* >* > rates( nv );
+        for ( unsigned int j = 0; j < nv; ++j )
+        {
+            rates[j] = &first_[j].getRateTerms();
+            ratesVersions_[j] = first_[j].getRatesVersion();
+        }
+        rates_.buildBlock( rates, numPools );
+    }
+
+    // Gather the voxels into the block.
+    for ( unsigned int j = 0; j < nv; ++j )
+    {
+        double* s = &first_[j].Svec()[0];
+        stoichPtr_->updateFuncs( s, p->currTime );
+        for ( unsigned int q = 0; q < numPools; ++q )
+            y_[ q * nv + j ] = s[q];
+    }
+
+#ifdef USE_GSL
+    double t = p->currTime - p->dt;
+    int status = gsl_odeiv2_driver_apply( driver_, &t, p->currTime, &y_[0] );
+    if ( status != GSL_SUCCESS )
+    {
+        cerr << "Error: VoxelBlock::advance: GSL integration error at time "
+             << t << "\n";
+        cerr << "Error info: " << status << ", " <<
+             gsl_strerror( status ) << endl;
+        assert( 0 );
+    }
+#elif USE_BOOST_ODE
+    // The same steppers as VoxelPools::advance, on the whole block.
+    auto rhs = [this]( const vector_type_& y, vector_type_& dydt, const double t ) {
+        updateRates( &y[0], &dydt[0] );
+    };
+    const double fixedDt = std::min( p->dt, 0.1 );
+    const double t0 = p->currTime - p->dt;
+    if ( method_ == "rk2" )
+        odeint::integrate_const( rk_midpoint_stepper_type_(), rhs, y_,
+                t0, p->currTime, fixedDt );
+    else if ( method_ == "rk4c" )
+        odeint::integrate_const( rk4_stepper_type_(), rhs, y_,
+                t0, p->currTime, fixedDt );
+    else if ( method_ == "rk5c" || method_ == "rk54c" )
+        odeint::integrate_const( rk_karp_stepper_type_(), rhs, y_,
+                t0, p->currTime, fixedDt );
+    else if ( method_ == "rk5" || method_ == "gsl" )
+        odeint::integrate_adaptive(
+                odeint::make_controlled< rk_dopri_stepper_type_ >( epsAbs_, epsRel_ ),
+                rhs, y_, t0, p->currTime, p->dt );
+    else if ( method_ == "rk8c" )
+        odeint::integrate_const( rk_felhberg_stepper_type_(), rhs, y_,
+                t0, p->currTime, fixedDt );
+    else if ( method_ == "rk8" )
+        odeint::integrate_adaptive(
+                odeint::make_controlled< rk_felhberg_stepper_type_ >( epsAbs_, epsRel_ ),
+                rhs, y_, t0, p->currTime, p->dt );
+    else
+        odeint::integrate_adaptive(
+                odeint::make_controlled< rk_karp_stepper_type_ >( epsAbs_, epsRel_ ),
+                rhs, y_, t0, p->currTime, p->dt );
+#endif
+
+    if ( !stoichPtr_->getAllowNegative() )   // clean out negatives
+    {
+        const unsigned int numVar = stoichPtr_->getNumVarPools() * nv;
+        for ( unsigned int i = 0; i < numVar; ++i )
+        {
+            if ( std::signbit( y_[i] ) )
+                y_[i] = 0.0;
+        }
+    }
+
+    // Scatter the block back to the voxels.
+    for ( unsigned int j = 0; j < nv; ++j )
+    {
+        double* s = &first_[j].Svec()[0];
+        for ( unsigned int q = 0; q < numPools; ++q )
+            s[q] = y_[ q * nv + j ];
+    }
+}
+
+void VoxelBlock::updateRates( const double* y, double* yprime ) const
+{
+    const KinSparseMatrix& N = stoichPtr_->getStoichiometryMatrix();
+    const unsigned int nv = numVoxels_;
+    unsigned int totVar = stoichPtr_->getNumVarPools() + stoichPtr_->getNumProxyPools();
+    unsigned int numPools = stoichPtr_->getNumAllPools();
+
+    v_.resize( rates_.size() * nv );
+    rates_.eval( y, v_.data() );
+
+    // yprime = N.v, each entry applied across the voxels.
+    const vector< int >& entry = N.matrixEntry();
+    const vector< unsigned int >& colIndex = N.colIndex();
+    const vector< unsigned int >& rowStart = N.rowStart();
+    unsigned int numRows = N.nColumns() == 0 ? 0 : min( totVar, N.nRows() );
+    for ( unsigned int i = 0; i < numRows; ++i )
+    {
+        double* out = yprime + i * nv;
+        std::fill( out, out + nv, 0.0 );
+        for ( unsigned int k = rowStart[i]; k < rowStart[i + 1]; ++k )
+        {
+            const double e = entry[k];
+            const double* vc = &v_[ colIndex[k] * nv ];
+            for ( unsigned int j = 0; j < nv; ++j )
+                out[j] += e * vc[j];
+        }
+    }
+    std::fill( yprime + numRows * nv, yprime + numPools * nv, 0.0 );
+}
+
+#ifdef USE_GSL
+void VoxelBlock::updateFuncs( double* y, double t )
+{
+    const unsigned int nv = numVoxels_;
+    const unsigned int numPools = stoichPtr_->getNumAllPools();
+    s_.resize( numPools );
+    for ( unsigned int j = 0; j < nv; ++j )
+    {
+        for ( unsigned int q = 0; q < numPools; ++q )
+            s_[q] = y[ q * nv + j ];
+        stoichPtr_->updateFuncs( &s_[0], t );
+        for ( unsigned int q = 0; q < numPools; ++q )
+            y[ q * nv + j ] = s_[q];
+    }
+}
+
+int VoxelBlock::gslFunc( double t, const double* y, double *dydt, void* params )
+{
+    VoxelBlock* vb = reinterpret_cast< VoxelBlock* >( params );
+    // Assign the func portion, as VoxelPools::gslFunc does.
+    if ( vb->stoichPtr_->getNumFuncs() > 0 )
+        vb->updateFuncs( const_cast< double* >( y ), t );
+    vb->updateRates( y, dydt );
+    return GSL_SUCCESS;
+}
+#endif
@@ -0,0 +1,93 @@
+/**********************************************************************
+** This program is part of 'MOOSE', the
+** Messaging Object Oriented Simulation Environment.
+**           Copyright (C) 2003-2014 Upinder S. Bhalla. and NCBS
+** It is made available under the terms of the
+** GNU Lesser General Public License version 2.1
+** See the file COPYING.LIB for the full notice.
+**********************************************************************/
+
+#ifndef _VOXEL_BLOCK_H
+#define _VOXEL_BLOCK_H
+
+/**
+ * A run of consecutive voxels of a Ksolve, integrated in lock step as a
+ * single ODE system. The voxels all have the same reactions, so the rate
+ * terms of the block are compiled together into FlatRateTerms. The pool
+ * numbers are held species-major and voxel-minor, y[ pool * numVoxels +
+ * voxel ], so each rate term and each entry of the stoichiometry matrix
+ * is applied across the voxels in an inner loop, with one stepper for the
+ * block instead of one per voxel. The error control of the stepper takes
+ * the worst voxel of the block, so every voxel gets at least the
+ * accuracy it would on its own.
+ *
+ * Functions are evaluated voxel by voxel just as for a single voxel: on
+ * every evaluation of the rates with GSL, and at the start of each step
+ * with Boost. The rate terms are compiled again whenever those of any
+ * voxel of the block change.
+ */
+class VoxelBlock
+{
+public:
+    VoxelBlock();
+    ~VoxelBlock();
+
+    /// True if the method can be used for a block; the implicit methods
+    /// and lsoda need a voxel at a time.
+    static bool isSupported( const string& method );
+
+    /**
+     * Assigns the voxels of the block, which must stay in place until
+     * the next setVoxels, and the ODE system taken from the Ksolve.
+     */
+    void setVoxels( VoxelPools* first, unsigned int numVoxels,
+            const Stoich* stoich, const OdeSystem& ode );
+
+    unsigned int getNumVoxels() const;
+
+    void reinit( double dt );
+
+    /// Advance the voxels of the block by one step of p.
+    void advance( const ProcInfo* p );
+
+    /**
+     * The velocities of the pools of all the voxels, in the layout of
+     * the block: yprime = N.v across the voxels.
+     */
+    void updateRates( const double* y, double* yprime ) const;
+
+#ifdef USE_GSL
+    static int gslFunc( double t, const double* y, double *dydt, void* params );
+#endif
+
+private:
+#ifdef USE_GSL
+    /// Evaluates the functions of each voxel on the block y at time t.
+    void updateFuncs( double* y, double t );
+#endif
+
+    VoxelPools* first_;
+    unsigned int numVoxels_;
+    const Stoich* stoichPtr_;
+    double epsAbs_;
+    double epsRel_;
+    string method_;
+
+    /// The rate terms of all the voxels, and the rates version of each
+    /// voxel that they were compiled from.
+    FlatRateTerms rates_;
+    vector< unsigned int > ratesVersions_;
+
+    /// Pool numbers of the block, and scratch for the velocities and
+    /// for the pools of one voxel.
+    vector< double > y_;
+    mutable vector< double > v_;
+    vector< double > s_;
+
+#ifdef USE_GSL
+    gsl_odeiv2_driver* driver_;
+    gsl_odeiv2_system sys_;
+#endif
+};
+
+#endif	// _VOXEL_BLOCK_H
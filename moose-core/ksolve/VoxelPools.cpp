@@ -26,15 +26,25 @@ using namespace boost::numeric;
 #include "RateTerm.h"
 #include "FuncTerm.h"
 #include "KinSparseMatrix.h"
+#include "FlatRateTerms.h"
+#include "VoxelBlock.h"
 #include "XferInfo.h"
 #include "ZombiePoolInterface.h"
 #include "Ksolve.h"
 #include "Stoich.h"
 
+/// True for the methods that need the Jacobian.
+static bool isImplicit( const string& method )
+{
+    return method == "rosenbrock4" || method == "msbdf" ||
+           method == "rk4imp" || method == "bsimp";
+}
+
 //////////////////////////////////////////////////////////////
 // Class definitions
 
-VoxelPools::VoxelPools() : pLSODA(nullptr)
+VoxelPools::VoxelPools() : pLSODA(nullptr),
+    useFlatRates_( true ), flatRatesVersion_( 0 )
 {
 #ifdef USE_GSL
     driver_ = 0;
@@ -81,6 +91,7 @@ void VoxelPools::setStoich( Stoich* s, const OdeSystem* ode )
         epsAbs_ = ode->epsAbs;
         epsRel_ = ode->epsRel;
         method_ = ode->method;
+        useFlatRates_ = ode->useFlatRates;
     }
 
 #ifdef USE_GSL
@@ -105,6 +116,11 @@ const string VoxelPools::getMethod( )
 
 void VoxelPools::advance( const ProcInfo* p )
 {
+    if ( useFlatRates_ && flatRatesVersion_ != getRatesVersion() )
+    {
+        flatRates_.build( rates_ );
+        flatRatesVersion_ = getRatesVersion();
+    }
     double t = p->currTime - p->dt;
     Ksolve* k = reinterpret_cast<Ksolve*>( stoichPtr_->getKsolve().eref().data() );
 
@@ -257,6 +273,29 @@ cleaner.
                     , p->currTime
                     , p->dt
                     );
+        else if( isImplicit( method_ ) )
+        {
+            // The GSL implicit methods map onto rosenbrock4 here.
+            ublas_vector_type_ x( size() );
+            std::copy( Svec().begin(), Svec().end(), x.begin() );
+            odeint::integrate_adaptive(
+                    odeint::make_controlled<rosenbrock_stepper_type_>( epsAbs_, epsRel_ )
+                    , std::make_pair(
+                        [this](const ublas_vector_type_& y, ublas_vector_type_& dydt, double t) {
+                        updateRates( &y[0], &dydt[0] );
+                        }
+                        , [this](const ublas_vector_type_& y, ublas_matrix_type_& J, double t,
+                            ublas_vector_type_& dfdt) {
+                        updateJacobian( &y[0], &J.data()[0] );
+                        std::fill( dfdt.begin(), dfdt.end(), 0.0 );
+                        } )
+                    , x
+                    , p->currTime - p->dt
+                    , p->currTime
+                    , p->dt
+                    );
+            std::copy( x.begin(), x.end(), Svec().begin() );
+        }
         else if( method_ == "rk8c" )
             odeint::integrate_const( rk_felhberg_stepper_type_()
                     , [this](const vector_type_& dy, vector_type_& dydt, const double t) { 
@@ -302,6 +341,16 @@ cleaner.
     }
 }
 
+void VoxelPools::setFlatRates( bool val )
+{
+    useFlatRates_ = val;
+}
+
+const vector< RateTerm* >& VoxelPools::getRateTerms() const
+{
+    return rates_;
+}
+
 void VoxelPools::setInitDt( double dt )
 {
 #ifdef USE_GSL
@@ -320,6 +369,18 @@ int VoxelPools::gslFunc( double t, const double* y, double *dydt, void* params )
     return GSL_SUCCESS;
 }
 
+// static func. The Jacobian for the implicit Gsl solvers. Functions of
+// time are not differentiated, so dfdt is zero.
+int VoxelPools::gslJacobian( double t, const double* y, double* dfdy,
+                             double* dfdt, void* params )
+{
+    VoxelPools* vp = reinterpret_cast< VoxelPools* >( params );
+    vp->updateJacobian( y, dfdy );
+    unsigned int n = vp->stoichPtr_->getNumAllPools();
+    std::fill( dfdt, dfdt + n, 0.0 );
+    return GSL_SUCCESS;
+}
+
 #elif USE_BOOST_ODE   // NOT GSL
 
 void VoxelPools::evalRates( VoxelPools* vp, const vector_type_& y,  vector_type_& dydt )
@@ -357,6 +418,7 @@ void VoxelPools::updateAllRateTerms( const vector< RateTerm* >& rates,
         delete( rates_[i] );
 
     rates_.resize(rates.size());
+    ratesChanged();
 
     for ( unsigned int i = 0; i < numCoreRates; ++i )
     {
@@ -380,6 +442,7 @@ void VoxelPools::updateRateTerms( const vector< RateTerm* >& rates,
     if ( index >= rates_.size() )
         return;
     delete( rates_[index] );
+    ratesChanged();
     if ( index >= numCoreRates )
     {
         rates_[index] = rates[index]->copyWithVolScaling(
@@ -394,8 +457,6 @@ void VoxelPools::updateRateTerms( const vector< RateTerm* >& rates,
 void VoxelPools::updateRates( const double* s, double* yprime ) const
 {
     const KinSparseMatrix& N = stoichPtr_->getStoichiometryMatrix();
-    vector< double > v( N.nColumns(), 0.0 );
-    vector< double >::iterator j = v.begin();
     // totVar should include proxyPools only if this voxel uses them
     unsigned int totVar = stoichPtr_->getNumVarPools() + stoichPtr_->getNumProxyPools();
     // totVar should include proxyPools if this voxel does not use them
@@ -403,18 +464,67 @@ void VoxelPools::updateRates( const double* s, double* yprime ) const
     assert( N.nColumns() == 0 || N.nRows() == stoichPtr_->getNumAllPools() );
     assert( N.nColumns() == rates_.size() );
 
-    for ( auto i = rates_.cbegin(); i != rates_.end(); i++)
-        *j++ = (**i)( s );
-    for (unsigned int i = 0; i < totVar; ++i)
+    v_.resize( rates_.size() );
+    double* v = v_.data();
+    if ( useFlatRates_ && flatRatesVersion_ == getRatesVersion() )
+        flatRates_.eval( s, v );
+    else
+        for ( auto i = rates_.cbegin(); i != rates_.end(); i++)
+            *v++ = (**i)( s );
+
+    // yprime = N.v, straight off the sparse rows.
+    const vector< int >& entry = N.matrixEntry();
+    const vector< unsigned int >& colIndex = N.colIndex();
+    const vector< unsigned int >& rowStart = N.rowStart();
+    // A matrix without columns keeps no row starts.
+    unsigned int numRows = N.nColumns() == 0 ? 0 : min( totVar, N.nRows() );
+    for (unsigned int i = 0; i < numRows; ++i)
     {
-        auto rate = N.computeRowRate( i, v );
+        double rate = 0.0;
+        for ( unsigned int j = rowStart[i]; j < rowStart[i + 1]; ++j )
+            rate += entry[j] * v_[ colIndex[j] ];
         assert(! std::isnan(rate));
         *yprime++ = rate;
     }
+    for (unsigned int i = numRows; i < totVar; ++i)
+        *yprime++ = 0.0;
     for (unsigned int i = 0; i < totInvar ; ++i)
         *yprime++ = 0.0;
 }
 
+void VoxelPools::updateJacobian( const double* s, double* J ) const
+{
+    const KinSparseMatrix& N = stoichPtr_->getStoichiometryMatrix();
+    unsigned int numAll = stoichPtr_->getNumAllPools();
+    unsigned int totVar = stoichPtr_->getNumVarPools() + stoichPtr_->getNumProxyPools();
+    std::fill( J, J + numAll * numAll, 0.0 );
+
+    // Derivatives of each rate, stored one rate after another.
+    vector< unsigned int > start( rates_.size() + 1, 0 );
+    vector< unsigned int > mol;
+    vector< double > deriv;
+    for ( unsigned int r = 0; r < rates_.size(); ++r )
+    {
+        start[r] = deriv.size();
+        rates_[r]->rateDerivs( s, mol, deriv );
+    }
+    start[ rates_.size() ] = deriv.size();
+
+    const int* entry;
+    const unsigned int* colIndex;
+    for ( unsigned int i = 0; i < totVar; ++i )
+    {
+        double* row = J + i * numAll;
+        unsigned int n = N.getRow( i, &entry, &colIndex );
+        for ( unsigned int k = 0; k < n; ++k )
+        {
+            unsigned int r = colIndex[k];
+            for ( unsigned int q = start[r]; q < start[r + 1]; ++q )
+                row[ mol[q] ] += entry[k] * deriv[q];
+        }
+    }
+}
+
 /**
  * updateReacVelocities computes the velocity *v* of each reaction.
  * This is a utility function for programs like SteadyState that need
@@ -12,6 +12,7 @@
 
 #include "OdeSystem.h"
 #include "VoxelPoolsBase.h"
+#include "FlatRateTerms.h"
 #include "external/libsoda/LSODA.h"
 
 #ifdef USE_BOOST_ODE
@@ -53,8 +54,16 @@ public:
     /// Set initial timestep to use by the solver.
     void setInitDt( double dt );
 
+    /// Flag: True to compute the rates from the flat rate terms.
+    void setFlatRates( bool val );
+
+    /// The rate terms of the voxel, scaled to its volume.
+    const vector< RateTerm* >& getRateTerms() const;
+
 #ifdef USE_GSL      /* -----  not USE_BOOST  ----- */
     static int gslFunc( double t, const double* y, double *dydt, void* params);
+    static int gslJacobian( double t, const double* y, double* dfdy,
+                            double* dfdt, void* params );
 #elif  USE_BOOST_ODE
     static void evalRates( VoxelPools* vp, const vector_type_& y, vector_type_& dydt );
 #endif     /* -----  not USE_BOOST_ODE  ----- */
@@ -86,6 +95,15 @@ public:
      */
     void updateRates( const double* s, double* yprime ) const;
 
+    /**
+     * Computes the Jacobian d(yprime_i)/d(s_k) of updateRates into the
+     * dense row-major matrix J, of side getNumAllPools. The rate
+     * derivatives come from the RateTerms, and are summed into the rows
+     * of the variable pools through the stoichiometry matrix, so only
+     * its nonzero entries are visited. Buffered pools get zero rows.
+     */
+    void updateJacobian( const double* s, double* J ) const;
+
     /**
      * updateReacVelocities computes the velocity *v* of each reaction
      * from the vector *s* of pool #s.
@@ -112,6 +130,17 @@ private:
     double epsRel_;
     string method_;
 
+    /**
+     * The rate terms compiled into flat arrays, which updateRates uses
+     * when they are current, that is when the version of the rate terms
+     * they were built from is still the latest. Also a scratch vector
+     * for the velocities.
+     */
+    FlatRateTerms flatRates_;
+    bool useFlatRates_;
+    unsigned int flatRatesVersion_;
+    mutable vector< double > v_;
+
 };
 
 #endif	// _VOXEL_POOLS_H
@@ -25,7 +25,8 @@ VoxelPoolsBase::VoxelPoolsBase() :
     stoichPtr_( 0 ),
     S_(1),
     Sinit_(1),
-    volume_(1.0)
+    volume_(1.0),
+    ratesVersion_(1)
 {
     ;
 }
@@ -48,6 +49,16 @@ void VoxelPoolsBase::reinit()
     S_ = Sinit_;
 }
 
+unsigned int VoxelPoolsBase::getRatesVersion() const
+{
+    return ratesVersion_;
+}
+
+void VoxelPoolsBase::ratesChanged()
+{
+    ++ratesVersion_;
+}
+
 //////////////////////////////////////////////////////////////
 // Access functions
 //////////////////////////////////////////////////////////////
@@ -131,6 +142,7 @@ void VoxelPoolsBase::scaleVolsBufsRates(double ratio, const Stoich* stoichPtr)
     unsigned int numCoreRates = stoichPtr->getNumCoreRates();
     const vector< RateTerm* >& rates = stoichPtr->getRateTerms();
     rates_.resize( rates.size() );
+    ratesChanged();
 
     for ( unsigned int i = 0; i < numCoreRates; ++i )
         rates_[i] = rates[i]->copyWithVolScaling( getVolume(), 1, 1 );
@@ -331,6 +343,7 @@ void VoxelPoolsBase::filterCrossRateTerms(
             Id reacId = offSolverReacs[i];
             const Cinfo* reacCinfo = reacId.element()->cinfo();
             unsigned int k = stoichPtr_->convertIdToReacIndex( offSolverReacs[i] );
+            ratesChanged();
             // Start by replacing the immediate cross reaction term.
             if ( rates_[k] )
                 delete rates_[k];
@@ -204,10 +204,19 @@ public:
 
     void scaleVolsBufsRates( double ratio, const Stoich* stoichPtr );
 
+    /**
+     * Count of the changes to the rate terms, so that anything compiled
+     * from them can tell when it is out of date.
+     */
+    unsigned int getRatesVersion() const;
+
     /// Debugging utility
     void print() const;
 
 protected:
+    /// To be called whenever rates_ is changed.
+    void ratesChanged();
+
     const Stoich* stoichPtr_;
     vector< RateTerm* > rates_;
 
@@ -287,6 +296,9 @@ private:
      * Applied to R2 of the RateTerm. Used only for cross reactions.
      */
     vector< double > xReacScaleProducts_;
+
+    /// Incremented by ratesChanged, starts at 1.
+    unsigned int ratesVersion_;
 };
 
 #endif	// _VOXEL_POOLS_BASE_H
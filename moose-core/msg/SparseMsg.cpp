@@ -76,6 +76,17 @@ const Cinfo* SparseMsg::initCinfo()
         &SparseMsg::getRowStart
     );
 
+    static LookupValueFinfo< SparseMsg, string, vector< double > >
+    targetField(
+        "targetField",
+        "Values of a double field, such as weight or delay, on the target "
+        "of every entry in the matrix. The values are in the same order "
+        "as columnIndex and matrixEntry, so a whole connection matrix can "
+        "be assigned or read in one call.",
+        &SparseMsg::setTargetField,
+        &SparseMsg::getTargetField
+    );
+
     static ValueFinfo< SparseMsg, double > probability(
         "probability",
         "connection probability for random connectivity.",
@@ -142,6 +153,19 @@ const Cinfo* SparseMsg::initCinfo()
             new OpFunc1< SparseMsg, vector< unsigned int > >(
                 &SparseMsg::tripletFill1 ) );
 
+    static DestFinfo csrFill( "csrFill",
+            "Fills entire matrix from compressed sparse row (CSR) arrays "
+            "catenated into a single vector as \n"
+            "(rowStart_0,... rowStart_numRows, colIndex_0,... colIndex_n-1)\n"
+            "or, to specify the field index of every target as well, \n"
+            "(rowStart_0,... rowStart_numRows, colIndex_0,... colIndex_n-1, "
+            "fi_0,... fi_n-1)\n"
+            "where n = rowStart_numRows is the number of entries. Column "
+            "indices must be sorted within each row. If field indices are "
+            "not given they are assigned automagically, as in pairFill.",
+            new OpFunc1< SparseMsg, vector< unsigned int > >(
+                &SparseMsg::csrFill ) );
+
 
     // Assemble it all.
     static Finfo* sparseMsgFinfos[] =
@@ -153,6 +177,7 @@ const Cinfo* SparseMsg::initCinfo()
         &matrixEntry,           // ReadOnlyValue
         &columnIndex,           // ReadOnlyValue
         &rowStart,              // ReadOnlyValue
+        &targetField,           // LookupValue
         &probability,           // value
         &seed,                  // value
         &setRandomConnectivity, // dest
@@ -163,6 +188,7 @@ const Cinfo* SparseMsg::initCinfo()
         &pairFill,              // dest
         &tripletFill,           // dest
         &tripletFill1,          // dest
+        &csrFill,               // dest
     };
 
     static Dinfo< short > dinfo;
@@ -234,6 +260,69 @@ vector< unsigned int > SparseMsg::getRowStart() const
     return matrix_.rowStart();
 }
 
+/// Returns the DestFinfo called prefix + Field on the targets, if any.
+static const DestFinfo* targetFinfo( const Element* e,
+                                     const string& prefix,
+                                     const string& field )
+{
+    string name = prefix + field;
+    if ( name.size() > prefix.size() )
+        name[ prefix.size() ] = std::toupper( name[ prefix.size() ] );
+    return dynamic_cast< const DestFinfo* >( e->cinfo()->findFinfo( name ) );
+}
+
+void SparseMsg::setTargetField( string field, vector< double > v )
+{
+    const DestFinfo* df = targetFinfo( e2_, "set", field );
+    const OpFunc1Base< double >* op = df ?
+        dynamic_cast< const OpFunc1Base< double >* >( df->getOpFunc() ) : 0;
+    if ( !op )
+    {
+        cout << "Warning: SparseMsg::setTargetField: " << e2_->getName() <<
+             " has no double field '" << field << "'. Aborting\n";
+        return;
+    }
+    const vector< unsigned int >& colIndex = matrix_.colIndex();
+    const vector< unsigned int >& entry = matrix_.matrixEntry();
+    if ( v.size() != entry.size() )
+    {
+        cout << "Warning: SparseMsg::setTargetField: " << v.size() <<
+             " values given for " << entry.size() << " entries. Aborting\n";
+        return;
+    }
+    for ( unsigned int i = 0; i < entry.size(); ++i )
+    {
+        Eref er( e2_, colIndex[i], entry[i] );
+        if ( er.isDataHere() )
+            op->op( er, v[i] );
+    }
+}
+
+vector< double > SparseMsg::getTargetField( string field ) const
+{
+    vector< double > ret;
+    const DestFinfo* df = targetFinfo( e2_, "get", field );
+    const GetOpFuncBase< double >* op = df ?
+        dynamic_cast< const GetOpFuncBase< double >* >( df->getOpFunc() ) : 0;
+    if ( !op )
+    {
+        cout << "Warning: SparseMsg::getTargetField: " << e2_->getName() <<
+             " has no double field '" << field << "'\n";
+        return ret;
+    }
+    const vector< unsigned int >& colIndex = matrix_.colIndex();
+    const vector< unsigned int >& entry = matrix_.matrixEntry();
+    // Targets on other nodes are reported as zero.
+    ret.resize( entry.size(), 0.0 );
+    for ( unsigned int i = 0; i < entry.size(); ++i )
+    {
+        Eref er( e2_, colIndex[i], entry[i] );
+        if ( er.isDataHere() )
+            ret[i] = op->returnOp( er );
+    }
+    return ret;
+}
+
 void SparseMsg::setEntryPairs( vector< unsigned int > v )
 {
     vector< unsigned int > src( v.begin(), v.begin() + v.size()/2 );
@@ -374,6 +463,73 @@ void SparseMsg::tripletFill1( vector< unsigned int > v )
     tripletFill( src, dest, fieldIndex );
 }
 
+void SparseMsg::csrFill( vector< unsigned int > v )
+{
+    unsigned int nRows = e1()->numData();
+    unsigned int nCols = e2()->numData();
+    if ( v.size() < nRows + 1 )
+    {
+        cout << "Warning: SparseMsg::csrFill: need " << nRows + 1 <<
+             " rowStart entries, got " << v.size() << ". Aborting\n";
+        return;
+    }
+    vector< unsigned int > rowStart( v.begin(), v.begin() + nRows + 1 );
+    unsigned int n = rowStart.back();
+    unsigned long rest = v.size() - nRows - 1;
+    vector< unsigned int >::const_iterator c = v.begin() + nRows + 1;
+    if ( rowStart[0] != 0 || ( rest != n && rest != 2UL * n ) )
+    {
+        cout << "Warning: SparseMsg::csrFill: " << rest <<
+             " entries follow rowStart, expected " << n << " or " << 2 * n <<
+             ". Aborting\n";
+        return;
+    }
+    vector< unsigned int > colIndex( c, c + n );
+    for ( unsigned int i = 0; i < nRows; ++i )
+    {
+        if ( rowStart[i] > rowStart[i + 1] )
+        {
+            cout << "Warning: SparseMsg::csrFill: rowStart decreases at row "
+                 << i << ". Aborting\n";
+            return;
+        }
+    }
+    for ( unsigned int i = 0; i < nRows; ++i )
+    {
+        for ( unsigned int j = rowStart[i]; j < rowStart[i + 1]; ++j )
+        {
+            if ( colIndex[j] >= nCols )
+            {
+                cout << "Warning: SparseMsg::csrFill: Dest index " <<
+                     colIndex[j] << " exceeds Dest array size " << nCols <<
+                     ". Aborting\n";
+                return;
+            }
+            if ( j > rowStart[i] && colIndex[j] < colIndex[j - 1] )
+            {
+                cout << "Warning: SparseMsg::csrFill: column indices of row "
+                     << i << " are not sorted. Aborting\n";
+                return;
+            }
+        }
+    }
+
+    vector< unsigned int > fieldIndex;
+    if ( rest == 2UL * n )
+    {
+        fieldIndex.assign( c + n, c + 2 * n );
+    }
+    else
+    {
+        vector< unsigned int > numAtDest( nCols, 0 );
+        fieldIndex.resize( n );
+        for ( unsigned int j = 0; j < n; ++j )
+            fieldIndex[j] = numAtDest[ colIndex[j] ]++;
+    }
+    matrix_.csrFill( nRows, nCols, fieldIndex, colIndex, rowStart );
+    updateAfterFill();
+}
+
 //////////////////////////////////////////////////////////////////
 //    Here are the actual class functions
 //////////////////////////////////////////////////////////////////
@@ -87,6 +87,13 @@ public:
     vector< unsigned int > getColIndex() const;
     vector< unsigned int > getRowStart() const;
 
+    /**
+     * Assigns or reads a double field, such as weight or delay, on the
+     * targets of all entries, in the order of the matrix entries.
+     */
+    void setTargetField( string field, vector< double > v );
+    vector< double > getTargetField( string field ) const;
+
     int getSeed() const;
     void setSeed( int value );
 
@@ -128,6 +135,14 @@ public:
      */
     void tripletFill1( vector< unsigned int > entries );
 
+    /**
+     * Fills up the entire message from compressed sparse row arrays,
+     * rowStart followed by colIndex and optionally the field indices,
+     * catenated into a single vector. This is what scipy.sparse and
+     * most connectome formats hold, so no conversion to pairs is needed.
+     */
+    void csrFill( vector< unsigned int > entries );
+
     /**
      * Utility function to update all sorts of values after we've
      * rebuilt the matrix.
@@ -9,6 +9,23 @@
 #include "../basecode/header.h"
 #include "PyRun.h"
 
+/**
+ * moose.start releases the GIL while the simulation runs. Every function
+ * here which is called from the scheduler must hold the GIL while it
+ * touches Python objects.
+ */
+class GILGuard
+{
+public:
+    GILGuard(): state_( PyGILState_Ensure() ) {}
+    ~GILGuard()
+    {
+        PyGILState_Release( state_ );
+    }
+private:
+    PyGILState_STATE state_;
+};
+
 const int PyRun::RUNPROC = 1;
 const int PyRun::RUNTRIG = 2;
 const int PyRun::RUNBOTH = 0;
@@ -211,6 +228,7 @@ int PyRun::getMode() const
 
 void PyRun::trigger(const Eref& e, double input)
 {
+    GILGuard gil;
     if (!runcompiled_)
     {
         return;
@@ -256,6 +274,7 @@ void PyRun::trigger(const Eref& e, double input)
 
 void PyRun::run(const Eref&e, string statement)
 {
+    GILGuard gil;
     PyRun_SimpleString(statement.c_str());
     PyObject * value = PyDict_GetItemString(locals_, outputvar_.c_str());
     if (value)
@@ -270,8 +289,9 @@ void PyRun::run(const Eref&e, string statement)
 
 void PyRun::process(const Eref & e, ProcPtr p)
 {
-    // Make sure the get the GIL. Ksolve/Gsolve can be multithreaded.
-    PyGILState_STATE gstate = PyGILState_Ensure();
+    // Make sure the get the GIL. It is released by moose.start and
+    // Ksolve/Gsolve can be multithreaded.
+    GILGuard gil;
 
     // PyRun_String(runstr_.c_str(), 0, globals_, locals_);
     // PyRun_SimpleString(runstr_.c_str());
@@ -299,8 +319,6 @@ void PyRun::process(const Eref & e, ProcPtr p)
         else
             outputOut()->send(e, output);
     }
-
-    PyGILState_Release( gstate );
 }
 
 /**
@@ -337,6 +355,7 @@ void handleError(bool syntax)
 
 void PyRun::reinit(const Eref& e, ProcPtr p)
 {
+    GILGuard gil;
     PyObject * main_module;
     if (globals_ == NULL)
     {
@@ -463,46 +463,17 @@ PyObject * moose_ObjId_getattro(_ObjId * self, PyObject * attr)
     {
         return _ret;
     }
-    string fieldName(field);
-    string className = Field<string>::get(self->oid_, "className");
-    vector<string> valueFinfos = getFieldNames(className, "valueFinfo");
-    bool isValueField = false;
-    for (unsigned int ii = 0; ii < valueFinfos.size(); ++ii)
+    const FieldDescriptor * desc = getFieldDescriptor(
+                                       self->oid_.element()->cinfo(), string(field));
+    if (desc == NULL || !desc->isValueField || !desc->ftype)
     {
-        if (fieldName == valueFinfos[ii])
+        if (desc != NULL && desc->name != field)
         {
-            isValueField = true;
-            break;
-        }
-    }
-
-    string type = getFieldType(className, fieldName);
-    if (type.empty() || !isValueField )
-    {
-        // Check if this field name is aliased and update fieldName and type if so.
-        map<string, string>::const_iterator it = get_field_alias().find(fieldName);
-        if (it != get_field_alias().end())
-        {
-            fieldName = it->second;
-            field = fieldName.c_str();
-            isValueField = false;
-            for (unsigned int ii = 0; ii < valueFinfos.size(); ++ii)
-            {
-                if (fieldName == valueFinfos[ii])
-                {
-                    isValueField = true;
-                    break;
-                }
-            }
-            type = getFieldType(Field<string>::get(self->oid_, "className"), fieldName);
-            // Update attr for next level (PyObject_GenericGetAttr) in case.
-            // Py_XDECREF(attr);
-            attr = PyString_FromString(field);
+            // Aliased field. Update attr for next level
+            // (PyObject_GenericGetAttr) in case.
+            attr = PyString_FromString(desc->name.c_str());
             new_attr = 1;
         }
-    }
-    if (type.empty() || !isValueField)
-    {
         _ret = PyObject_GenericGetAttr((PyObject*)self, attr);
         if (new_attr)
         {
@@ -510,17 +481,8 @@ PyObject * moose_ObjId_getattro(_ObjId * self, PyObject * attr)
         }
         return _ret;
     }
-    ftype = shortType(type);
-    if (!ftype)
-    {
-        _ret = PyObject_GenericGetAttr((PyObject*)self, attr);
-        if (new_attr)
-        {
-            Py_DECREF(attr);
-        }
-        return _ret;
-    }
-    fieldName= string(field);
+    ftype = desc->ftype;
+    const string& fieldName = desc->name;
     switch(ftype)
     {
     case 's':
@@ -780,8 +742,9 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         PyErr_SetString(PyExc_TypeError, "Attribute name must be a string");
         return -1;
     }
-    string fieldtype = getFieldType(Field<string>::get(self->oid_, "className"), string(field));
-    if (fieldtype.length() == 0)
+    const FieldDescriptor * desc = getFieldDescriptor(
+                                       self->oid_.element()->cinfo(), string(field));
+    if (desc == NULL)
     {
         // If it is instance of a MOOSE built-in class then throw
         // error (to avoid silently creating new attributes due to
@@ -798,14 +761,20 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         PyErr_SetString(PyExc_AttributeError, msg.str().c_str());
         return -1;
     }
-    char ftype = shortType(fieldtype);
+    char ftype = desc->ftype;
+    // Numeric vector fields are copied out of numpy arrays in one go.
+    int status = set_vector_field_from_array(self->oid_, desc->name, ftype, value);
+    if (status != 1)
+    {
+        return status;
+    }
     int ret = 0;
     switch(ftype)
     {
     case 'd':
     {
         double _value = PyFloat_AsDouble(value);
-        ret = Field<double>::set(self->oid_, string(field), _value);
+        ret = Field<double>::set(self->oid_, desc->name, _value);
         break;
     }
     case 'l':
@@ -813,26 +782,26 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         long _value = PyInt_AsLong(value);
         if ((_value != -1) || (!PyErr_Occurred()))
         {
-            ret = Field<long>::set(self->oid_, string(field), _value);
+            ret = Field<long>::set(self->oid_, desc->name, _value);
         }
         break;
     }
     case 'I':
     {
         unsigned long _value = PyInt_AsUnsignedLongMask(value);
-        ret = Field<unsigned int>::set(self->oid_, string(field), (unsigned int)_value);
+        ret = Field<unsigned int>::set(self->oid_, desc->name, (unsigned int)_value);
         break;
     }
     case 'k':
     {
         unsigned long _value = PyInt_AsUnsignedLongMask(value);
-        ret = Field<unsigned long>::set(self->oid_, string(field), _value);
+        ret = Field<unsigned long>::set(self->oid_, desc->name, _value);
         break;
     }
     case 'f':
     {
         float _value = PyFloat_AsDouble(value);
-        ret = Field<float>::set(self->oid_, string(field), _value);
+        ret = Field<float>::set(self->oid_, desc->name, _value);
         break;
     }
     case 's':
@@ -840,7 +809,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         char * _value = PyString_AsString(value);
         if (_value)
         {
-            ret = Field<string>::set(self->oid_, string(field), string(_value));
+            ret = Field<string>::set(self->oid_, desc->name, string(_value));
         }
         break;
     }
@@ -848,7 +817,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
     {
         if (value)
         {
-            ret = Field<Id>::set(self->oid_, string(field), ((_Id*)value)->id_);
+            ret = Field<Id>::set(self->oid_, desc->name, ((_Id*)value)->id_);
         }
         else
         {
@@ -861,7 +830,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
     {
         if (value)
         {
-            ret = Field<ObjId>::set(self->oid_, string(field), ((_ObjId*)value)->oid_);
+            ret = Field<ObjId>::set(self->oid_, desc->name, ((_ObjId*)value)->oid_);
         }
         else
         {
@@ -887,14 +856,14 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
                 Py_XDECREF(vo);
                 _value.push_back(v);
             }
-            ret = Field< vector < double > >::set(self->oid_, string(field), _value);
+            ret = Field< vector < double > >::set(self->oid_, desc->name, _value);
         }
         break;
     }
     case 'b':
     {
         bool _value = (Py_True == value) || (PyInt_AsLong(value) != 0);
-        ret = Field<bool>::set(self->oid_, string(field), _value);
+        ret = Field<bool>::set(self->oid_, desc->name, _value);
         break;
     }
     case 'c':
@@ -902,7 +871,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         char * _value = PyString_AsString(value);
         if (_value && _value[0])
         {
-            ret = Field<char>::set(self->oid_, string(field), _value[0]);
+            ret = Field<char>::set(self->oid_, desc->name, _value[0]);
         }
         break;
     }
@@ -911,7 +880,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         int _value = PyInt_AsLong(value);
         if ((_value != -1) || (!PyErr_Occurred()))
         {
-            ret = Field<int>::set(self->oid_, string(field), _value);
+            ret = Field<int>::set(self->oid_, desc->name, _value);
         }
         break;
     }
@@ -920,7 +889,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         short _value = (short)PyInt_AsLong(value);
         if ((_value != -1) || (!PyErr_Occurred()))
         {
-            ret = Field<short>::set(self->oid_, string(field), _value);
+            ret = Field<short>::set(self->oid_, desc->name, _value);
         }
         break;
     }
@@ -944,7 +913,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
             Py_XDECREF(vo);
             _value.push_back(v);
         }
-        ret = Field< vector < int > >::set(self->oid_, string(field), _value);
+        ret = Field< vector < int > >::set(self->oid_, desc->name, _value);
         break;
     }
     case 'w':
@@ -964,7 +933,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
                 Py_XDECREF(vo);
                 _value.push_back(v);
             }
-            ret = Field< vector < short > >::set(self->oid_, string(field), _value);
+            ret = Field< vector < short > >::set(self->oid_, desc->name, _value);
         }
         break;
     }
@@ -986,7 +955,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
                 Py_XDECREF(vo);
                 _value.push_back(v);
             }
-            ret = Field< vector < long > >::set(self->oid_, string(field), _value);
+            ret = Field< vector < long > >::set(self->oid_, desc->name, _value);
         }
         break;
     }
@@ -1007,7 +976,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
                 Py_XDECREF(vo);
                 _value.push_back(v);
             }
-            ret = Field< vector < unsigned int > >::set(self->oid_, string(field), _value);
+            ret = Field< vector < unsigned int > >::set(self->oid_, desc->name, _value);
         }
         break;
     }
@@ -1028,7 +997,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
                 Py_XDECREF(vo);
                 _value.push_back(v);
             }
-            ret = Field< vector < unsigned long > >::set(self->oid_, string(field), _value);
+            ret = Field< vector < unsigned long > >::set(self->oid_, desc->name, _value);
         }
         break;
     }
@@ -1049,7 +1018,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
                 Py_XDECREF(vo);
                 _value.push_back(v);
             }
-            ret = Field< vector < float > >::set(self->oid_, string(field), _value);
+            ret = Field< vector < float > >::set(self->oid_, desc->name, _value);
         }
         break;
     }
@@ -1070,7 +1039,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
                 Py_XDECREF(vo);
                 _value.push_back(string(v));
             }
-            ret = Field< vector < string > >::set(self->oid_, string(field), _value);
+            ret = Field< vector < string > >::set(self->oid_, desc->name, _value);
         }
         break;
     }
@@ -1079,7 +1048,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         vector < vector <unsigned> > * _value = (vector < vector <unsigned> > *)to_cpp(value, ftype);
         if (!PyErr_Occurred())
         {
-            ret = Field < vector < vector <unsigned> > >::set(self->oid_, string(field), *_value);
+            ret = Field < vector < vector <unsigned> > >::set(self->oid_, desc->name, *_value);
         }
         delete _value;
         break;
@@ -1089,7 +1058,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         vector < vector <int> > * _value = (vector < vector <int> > *)to_cpp(value, ftype);
         if (!PyErr_Occurred())
         {
-            ret = Field < vector < vector <int> > >::set(self->oid_, string(field), *_value);
+            ret = Field < vector < vector <int> > >::set(self->oid_, desc->name, *_value);
         }
         delete _value;
         break;
@@ -1099,7 +1068,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
         vector < vector <double> > * _value = (vector < vector <double> > *)to_cpp(value, ftype);
         if (!PyErr_Occurred())
         {
-            ret = Field < vector < vector <double> > >::set(self->oid_, string(field), *_value);
+            ret = Field < vector < vector <double> > >::set(self->oid_, desc->name, *_value);
         }
         delete _value;
         break;
@@ -1121,7 +1090,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
                 Py_XDECREF(vo);
                 _value.push_back(v);
             }
-            ret = Field< vector < Id > >::set(self->oid_, string(field), _value);
+            ret = Field< vector < Id > >::set(self->oid_, desc->name, _value);
         }
         break;
     }
@@ -1142,7 +1111,7 @@ int  moose_ObjId_setattro(_ObjId * self, PyObject * attr, PyObject * value)
                 Py_XDECREF(vo);
                 _value.push_back(v);
             }
-            ret = Field< vector < ObjId > >::set(self->oid_, string(field), _value);
+            ret = Field< vector < ObjId > >::set(self->oid_, desc->name, _value);
         }
         break;
     }
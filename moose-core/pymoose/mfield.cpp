@@ -684,121 +684,103 @@ PyObject * moose_ElementField_getSlice(_Field * self, Py_ssize_t start, Py_ssize
 
 PyObject * moose_ElementField_getattro(_Field * self, PyObject * attr)
 {
-    int new_attr = 0;
     PyObject * ret = NULL;
     if (self->owner->oid_.bad())
     {
         RAISE_INVALID_ID(NULL, "moose_ElementField_getSlice");
     }
     char * field = PyString_AsString(attr);
-    string className = Field<string>::get(self->myoid, "className");
-    string type = getFieldType(className, field);
-    if (type.empty())
+    const FieldDescriptor * desc = getFieldDescriptor(
+                                       self->myoid.element()->cinfo(), string(field));
+    if (desc == NULL || !desc->ftype)
     {
-        // Check if this field name is aliased and update fieldname and type if so.
-        map<string, string>::const_iterator it = get_field_alias().find(string(field));
-        if (it != get_field_alias().end())
-        {
-            field = const_cast<char*>((it->second).c_str());
-            type = getFieldType(Field<string>::get(self->myoid, "className"), it->second);
-            // Update attr for next level (PyObject_GenericGetAttr) in case.
-            new_attr = 1;
-            attr = PyString_FromString(field);
-        }
+        return PyObject_GenericGetAttr((PyObject*)self, attr);
     }
-    if (type.empty())
-    {
-        ret = PyObject_GenericGetAttr((PyObject*)self, attr);
-        if (new_attr)
-        {
-            Py_DECREF(attr);
-            return ret;
-        }
-    }
-    char ftype = shortType(type);
+    char ftype = desc->ftype;
+    const string& fieldName = desc->name;
     switch (ftype)
     {
     case 'd':
     {
         vector < double > val;
-        Field< double >::getVec(self->myoid, string(field), val);
+        Field< double >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 's':
     {
         vector < string > val;
-        Field< string >::getVec(self->myoid, string(field), val);
+        Field< string >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'l':
     {
         vector < long > val;
-        Field< long >::getVec(self->myoid, string(field), val);
+        Field< long >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'x':
     {
         vector < Id > val;
-        Field< Id >::getVec(self->myoid, string(field), val);
+        Field< Id >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'y':
     {
         vector < ObjId > val;
-        Field< ObjId >::getVec(self->myoid, string(field), val);
+        Field< ObjId >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'i':
     {
         vector < int > val;
-        Field< int >::getVec(self->myoid, string(field), val);
+        Field< int >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'I':
     {
         vector < unsigned int > val;
-        Field< unsigned int >::getVec(self->myoid, string(field), val);
+        Field< unsigned int >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'k':
     {
         vector < unsigned long > val;
-        Field< unsigned long >::getVec(self->myoid, string(field), val);
+        Field< unsigned long >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'f':
     {
         vector < float > val;
-        Field< float >::getVec(self->myoid, string(field), val);
+        Field< float >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'b':
     {
         vector<bool> val;
-        Field< bool >::getVec(self->myoid, string(field), val);
+        Field< bool >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'c':
     {
         vector < char > val;
-        Field< char >::getVec(self->myoid, string(field), val);
+        Field< char >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
     case 'h':
     {
         vector < short > val;
-        Field< short >::getVec(self->myoid, string(field), val);
+        Field< short >::getVec(self->myoid, fieldName, val);
         ret = to_pytuple(&val, ftype);
         break;
     }
@@ -816,10 +798,6 @@ PyObject * moose_ElementField_getattro(_Field * self, PyObject * attr)
         PyErr_SetString(PyExc_ValueError, "unhandled field type.");
         break;
     }
-    if (new_attr)
-    {
-        Py_DECREF(attr);
-    }
     return ret;
 }
 
@@ -840,9 +818,9 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
         PyErr_SetString(PyExc_TypeError, "Attribute name must be a string");
         return -1;
     }
-    string moose_class = Field<string>::get(self->myoid, "className");
-    string fieldtype = getFieldType(moose_class, field);
-    if (fieldtype.length() == 0)
+    const FieldDescriptor * desc = getFieldDescriptor(
+                                       self->myoid.element()->cinfo(), field);
+    if (desc == NULL)
     {
         if (field == "num")
         {
@@ -851,7 +829,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
         PyErr_SetString(PyExc_AttributeError, "cannot add new field to ElementField objects");
         return -1;
     }
-    char ftype = shortType(fieldtype);
+    char ftype = desc->ftype;
     Py_ssize_t length = moose_ElementField_getLen(self, NULL);
     bool is_seq = true;
     if (!PySequence_Check(value))
@@ -883,7 +861,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
             double v = PyFloat_AsDouble(value);
             _value.assign(length, v);
         }
-        ret = Field<double>::setVec(self->myoid, field, _value);
+        ret = Field<double>::setVec(self->myoid, desc->name, _value);
         break;
     }
     case 's':
@@ -902,7 +880,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
             char * v = PyString_AsString(value);
             _value.assign(length, string(v));
         }
-        ret = Field<string>::setVec(self->myoid, field, _value);
+        ret = Field<string>::setVec(self->myoid, desc->name, _value);
         break;
     }
     case 'i':
@@ -921,7 +899,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
             int v = PyInt_AsLong(value);
             _value.assign(length, v);
         }
-        ret = Field< int >::setVec(self->myoid, field, _value);
+        ret = Field< int >::setVec(self->myoid, desc->name, _value);
         break;
     }
     case 'I':  //SET_VECFIELD(unsigned int, I)
@@ -940,7 +918,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
             unsigned int v = PyInt_AsUnsignedLongMask(value);
             _value.assign(length, v);
         }
-        ret = Field< unsigned int >::setVec(self->myoid, field, _value);
+        ret = Field< unsigned int >::setVec(self->myoid, desc->name, _value);
         break;
     }
     case 'l':  //SET_VECFIELD(long, l)
@@ -959,7 +937,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
             long v = PyInt_AsLong(value);
             _value.assign(length, v);
         }
-        ret = Field<long>::setVec(self->myoid, field, _value);
+        ret = Field<long>::setVec(self->myoid, desc->name, _value);
         break;
     }
     case 'k':  //SET_VECFIELD(unsigned long, k)
@@ -978,7 +956,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
             unsigned long v = PyInt_AsUnsignedLongMask(value);
             _value.assign(length, v);
         }
-        ret = Field< unsigned long >::setVec(self->myoid, field, _value);
+        ret = Field< unsigned long >::setVec(self->myoid, desc->name, _value);
         break;
     }
     case 'b':
@@ -998,7 +976,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
             bool v = (Py_True ==value) || (PyInt_AsLong(value) != 0);
             _value.assign(length, v);
         }
-        ret = Field< bool >::setVec(self->myoid, field, _value);
+        ret = Field< bool >::setVec(self->myoid, desc->name, _value);
         break;
     }
     case 'c':
@@ -1036,7 +1014,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
                 return -1;
             }
         }
-        ret = Field< char >::setVec(self->myoid, field, _value);
+        ret = Field< char >::setVec(self->myoid, desc->name, _value);
         break;
     }
     case 'h':
@@ -1055,7 +1033,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
             short v = PyInt_AsLong(value);
             _value.assign(length, v);
         }
-        ret = Field< short >::setVec(self->myoid, field, _value);
+        ret = Field< short >::setVec(self->myoid, desc->name, _value);
         break;
     }
     case 'f':  //SET_VECFIELD(float, f)
@@ -1074,7 +1052,7 @@ int moose_ElementField_setattro(_Field * self, PyObject * attr, PyObject * value
             float v = PyFloat_AsDouble(value);
             _value.assign(length, v);
         }
-        ret = Field<float>::setVec(self->myoid, field, _value);
+        ret = Field<float>::setVec(self->myoid, desc->name, _value);
         break;
     }
     default:
@@ -195,6 +195,11 @@ vector<int> pysequence_to_dimvec(PyObject * dims)
 */
 void * to_cpp(PyObject * object, char typecode)
 {
+    void * vec = array_to_vector(object, typecode);
+    if (vec != NULL || PyErr_Occurred())
+    {
+        return vec;
+    }
     switch(typecode)
     {
     case 'i':
@@ -535,6 +540,32 @@ PyObject * to_pytuple(void * obj, char typecode)
         assert(ret != NULL);
         char * ptr = PyArray_BYTES((PyArrayObject*)ret);
         memcpy(ptr, &(*vec)[0], size * sizeof(int));
+#endif
+        return ret;
+    }
+    case 'b':   // vector<bool> is packed, so copy one by one
+    {
+        vector< bool > * vec = static_cast< vector < bool >* >(obj);
+        assert(vec != NULL);
+#ifndef USE_NUMPY
+        ret = PyTuple_New((Py_ssize_t)vec->size());
+        for (unsigned int ii = 0; ii < vec->size(); ++ii)
+        {
+            if (0 != PyTuple_SetItem(ret, ii, PyBool_FromLong(vec->at(ii))))
+            {
+                Py_DECREF(ret);
+                return NULL;
+            }
+        }
+#else
+        npy_intp size = (npy_intp)(vec->size());
+        ret = PyArray_SimpleNew(1, &size, NPY_BOOL);
+        assert(ret != NULL);
+        npy_bool * ptr = (npy_bool *)PyArray_DATA((PyArrayObject*)ret);
+        for (npy_intp ii = 0; ii < size; ++ii)
+        {
+            ptr[ii] = (*vec)[ii];
+        }
 #endif
         return ret;
     }
@@ -577,7 +608,7 @@ PyObject * to_pytuple(void * obj, char typecode)
         }
 #else
         npy_intp size = (npy_intp)(vec->size());
-        ret = PyArray_SimpleNew(1, &size, NPY_INT);
+        ret = PyArray_SimpleNew(1, &size, NPY_LONG);
         assert(ret != NULL);
         char * ptr = PyArray_BYTES((PyArrayObject*)ret);
         memcpy(ptr, &(*vec)[0], size * sizeof(long));
@@ -646,7 +677,7 @@ PyObject * to_pytuple(void * obj, char typecode)
     }
     case 'k':   // vector<unsigned long>
     {
-        vector< unsigned int > * vec = static_cast< vector < unsigned int >* >(obj);
+        vector< unsigned long > * vec = static_cast< vector < unsigned long >* >(obj);
         assert(vec != NULL);
 #ifndef USE_NUMPY
         ret = PyTuple_New((Py_ssize_t)vec->size());
@@ -660,10 +691,10 @@ PyObject * to_pytuple(void * obj, char typecode)
         }
 #else
         npy_intp size = (npy_intp)(vec->size());
-        ret = PyArray_SimpleNew(1, &size, NPY_UINT);
+        ret = PyArray_SimpleNew(1, &size, NPY_ULONG);
         assert(ret != NULL);
         char * ptr = PyArray_BYTES((PyArrayObject*)ret);
-        memcpy(ptr, &(*vec)[0], size * sizeof(unsigned int));
+        memcpy(ptr, &(*vec)[0], size * sizeof(unsigned long));
 #endif
         return ret;
     }
@@ -804,6 +835,443 @@ PyObject * to_pytuple(void * obj, char typecode)
     return ret;
 }
 
+/**
+   Numpy type number used to hold a vectorized field with short type
+   code `typecode`. Returns NPY_NOTYPE for fields that are not numeric.
+*/
+static int vec_field_typenum(char typecode)
+{
+    switch (typecode)
+    {
+    case 'd':
+        return NPY_DOUBLE;
+    case 'f':
+        return NPY_FLOAT;
+    case 'i':
+        return NPY_INT;
+    case 'I':
+        return NPY_UINT;
+    case 'l':
+        return NPY_LONG;
+    case 'k':
+        return NPY_ULONG;
+    case 'h':
+        return NPY_SHORT;
+    case 'b':
+        return NPY_BOOL;
+    default:
+        return NPY_NOTYPE;
+    }
+}
+
+/**
+   Fill `arr` with field values of all entries of `oid` using
+   Field::getVecInto, which writes straight into the array buffer.
+*/
+template <class A, class B>
+static bool fill_vec_field_array(ObjId oid, const string& field, PyArrayObject * arr)
+{
+    unsigned int size = (unsigned int)PyArray_SIZE(arr);
+    if (size == 0)
+    {
+        return true;
+    }
+    B * ptr = static_cast< B * >(PyArray_DATA(arr));
+    return Field< A >::template getVecInto< B >(oid, field, ptr, size) == size;
+}
+
+bool is_vec_field_numeric(char typecode)
+{
+    return vec_field_typenum(typecode) != NPY_NOTYPE;
+}
+
+/**
+   Read `field` of all `length` entries of `oid` into a numpy array.
+
+   If `out` is NULL a new array is created. Otherwise `out` must be a
+   writable, C-contiguous numpy array of the field's dtype with
+   `length` entries; it is filled in place and a new reference to it is
+   returned. This saves the intermediate std::vector and the per-call
+   allocation in tight monitoring loops.
+*/
+PyObject * get_vec_field_array(ObjId oid, const string& field, char typecode,
+                               Py_ssize_t length, PyObject * out)
+{
+    int typenum = vec_field_typenum(typecode);
+    if (typenum == NPY_NOTYPE)
+    {
+        ostringstream msg;
+        msg << "get_vec_field_array: field '" << field << "' is not numeric.";
+        PyErr_SetString(PyExc_TypeError, msg.str().c_str());
+        return NULL;
+    }
+    PyArrayObject * arr = NULL;
+    if (out == NULL || out == Py_None)
+    {
+        npy_intp size = (npy_intp)length;
+        arr = (PyArrayObject*)PyArray_SimpleNew(1, &size, typenum);
+        if (arr == NULL)
+        {
+            return NULL;
+        }
+    }
+    else
+    {
+        if (!PyArray_Check(out))
+        {
+            PyErr_SetString(PyExc_TypeError, "get_vec_field_array: `out` must be a numpy array.");
+            return NULL;
+        }
+        arr = (PyArrayObject*)out;
+        if (PyArray_TYPE(arr) != typenum)
+        {
+            PyArray_Descr * descr = PyArray_DescrFromType(typenum);
+            ostringstream msg;
+            msg << "get_vec_field_array: `out` must have dtype '"
+                << descr->type << "' for field '" << field << "'.";
+            Py_DECREF(descr);
+            PyErr_SetString(PyExc_TypeError, msg.str().c_str());
+            return NULL;
+        }
+        if (!PyArray_IS_C_CONTIGUOUS(arr) || !PyArray_ISWRITEABLE(arr))
+        {
+            PyErr_SetString(PyExc_ValueError,
+                            "get_vec_field_array: `out` must be writable and C-contiguous.");
+            return NULL;
+        }
+        if (PyArray_SIZE(arr) != length)
+        {
+            ostringstream msg;
+            msg << "get_vec_field_array: `out` has " << PyArray_SIZE(arr)
+                << " entries, vec has " << length << ".";
+            PyErr_SetString(PyExc_ValueError, msg.str().c_str());
+            return NULL;
+        }
+        Py_INCREF(out);
+    }
+
+    bool ok = false;
+    switch (typecode)
+    {
+    case 'd':
+        ok = fill_vec_field_array< double, double >(oid, field, arr);
+        break;
+    case 'f':
+        ok = fill_vec_field_array< float, float >(oid, field, arr);
+        break;
+    case 'i':
+        ok = fill_vec_field_array< int, int >(oid, field, arr);
+        break;
+    case 'I':
+        ok = fill_vec_field_array< unsigned int, unsigned int >(oid, field, arr);
+        break;
+    case 'l':
+        ok = fill_vec_field_array< long, long >(oid, field, arr);
+        break;
+    case 'k':
+        ok = fill_vec_field_array< unsigned long, unsigned long >(oid, field, arr);
+        break;
+    case 'h':
+        ok = fill_vec_field_array< short, short >(oid, field, arr);
+        break;
+    case 'b':
+        ok = fill_vec_field_array< bool, npy_bool >(oid, field, arr);
+        break;
+    }
+    if (!ok)
+    {
+        Py_DECREF(arr);
+        ostringstream msg;
+        msg << "get_vec_field_array: could not read field '" << field
+            << "' of " << oid.path();
+        PyErr_SetString(PyExc_RuntimeError, msg.str().c_str());
+        return NULL;
+    }
+    return (PyObject*)arr;
+}
+
+/**
+   Assign the contents of numpy array `arr` to field of all entries of
+   `oid`. A 0-d array is broadcast to all entries.
+*/
+template <class A, class B>
+static bool set_vec_field_array(ObjId oid, const string& field, PyArrayObject * arr)
+{
+    B * ptr = static_cast< B * >(PyArray_DATA(arr));
+    if (PyArray_NDIM(arr) == 0)
+    {
+        return Field< A >::setRepeat(oid, field, (A)ptr[0]);
+    }
+    vector< A > value(ptr, ptr + PyArray_SIZE(arr));
+    return Field< A >::setVec(oid, field, value);
+}
+
+/**
+   Convert `src` to an aligned, contiguous array of `typenum`. Only casts
+   that keep the kind of the values are done, as numpy's same_kind
+   casting, except that integers and bools may go to any integer or bool
+   type. A float array is not truncated into an integer field.
+
+   Returns a new reference, or NULL with TypeError set.
+*/
+static PyArrayObject * cast_field_array(PyArrayObject * src, int typenum)
+{
+    PyArray_Descr * descr = PyArray_DescrFromType(typenum);
+    int srctype = PyArray_TYPE(src);
+    bool integral = (PyTypeNum_ISINTEGER(srctype) || PyTypeNum_ISBOOL(srctype))
+                    && (PyTypeNum_ISINTEGER(typenum) || PyTypeNum_ISBOOL(typenum));
+    if (!integral && !PyArray_CanCastArrayTo(src, descr, NPY_SAME_KIND_CASTING))
+    {
+        PyErr_Format(PyExc_TypeError,
+                     "cannot cast values of dtype '%c' to a field of dtype '%c'",
+                     PyArray_DESCR(src)->type, descr->type);
+        Py_DECREF(descr);
+        return NULL;
+    }
+    // PyArray_FromArray steals the reference to descr.
+    return (PyArrayObject*)PyArray_FromArray(src, descr,
+            NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+}
+
+/**
+   Set numeric `field` of all `length` entries of `oid` from a
+   buffer-protocol object (numpy array, memoryview, array.array) or
+   broadcast a scalar number to all of them. The whole buffer is
+   converted in one go instead of item by item.
+
+   Returns 0 on success, -1 on error (with Python exception set) and 1
+   if `value` is not something this function handles, e.g. a list.
+*/
+int set_vec_field_from_buffer(ObjId oid, const string& field, char typecode,
+                              Py_ssize_t length, PyObject * value)
+{
+    int typenum = vec_field_typenum(typecode);
+    if (typenum == NPY_NOTYPE || PyBytes_Check(value) || PyUnicode_Check(value))
+    {
+        return 1;
+    }
+    if (!PyObject_CheckBuffer(value) && !PyArray_Check(value)
+            && (PySequence_Check(value) || !PyNumber_Check(value)))
+    {
+        return 1;
+    }
+    PyArrayObject * src = (PyArrayObject*)PyArray_FromAny(
+                              value, NULL, 0, 1, NPY_ARRAY_IN_ARRAY, NULL);
+    if (src == NULL)
+    {
+        return -1;
+    }
+    PyArrayObject * arr = cast_field_array(src, typenum);
+    Py_DECREF(src);
+    if (arr == NULL)
+    {
+        return -1;
+    }
+    if (PyArray_NDIM(arr) == 1 && PyArray_SIZE(arr) != length)
+    {
+        Py_DECREF(arr);
+        PyErr_SetString(PyExc_IndexError,
+                        "set_vec_field_from_buffer: length of the sequence on the right hand side does not match Id size.");
+        return -1;
+    }
+    if (length == 0)
+    {
+        Py_DECREF(arr);
+        return 0;
+    }
+
+    bool ok = false;
+    switch (typecode)
+    {
+    case 'd':
+        ok = set_vec_field_array< double, double >(oid, field, arr);
+        break;
+    case 'f':
+        ok = set_vec_field_array< float, float >(oid, field, arr);
+        break;
+    case 'i':
+        ok = set_vec_field_array< int, int >(oid, field, arr);
+        break;
+    case 'I':
+        ok = set_vec_field_array< unsigned int, unsigned int >(oid, field, arr);
+        break;
+    case 'l':
+        ok = set_vec_field_array< long, long >(oid, field, arr);
+        break;
+    case 'k':
+        ok = set_vec_field_array< unsigned long, unsigned long >(oid, field, arr);
+        break;
+    case 'h':
+        ok = set_vec_field_array< short, short >(oid, field, arr);
+        break;
+    case 'b':
+        ok = set_vec_field_array< bool, npy_bool >(oid, field, arr);
+        break;
+    }
+    Py_DECREF(arr);
+    if (!ok)
+    {
+        ostringstream msg;
+        msg << "set_vec_field_from_buffer: could not set field '" << field
+            << "' of " << oid.path();
+        PyErr_SetString(PyExc_RuntimeError, msg.str().c_str());
+        return -1;
+    }
+    return 0;
+}
+
+/**
+   Element typecode of the numeric vector typecode `vtypecode`, 0 if
+   the vector is not numeric.
+*/
+static char vector_element_typecode(char vtypecode)
+{
+    switch (vtypecode)
+    {
+    case 'D':
+        return 'd';
+    case 'F':
+        return 'f';
+    case 'v':
+        return 'i';
+    case 'N':
+        return 'I';
+    case 'M':
+        return 'l';
+    case 'P':
+        return 'k';
+    case 'w':
+        return 'h';
+    default:
+        return 0;
+    }
+}
+
+template <class A>
+static vector< A > * new_vector_from_array(PyArrayObject * arr)
+{
+    const A * data = static_cast< const A * >(PyArray_DATA(arr));
+    return new vector< A >(data, data + PyArray_SIZE(arr));
+}
+
+/**
+   Copy a 1-d numpy array, or anything supporting the buffer protocol,
+   into a newly allocated vector in one go instead of converting item
+   by item.
+
+   Returns NULL without setting a Python exception if `object` is not
+   such an array, so that the caller can fall back to the sequence
+   protocol, and NULL with TypeError set if its values cannot be cast
+   to the element type, see cast_field_array.
+*/
+void * array_to_vector(PyObject * object, char vtypecode)
+{
+    char typecode = vector_element_typecode(vtypecode);
+    if (typecode == 0 || PyBytes_Check(object)
+            || !(PyArray_Check(object) || PyObject_CheckBuffer(object)))
+    {
+        return NULL;
+    }
+    PyArrayObject * src = (PyArrayObject*)PyArray_FromAny(
+                              object, NULL, 1, 1, NPY_ARRAY_IN_ARRAY, NULL);
+    if (src == NULL)
+    {
+        PyErr_Clear();
+        return NULL;
+    }
+    PyArrayObject * arr = cast_field_array(src, vec_field_typenum(typecode));
+    Py_DECREF(src);
+    if (arr == NULL)
+    {
+        return NULL;
+    }
+    void * ret = NULL;
+    switch (typecode)
+    {
+    case 'd':
+        ret = new_vector_from_array< double >(arr);
+        break;
+    case 'f':
+        ret = new_vector_from_array< float >(arr);
+        break;
+    case 'i':
+        ret = new_vector_from_array< int >(arr);
+        break;
+    case 'I':
+        ret = new_vector_from_array< unsigned int >(arr);
+        break;
+    case 'l':
+        ret = new_vector_from_array< long >(arr);
+        break;
+    case 'k':
+        ret = new_vector_from_array< unsigned long >(arr);
+        break;
+    case 'h':
+        ret = new_vector_from_array< short >(arr);
+        break;
+    }
+    Py_DECREF(arr);
+    return ret;
+}
+
+template <class A>
+static bool set_vector_field(ObjId oid, const string& field, void * value)
+{
+    vector< A > * vec = static_cast< vector< A > * >(value);
+    bool ret = Field< vector< A > >::set(oid, field, *vec);
+    delete vec;
+    return ret;
+}
+
+/**
+   Set a vector field of `oid` from a numpy array or buffer, see
+   array_to_vector. Returns 0 on success, -1 on error (with Python
+   exception set) and 1 if `value` is not something this function
+   handles, e.g. a list.
+*/
+int set_vector_field_from_array(ObjId oid, const string& field, char vtypecode,
+                                PyObject * value)
+{
+    void * vec = array_to_vector(value, vtypecode);
+    if (vec == NULL)
+    {
+        return PyErr_Occurred() ? -1 : 1;
+    }
+    bool ok = false;
+    switch (vector_element_typecode(vtypecode))
+    {
+    case 'd':
+        ok = set_vector_field< double >(oid, field, vec);
+        break;
+    case 'f':
+        ok = set_vector_field< float >(oid, field, vec);
+        break;
+    case 'i':
+        ok = set_vector_field< int >(oid, field, vec);
+        break;
+    case 'I':
+        ok = set_vector_field< unsigned int >(oid, field, vec);
+        break;
+    case 'l':
+        ok = set_vector_field< long >(oid, field, vec);
+        break;
+    case 'k':
+        ok = set_vector_field< unsigned long >(oid, field, vec);
+        break;
+    case 'h':
+        ok = set_vector_field< short >(oid, field, vec);
+        break;
+    }
+    if (!ok)
+    {
+        ostringstream msg;
+        msg << "Failed to set field '" << field << "'";
+        PyErr_SetString(PyExc_AttributeError, msg.str().c_str());
+        return -1;
+    }
+    return 0;
+}
+
 // Global store of defined MOOSE classes.
 map<string, PyTypeObject *>& get_moose_classes()
 {
@@ -1035,6 +1503,49 @@ string getFieldType(string className, string fieldName)
     return fieldType;
 }
 
+/**
+   Get the cached descriptor of field `fieldName` of class `cinfo`.
+
+   The descriptor is computed on first use for each class and name,
+   with aliases from get_field_alias() resolved, and reused for all
+   later accesses from melement, vec and mfield. Returns NULL if the
+   class has no such field.
+*/
+const FieldDescriptor * getFieldDescriptor(const Cinfo * cinfo, const string& fieldName)
+{
+    static map< const Cinfo *, map< string, FieldDescriptor > > cache;
+    if (cinfo == NULL)
+    {
+        return NULL;
+    }
+    map< string, FieldDescriptor >& fields = cache[cinfo];
+    map< string, FieldDescriptor >::iterator it = fields.find(fieldName);
+    if (it == fields.end())
+    {
+        FieldDescriptor desc;
+        desc.name = fieldName;
+        desc.finfo = cinfo->findFinfo(fieldName);
+        if (desc.finfo == NULL)
+        {
+            map<string, string>::const_iterator alias = get_field_alias().find(fieldName);
+            if (alias != get_field_alias().end())
+            {
+                desc.name = alias->second;
+                desc.finfo = cinfo->findFinfo(desc.name);
+            }
+        }
+        desc.type = desc.finfo ? desc.finfo->rttiType() : "";
+        desc.ftype = desc.type.empty() ? 0 : shortType(desc.type);
+        desc.isValueField = dynamic_cast< const ValueFinfoBase* >(desc.finfo) != NULL;
+        it = fields.insert(make_pair(fieldName, desc)).first;
+    }
+    if (it->second.finfo == NULL)
+    {
+        return NULL;
+    }
+    return &(it->second);
+}
+
 /**
    Parse the type field of Finfo objects.
 
@@ -1598,6 +2109,10 @@ PyDoc_STRVAR(moose_start_documentation,
              "time. If 'notify = True', a message is written to terminal whenever \n"
              "10\% of simulation time is over. \n"
              "\n"
+             "The GIL is released while the simulation runs so other Python\n"
+             "threads keep running. Do not modify the model from them; use\n"
+             "moose.startAsync to run the simulation in the background.\n"
+             "\n"
              "After setting up a simulation, YOU MUST CALL MOOSE.REINIT() before\n"
              "CALLING MOOSE.START() TO EXECUTE THE SIMULATION. Otherwise, the\n"
              "simulator behaviour will be undefined. Once moose.reinit() has been\n"
@@ -1624,9 +2139,10 @@ PyDoc_STRVAR(moose_start_documentation,
 PyObject * moose_start(PyObject * dummy, PyObject * args )
 {
     double runtime = 0.0;
-    bool notify = false;
+    unsigned int notify = 0;
 
-    PyArg_ParseTuple(args, "d|I:moose_start", &runtime, &notify);
+    if (!PyArg_ParseTuple(args, "d|I:moose_start", &runtime, &notify))
+        return NULL;
 
     if (runtime <= 0.0)
     {
@@ -1640,7 +2156,12 @@ PyObject * moose_start(PyObject * dummy, PyObject * args )
     sigemptyset(&sigHandler.sa_mask);
     sigHandler.sa_flags = 0;
     sigaction(SIGINT, &sigHandler, NULL);
+
+    // Other python threads can run while we simulate. PyRun objects take the
+    // GIL back when they execute.
+    Py_BEGIN_ALLOW_THREADS
     SHELLPTR->doStart( runtime, notify );
+    Py_END_ALLOW_THREADS
     Py_RETURN_NONE;
 }
 
@@ -2235,6 +2756,132 @@ PyObject * moose_getField(PyObject * dummy, PyObject * args)
     return NULL;
 }
 
+PyDoc_STRVAR(moose_getFieldArray_documentation,
+             "moose.getFieldArray(elements, fieldname, out=None) -> numpy.ndarray\n"
+             "\n"
+             "Get the value of double field `fieldname` of every element in a"
+             " sequence as a numpy array, in one call. Unlike vec.getFieldArray"
+             " the elements need not belong to one vec, e.g. the compartments of"
+             " a neuron.\n"
+             "\n"
+             "Parameters\n"
+             "----------\n"
+             "elements: sequence of melement or vec\n"
+             "    elements to read. Reading from a list or tuple is fastest.\n"
+             "fieldname: str\n"
+             "    field to be read.\n"
+             "out: numpy.ndarray, optional\n"
+             "    preallocated, writable, C-contiguous float64 array with one"
+             " entry per element. If given, it is filled in place and returned.\n"
+             "\n"
+             "Example\n"
+             "-------\n"
+             "        >>> compts = moose.wildcardFind('/cell/#[ISA=CompartmentBase]')\n"
+             "        >>> vm = moose.getFieldArray(compts, 'Vm')\n"
+             "\n");
+
+PyObject * moose_getFieldArray(PyObject * dummy, PyObject * args, PyObject * kwargs)
+{
+    static const char * kwlist[] = {"elements", "fieldname", "out", NULL};
+    PyObject * elements = NULL;
+    char * field = NULL;
+    PyObject * out = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "Os|O:moose.getFieldArray",
+                                     (char**)kwlist, &elements, &field, &out))
+    {
+        return NULL;
+    }
+    if (field[0] == '\0')
+    {
+        PyErr_SetString(PyExc_ValueError, "moose.getFieldArray: `fieldname` must not be empty.");
+        return NULL;
+    }
+    PyObject * seq = PySequence_Fast(elements, "moose.getFieldArray: `elements` must be a sequence.");
+    if (seq == NULL)
+    {
+        return NULL;
+    }
+    npy_intp length = (npy_intp)PySequence_Fast_GET_SIZE(seq);
+    PyArrayObject * arr = NULL;
+    if (out == NULL || out == Py_None)
+    {
+        arr = (PyArrayObject*)PyArray_SimpleNew(1, &length, NPY_DOUBLE);
+    }
+    else if (!PyArray_Check(out) || PyArray_TYPE((PyArrayObject*)out) != NPY_DOUBLE
+             || !PyArray_IS_C_CONTIGUOUS((PyArrayObject*)out)
+             || !PyArray_ISWRITEABLE((PyArrayObject*)out)
+             || PyArray_SIZE((PyArrayObject*)out) != length)
+    {
+        PyErr_SetString(PyExc_ValueError, "moose.getFieldArray: `out` must be a"
+                        " writable, C-contiguous float64 array with one entry per element.");
+    }
+    else
+    {
+        Py_INCREF(out);
+        arr = (PyArrayObject*)out;
+    }
+    if (arr == NULL)
+    {
+        Py_DECREF(seq);
+        return NULL;
+    }
+
+    // The getter is looked up again only when the class changes, which
+    // for the usual homogeneous lists means once.
+    string fname(field);
+    string getName = "get" + fname;
+    getName[3] = std::toupper(getName[3]);
+    const Cinfo * cinfo = NULL;
+    const GetOpFuncBase< double > * op = NULL;
+    double * data = static_cast< double * >(PyArray_DATA(arr));
+    for (npy_intp ii = 0; ii < length; ++ii)
+    {
+        PyObject * item = PySequence_Fast_GET_ITEM(seq, ii);
+        ObjId oid;
+        if (PyObject_IsInstance(item, (PyObject*)&ObjIdType))
+        {
+            oid = ((_ObjId*)item)->oid_;
+        }
+        else if (PyObject_IsInstance(item, (PyObject*)&IdType))
+        {
+            oid = ObjId(((_Id*)item)->id_);
+        }
+        else
+        {
+            PyErr_SetString(PyExc_TypeError, "moose.getFieldArray: `elements` must contain only melements or vecs.");
+            break;
+        }
+        if (!Id::isValid(oid.id))
+        {
+            PyErr_SetString(PyExc_ValueError, "moose.getFieldArray: invalid element in `elements`.");
+            break;
+        }
+        if (oid.element()->cinfo() != cinfo)
+        {
+            cinfo = oid.element()->cinfo();
+            const DestFinfo * df = dynamic_cast< const DestFinfo * >(cinfo->findFinfo(getName));
+            op = df ? dynamic_cast< const GetOpFuncBase< double > * >(df->getOpFunc()) : NULL;
+            if (op == NULL)
+            {
+                ostringstream msg;
+                msg << "moose.getFieldArray: '" << cinfo->name()
+                    << "' class has no double field '" << fname << "'";
+                PyErr_SetString(PyExc_AttributeError, msg.str().c_str());
+                break;
+            }
+        }
+        Eref er = oid.eref();
+        data[ii] = er.isDataHere() ? op->returnOp(er) : Field< double >::get(oid, fname);
+    }
+    Py_DECREF(seq);
+    if (PyErr_Occurred())
+    {
+        Py_DECREF(arr);
+        return NULL;
+    }
+    return (PyObject*)arr;
+}
+
 PyDoc_STRVAR(moose_seed_documentation,
              "moose.seed(seedvalue) -> seed \n"
              "\n"
@@ -2965,6 +3612,10 @@ static PyMethodDef MooseMethods[] =
         "getField", (PyCFunction)moose_getField, METH_VARARGS,
         "getField(element, field, fieldtype) -- Get specified field of specified type from object vec."
     },
+    {
+        "getFieldArray", (PyCFunction)moose_getFieldArray, METH_VARARGS | METH_KEYWORDS,
+        moose_getFieldArray_documentation
+    },
     {"seed", (PyCFunction)moose_seed, METH_VARARGS, moose_seed_documentation},
     {"rand", (PyCFunction)moose_rand, METH_NOARGS, moose_rand_documentation},
     {"wildcardFind", (PyCFunction)moose_wildcardFind, METH_VARARGS, moose_wildcardFind_documentation},
@@ -3032,6 +3683,11 @@ PyMODINIT_FUNC MODINIT(_moose)
 {
     clock_t modinit_start = clock();
 
+#if PY_VERSION_HEX < 0x03070000
+    // moose.start releases the GIL; older pythons need this before that.
+    PyEval_InitThreads();
+#endif
+
     // Now initialize the module
 #ifdef PY3K
     PyObject * moose_module = PyModule_Create(&MooseModuleDef);
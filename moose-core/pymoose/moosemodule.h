@@ -159,6 +159,7 @@ int moose_Id_contains(_Id * self, PyObject * args);
 PyObject * moose_Id_getattro(_Id * self, PyObject * attr);
 int moose_Id_setattro(_Id * self, PyObject * attr, PyObject * value);
 PyObject * moose_Id_setField(_Id * self, PyObject *args);
+PyObject * moose_Id_getFieldArray(_Id * self, PyObject *args, PyObject *kwargs);
 ///////////////////////////////////////////
 // Methods for ObjId class
 ///////////////////////////////////////////
@@ -220,6 +221,7 @@ PyObject * moose_delete(PyObject * dummy, PyObject * args);
 PyObject * moose_connect(PyObject * dummy, PyObject * args);
 PyObject * moose_getFieldDict(PyObject * dummy, PyObject * args);
 PyObject * moose_getField(PyObject * dummy, PyObject * args);
+PyObject * moose_getFieldArray(PyObject * dummy, PyObject * args, PyObject * kwargs);
 PyObject * moose_syncDataHandler(PyObject * dummy, PyObject * target);
 PyObject * moose_seed(PyObject * dummy, PyObject * args);
 PyObject * moose_wildcardFind(PyObject * dummy, PyObject * args);
@@ -249,6 +251,22 @@ map<string, vector <PyGetSetDef> >& get_getsetdefs();
 map<string, PyTypeObject *>& get_moose_classes();
 int get_npy_typenum(const type_info& ctype);
 string getFieldType(string className, string fieldName);
+
+/**
+   Cached description of a field of a MOOSE class as seen from Python.
+   Filled once per (class, attribute name) by getFieldDescriptor so
+   that attribute access does not have to look up the class name and
+   field type strings every time.
+*/
+struct FieldDescriptor
+{
+    const Finfo * finfo; // NULL if the class has no such field.
+    string name;         // Field name in MOOSE, after resolving aliases.
+    string type;         // Finfo::rttiType().
+    char ftype;          // shortType(type), 0 if unhandled.
+    bool isValueField;   // True for ValueFinfos.
+};
+const FieldDescriptor * getFieldDescriptor(const Cinfo * cinfo, const string& fieldName);
 const map<string, string>& get_field_alias();
 PyTypeObject * getBaseClass(PyObject * self);
 int parseFinfoType(string className, string finfoType, string fieldName, vector<string> & typeVec);
@@ -270,6 +288,32 @@ PyObject * to_py(void * obj, char typecode);
 */
 PyObject * to_pytuple(void * obj, char typecode);
 
+/**
+   Read a numeric field of all entries of a vec into a numpy array,
+   optionally filling the preallocated array `out`.
+*/
+PyObject * get_vec_field_array(ObjId oid, const string& field, char typecode,
+                               Py_ssize_t length, PyObject * out);
+bool is_vec_field_numeric(char typecode);
+/**
+   Set a numeric field of all entries of a vec from a buffer object or
+   a scalar. Returns 0 on success, -1 on error, 1 if not applicable.
+*/
+int set_vec_field_from_buffer(ObjId oid, const string& field, char typecode,
+                              Py_ssize_t length, PyObject * value);
+/**
+   Copy a numpy array or other buffer into a new C++ vector of the
+   numeric vector type `vtypecode`. Returns NULL, without a Python
+   exception, if `object` is not a 1-d array or buffer.
+*/
+void * array_to_vector(PyObject * object, char vtypecode);
+/**
+   Set a numeric vector field of one element from a numpy array or
+   other buffer. Returns 0 on success, -1 on error, 1 if not applicable.
+*/
+int set_vector_field_from_array(ObjId oid, const string& field, char vtypecode,
+                                PyObject * value);
+
 /* inner fn for use in to_pytuple */
 PyObject * convert_and_set_tuple_entry(PyObject * tuple, unsigned int index, void * vptr, char typecode);
 
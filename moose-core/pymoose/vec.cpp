@@ -59,9 +59,10 @@ PyDoc_STRVAR(moose_Id_setField_doc,
              "----------\n"
              "fieldname: str\n"
              "    field to be set.\n"
-             "value: sequence of values\n"
+             "value: sequence of values or scalar\n"
              "    sequence of values corresponding to individual elements"
-			    	 "    under this vec.\n"
+			    	 "    under this vec. numpy arrays and other buffer objects"
+             "    are converted in one go. A scalar is assigned to all elements.\n"
              "\n Example"
              "\n--------"
              "\n        >>> iaf.setField('Vm', 20)"
@@ -75,6 +76,28 @@ PyDoc_STRVAR(moose_Id_setField_doc,
              "    This is an interface to SetGet::setVec"
              "\n");
 
+PyDoc_STRVAR(moose_Id_getFieldArray_doc,
+             "getFieldArray(fieldname, out=None) -> numpy.ndarray\n"
+             "\n"
+             "Get the value of numeric field `fieldname` in all elements under"
+             " this vec as a numpy array.\n"
+             "\n"
+             "Parameters\n"
+             "----------\n"
+             "fieldname: str\n"
+             "    field to be read.\n"
+             "out: numpy.ndarray, optional\n"
+             "    preallocated, writable, C-contiguous array with the dtype of"
+             " the field and one entry per element. If given, it is filled in"
+             " place and returned, so repeated reads do not allocate.\n"
+             "\n Example"
+             "\n--------"
+             "\n        >>> vm = numpy.empty(len(comp))"
+             "\n        >>> for ii in range(100):"
+             "\n        ...     moose.start(1e-3)"
+             "\n        ...     comp.getFieldArray('Vm', out=vm)"
+             "\n");
+
 static PyMethodDef IdMethods[] =
 {
     // {"init", (PyCFunction)moose_Id_init, METH_VARARGS,
@@ -99,6 +122,11 @@ static PyMethodDef IdMethods[] =
         "setField", (PyCFunction)moose_Id_setField, METH_VARARGS,
         moose_Id_setField_doc
     },
+    {
+        "getFieldArray", (PyCFunction)moose_Id_getFieldArray,
+        METH_VARARGS | METH_KEYWORDS,
+        moose_Id_getFieldArray_doc
+    },
     {NULL, NULL, 0, NULL},        /* Sentinel */
 };
 
@@ -763,7 +791,6 @@ int moose_Id_contains(_Id * self, PyObject * obj)
 
 PyObject * moose_Id_getattro(_Id * self, PyObject * attr)
 {
-    int new_attr = 0;
     if (!Id::isValid(self->id_))
     {
         RAISE_INVALID_ID(NULL, "moose_Id_getattro");
@@ -774,115 +801,54 @@ PyObject * moose_Id_getattro(_Id * self, PyObject * attr)
     {
         return _ret;
     }
-    string className = Field<string>::get(self->id_, "className");
-    string type = getFieldType(className, string(field));
-    if (type.empty())
-    {
-        // Check if this field name is aliased and update fieldname and type if so.
-        map<string, string>::const_iterator it = get_field_alias().find(string(field));
-        if (it != get_field_alias().end())
-        {
-            field = const_cast<char*>((it->second).c_str());
-            type = getFieldType(Field<string>::get(self->id_, "className"), it->second);
-            // Update attr for next level (PyObject_GenericGetAttr) in case.
-            // Py_XDECREF(attr);
-            attr = PyString_FromString(field);
-            new_attr = 1;
-        }
-    }
-    if (type.empty())
-    {
-        return PyObject_GenericGetAttr((PyObject*)self, attr);
-    }
-    char ftype = shortType(type);
-    if (!ftype)
+    const FieldDescriptor * desc = getFieldDescriptor(
+                                       self->id_.element()->cinfo(), string(field));
+    if (desc == NULL || !desc->ftype)
     {
         return PyObject_GenericGetAttr((PyObject*)self, attr);
     }
+    char ftype = desc->ftype;
+    const string& fieldName = desc->name;
 
     switch (ftype)
     {
     case 'd':
-    {
-        vector < double > val;
-        Field< double >::getVec(self->id_, string(field), val);
-        _ret = to_pytuple(&val, ftype);
+    case 'f':
+    case 'i':
+    case 'I':
+    case 'l':
+    case 'k':
+    case 'h':
+    case 'b':
+        // Numeric fields are read straight into a numpy array.
+        _ret = get_vec_field_array(self->id_, fieldName, ftype,
+                                   moose_Id_getLength(self), NULL);
         break;
-    }
     case 's':
     {
         vector < string > val;
-        Field< string >::getVec(self->id_, string(field), val);
-        _ret = to_pytuple(&val, ftype);
-        break;
-    }
-    case 'l':
-    {
-        vector < long > val;
-        Field< long >::getVec(self->id_, string(field), val);
+        Field< string >::getVec(self->id_, fieldName, val);
         _ret = to_pytuple(&val, ftype);
         break;
     }
     case 'x':
     {
         vector < Id > val;
-        Field< Id >::getVec(self->id_, string(field), val);
+        Field< Id >::getVec(self->id_, fieldName, val);
         _ret = to_pytuple(&val, ftype);
         break;
     }
     case 'y':
     {
         vector < ObjId > val;
-        Field< ObjId >::getVec(self->id_, string(field), val);
-        _ret = to_pytuple(&val, ftype);
-        break;
-    }
-    case 'i':
-    {
-        vector < int > val;
-        Field< int >::getVec(self->id_, string(field), val);
-        _ret = to_pytuple(&val, ftype);
-        break;
-    }
-    case 'I':
-    {
-        vector < unsigned int > val;
-        Field< unsigned int >::getVec(self->id_, string(field), val);
-        _ret = to_pytuple(&val, ftype);
-        break;
-    }
-    case 'k':
-    {
-        vector < unsigned long > val;
-        Field< unsigned long >::getVec(self->id_, string(field), val);
-        _ret = to_pytuple(&val, ftype);
-        break;
-    }
-    case 'f':
-    {
-        vector < float > val;
-        Field< float >::getVec(self->id_, string(field), val);
-        _ret = to_pytuple(&val, ftype);
-        break;
-    }
-    case 'b':
-    {
-        vector<bool> val;
-        Field< bool >::getVec(self->id_, string(field), val);
+        Field< ObjId >::getVec(self->id_, fieldName, val);
         _ret = to_pytuple(&val, ftype);
         break;
     }
     case 'c':
     {
         vector < char > val;
-        Field< char >::getVec(self->id_, string(field), val);
-        _ret = to_pytuple(&val, ftype);
-        break;
-    }
-    case 'h':
-    {
-        vector < short > val;
-        Field< short >::getVec(self->id_, string(field), val);
+        Field< char >::getVec(self->id_, fieldName, val);
         _ret = to_pytuple(&val, ftype);
         break;
     }
@@ -895,17 +861,13 @@ PyObject * moose_Id_getattro(_Id * self, PyObject * attr)
     }
     default:
         ostringstream msg;
-        msg << "moose_Id_getattro: unhandled field type '" << type << "'\n"
+        msg << "moose_Id_getattro: unhandled field type '" << desc->type << "'\n"
             << "This is a vec object. Perhaps you are trying to access the field in an"
             << " element in this. Then use indexing to get the element first.";
         PyErr_SetString(PyExc_ValueError, msg.str().c_str());
         _ret = NULL;
         break;
     }
-    if (new_attr)
-    {
-        Py_DECREF(attr);
-    }
     return _ret;
 }
 
@@ -928,6 +890,34 @@ PyObject * moose_Id_setField(_Id * self, PyObject * args)
     Py_RETURN_NONE;
 }
 
+PyObject * moose_Id_getFieldArray(_Id * self, PyObject * args, PyObject * kwargs)
+{
+    if (!Id::isValid(self->id_))
+    {
+        RAISE_INVALID_ID(NULL, "moose_Id_getFieldArray");
+    }
+    static const char * kwlist[] = {"fieldname", "out", NULL};
+    char * field = NULL;
+    PyObject * out = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|O:moose_Id_getFieldArray",
+                                     (char**)kwlist, &field, &out))
+    {
+        return NULL;
+    }
+    const FieldDescriptor * desc = getFieldDescriptor(
+                                       self->id_.element()->cinfo(), string(field));
+    if (desc == NULL)
+    {
+        ostringstream msg;
+        msg << "moose_Id_getFieldArray: '" << self->id_.element()->cinfo()->name()
+            << "' class has no field '" << field << "'";
+        PyErr_SetString(PyExc_AttributeError, msg.str().c_str());
+        return NULL;
+    }
+    return get_vec_field_array(self->id_, desc->name, desc->ftype,
+                               moose_Id_getLength(self), out);
+}
+
 int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
 {
     if (!Id::isValid(self->id_))
@@ -945,9 +935,9 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
         PyErr_SetString(PyExc_TypeError, "moose_Id_setattro: Attribute name must be a string");
         return -1;
     }
-    string moose_class = Field<string>::get(self->id_, "className");
-    string fieldtype = getFieldType(moose_class, string(fieldname));
-    if (fieldtype.length() == 0)
+    const FieldDescriptor * desc = getFieldDescriptor(
+                                       self->id_.element()->cinfo(), string(fieldname));
+    if (desc == NULL)
     {
         // If it is instance of a MOOSE Id then throw
         // error (to avoid silently creating new attributes due to
@@ -963,12 +953,21 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             return ret;
         }
         ostringstream msg;
-        msg << "moose_Id_setattro: '" << moose_class << "' class has no field '" << fieldname << "'" << endl;
+        msg << "moose_Id_setattro: '" << self->id_.element()->cinfo()->name()
+            << "' class has no field '" << fieldname << "'" << endl;
         PyErr_SetString(PyExc_AttributeError, msg.str().c_str());
         return -1;
     }
-    char ftype = shortType(fieldtype);
+    char ftype = desc->ftype;
     Py_ssize_t length = moose_Id_getLength(self);
+    // Numpy arrays and other buffers are converted in one go and
+    // scalars are broadcast; only plain sequences go item by item.
+    ret = set_vec_field_from_buffer(self->id_, desc->name, ftype, length, value);
+    if (ret <= 0)
+    {
+        return ret;
+    }
+    ret = -1;
     bool is_seq = true;
     if (!PySequence_Check(value))
     {
@@ -1000,7 +999,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             double v = PyFloat_AsDouble(value);
             _value.assign(length, v);
         }
-        ret = Field<double>::setVec(self->id_, string(fieldname), _value);
+        ret = Field<double>::setVec(self->id_, desc->name, _value);
         break;
     }
     case 's':
@@ -1021,7 +1020,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             char * v = PyString_AsString(value);
             _value.assign(length, string(v));
         }
-        ret = Field<string>::setVec(self->id_, string(fieldname), _value);
+        ret = Field<string>::setVec(self->id_, desc->name, _value);
         break;
     }
     case 'i':
@@ -1042,7 +1041,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             int v = PyInt_AsLong(value);
             _value.assign(length, v);
         }
-        ret = Field< int >::setVec(self->id_, string(fieldname), _value);
+        ret = Field< int >::setVec(self->id_, desc->name, _value);
         break;
     }
     case 'I':  //SET_VECFIELD(unsigned int, I)
@@ -1063,7 +1062,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             unsigned int v = PyInt_AsUnsignedLongMask(value);
             _value.assign(length, v);
         }
-        ret = Field< unsigned int >::setVec(self->id_, string(fieldname), _value);
+        ret = Field< unsigned int >::setVec(self->id_, desc->name, _value);
         break;
     }
     case 'l':  //SET_VECFIELD(long, l)
@@ -1084,7 +1083,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             long v = PyInt_AsLong(value);
             _value.assign(length, v);
         }
-        ret = Field<long>::setVec(self->id_, string(fieldname), _value);
+        ret = Field<long>::setVec(self->id_, desc->name, _value);
         break;
     }
     case 'k':  //SET_VECFIELD(unsigned long, k)
@@ -1105,7 +1104,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             unsigned long v = PyInt_AsUnsignedLongMask(value);
             _value.assign(length, v);
         }
-        ret = Field< unsigned long >::setVec(self->id_, string(fieldname), _value);
+        ret = Field< unsigned long >::setVec(self->id_, desc->name, _value);
         break;
     }
     case 'b':
@@ -1126,7 +1125,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             bool v = (Py_True ==value) || (PyInt_AsLong(value) != 0);
             _value.assign(length, v);
         }
-        ret = Field< bool >::setVec(self->id_, string(fieldname), _value);
+        ret = Field< bool >::setVec(self->id_, desc->name, _value);
         break;
     }
     case 'c':
@@ -1165,7 +1164,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
                 return -1;
             }
         }
-        ret = Field< char >::setVec(self->id_, string(fieldname), _value);
+        ret = Field< char >::setVec(self->id_, desc->name, _value);
         break;
     }
     case 'h':
@@ -1186,7 +1185,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             short v = PyInt_AsLong(value);
             _value.assign(length, v);
         }
-        ret = Field< short >::setVec(self->id_, string(fieldname), _value);
+        ret = Field< short >::setVec(self->id_, desc->name, _value);
         break;
     }
     case 'f':  //SET_VECFIELD(float, f)
@@ -1207,7 +1206,7 @@ int moose_Id_setattro(_Id * self, PyObject * attr, PyObject *value)
             float v = PyFloat_AsDouble(value);
             _value.assign(length, v);
         }
-        ret = Field<float>::setVec(self->id_, string(fieldname), _value);
+        ret = Field<float>::setVec(self->id_, desc->name, _value);
         break;
     }
     default:
@@ -1,17 +1,16 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 
-# Bring everything from c++ module to global namespace. 
+import sys as _sys
+import importlib as _importlib
+
+# Bring everything from c++ module to global namespace.
 from moose._moose import *
 
-# Bring everything from moose.py to global namespace. 
+# Bring everything from moose.py to global namespace.
 # IMP: It will overwrite any c++ function with the same name.  We can override
 # some C++ here.
 from moose.moose import *
-from moose.server import *
-
-# SBML and NML2 support.
-from moose.model_utils import *
 
 # create a shorthand for version() call here.
 __version__ = version()
@@ -21,3 +20,42 @@ from moose.wrapper import *
 
 # Import moose test.
 from moose.moose_test import test
+
+# The server and SBML/NML2 support are slow to import and not needed by most
+# scripts. Their names are imported from the submodule when they are accessed
+# for the first time.
+_lazy_names = {
+    'moose.server' : [ 'serve', 'JobScheduler', 'ResultCache' ],
+    'moose.model_utils' : [ 'mooseReadSBML', 'mooseWriteSBML'
+        , 'mooseWriteKkit', 'mooseDeleteChemSolver', 'mooseAddChemSolver'
+        , 'mergeChemModel', 'mooseReadNML2', 'mooseWriteNML2', 'loadModel'
+        , 'sbmlImport_', 'sbmlError_', 'nml2Import_', 'nml2ImportError_'
+        , 'chemImport_', 'chemError_', 'kkitImport_', 'kkitImport_error_'
+        , 'mergechemImport_', 'mergechemError_' ],
+    }
+_lazy_modules = dict((n, m) for m, ns in _lazy_names.items() for n in ns)
+
+# Submodules which used to be imported by `import moose`.
+_lazy_submodules = [ 'server', 'model_utils', 'SBML', 'chemUtil'
+        , 'chemMerge', 'genesis' ]
+
+def __getattr__(name):
+    if name in _lazy_modules:
+        val = getattr(_importlib.import_module(_lazy_modules[name]), name)
+        globals()[name] = val
+        return val
+    if name in _lazy_submodules:
+        return _importlib.import_module('moose.%s' % name)
+    raise AttributeError("module 'moose' has no attribute '%s'" % name)
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_modules) | set(_lazy_submodules))
+
+if _sys.version_info < (3, 7):
+    # No module level __getattr__ (PEP 562).
+    from moose.server import *
+    from moose.model_utils import *
+
+# `from moose import *` still brings in the lazily loaded names.
+__all__ = [ k for k in list(globals()) if not k.startswith('_') ] \
+        + [ k for k in _lazy_modules if k not in globals() ]
@@ -59,6 +59,20 @@
 # Serializing MOOSE tree structure into HDF5 tables for each class.
 # This is the approach I took initially. This is possibly more space
 # saving.
+#
+# Checkpoint layout written by `savestate` (version 2):
+#
+#   /elements/<class>/_path      paths of the vecs of this class
+#   /elements/<class>/_numData   number of entries in each vec
+#   /elements/<class>/_numField  field elements: entries per parent entry
+#   /elements/<class>/<field>    one column per value field, holding the
+#                                entries of all the vecs one after another
+#   /messages/<column>           one row per (src, dest) field pair
+#   /messages/sparse/<row>       connection list of SparseMsg at <row>
+#   /solvers/<n>/nVec            Ksolve/Gsolve (voxel x pool) or Dsolve
+#                                (pool x voxel) molecule counts
+#
+# Clock state is kept in the attributes of /clock.
 
 
 # Change log:
@@ -85,18 +99,35 @@
 
 # Code:
 from __future__ import print_function, division, absolute_import
-try:
-    from future_builtins import zip
-except ImportError:
-    pass
-import moose
+import time
+import logging
 import numpy as np
 import h5py as h5
-import time
-from collections import defaultdict
+import moose
+
+logger_ = logging.getLogger('moose.hdfutil')
 
-size_step=256
+# Version of the checkpoint layout written by savetree.
+CHECKPOINT_VERSION = 2
 
+# These are created by MOOSE itself and are never saved.
+system_paths = ('/Msgs', '/classes', '/clock', '/postmaster')
+
+# Solvers take over the objects they manage when they are set up, so they
+# are restored after everything else.
+solver_classes = ('Stoich', 'Ksolve', 'Gsolve', 'Dsolve', 'HSolve')
+
+# Value fields which are bookkeeping, implied by the element tree or
+# computed by solvers and meshes.
+skip_fields = set(['this', 'name', 'lastDimension', 'runTime', 'numData',
+                   'numField', 'idValue', 'index', 'fieldIndex', 'volume',
+                   'numAllVoxels', 'numPools'])
+
+# Fields which tabulate other fields from parameters. The tables are saved
+# themselves, and the parameters need not have been set.
+derived_fields = {
+    'HHGate': set(['alpha', 'beta', 'tau', 'mInfinity', 'alphaParms']),
+    }
 
 # maps cpp data type names to numpy data types
 cpptonp = {
@@ -107,225 +138,459 @@ cpptonp = {
     'unsigned long': 'u8',
     'float': 'f4',
     'double': 'f8',
-    'string': 'S1024',
-    'Id': 'S1024',
-    'ObjId': 'S1024',
     }
 
-dtype_table = {}
-# dims allows only 3 dims for the time being
-em_dtype = np.dtype([('path', 'S1024'), ('class', 'S64'), ('dims', 'i4', (3,))])
-
-def get_rec_dtype(em):
-    bad_fields = []
-    # Check if already have data type information for this class.
-    # Create it otherwise.
-    if em.className in dtype_table:
-        dtype = dtype_table[em.className]
-    else:
-        print('Creating entries for class:', em.className)
-        fielddict = moose.getFieldDict(em.className, 'valueFinfo')
-        print(fielddict)
-
-        # If we do not have the type of this field in cpp-np data
-        # type map, skip it. We can handle vectors as nested
-        # table, but the problem with that is numpy requires all
-        # entries to have a fixed size for this table. Since
-        # vectors can have arbitrary length, we cannot get such a
-        # fixed size without checking the size of the vector field
-        # in all elements.
-        fields = [(fieldname, cpptonp[ftype]) # [('path', 'S1024')]
-                  for fieldname, ftype in sorted(fielddict.items())
-                  if ftype in cpptonp]
-        dtype_table[em.className] = np.dtype(fields)
-        return dtype_table[em.className]
-
-def save_dataset(classname, rec, dtype, hdfnode):
-    """Saves the data from rec into dataset"""
-    # Check if there is a dataset for this class. Create it
-    # otherwise.
-    if len(rec) == 0:
+# Fields of these types are saved as paths.
+path_types = ('Id', 'ObjId')
+
+# Vector fields are saved per entry as variable length arrays.
+vectortonp = {
+    'vector<double>': np.float64,
+    'vector<int>': np.int32,
+    'vector<unsigned int>': np.uint32,
+    }
+
+msg_types = {
+    'SingleMsg': 'Single',
+    'OneToAllMsg': 'OneToAll',
+    'OneToOneMsg': 'OneToOne',
+    'OneToOneDataIndexMsg': 'OneToOne',
+    'DiagonalMsg': 'Diagonal',
+    'SparseMsg': 'Sparse',
+    }
+
+str_dtype = h5.special_dtype(vlen=str)
+
+field_table = {}
+
+def get_fields(classname):
+    """Return [(fieldname, type)] for the value fields of `classname` which
+    can be saved and set back."""
+    if classname in field_table:
+        return field_table[classname]
+    dests = set(moose.getFieldNames(classname, 'destFinfo'))
+    fields = []
+    fielddict = moose.getFieldDict(classname, 'valueFinfo')
+    for fname, ftype in sorted(fielddict.items()):
+        if fname in skip_fields or fname in derived_fields.get(classname, ()) or \
+                'set' + fname[0].upper() + fname[1:] not in dests:
+            continue
+        if ftype in cpptonp or ftype in vectortonp or ftype in path_types \
+                or ftype == 'string':
+            fields.append((fname, ftype))
+    field_table[classname] = fields
+    return fields
+
+def obj_path(obj):
+    """Path of a vec or an element. The `path` attribute is not used as
+    some classes (Stoich, Dsolve) have a field of the same name."""
+    if isinstance(obj, moose.vec):
+        return obj.getPath()
+    path = obj.vec.getPath()
+    return path if path == '/' else '%s[%d]' % (path, obj.dindex)
+
+def strip_index(path):
+    """'/a[0]/b[2]' -> '/a[0]/b'"""
+    return path[:path.rfind('[')] if path.endswith(']') else path
+
+def is_system_path(path):
+    return any(path == p or path.startswith(p + '/') or path.startswith(p + '[')
+               for p in system_paths)
+
+def field_element_parent(path, classname):
+    """Return the parent vec of `path` if it is a field element, else None."""
+    parent, _, name = path.rpartition('/')
+    pcls = moose.element(parent or '/').className
+    if strip_index(name) in moose.getFieldNames(pcls, 'fieldElementFinfo'):
+        return moose.vec(strip_index(parent))
+    return None
+
+def field_element_entries(parentvec, name):
+    return [getattr(parentvec[i], name) for i in range(len(parentvec))]
+
+def read_column(entries, fname, ftype):
+    """Read field `fname` of `entries` (a vec or an ElementField) as a
+    sequence with one value per entry."""
+    if ftype in cpptonp:
+        return np.asarray(getattr(entries, fname), dtype=cpptonp[ftype])
+    if ftype in path_types:
+        return [obj_path(x) for x in getattr(entries, fname)]
+    # Read these one by one: `path` for instance is also an attribute of
+    # vec itself.
+    values = [e.getField(fname) for e in entries]
+    if ftype == 'string':
+        return values
+    return [np.asarray(x, dtype=vectortonp[ftype]) for x in values]
+
+def write_column(entries, fname, ftype, values, remap):
+    """Set field `fname` of `entries` to `values`. Only the values which
+    differ from the current ones are set, since setting some fields (mesh
+    geometry, solver paths) rebuilds the model."""
+    current = read_column(entries, fname, ftype)
+    if ftype in cpptonp:
+        values = np.asarray(values, dtype=current.dtype)
+        if not np.array_equal(current, values):
+            setattr(entries, fname, values)
         return
-    if classname in hdfnode:
-        ds = hdfnode[classname]
-        oldlen = ds.len()
-        newlen = oldlen + len(rec)
-        ds.resize(newlen)
-    else:
-        ds = hdfnode.create_dataset(classname,
-                                    shape=(len(rec),),
-                                    dtype=dtype,
-                                    compression='gzip',
+    for e, cur, v in zip(entries, current, values):
+        if ftype in vectortonp:
+            if not np.array_equal(cur, v):
+                e.setField(fname, np.asarray(v).tolist())
+            continue
+        if isinstance(v, bytes):
+            v = v.decode('utf-8')
+        if ftype in path_types:
+            v = remap(v)
+            if v is None or not moose.exists(v):
+                continue
+            if v != cur:
+                e.setField(fname, moose.element(v))
+        elif v != cur:
+            e.setField(fname, v)
+
+def collect_elements(moosenode):
+    """Group the vecs under `moosenode` by class."""
+    root = obj_path(moosenode)
+    paths = set()
+    for obj in moose.wildcardFind(root.rstrip('/') + '/##'):
+        path = obj.vec.getPath()
+        if not is_system_path(path):
+            paths.add(path)
+    byclass = {}
+    for path in sorted(paths):
+        byclass.setdefault(moose.element(path).className, []).append(path)
+    return byclass
+
+def save_class(classname, paths, hdfnode):
+    grp = hdfnode.create_group(classname)
+    fields = get_fields(classname)
+    columns = dict((f, []) for f, t in fields)
+    numData, numField = [], []
+    for path in paths:
+        parent = field_element_parent(path, classname)
+        if parent is None:
+            chunks = [moose.vec(path)]
+        else:
+            chunks = field_element_entries(parent, path.rpartition('/')[2])
+            numField.append(np.array([c.num for c in chunks], dtype='u4'))
+        numData.append(sum(len(c) for c in chunks))
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            for fname, ftype in fields:
+                columns[fname].append(read_column(chunk, fname, ftype))
+    grp.create_dataset('_path', data=np.array(paths, dtype=object), dtype=str_dtype)
+    grp.create_dataset('_numData', data=np.array(numData, dtype='u4'))
+    if numField:
+        grp.create_dataset('_numField', data=np.concatenate(numField))
+    for fname, ftype in fields:
+        cols = columns[fname]
+        if ftype in cpptonp:
+            data = np.concatenate(cols) if cols else np.zeros(0, cpptonp[ftype])
+            ds = grp.create_dataset(fname, data=data, compression='gzip',
                                     compression_opts=6)
-    ds[oldlen:newlen] = np.rec.array(rec, dtype=dtype)
+        elif ftype in vectortonp:
+            data = [x for c in cols for x in c]
+            ds = grp.create_dataset(fname, (len(data),),
+                                    dtype=h5.special_dtype(vlen=vectortonp[ftype]))
+            for i, x in enumerate(data):
+                ds[i] = x
+        else:
+            data = np.array([x for c in cols for x in c], dtype=object)
+            ds = grp.create_dataset(fname, data=data, dtype=str_dtype)
+        ds.attrs['type'] = ftype
+
+shared_table = {}
+
+def shared_finfos(classname):
+    """Return [(name, srcs, dests)] for the shared fields of `classname`
+    and its base classes."""
+    if classname in shared_table:
+        return shared_table[classname]
+    ret = []
+    cname = classname
+    while cname and moose.exists('/classes/' + cname):
+        if moose.exists('/classes/%s/sharedFinfo' % cname):
+            for f in moose.vec('/classes/%s/sharedFinfo' % cname):
+                ret.append((f.fieldName, set(f.src), set(f.dest)))
+        cname = moose.element('/classes/' + cname).baseClass
+    shared_table[classname] = ret
+    return ret
+
+def find_shared(classname, srcs, dests):
+    for name, s, d in shared_finfos(classname):
+        if set(srcs) <= s and set(dests) <= d:
+            return name
+    return None
+
+def msg_fields(msg):
+    """Return the [(src, dest)] field pairs to connect to recreate `msg`.
+    A shared message is a single pair of shared fields."""
+    srcs1, dests2 = msg.srcFieldsOnE1, msg.destFieldsOnE2
+    srcs2, dests1 = msg.srcFieldsOnE2, msg.destFieldsOnE1
+    if srcs2 or dests1 or len(srcs1) > 1:
+        f1 = find_shared(msg.e1.className, srcs1, dests1)
+        f2 = find_shared(msg.e2.className, srcs2, dests2)
+        if f1 and f2:
+            return [(f1, f2)]
+    return list(zip(srcs1, dests2))
+
+def save_messages(byclass, hdfnode):
+    """Save messages between the saved elements. Parent-child messages are
+    implied by the element tree, and messages to and from solvers are made
+    by the solvers when they are set up, so these are skipped."""
+    saved = set(p for c, paths in byclass.items() if c not in solver_classes
+                for p in paths)
+    rows = dict((k, []) for k in ('type', 'e1', 'e2', 'i1', 'i2', 'src', 'dest'))
+    sparse = []
+    seen = set()
+    for path in sorted(saved):
+        for msg in moose.element(path).msgOut:
+            key = (msg.className, msg.dindex)
+            if key in seen or msg.className not in msg_types:
+                continue
+            seen.add(key)
+            e1, e2 = msg.e1.getPath(), msg.e2.getPath()
+            if e1 not in saved or e2 not in saved:
+                continue
+            i1 = i2 = 0
+            if msg.className == 'SingleMsg':
+                i1, i2 = msg.i1, msg.i2
+            elif msg.className == 'OneToAllMsg':
+                i1 = msg.i1
+            for src, dest in msg_fields(msg):
+                if src == 'childOut':
+                    continue
+                if msg.className == 'SparseMsg':
+                    sparse.append((len(rows['type']),
+                                   np.array(msg.connectionList, dtype='u4')))
+                for k, v in zip(('type', 'e1', 'e2', 'i1', 'i2', 'src', 'dest'),
+                                (msg.className, e1, e2, i1, i2, src, dest)):
+                    rows[k].append(v)
+    grp = hdfnode.create_group('messages')
+    for k, v in rows.items():
+        if k in ('i1', 'i2'):
+            grp.create_dataset(k, data=np.array(v, dtype='u4'))
+        else:
+            grp.create_dataset(k, data=np.array(v, dtype=object), dtype=str_dtype)
+    sgrp = grp.create_group('sparse')
+    for row, conn in sparse:
+        sgrp.create_dataset(str(row), data=conn, compression='gzip')
+
+def save_solvers(byclass, hdfnode):
+    """Dump the molecule counts held by the chemical solvers."""
+    grp = hdfnode.create_group('solvers')
+    n = 0
+    for classname in ('Ksolve', 'Gsolve', 'Dsolve'):
+        for path in byclass.get(classname, []):
+            for obj in moose.vec(path):
+                if classname == 'Dsolve':
+                    num = obj.numPools
+                else:
+                    num = obj.numAllVoxels
+                nvec = [obj.nVec[i] for i in range(num)]
+                sgrp = grp.create_group(str(n))
+                sgrp.attrs['path'] = obj_path(obj)
+                sgrp.attrs['class'] = classname
+                sgrp.create_dataset('nVec', data=np.array(nvec, dtype='f8'))
+                n += 1
+
+def save_clock(hdfnode):
+    clock = moose.element('/clock')
+    grp = hdfnode.create_group('clock')
+    grp.attrs['dts'] = np.array(clock.dts)
+    grp.attrs['currentTime'] = clock.currentTime
+    grp.attrs['nsteps'] = clock.nsteps
 
 def savetree(moosenode, hdfnode):
-    """Dump the MOOSE element tree rooted at moosenode as datasets
-    under hdfnode."""
-    # Keep track of total number of ematrices seen in each class.
-    obj_count = defaultdict(int)
-    # Buffer the last `size_step` object records for each class in
-    # this array.
-    obj_rec = defaultdict(list)
-    em_rec = []
-    hdfnode.attr['path'] = moosenode.path
+    """Dump the MOOSE element tree rooted at moosenode, the messages within
+    it, the clock and the solver state under hdfnode."""
+    moosenode = moose.element(moosenode)
+    hdfnode.attrs['path'] = obj_path(moosenode)
+    hdfnode.attrs['version'] = CHECKPOINT_VERSION
+    hdfnode.attrs['moose'] = moose.__version__
+    byclass = collect_elements(moosenode)
     elements = hdfnode.create_group('elements')
-    for em in moose.wildcardFind(moosenode.path+'/##'):
-        em_rec.append((em.path, em.className, em.shape))
-        dtype = get_rec_dtype(em)
-        for obj in em:
-            fields = []
-            for fname in dtype.names:
-                f = obj.getField(fname)
-                if isinstance(f, moose.vec) or isinstance(f, moose.element):
-                    fields.append(f.path)
-                else:
-                    fields.append(f)
-            obj_rec[em.className].append(fields)
-            obj_count[em.className] += 1
-            if obj_count[em.className] % size_step == 0:
-                save_dataset(em.className, obj_rec[em.className], dtype, elements)
-                obj_rec[em.className][:] = [] # clear the records after saving
-    # now save the remaining records (length < size_step)
-    for classname, rec in list(obj_rec.items()):
-        save_dataset(classname, rec, dtype_table[classname], hdfnode)
-    vec = hdfnode.create_dataset('vec', shape=(len(em_rec),), dtype=em_dtype)
-    vec[:] = em_rec
-
-def loadtree(hdfnode, moosenode):
-    """Load the element tree saved under the group `hdfnode` into `moosenode`"""
-    pathclass = {}
-    basepath = hdfnode.attr['path']
-    if basepath != '/':
-        basepath = basepath + '/'
-    emdata = hdfnode['vec'][:]
-    sorted_paths = sorted(emdata['path'], key=lambda x: x.count('/'))
-    dims = dict(emdata['path', 'dims'])
-    classes = dict(emdata['path', 'class'])
-    current = moose.getCwe()
-    moose.setCwe(moosenode)
-    # First create all the ematrices
-    for path in sorted_paths:
-        rpath = path[len(basepath):]
-        classname = classes[path]
-        shape = dims[path]
-        em = moose.vec(rpath, shape, classname)
-    wfields = {}
-    for cinfo in moose.element('/classes').children:
-        cname = cinfo[0].name
-        wfields[cname] = [f[len('set_'):] for f in moose.getFieldNames(cname, 'destFinfo')
-                          if f.startswith('set_') and f not in ['set_this', 'set_name', 'set_lastDimension', 'set_runTime'] and not f.startswith('set_num_')]
-        for key in hdfnode['/elements']:
-            dset = hdfnode['/elements/'][key][:]
-            fieldnames = dset.dtype.names
-            for ii in range(len(dset)):
-                obj = moose.element(dset['path'][ii][len(basepath):])
-                for f in wfields[obj.className]:
-                    obj.setField(f, dset[f][ii])
-
-
-
-def savestate(filename=None):
-    """Dump the state of MOOSE in an hdf5 file.
-
-    The file will have a data set for each class.
-    Each such dataset will be a column of field values.
-
-    This function needs more work on moose serialization.
+    for classname, paths in sorted(byclass.items()):
+        save_class(classname, paths, elements)
+    save_messages(byclass, hdfnode)
+    save_solvers(byclass, hdfnode)
+    save_clock(hdfnode)
+
+def path_mapper(oldroot, newroot):
+    """Return a function mapping saved paths under `oldroot` to the same
+    paths under `newroot`. Paths outside `oldroot` are left as they are."""
+    oldroot = oldroot.rstrip('/')
+    newroot = newroot.rstrip('/')
+    def remap(path):
+        if isinstance(path, bytes):
+            path = path.decode('utf-8')
+        if not path or path == '/':
+            return None
+        if path == oldroot or path.startswith(oldroot + '/') \
+                or path.startswith(oldroot + '['):
+            return newroot + path[len(oldroot):] or '/'
+        return path
+    return remap
+
+def create_elements(elements, remap):
+    """Create the vecs which do not exist yet. Returns the set of paths
+    created."""
+    todo = []
+    for classname in elements:
+        grp = elements[classname]
+        for path, n in zip(grp['_path'][:], grp['_numData'][:]):
+            todo.append((remap(path), classname, int(n)))
+    created = set()
+    for path, classname, n in sorted(todo, key=lambda x: x[0].count('/')):
+        if moose.exists(path) or '_numField' in elements[classname]:
+            continue
+        # Solvers turn objects into zombies again when they are set up.
+        if classname.startswith('Zombie'):
+            classname = classname[len('Zombie'):]
+        moose.vec(path, n, 0, classname)
+        created.add(path)
+    return created
+
+def restore_field_counts(elements, remap):
+    """Resize the field elements (synapses, Function variables) to their
+    saved counts, so that messages to them can be connected."""
+    for classname in sorted(elements):
+        grp = elements[classname]
+        if '_numField' not in grp:
+            continue
+        numField = grp['_numField'][:]
+        k = 0
+        for path in grp['_path'][:]:
+            path = remap(path)
+            parent = moose.vec(strip_index(path.rpartition('/')[0]))
+            for c in field_element_entries(parent, path.rpartition('/')[2]):
+                if c.num != numField[k]:
+                    c.num = int(numField[k])
+                k += 1
+
+def set_class_fields(classname, grp, remap, only=None):
+    columns = [(f, grp[f].attrs['type'], grp[f][:]) for f in grp
+               if not f.startswith('_')]
+    numField = grp['_numField'][:] if '_numField' in grp else None
+    offset, k = 0, 0
+    for path, n in zip(grp['_path'][:], grp['_numData'][:]):
+        path = remap(path)
+        if numField is None:
+            chunks = [moose.vec(path)]
+        else:
+            parent = moose.vec(strip_index(path.rpartition('/')[0]))
+            chunks = field_element_entries(parent, path.rpartition('/')[2])
+            for c in chunks:
+                if c.num != numField[k]:
+                    c.num = int(numField[k])
+                k += 1
+        if only is not None and path not in only:
+            offset += int(n)
+            continue
+        for chunk in chunks:
+            m = len(chunk)
+            if m == 0:
+                continue
+            for fname, ftype, values in columns:
+                try:
+                    write_column(chunk, fname, ftype,
+                                 values[offset:offset+m], remap)
+                except Exception as e:
+                    logger_.warning('Could not restore %s.%s: %s' % (path, fname, e))
+            offset += m
+
+def restore_fields(elements, remap, solvers=False, only=None):
+    for classname in sorted(elements):
+        if (classname in solver_classes) == solvers:
+            set_class_fields(classname, elements[classname], remap, only)
+
+def restore_messages(grp, created, remap):
+    """Connect saved messages which touch a newly created element."""
+    cols = dict((k, grp[k][:]) for k in ('type', 'e1', 'e2', 'i1', 'i2', 'src', 'dest'))
+    sparse = grp['sparse']
+    for row in range(len(cols['type'])):
+        e1, e2 = remap(cols['e1'][row]), remap(cols['e2'][row])
+        if e1 not in created and e2 not in created:
+            continue
+        mtype = cols['type'][row]
+        if isinstance(mtype, bytes):
+            mtype = mtype.decode('utf-8')
+        src, dest = cols['src'][row], cols['dest'][row]
+        if isinstance(src, bytes):
+            src, dest = src.decode('utf-8'), dest.decode('utf-8')
+        srcobj, destobj = moose.vec(e1), moose.vec(e2)
+        if mtype == 'SingleMsg':
+            srcobj, destobj = srcobj[int(cols['i1'][row])], destobj[int(cols['i2'][row])]
+        elif mtype == 'OneToAllMsg':
+            srcobj = srcobj[int(cols['i1'][row])]
+        msg = moose.connect(srcobj, src, destobj, dest, msg_types[mtype])
+        if str(row) in sparse:
+            msg.connectionList = sparse[str(row)][:].tolist()
+
+def restore_clock(grp):
+    dts = grp.attrs['dts']
+    current = moose.element('/clock').dts
+    for i, dt in enumerate(dts):
+        if dt > 0 and (i >= len(current) or current[i] != dt):
+            moose.setClock(i, dt)
+
+def restore_solvers(grp, remap):
+    for key in grp:
+        sgrp = grp[key]
+        obj = moose.element(remap(sgrp.attrs['path']))
+        for i, row in enumerate(sgrp['nVec'][:]):
+            obj.nVec[i] = row.tolist()
+
+def loadtree(hdfnode, moosenode, reinit=True, clock=True):
+    """Load the element tree saved under the group `hdfnode` into
+    `moosenode`.
+
+    Elements which do not exist are created along with their messages. Field
+    values, clock (unless `clock` is False) and solver state are then set in
+    bulk. With `reinit`,
+    moose.reinit() is called before the state is set so that the
+    simulation continues from the saved state on the next moose.start().
+
+    Returns the simulation time at which the state was saved. Clock time
+    cannot be set, so a restored simulation runs from time 0.
+    """
+    moosenode = moose.element(moosenode)
+    remap = path_mapper(hdfnode.attrs['path'], obj_path(moosenode))
+    elements = hdfnode['elements']
+    created = create_elements(elements, remap)
+    restore_field_counts(elements, remap)
+    # Messages first: SparseMsg for instance sets the number of synapses.
+    restore_messages(hdfnode['messages'], created, remap)
+    if clock:
+        restore_clock(hdfnode['clock'])
+    restore_fields(elements, remap)
+    # Solvers which already exist are set up already.
+    restore_fields(elements, remap, solvers=True, only=created)
+    if reinit:
+        moose.reinit()
+        # reinit puts initial values back in.
+        restore_fields(elements, remap)
+    restore_solvers(hdfnode['solvers'], remap)
+    return hdfnode['clock'].attrs['currentTime']
+
+def savestate(filename=None, root='/'):
+    """Save a checkpoint of the model under `root` in an hdf5 file.
+
+    Every class gets a group with one dataset per value field. Messages,
+    clock ticks and solver state are saved as well. Returns the filename.
     """
     if filename is None:
         filename = 'moose_session_' + time.strftime('%Y%m%d_%H%M%S') + '.hdf5'
     with h5.File(filename, 'w') as fd:
-        root = fd.create_group('/elements')
-        meta = fd.create_group('/metadata')
-        typeinfo_dataset = meta.create_dataset('typeinfo', shape=(size_step,), dtype=[('path', 'S1024'), ('class', 'S64'), ('dims', 'S64'), ('parent', 'S1024')], compression='gzip', compression_opts=6)
-        typeinfo = []
-        class_dataset_dict = {}
-        class_count_dict = {}
-        class_array_dict = {}
-        objcount = 0
-        for obj in moose.wildcardFind("/##"):
-            if obj.path.startswith('/Msg') or obj.path.startswith('/class') or obj.className == 'Table' or obj.className == 'TableEntry':
-                continue
-            print('Processing:', obj.path, obj.className)
-            typeinfo.append((obj.path, obj.className, str(obj.shape), obj[0].parent.path))
-            objcount += 1
-            if len(typeinfo) == size_step:
-                typeinfo_dataset.resize(objcount)
-                typeinfo_dataset[objcount - size_step: objcount] = np.rec.array(typeinfo, typeinfo_dataset.dtype)
-                typeinfo = []
-            # If we do not yet have dataset for this class, create one and keep it in dict
-            if obj.className not in class_dataset_dict:
-                print('Creating entries for class:', obj.className)
-                fielddict = moose.getFieldDict(obj.className, 'valueFinfo')
-                print(fielddict)
-                keys = sorted(fielddict)
-                fields = [] # [('path', 'S1024')]
-                for fieldname in keys:
-                    ftype = fielddict[fieldname]
-                    if ftype in cpptonp:
-                        fields.append((fieldname, cpptonp[ftype]))
-                    elif ftype == 'Id' or ftype == 'ObjId':
-                        fields.append((fieldname, 'S1024'))
-                # print fields
-                ds = root.create_dataset(obj.className, shape=(size_step,), dtype=fields, compression='gzip', compression_opts=6)
-                class_dataset_dict[obj.className] = ds
-                class_array_dict[obj.className] = []
-                class_count_dict[obj.className] = 0
-            # Lookup the dataset for the class this object belongs to
-            ds = class_dataset_dict[obj.className]
-            for entry in obj:
-                fields = []
-                print(entry.path, end=' ')
-                for f in ds.dtype.names:
-                    print('getting field:', f)
-                    entry.getField(f)
-                fields = [f.path if isinstance(f, moose.vec) or isinstance(f, moose.element) else f for f in fields]
-                class_array_dict[obj.className].append(fields)
-                # print 'fields:'
-                # print fields
-                # print 'length:', len(class_array_dict[obj.className])
-                class_count_dict[obj.className] += 1
-                if class_count_dict[obj.className] == size_step:
-                    oldlen = ds.len()
-                    if oldlen <= class_count_dict[obj.className]:
-                        ds.resize((class_count_dict[obj.className]))
-                    ds[oldlen: class_count_dict[obj.className]] = np.rec.array(class_array_dict[obj.className], dtype=ds.dtype)
-                    class_array_dict[obj.className] = []
-        for classname in class_array_dict:
-            ds = class_dataset_dict[classname]
-            ds.resize((class_count_dict[classname], ))
-            if len(class_array_dict[classname]) > 0:
-                start = class_count_dict[classname] - len(class_array_dict[classname])
-                ds[start:] = np.rec.array(class_array_dict[classname], dtype=ds.dtype)
-
-        if len(typeinfo) > 0:
-            typeinfo_dataset.resize((objcount,))
-            typeinfo_dataset[objcount-len(typeinfo): objcount] = np.rec.array(typeinfo, dtype=typeinfo_dataset.dtype)
-
-def restorestate(filename):
-    wfields = {}
-    for cinfo in moose.element('/classes').children:
-        cname = cinfo[0].name
-        wfields[cname] = [f[len('set_'):] for f in moose.getFieldNames(cname, 'destFinfo')
-                          if f.startswith('set_') and f not in ['set_this', 'set_name', 'set_lastDimension', 'set_runTime'] and not f.startswith('set_num_')]
+        savetree(moose.element(root), fd)
+    return filename
+
+def restorestate(filename, root='/', reinit=True):
+    """Restore a checkpoint saved by savestate under `root`. See loadtree.
+    """
     with h5.File(filename, 'r') as fd:
-        typeinfo = fd['/metadata/typeinfo'][:]
-        classdict = {}
-        dimsdict = dict(zip(typeinfo['path'], typeinfo['dims']))
-        classdict = dict(zip(typeinfo['path'], typeinfo['class']))
-        parentdict = dict(zip(typeinfo['path'], typeinfo['parent']))
-        sorted_paths = sorted(typeinfo['path'], key=lambda x: x.count('/'))
-        for path in sorted_paths:
-            name = path.rpartition('/')[-1].partition('[')[0]
-            moose.vec(parentdict[path] + '/' + name, eval(dimsdict[path]), classdict[path])
-        for key in fd['/elements']:
-            dset = fd['/elements/'][key][:]
-            fieldnames = dset.dtype.names
-            for ii in range(len(dset)):
-                obj = moose.element(dset['path'][ii])
-                for f in wfields[obj.className]:
-                    obj.setField(f, dset[f][ii])
+        return loadtree(fd, moose.element(root), reinit)
 
 #
 # hdfutil.py ends here
@@ -8,6 +8,8 @@ import warnings
 import os
 import pydoc
 import io
+import threading
+import concurrent.futures
 from contextlib import closing
 
 import moose._moose as _moose
@@ -326,6 +328,108 @@ def _getMooseDoc(tokens, inherited=False):
         return docstring.getvalue()
 
 
+class SimulationFuture(concurrent.futures.Future):
+    """Simulation running in the background; returned by `startAsync`.
+
+    It is a `concurrent.futures.Future` whose result is the simulation time
+    at which the run ended. It can also be awaited in a coroutine. While
+    the simulation runs, `currentTime`, `currentStep` and `progress` report
+    how far it has got.
+    """
+
+    def __init__(self, runtime):
+        super(SimulationFuture, self).__init__()
+        self.runtime = runtime
+        self._clock = _moose.element('/clock')
+        self._startTime = self._clock.currentTime
+        self._stopRequested = False
+
+    @property
+    def currentTime(self):
+        return self._clock.currentTime
+
+    @property
+    def currentStep(self):
+        return self._clock.currentStep
+
+    @property
+    def progress(self):
+        """Fraction of `runtime` simulated so far."""
+        if self.done():
+            return 1.0
+        return min(1.0, (self.currentTime - self._startTime) / self.runtime)
+
+    def running(self):
+        return not self.done()
+
+    def cancel(self):
+        """Request the simulation to stop at the end of the current step.
+        The model can be run further with moose.start later.
+
+        Unlike `concurrent.futures.Future.cancel`, this is only a stop
+        request: it returns True if the request was made, that is unless
+        the simulation has already finished. The future is cancelled once
+        the simulation has stopped early; if the run completes before the
+        request takes effect, it gets its result instead, and `cancelled()`
+        stays False.
+        """
+        if self.done():
+            return False
+        self._stopRequested = True
+        _moose.stop()
+        return True
+
+    def _run(self, notify):
+        try:
+            _moose.start(self.runtime, notify)
+        except Exception as e:
+            self.set_exception(e)
+            return
+        # A stop which came before the run began does not stop it.
+        end = self._startTime + self.runtime
+        if self._stopRequested and end - self.currentTime > 1e-9 * end:
+            super(SimulationFuture, self).cancel()
+        else:
+            self.set_result(self.currentTime)
+
+    def __await__(self):
+        import asyncio
+        return asyncio.wrap_future(self).__await__()
+
+
+# startAsync checks that no simulation runs and starts one as one step.
+_startAsyncLock = threading.Lock()
+_startAsyncFuture = None
+
+def startAsync(runtime, notify=False):
+    """Run the simulation for `runtime` in a background thread.
+
+    Returns a `SimulationFuture` at once. moose.start releases the GIL, so
+    the calling thread can analyse data of the previous run meanwhile. Do
+    not change the model or call moose.reinit before the future is done.
+
+    >>> f = moose.startAsync(10)
+    >>> f.currentTime           # progress of the simulation
+    >>> f.cancel()              # stop early, or
+    >>> f.result()              # wait for it
+    """
+    if runtime <= 0.0:
+        raise ValueError('simulation runtime must be positive.')
+    global _startAsyncFuture
+    with _startAsyncLock:
+        # The thread of the last future may not have got into moose.start
+        # yet, so isRunning alone does not tell.
+        if _moose.isRunning() or (_startAsyncFuture is not None
+                and not _startAsyncFuture.done()):
+            raise RuntimeError('A simulation is already running.')
+        future = SimulationFuture(runtime)
+        t = threading.Thread(target=future._run, args=(notify,)
+                , name='moose.startAsync')
+        t.start()
+        _startAsyncFuture = future
+    return future
+
+
 __pager = None
 
 def doc(arg, inherited=True, paged=True):
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function, division, absolute_import
+
+# Description: Vectorised evaluation of LEMS ComponentType dynamics.
+#
+#    pyneuroml.pynml.evaluate_component builds and exec()s a python script
+#    for every single voltage sample. Here the DerivedVariable and
+#    ConditionalDerivedVariable expressions of a ComponentType are compiled
+#    once into a function of numpy arrays, so that a whole HHGate table is
+#    computed in one call. Computed tables are cached at module level; the
+#    same rate used by many channels (or read again by another NML2Reader)
+#    is evaluated only once.
+# Maintainer:  Dilawar Singh <dilawars@ncbs.res.in>
+
+import ast
+import logging
+import numpy as np
+from moose.neuroml2.units import SI
+
+logger_ = logging.getLogger('moose.nml2')
+
+# Functions allowed in LEMS expressions.
+_functions = {
+    'exp': np.exp, 'log': np.log, 'ln': np.log, 'sqrt': np.sqrt,
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan, 'sinh': np.sinh,
+    'cosh': np.cosh, 'tanh': np.tanh, 'abs': np.abs, 'ceil': np.ceil,
+    'floor': np.floor, 'H': lambda x: np.heaviside(x, 0.0),
+    }
+
+_operators = [
+    ('.neq.', '!='), ('.eq.', '=='), ('.geq.', '>='), ('.leq.', '<='),
+    ('.gt.', '>'), ('.lt.', '<'), ('.and.', ' and '), ('.or.', ' or '),
+    ('^', '**'),
+    ]
+
+# Compiled functions keyed by component signature, and computed tables keyed
+# by (signature, variables, vmin, vmax, divs).
+_compiled = {}
+_tables = {}
+
+class _BoolOps(ast.NodeTransformer):
+    """Rewrite `and`/`or` into elementwise numpy calls."""
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        fname = 'logical_and' if isinstance(node.op, ast.And) else 'logical_or'
+        expr = node.values[0]
+        for v in node.values[1:]:
+            expr = ast.Call(func=ast.Name(id=fname, ctx=ast.Load()),
+                    args=[expr, v], keywords=[])
+        return ast.copy_location(expr, node)
+
+def _compile_expr(expr):
+    for lems, py in _operators:
+        expr = expr.replace(lems, py)
+    tree = _BoolOps().visit(ast.parse(expr.strip(), mode='eval'))
+    return compile(ast.fix_missing_locations(tree), '<lems>', 'eval')
+
+def signature(ct):
+    """Hashable description of the dynamics of ComponentType `ct`."""
+    consts = tuple((c.name, c.value) for c in ct.Constant)
+    dvs, cdvs = [], []
+    for d in ct.Dynamics:
+        dvs += [(dv.name, dv.value) for dv in d.DerivedVariable]
+        cdvs += [(cdv.name, tuple((c.condition, c.value) for c in cdv.Case))
+                for cdv in d.ConditionalDerivedVariable]
+    return (ct.name, consts, tuple(dvs), tuple(cdvs))
+
+def compile_component(ct):
+    """Compile the dynamics of ComponentType `ct`.
+
+    Returns a function which takes a dict of variables (scalars or numpy
+    arrays, in SI units) and returns a dict with the values of all derived
+    variables. Variables are evaluated in the same order as
+    pynml.evaluate_component does.
+    """
+    sig = signature(ct)
+    if sig in _compiled:
+        return _compiled[sig]
+
+    _, consts, dvs, cdvs = sig
+    consts = dict((name, SI(value)) for name, value in consts)
+    derived = [(name, _compile_expr(value)) for name, value in dvs
+            if value is not None]
+    conditional = []
+    for name, cases in cdvs:
+        conds, values, default = [], [], None
+        for cond, value in cases:
+            if cond:
+                conds.append(_compile_expr(cond))
+                values.append(_compile_expr(value))
+            else:
+                default = _compile_expr(value)
+        conditional.append((name, conds, values, default))
+
+    def evaluate(variables):
+        ns = dict(_functions)
+        ns['logical_and'], ns['logical_or'] = np.logical_and, np.logical_or
+        ns.update(consts)
+        ns.update(variables)
+        with np.errstate(all='ignore'):
+            for name, code in derived:
+                ns[name] = eval(code, ns)
+            for name, conds, values, default in conditional:
+                choices = [eval(c, ns) for c in values]
+                dflt = eval(default, ns) if default is not None else np.nan
+                ns[name] = np.select([eval(c, ns) for c in conds], choices, dflt)
+        names = [x[0] for x in dvs] + [x[0] for x in cdvs]
+        return dict((name, ns[name]) for name in names if name in ns)
+
+    _compiled[sig] = evaluate
+    return evaluate
+
+def evaluate_rate(ct, varname, variables, vmin, vmax, divs):
+    """Evaluate the rate exposed by ComponentType `ct` over `divs` values of
+    `varname` between `vmin` and `vmax`.
+
+    `variables` are the other required variables (e.g. vShift, temperature).
+    Returns a read-only array; raises an Exception if the component can not
+    be compiled.
+    """
+    variables = dict((k, SI(v)) for k, v in variables.items())
+    key = (signature(ct), varname, tuple(sorted(variables.items())),
+            vmin, vmax, divs)
+    if key in _tables:
+        return _tables[key]
+
+    evaluate = compile_component(ct)
+    tab = np.linspace(vmin, vmax, divs)
+    if varname != 'v':
+        # Concentration can't be negative.
+        tab = np.maximum(tab, 0)
+    variables[varname] = tab
+    vals = evaluate(variables)
+    rate = vals.get('x', vals.get('t', vals.get('r', None)))
+    if rate is None:
+        raise ValueError('%s exposes none of x, t or r' % ct.name)
+    rate = np.array(np.broadcast_to(rate, tab.shape), dtype=float)
+    rate.setflags(write=False)
+    _tables[key] = rate
+    logger_.debug('Evaluated %s over %d points' % (ct.name, divs))
+    return rate
+
+def clear_cache():
+    """Forget all compiled components and computed tables."""
+    _compiled.clear()
+    _tables.clear()
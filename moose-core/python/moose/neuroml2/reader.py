@@ -28,6 +28,7 @@ logger_ = logging.getLogger('moose.nml2')
 import neuroml         as nml
 import pyneuroml.pynml as pynml
 from moose.neuroml2.units import SI
+from moose.neuroml2 import lems
 
 def _write_flattened_nml( doc, outfile ):
     """_write_flattened_nml
@@ -476,20 +477,29 @@ class NML2Reader(object):
                 continue
 
             logger_.info("Using %s to evaluate rate"%ct.name)
+            # Note: MOOSE HHGate are either voltage of concentration
+            # dependant. Here we figure out if nml description of gate is
+            # concentration dependant or note.
+            if _isConcDep(ct):
+                # Concentration dependant. Find a suitable CaConc from the
+                # /library. Currently on Ca dependant channels are allowed.
+                varname = _findCaConcVariableName()
+            else:
+                varname = 'v'
+            req_vars = {'vShift':vShift,'temperature':self._getTemperature()}
+            req_vars.update( self._variables )
+            try:
+                return lems.evaluate_rate(ct, varname, req_vars, vmin, vmax, tablen)
+            except Exception as e:
+                logger_.warning("Could not vectorise %s (%s). Evaluating "
+                        "it one point at a time." % (ct.name, e))
+
             rate = []
             for v in tab:
-                # Note: MOOSE HHGate are either voltage of concentration
-                # dependant. Here we figure out if nml description of gate is
-                # concentration dependant or note.
-                if _isConcDep(ct):
-                    # Concentration dependant. Concentration can't be negative.
-                    # Find a suitable CaConc from the /library. Currently on Ca
-                    # dependant channels are allowed.
-                    caConcName = _findCaConcVariableName()
-                    req_vars  = {caConcName:'%g'%max(0,v),'vShift':vShift,'temperature':self._getTemperature()}
+                if varname != 'v':
+                    req_vars[varname] = '%g'%max(0,v)
                 else:
-                    req_vars  = {'v':'%sV'%v,'vShift':vShift,'temperature':self._getTemperature()}
-                req_vars.update( self._variables )
+                    req_vars['v'] = '%sV'%v
                 vals = pynml.evaluate_component(ct, req_variables=req_vars)
                 v = vals.get('x', vals.get('t', vals.get('r', None)))
                 if v is not None:
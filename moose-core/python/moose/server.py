@@ -25,30 +25,29 @@ import signal
 import tarfile 
 import tempfile 
 import threading 
+import hashlib
+import itertools
+import multiprocessing
 import logging
 import subprocess
 
-# create a logger for this server.
-logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s %(name)-12s %(levelname)-8s %(message)s',
-        datefmt='%m-%d %H:%M',
-        filename='moose_server.log',
-        filemode='a'
-        )
-console = logging.StreamHandler()
-console.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(name)-12s: %(levelname)-8s %(message)s')
-console.setFormatter(formatter)
-_logger = logging.getLogger('')
-_logger.addHandler(console)
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from moose import streamer_utils
+
+_logger = logging.getLogger('moose.server')
 
-__all__ = [ 'serve' ]
+__all__ = [ 'serve', 'JobScheduler', 'ResultCache' ]
 
 # Global variable to stop all running threads.
 stop_all_ = False
 sock_     = None
 stop_streamer_ = {}
+scheduler_ = None
+cache_ = None
 
 # Use prefixL_ bytes to encode the size of stream. One can probably use just one
 # byte to do. Lets go with the inefficient one for now.
@@ -84,16 +83,22 @@ except Exception as e:
 """
 
 
-def execute(cmd):
+def execute(cmd, cwd=None, env=None, job=None):
     """execute: Execute a given command.
 
-    :param cmd: string, given command.
+    :param cmd: list, given command.
+    :param cwd: working directory of the command.
+    :param env: environment of the command.
+    :param job: Job to attach the process to (so that it can be cancelled).
 
     Return:
     ------
         Return a iterator over output.
     """
-    popen = subprocess.Popen(cmd, stdout=subprocess.PIPE, universal_newlines=True)
+    popen = subprocess.Popen(cmd, stdout=subprocess.PIPE
+            , universal_newlines=True, cwd=cwd, env=env)
+    if job is not None:
+        job.attach(popen)
     for stdout_line in iter(popen.stdout.readline, ""):
         yield stdout_line 
     popen.stdout.close()
@@ -135,6 +140,8 @@ def signal_handler(signum, frame):
     global sock_
     _logger.info( "User terminated all processes." )
     stop_all_ = True
+    if scheduler_ is not None:
+        scheduler_.shutdown(wait=False)
     #  sock_.shutdown( socket.SHUT_RDWR )
     sock_.close()
     time.sleep(1)
@@ -146,27 +153,30 @@ def split_data( data ):
     return data[:prefixL_].strip(), data[prefixL_:]
 
 def send_msg(msg, conn, prefix='LOG'):
-    if not msg.strip():
-        return False
-    if prefix != 'TAB':
+    if not isinstance(msg, bytes):
+        if not msg.strip():
+            return False
+        msg = msg.encode('utf-8')
+    if prefix not in ('TAB', 'TAR'):
         _logger.debug(msg)
     else:
         _logger.debug( 'Sending msg with size %d' % len(msg))
-    msg = '<%s>%s' % (prefix, msg)
+    msg = b'<%s>%s' % (prefix.encode('utf-8'), msg)
     conn.sendall(prefix_data_with_size(msg))
 
-def run(cmd, conn, cwd=None):
-    _logger.info( "Executing %s" % cmd )
-    oldCWD = os.getcwd()
-    if cwd is not None:
-        os.chdir(cwd)
+def run(cmd, conn, cwd=None, env=None, job=None):
+    _logger.info( "Executing %s in %s" % (' '.join(cmd), cwd) )
     try:
-        for line in execute(cmd.split()):
+        for line in execute(cmd, cwd, env, job):
             if line:
                 send_msg(line, conn)
+    except socket.error as e:
+        # Client has gone away; there is no one to send the results to.
+        _logger.warning( "Lost connection to client: %s" % e )
+        if job is not None:
+            job.cancel()
     except Exception as e:
         send_msg("Simulation failed: %s" % e, conn)
-    os.chdir(oldCWD)
 
 def recv_input(conn, size=1024):
     # first 10 bytes always tell how much to read next. Make sure the submit job
@@ -225,36 +235,44 @@ def streamer_client(socketPath, conn):
         _logger.warning('Could not connect: %s' % e)
         return
 
-    # send streaming data back to client. The streamer send fixed size messages
-    # of 1024/2048 bytes each (see the c++ implmenetation).
+    # Send streaming data back to client. The streamer sends binary frames
+    # (see moose.streamer_utils); each complete frame is relayed as one TAB
+    # message so that the client can decode it with
+    # streamer_utils.StreamDecoder without reassembling chunks.
     _logger.info( "Socket Streamer is connected with server." )
     stClient.settimeout(0.05)
-    send_msg( b'Now streaming table data.', conn, 'TAB')
+    send_msg( 'Now streaming table data.', conn, 'LOG')
+    data = bytearray()
     while not stop:
         stop = stop_streamer_[threading.currentThread().name]
-        data = b''
         try:
-            data = stClient.recv(1024)
-            if len(data.strip()) > 0:
-                send_msg(data, conn, 'TAB')
+            chunk = stClient.recv(1<<16)
         except socket.timeout:
             continue
+        if not chunk:
+            break
+        data += chunk
+        frames, n = streamer_utils.split_frames(data)
+        for ftype, payload in frames:
+            send_msg(streamer_utils.encode_frame(ftype, payload), conn, 'TAB')
+        del data[:n]
     stClient.close()
     if os.path.isfile(socketPath):
         os.unlink(socketPath)
 
-def run_file(filename, conn, cwd=None):
-    # set environment variable so that socket streamer can start.
+def run_file(filename, conn, cwd=None, job=None):
+    # set environment variable so that socket streamer can start. It is only
+    # set for the child process since many jobs may be running at once.
     global stop_streamer_
     socketPath = os.path.join(tempfile.mkdtemp(), 'SOCK_TABLE_STREAMER')
-    os.environ['MOOSE_STREAMER_ADDRESS'] = socketPath
+    env = dict(os.environ, MOOSE_STREAMER_ADDRESS=socketPath)
     streamerThread = threading.Thread(target=streamer_client
             , args=(socketPath, conn,))
     stop_streamer_[streamerThread.name] = False
     streamerThread.daemon = True
     streamerThread.start()
     filename = suffixMatplotlibStmt(filename)
-    run( "%s %s" % (sys.executable, filename), conn, cwd)
+    run([sys.executable, filename], conn, cwd, env, job)
     stop_streamer_[streamerThread.name] = True
     streamerThread.join( timeout = 1)
     if streamerThread.is_alive():
@@ -263,7 +281,7 @@ def run_file(filename, conn, cwd=None):
 def extract_files(tfile, to):
     userFiles = []
     with tarfile.open(tfile, 'r' ) as f:
-        userFiles = f.getnames( )
+        userFiles = [os.path.join(to, x) for x in f.getnames()]
         try:
             f.extractall( to )
         except Exception as e:
@@ -321,36 +339,302 @@ def find_files_to_run( files ):
                     toRun.append(f)
     return toRun
 
-def simulate( tfile, conn ):
+def simulate( tfile, conn, job=None ):
     """Simulate a given tar file.
+
+    Files are extracted to and run in the directory of `tfile`; the server's
+    own working directory is left alone.
     """
     tdir = os.path.dirname( tfile )
-    os.chdir( tdir )
     userFiles = extract_files(tfile, tdir)
     # Now simulate.
     toRun = find_files_to_run(userFiles)
     if len(toRun) < 1:
-        return 1
+        return 1, 'No file to run.'
     prepareMatplotlib(tdir)
     status, msg = 0, ''
     for _file in toRun:
+        if job is not None and job.cancelled.is_set():
+            break
         try:
-            run_file(_file, conn, tdir) 
+            run_file(_file, conn, tdir, job)
         except Exception as e:
             msg += str(e)
             status = 1
     return status, msg
 
-def savePayload( conn ):
-    data = recv_input(conn)
-    tarfileName = writeTarfile(data)
-    return tarfileName, len(data)
+class Job(object):
+    """A simulation request waiting in (or taken from) JobScheduler queue.
+
+    `status` is one of 'queued', 'running', 'done', 'failed' or 'cancelled'.
+    """
+
+    def __init__(self, jobId, tfile, conn):
+        self.id = jobId
+        self.tfile = tfile
+        self.conn = conn
+        self.status = 'queued'
+        self.result = (0, '')
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self._popen = None
+        self._lock = threading.Lock()
+
+    def attach(self, popen):
+        # Keep the handle of the running process so that cancel() can
+        # terminate it.
+        with self._lock:
+            self._popen = popen
+            if self.cancelled.is_set():
+                popen.terminate()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled.set()
+            if self._popen is not None and self._popen.poll() is None:
+                _logger.info( "Terminating job %d" % self.id )
+                self._popen.terminate()
+
+class JobScheduler(object):
+    """Run simulation jobs with at most `max_jobs` of them at a time.
+
+    Jobs are queued in order of submission. Each job runs in its own
+    directory (the one its payload was written to) as a child process of
+    the server. Queue depth, waiting and running times are logged and
+    available from stats().
+    """
+
+    def __init__(self, max_jobs=None):
+        self.max_jobs = max_jobs or multiprocessing.cpu_count()
+        self.queue = queue.Queue()
+        self.jobs = {}
+        self.running = 0
+        self.counts = dict(submitted=0, done=0, failed=0, cancelled=0)
+        self.totalWait = 0.0
+        self.totalRun = 0.0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._workers = []
+        for i in range(self.max_jobs):
+            t = threading.Thread(target=self._worker, name='moose-job-%d'%i)
+            t.daemon = True
+            t.start()
+            self._workers.append(t)
+        _logger.info( "Scheduler started with %d workers." % self.max_jobs )
+
+    def submit(self, tfile, conn):
+        """Queue tar file `tfile` for simulation. Output is sent to `conn`.
+        Returns the Job; wait on `job.done` for it to finish.
+        """
+        with self._lock:
+            job = Job(next(self._ids), tfile, conn)
+            self.jobs[job.id] = job
+            self.counts['submitted'] += 1
+        self.queue.put(job)
+        _logger.info( "Job %d queued (queue depth %d, running %d)" % (
+            job.id, self.queue.qsize(), self.running))
+        return job
+
+    def cancel(self, jobId):
+        """Cancel a queued or running job. Returns False if there is no
+        such job or if it has already finished.
+        """
+        job = self.jobs.get(jobId)
+        if job is None or job.done.is_set():
+            return False
+        job.cancel()
+        return True
+
+    def stats(self):
+        """Return a dict of scheduler metrics."""
+        with self._lock:
+            res = dict(self.counts)
+            finished = res['done'] + res['failed']
+            res.update(queued=self.queue.qsize(), running=self.running
+                    , max_jobs=self.max_jobs
+                    , mean_wait=self.totalWait/max(1, finished)
+                    , mean_run=self.totalRun/max(1, finished))
+        return res
+
+    def shutdown(self, wait=True):
+        """Cancel all unfinished jobs and stop the workers."""
+        for job in list(self.jobs.values()):
+            if not job.done.is_set():
+                job.cancel()
+        for t in self._workers:
+            self.queue.put(None)
+        if wait:
+            for t in self._workers:
+                t.join()
+
+    def _finish(self, job, status):
+        with self._lock:
+            job.status = status
+            job.finished = time.time()
+            self.counts[status] += 1
+            if job.started is not None:
+                self.totalWait += job.started - job.submitted
+                self.totalRun += job.finished - job.started
+            self.jobs.pop(job.id, None)
+        job.done.set()
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+            if job.cancelled.is_set():
+                self._finish(job, 'cancelled')
+                continue
+            with self._lock:
+                self.running += 1
+                job.status = 'running'
+                job.started = time.time()
+            _logger.info( "Job %d started after waiting %.3f s" % (job.id
+                , job.started - job.submitted))
+            try:
+                job.result = simulate(job.tfile, job.conn, job)
+            except Exception as e:
+                job.result = (1, str(e))
+            with self._lock:
+                self.running -= 1
+            if job.cancelled.is_set():
+                status = 'cancelled'
+            else:
+                status = 'failed' if job.result[0] else 'done'
+            self._finish(job, status)
+            _logger.info( "Job %d %s in %.3f s. %s" % (job.id, status
+                , job.finished - job.started, self.stats()))
+
+class RecordingConnection(object):
+    """Wrap a client socket and keep a copy of everything sent to it in
+    file `path`, so that ResultCache can replay it later.
+    """
+
+    def __init__(self, conn, path):
+        self.conn = conn
+        self.path = path
+        self._file = open(path, 'wb')
+        self._lock = threading.Lock()
+
+    def sendall(self, data):
+        # Streamer and simulation output are sent from different threads.
+        with self._lock:
+            self.conn.sendall(data)
+            self._file.write(data)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+class ResultCache(object):
+    """Size bounded on-disk cache of results sent back to clients.
+
+    An entry is everything sent to the client for a payload (log lines,
+    table streams and the tar of results) keyed by the sha256 of payload and
+    MOOSE version. Resubmitting the same payload replays the entry without
+    running the simulation. Least recently used entries are evicted once the
+    cache grows beyond `max_bytes`.
+    """
+
+    def __init__(self, cachedir=None, max_bytes=512*1024*1024):
+        if cachedir is None:
+            cachedir = os.path.join(os.path.expanduser('~'), '.cache'
+                    , 'moose', 'server')
+        self.cachedir = cachedir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if not os.path.isdir(cachedir):
+            os.makedirs(cachedir)
+
+    def key(self, data):
+        from moose import _moose
+        h = hashlib.sha256(_moose.VERSION.encode('utf-8'))
+        h.update(data)
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cachedir, key + '.bin')
+
+    def replay(self, key, conn):
+        """Send the cached results for `key` to `conn`. Returns False on a
+        cache miss.
+        """
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Modification time marks the last use of an entry.
+            os.utime(path, None)
+        except (IOError, OSError):
+            with self._lock:
+                self.misses += 1
+            _logger.info( "Cache miss for %s (hits %d, misses %d)" % (key
+                , self.hits, self.misses))
+            return False
+        with self._lock:
+            self.hits += 1
+        _logger.info( "Cache hit for %s (hits %d, misses %d)" % (key
+            , self.hits, self.misses))
+        conn.sendall(data)
+        return True
+
+    def recorder(self, key, conn):
+        """Return a RecordingConnection to use in place of `conn` for
+        results that may be stored under `key`.
+        """
+        tmp = '%s.%d.tmp' % (self.path(key), threading.current_thread().ident)
+        return RecordingConnection(conn, tmp)
+
+    def store(self, key, rec):
+        rec.close()
+        os.rename(rec.path, self.path(key))
+        self.evict()
+
+    def discard(self, rec):
+        rec.close()
+        if os.path.isfile(rec.path):
+            os.remove(rec.path)
+
+    def evict(self):
+        with self._lock:
+            entries = []
+            for f in os.listdir(self.cachedir):
+                if not f.endswith('.bin'):
+                    continue
+                path = os.path.join(self.cachedir, f)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+            total = sum(x[1] for x in entries)
+            for mtime, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                _logger.info( "Evicting %s from cache" % path )
+                os.remove(path)
+                total -= size
 
 def handle_client(conn, ip, port):
     isActive = True
     _logger.info( "Serving request from %s:%s" % (ip, port) )
     while isActive:
-        tarfileName, nBytes = savePayload(conn)
+        data = recv_input(conn)
+        key = None
+        if cache_ is not None:
+            key = cache_.key(data)
+            if cache_.replay(key, conn):
+                break
+        tarfileName = writeTarfile(data)
         if tarfileName is None:
             _logger.warn( "Could not recieve data." )
             isActive = False
@@ -360,21 +644,40 @@ def handle_client(conn, ip, port):
 
         # list of files before the simulation.
         notthesefiles = find_files(os.path.dirname(tarfileName))
-        res, msg = simulate( tarfileName, conn )
-        if 0 != res:
-            send_msg( "Failed to run simulation: %s" % msg, conn)
-            isActive = False
-            time.sleep(0.1)
-
-        # Send results after DONE is sent.
-        send_msg('All done', conn, 'EOS')
-        sendResults(os.path.dirname(tarfileName), conn, notthesefiles)
+        send_msg( "Job is queued.", conn)
+        rec = cache_.recorder(key, conn) if cache_ is not None else conn
+        try:
+            job = scheduler_.submit(tarfileName, rec)
+            job.done.wait()
+            if job.status == 'cancelled':
+                send_msg( "Job %d was cancelled." % job.id, conn)
+                break
+            res, msg = job.result
+            if 0 != res:
+                send_msg( "Failed to run simulation: %s" % msg, rec)
+                isActive = False
+                time.sleep(0.1)
+
+            # Send results after DONE is sent.
+            send_msg('All done', rec, 'EOS')
+            sendResults(os.path.dirname(tarfileName), rec, notthesefiles)
+            if rec is not conn and 0 == res:
+                cache_.store(key, rec)
+        finally:
+            if rec is not conn:
+                cache_.discard(rec)
         break
 
 
-def start_server( host, port, max_requests = 10 ):
+def start_server( host, port, max_requests = 10, max_jobs = None
+        , cachedir = None, cache_size = 512 ):
     global stop_all_
     global sock_
+    global scheduler_
+    global cache_
+    scheduler_ = JobScheduler(max_jobs)
+    if cache_size > 0:
+        cache_ = ResultCache(cachedir, cache_size * 1024 * 1024)
     sock_ = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock_.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     try:
@@ -398,16 +701,43 @@ def start_server( host, port, max_requests = 10 ):
         t = threading.Thread(target=handle_client, args=(conn, ip, port)) 
         t.start()
     sock_.close()
+    scheduler_.shutdown()
 
-def serve(host, port):
-    start_server(host, port)
+def setup_logging(logfile='moose_server.log'):
+    """Log everything to `logfile` and to the console.
+
+    This is done by `serve` and not at import so that importing moose does
+    not change the logging configuration of the application.
+    """
+    logging.basicConfig(
+            level=logging.DEBUG,
+            format='%(asctime)s %(name)-12s %(levelname)-8s %(message)s',
+            datefmt='%m-%d %H:%M',
+            filename=logfile,
+            filemode='a'
+            )
+    console = logging.StreamHandler()
+    console.setLevel(logging.DEBUG)
+    formatter = logging.Formatter('%(name)-12s: %(levelname)-8s %(message)s')
+    console.setFormatter(formatter)
+    logging.getLogger('').addHandler(console)
+
+def serve(host, port, max_jobs=None, cachedir=None, cache_size=512):
+    """Serve simulation requests on host:port. At most `max_jobs`
+    simulations run at a time (default: number of CPUs); the rest wait in
+    a queue. Results are cached in `cachedir` upto `cache_size` MB; 0
+    disables the cache.
+    """
+    setup_logging()
+    start_server(host, port, max_jobs=max_jobs, cachedir=cachedir
+            , cache_size=cache_size)
 
 def main( args ):
     global stop_all_
     host, port = args.host, args.port
     # Install a signal handler.
     signal.signal( signal.SIGINT, signal_handler)
-    serve(host, port)
+    serve(host, port, args.max_jobs, args.cache_dir, args.cache_size)
 
 if __name__ == '__main__':
     import argparse
@@ -423,6 +753,18 @@ if __name__ == '__main__':
         , required = False, default = 31417, type=int
         , help = 'Port number'
         )
+    parser.add_argument('--max-jobs', '-j'
+        , required = False, default = None, type=int
+        , help = 'Maximum number of simulations to run at a time'
+        )
+    parser.add_argument('--cache-dir'
+        , required = False, default = None
+        , help = 'Directory to cache results in (default ~/.cache/moose/server)'
+        )
+    parser.add_argument('--cache-size'
+        , required = False, default = 512, type=int
+        , help = 'Maximum size of result cache in MB; 0 disables it'
+        )
     class Args: pass 
     args = Args()
     parser.parse_args(namespace=args)
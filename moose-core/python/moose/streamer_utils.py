@@ -1,9 +1,22 @@
-"""streamer_utils.py: 
+"""streamer_utils.py:
 
 Utility for Table streamer.
 
+SocketStreamer sends table data as binary frames (see
+builtins/SocketStreamer.h for the wire format). Every frame has a 16 byte
+little-endian header followed by its payload. The column dictionary (id,
+name and dt of every table) is sent once; data frames then carry raw
+float64 blocks of (time, value) pairs per column id.
+
+Use `StreamDecoder` to decode bytes as they arrive, or `iter_batches` to
+read batches of ``{column: ndarray}`` directly from a socket.
+
+Tables and Streamer with format 'mcol' write an append-only binary file (see
+builtins/StreamerBase.h). `TableFile` opens it as a `np.memmap`, also while
+the simulation is still appending to it.
+
 """
-    
+
 __author__           = "Dilawar Singh"
 __copyright__        = "Copyright 2017-, Dilawar Singh"
 __version__          = "1.0.0"
@@ -11,41 +24,226 @@ __maintainer__       = "Dilawar Singh"
 __email__            = "dilawars@ncbs.res.in"
 __status__           = "Development"
 
-import sys
 import os
-import numpy as np
-import math
+import sys
+import socket
 import struct
+import numpy as np
 from collections import defaultdict
 
-def bytes_to_np_arr(data):
-    return np.frombuffer(data, float)
+MAGIC = b'MSTR'
+VERSION = 2
+FRAME_COLUMNS = 1
+FRAME_DATA = 2
+
+# magic, version, frame type, payload size.
+_header = struct.Struct('<4sHHQ')
+# count, reserved.
+_count = struct.Struct('<II')
+# column id, name length, dt.
+_column = struct.Struct('<IId')
+# column id, reserved, number of (time, value) pairs.
+_block = struct.Struct('<IIQ')
+
+HEADER_SIZE = _header.size
+
+def split_frames(data):
+    """Split `data` into complete frames.
+
+    Returns a list of (frame type, payload) and the number of bytes
+    consumed. Bytes of an incomplete trailing frame are not consumed. The
+    headers are parsed in place, so `data` may be a growing bytearray; only
+    the payloads of complete frames are copied out, which leaves it free to
+    be trimmed.
+    """
+    frames, n = [], 0
+    with memoryview(data) as view:
+        while len(view) - n >= HEADER_SIZE:
+            magic, version, ftype, size = _header.unpack_from(view, n)
+            if magic != MAGIC:
+                raise ValueError('Bad frame magic %r at byte %d' % (magic, n))
+            if version != VERSION:
+                raise ValueError('Unsupported stream version %d' % version)
+            if len(view) - n - HEADER_SIZE < size:
+                break
+            start = n + HEADER_SIZE
+            frames.append((ftype, view[start:start+size].tobytes()))
+            n = start + size
+    return frames, n
+
+def encode_frame(ftype, payload):
+    """Prefix `payload` with a frame header."""
+    return _header.pack(MAGIC, VERSION, ftype, len(payload)) + bytes(payload)
+
+def decode_columns(payload):
+    """Decode a COLUMNS payload into {id: (name, dt)}."""
+    ncols, _ = _count.unpack_from(payload, 0)
+    n, columns = _count.size, {}
+    for i in range(ncols):
+        cid, nameLen, dt = _column.unpack_from(payload, n)
+        n += _column.size
+        name = bytes(payload[n:n+nameLen]).decode('utf-8')
+        n += nameLen
+        columns[cid] = (name, dt)
+    return columns
+
+def decode_data_frame(payload, columns=None):
+    """Decode a DATA payload into {column: ndarray of shape (n, 2)}.
+
+    Each row of the array is a (time, value) pair. Columns are named using
+    `columns` (as returned by `decode_columns`), else by their id.
+    """
+    columns = columns or {}
+    nblocks, _ = _count.unpack_from(payload, 0)
+    n, res = _count.size, {}
+    for i in range(nblocks):
+        cid, _, npairs = _block.unpack_from(payload, n)
+        n += _block.size
+        arr = np.frombuffer(payload, dtype='<f8', count=2*npairs, offset=n)
+        n += arr.nbytes
+        res[columns.get(cid, (cid,))[0]] = arr.reshape(-1, 2)
+    return res
+
+class StreamDecoder(object):
+    """Incremental decoder for SocketStreamer output.
+
+    Feed it bytes in whatever chunks they arrive; `feed` returns the list
+    of data batches, each a dict {column: ndarray of (time, value) rows},
+    completed by these bytes.
+    """
 
-def np_array_to_string(arr):
-    return np.uint8(arr).tostring()
+    def __init__(self):
+        self.columns = {}
+        self._buffer = bytearray()
 
-def np_array_to_data(arr):
-    # Make sure that first char of arr is 'H'
-    n = 0
+    def feed(self, data):
+        self._buffer += data
+        frames, n = split_frames(self._buffer)
+        del self._buffer[:n]
+        batches = []
+        for ftype, payload in frames:
+            if ftype == FRAME_COLUMNS:
+                self.columns = decode_columns(payload)
+            elif ftype == FRAME_DATA:
+                batches.append(decode_data_frame(payload, self.columns))
+        return batches
+
+def iter_batches(sock, bufsize=1<<16):
+    """Yield {column: ndarray} batches read from a connected socket until
+    the peer closes it. A socket timeout ends the iteration as well.
+    """
+    decoder = StreamDecoder()
+    while True:
+        try:
+            data = sock.recv(bufsize)
+        except socket.timeout:
+            return
+        if not data:
+            return
+        for batch in decoder.feed(data):
+            yield batch
+
+def decode_data(data):
+    """Decode a complete recording; returns {column: ndarray (n, 2)} with
+    all batches of a column concatenated.
+    """
     res = defaultdict(list)
-    while n < len(arr):
-        assert chr(int(arr[n])) == 'H', 'Expected H, Got %s'%arr[n]
-        hSize = int(arr[n+1])
-        n += 1
-        colName = np_array_to_string(arr[n+1:n+1+hSize])
-        n += hSize + 1
-        assert chr(int(arr[n])) == 'V', 'Expected V'
-        n += 1
-        dataSize = int(arr[n])
-        n += 1
-        res[colName].append(arr[n:n+dataSize])
-        n += dataSize 
+    for batch in StreamDecoder().feed(data):
+        for k, v in batch.items():
+            res[k].append(v)
     return { k : np.concatenate(v) for k, v in res.items() }
 
-def decode_data(data):
-    arr = bytes_to_np_arr(data)
-    assert int(arr[0]) == ord('H'), "First char must be H"
-    return np_array_to_data(arr)
+MCOL_MAGIC = b'MCOL'
+MCOL_VERSION = 1
+
+# magic, version, byte order mark, number of columns, offset of data. The
+# numbers are in the byte order of the writer; see mcol_byte_order.
+_mcol_header = '4sHHII'
+# dt, name length.
+_mcol_column = 'dI'
+
+def mcol_byte_order(head):
+    """Byte order ('<' or '>') of an mcol file from its first 8 bytes.
+
+    The byte order mark is 1 in the order of the file. It is 0 in files
+    from writers which did not set it, all of which are little-endian.
+    """
+    return '>' if head[6:8] == b'\x00\x01' else '<'
+
+def read_mcol_header(filename):
+    """Read the header of an mcol file.
+
+    Returns (columns, dts, offset, order): names of columns, dt of each
+    column, the offset of the data in bytes and the byte order of the file.
+    """
+    size = struct.calcsize('<' + _mcol_header)
+    with open(filename, 'rb') as f:
+        head = f.read(size)
+        if len(head) < size:
+            raise ValueError('%s: incomplete header' % filename)
+        order = mcol_byte_order(head)
+        magic, version, _, ncols, offset = struct.unpack(order + _mcol_header
+                , head)
+        if magic != MCOL_MAGIC:
+            raise ValueError('%s: not an mcol file' % filename)
+        if version != MCOL_VERSION:
+            raise ValueError('%s: unsupported mcol version %d' % (filename
+                , version))
+        head += f.read(offset - len(head))
+    if len(head) < offset:
+        raise ValueError('%s: incomplete header' % filename)
+    column = struct.Struct(order + _mcol_column)
+    columns, dts, n = [], [], size
+    for i in range(ncols):
+        dt, nameLen = column.unpack_from(head, n)
+        n += column.size
+        columns.append(head[n:n+nameLen].decode('utf-8'))
+        dts.append(dt)
+        n += nameLen
+    return columns, dts, offset, order
+
+class TableFile(object):
+    """Read-only view of an mcol file written by Table or Streamer.
+
+    The data is memory-mapped, not read; `data` is an array of shape
+    (rows, columns) and ``tf['name']`` is a view of one column. Call
+    `refresh` to see rows appended since the file was opened. A partially
+    written row at the end of the file is ignored.
+
+    >>> tf = TableFile('_tables/model/vm.mcol')
+    >>> tf.columns
+    ['time', '/model/vm']
+    >>> vm = tf['/model/vm']
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.columns, dts, self.offset, self.order = read_mcol_header(filename)
+        self.dt = dict(zip(self.columns, dts))
+        self.data = None
+        self.refresh()
+
+    def refresh(self):
+        """Map the rows written so far. Returns the number of rows."""
+        rowsize = 8 * len(self.columns)
+        nrows = (os.path.getsize(self.filename) - self.offset) // rowsize
+        if self.data is None or nrows != len(self.data):
+            if nrows > 0:
+                self.data = np.memmap(self.filename, dtype=self.order + 'f8', mode='r'
+                        , offset=self.offset, shape=(nrows, len(self.columns)))
+            else:
+                self.data = np.empty((0, len(self.columns)))
+        return nrows
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, column):
+        return self.data[:, self.columns.index(column)]
+
+    def tail(self, n):
+        """Last `n` rows."""
+        return self.data[max(0, len(self.data) - n):]
 
 def test():
     with open(sys.argv[1], 'rb') as f:
@@ -5,6 +5,7 @@ from __future__ import print_function, division, absolute_import
 from __future__ import print_function, division
 from __future__ import absolute_import
 
+import sys
 import types
 import parser
 import token
@@ -27,11 +28,35 @@ try:
 except Exception as e:
     logger_.warn("Netowrk utilities are not loaded due to %s" % e)
 
-# Print and Plot utilities.
-try:
-    from moose.plot_utils import *
-except Exception as e:
-    logger_.warn( "Plot utilities are not loaded due to '%s'" % e )
+# Plot utilities import matplotlib.pyplot which is slow to import. They are
+# loaded when one of them is used for the first time.
+_plot_utils_names = [ 'plotAscii', 'plotInTerminal', 'xyToString'
+        , 'saveNumpyVec', 'saveAsGnuplot', 'scaleVector', 'scaleAxis'
+        , 'reformatTable', 'plotTable', 'plotTables', 'plotVector'
+        , 'saveRecords', 'plotRecords', 'plotTablesByRegex' ]
+
+def _import_plot_utils():
+    try:
+        import moose.plot_utils as _plot_utils
+    except Exception as e:
+        logger_.warn( "Plot utilities are not loaded due to '%s'" % e )
+        return None
+    return _plot_utils
+
+def __getattr__(name):
+    if name in _plot_utils_names:
+        _plot_utils = _import_plot_utils()
+        if _plot_utils is not None:
+            val = getattr(_plot_utils, name)
+            globals()[name] = val
+            return val
+    raise AttributeError("module 'moose.utils' has no attribute '%s'" % name)
+
+if sys.version_info < (3, 7):
+    # No module level __getattr__ (PEP 562).
+    _plot_utils = _import_plot_utils()
+    if _plot_utils is not None:
+        globals().update((k, getattr(_plot_utils, k)) for k in _plot_utils_names)
 
 def create_table_path(model, graph, element, field):
 
@@ -914,3 +939,8 @@ def connect_CaConc(compartment_list, temperature=None):
                                     #print 'Connected concOut of',caconc.path,'to concen of',channel.path
                         except TypeError:
                             pass
+
+# What `from moose.utils import *` gives: every public name, including the
+# plot utilities, which are not in globals() until they are used.
+__all__ = sorted(set([k for k in globals() if not k.startswith('_')]
+    + _plot_utils_names))
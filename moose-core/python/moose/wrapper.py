@@ -15,25 +15,35 @@ __email__ = "dilawars@ncbs.res.in"
 
 import difflib
 import moose._moose as _moose
-import pprint
+import pprint as _pprint
 
 import logging
 
 logger_ = logging.getLogger("moose")
 
-# Provide a pretty printer.
-pprint = pprint.pprint
+_sympy = None
 
-sympyFound_ = False
-try:
-    import sympy
 
-    sympy.init_printing(use_unicode=True)
-    sympyFound_ = True
-    # When sympy is found, pprint is sympy pprint.
-    pprint = sympy.pprint
-except ImportError:
-    pass
+def _import_sympy():
+    """Import sympy on first use; it takes longer to import than moose."""
+    global _sympy
+    if _sympy is None:
+        try:
+            import sympy
+
+            sympy.init_printing(use_unicode=True)
+            _sympy = sympy
+        except ImportError:
+            _sympy = False
+    return _sympy
+
+
+def pprint(*args, **kwargs):
+    """Pretty printer. It is sympy.pprint when sympy is found."""
+    sympy = _import_sympy()
+    if sympy:
+        return sympy.pprint(*args, **kwargs)
+    return _pprint.pprint(*args, **kwargs)
 
 
 def _didYouMean(v, options):
@@ -52,8 +62,8 @@ def _eval(expr):
 
 
 def _prettifyExpr(expr):
-    global sympyFound_
-    if not sympyFound_:
+    sympy = _import_sympy()
+    if not sympy:
         return expr
     try:
         return sympy.pretty(sympy.simplify(expr, use_unicode=True))
@@ -28,13 +28,11 @@ class MooView:
         self.ax = self.fig_.add_subplot(111, projection='3d' )
         self.drawables_ = []
         self.fig_.canvas.mpl_connect("key_press_event", self.moveView )
-        plt.rcParams['keymap.xscale'] = ''
-        plt.rcParams['keymap.yscale'] = ''
-        plt.rcParams['keymap.zoom'] = ''
-        plt.rcParams['keymap.back'] = ''
-        plt.rcParams['keymap.home'] = ''
-        plt.rcParams['keymap.forward'] = ''
-        plt.rcParams['keymap.all_axes'] = ''
+        for key in ( 'xscale', 'yscale', 'zoom', 'back', 'home', 'forward',
+                'all_axes' ):
+            # Newer matplotlib has dropped some of these.
+            if 'keymap.' + key in plt.rcParams:
+                plt.rcParams['keymap.' + key] = ''
         self.hideAxis = hideAxis
         if self.hideAxis:
             self.ax.set_axis_off()
@@ -187,19 +185,27 @@ class MooDrawable:
         self.fieldInfo = fieldInfo
         self.fieldScale = fieldInfo[2]
         #FieldInfo = [baseclass, fieldGetFunc, scale, axisText, min, max]
+        # Colour lookup table, indexed by the scaled value.
+        cmap = plt.get_cmap( self.colormap )
+        self.lut = cmap( np.arange( cmap.N ) )
+        self.val = None
 
     def updateValues( self ):
         ''' Obtains values from the associated cell'''
-        self.val = np.array([moose.getField( i, self.field, 'double' ) for i in self.activeObjs]) * self.fieldScale
-        cmap = plt.get_cmap( self.colormap )
+        if self.val is None or len( self.val ) != len( self.activeObjs ):
+            self.val = np.empty( len( self.activeObjs ) )
+        moose.getFieldArray( self.activeObjs, self.field, out = self.val )
+        self.val *= self.fieldScale
         if self.autoscale:
-            valMin = min( self.val )
-            valMax = max( self.val )
+            valMin = self.val.min()
+            valMax = self.val.max()
         else:
             valMin = self.valMin
             valMax = self.valMax
-        scaleVal = (self.val - valMin) / (valMax - valMin)
-        self.rgba = [ cmap(i) for i in scaleVal ]
+        scale = len( self.lut ) / ( valMax - valMin ) if valMax > valMin else 0.0
+        idx = ( ( self.val - valMin ) * scale ).astype( int )
+        np.clip( idx, 0, len( self.lut ) - 1, out = idx )
+        self.rgba = self.lut[ idx ]
         self.segments.set_color( self.rgba )
         return
 
@@ -240,15 +246,16 @@ class MooNeuron( MooDrawable ):
 
     def updateCoords( self ):
         ''' Obtains coords from the associated cell'''
-        self.compts_ = moose.wildcardFind( self.neuronId.path + "/#[ISA=CompartmentBase]" )
+        self.compts_ = list( moose.wildcardFind( self.neuronId.path + "/#[ISA=CompartmentBase]" ) )
         # Matplotlib3d isn't able to do full rotations about an y axis,
         # which is what the NeuroMorpho models use, so
         # here we shuffle the axes around. Should be an option.
         #coords = np.array([[[i.x0,i.y0,i.z0],[i.x,i.y,i.z]] 
             #for i in self.compts_])
-        coords = np.array([[[i.z0,i.x0,i.y0],[i.z,i.x,i.y]] 
-            for i in self.compts_])
-        dia = np.array([i.diameter for i in self.compts_])
+        xyz = [ moose.getFieldArray( self.compts_, f ) for f in
+                ( 'z0', 'x0', 'y0', 'z', 'x', 'y' ) ]
+        coords = np.array( xyz ).T.reshape( -1, 2, 3 )
+        dia = moose.getFieldArray( self.compts_, 'diameter' )
         if self.relativeObj == '.':
             self.activeCoords = coords
             self.activeDia = dia
@@ -267,7 +274,8 @@ class MooNeuron( MooDrawable ):
         self.activeCoords = np.array( self.activeCoords ) * self.lenScale
         self.coordMax = np.amax( self.activeCoords )
         self.coordMin = np.amin( self.activeCoords )
-        self.linewidth = np.array( [ min(self.maxLineWidth, 1 + int(i * self.diaScale )) for i in self.activeDia ] )
+        self.linewidth = np.minimum( self.maxLineWidth,
+                1 + ( np.array( self.activeDia ) * self.diaScale ).astype( int ) )
 
         return
 
@@ -305,10 +313,11 @@ class MooReacSystem( MooDrawable ):
         dia = np.ones( numObj ) * dummyDia
         self.activeCoords = coords
         self.activeDia = dia
-        self.activeObjs = self.mooObj
+        self.activeObjs = list( self.mooObj )
         self.activeCoords = np.array( self.activeCoords ) * self.lenScale
         self.coordMax = np.amax( self.activeCoords )
         self.coordMin = np.amin( self.activeCoords )
-        self.linewidth = np.array( [ min(self.maxLineWidth, 1 + int(i * self.diaScale )) for i in self.activeDia ] )
+        self.linewidth = np.minimum( self.maxLineWidth,
+                1 + ( self.activeDia * self.diaScale ).astype( int ) )
 
         return
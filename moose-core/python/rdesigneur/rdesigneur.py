@@ -44,6 +44,9 @@ except ImportError:
   import xml.etree.ElementTree as etree
 
 import csv
+import json
+import hashlib
+import inspect
 
 #EREST_ACT = -70e-3
 
@@ -66,6 +69,17 @@ class BuildError(Exception):
     def __str__(self):
         return repr(self.value)
 
+# File types for rplot.saveFile. The HDF5 ones use the NSDF layout.
+saveFileTypes = [ '.xml', '.csv', '.npz', '.h5', '.hdf5', '.nsdf' ]
+hdf5FileTypes = [ '.h5', '.hdf5', '.nsdf' ]
+
+# PlotStreams of the current model, updated by its streamPlots PyRun.
+plotStreams = []
+
+def updatePlotStreams():
+    for i in plotStreams:
+        i.update()
+
 #######################################################################
 
 class rdesigneur:
@@ -77,6 +91,12 @@ class rdesigneur:
         diffusionLength: default 2e-6
         adaptCa: [( Ca_wildcard_string, chem_wildcard_string, offset, scale ),...]
         adaptChem: [( Chem_wildcard_string, elec_wildcard_string, offset, scale ),...]
+        cache: None/True/directory        for an on-disk cache of the
+            prototypes in /library. True uses $MOOSE_RDESIGNEUR_CACHE or
+            ~/.cache/moose/rdesigneur. The cache is keyed by the proto
+            specs, the files they name, the modules of the functions they
+            name, and the moose version. Helper functions in other modules
+            are not tracked, so clear the cache after changing them.
 
     I need to put the extra channels now into the NeuroML definition.
     """
@@ -115,7 +135,8 @@ class rdesigneur:
             plotList = [],  # elecpath, geom_expr, object, field, title ['wave' [min max]]
             moogList = [], 
             ode_method = "gsl",  # gsl, lsoda, gssa, gillespie
-            params = None
+            params = None,
+            cache = None    # True or a directory to cache the prototypes in
         ):
         """ Constructor of the rdesigner. This just sets up internal fields
             for the model building, it doesn't actually create any objects.
@@ -171,6 +192,7 @@ class rdesigneur:
         self.plotNames = []
         self.wavePlotNames = []
         self.saveNames = []
+        self.plotStreams = []
         self.moogNames = []
         self.cellPortionElist = []
         self.spineComptElist = []
@@ -179,14 +201,25 @@ class rdesigneur:
 
         if not moose.exists( '/library' ):
             library = moose.Neutral( '/library' )
-        try:
-            self.buildCellProto()
-            self.buildChanProto()
-            self.buildSpineProto()
-            self.buildChemProto()
-        except BuildError as msg:
-            print("Error: rdesigneur: Prototype build failed:", msg)
-            quit()
+        t0 = time.time()
+        cacheFile = self._protoCacheFile( cache )
+        if cacheFile and os.path.isfile( cacheFile ) and \
+                self._loadProtosFromCache( cacheFile ):
+            status = 'loaded from cache'
+        else:
+            try:
+                self.buildCellProto()
+                self.buildChanProto()
+                self.buildSpineProto()
+                self.buildChemProto()
+            except BuildError as msg:
+                print("Error: rdesigneur: Prototype build failed:", msg)
+                quit()
+            status = 'built'
+            if cacheFile and self._saveProtosToCache( cacheFile ):
+                status = 'built and cached'
+        if self.benchmark:
+            print( "- Prototypes %s in %.3f sec" % ( status, time.time() - t0 ) )
 
 
     ################################################################
@@ -278,11 +311,7 @@ class rdesigneur:
         # to be the function name.
         modPos = func.rfind( "." )
         if ( modPos != -1 ): # Function is in a file, load and check
-            resolvedPath = os.path.realpath( func[0:modPos] )
-            pathTokens = resolvedPath.split('/')
-            pathTokens = ['/'] + pathTokens
-            modulePath = os.path.realpath(os.path.join(*pathTokens[:-1]))
-            moduleName = pathTokens[-1]
+            moduleName, modulePath = self._protoFuncModule( func )
             funcName = func[modPos+1:bracePos]
             moduleFile, pathName, description = imp.find_module(moduleName, [modulePath])
             try:
@@ -299,6 +328,14 @@ class rdesigneur:
         globals().get( func[0:bracePos] )( protoName )
         return True
 
+    # Name and directory of the module of a 'path/module.func()' proto.
+    def _protoFuncModule( self, func ):
+        resolvedPath = os.path.realpath( func[0:func.rfind( "." )] )
+        pathTokens = resolvedPath.split('/')
+        pathTokens = ['/'] + pathTokens
+        modulePath = os.path.realpath(os.path.join(*pathTokens[:-1]))
+        return pathTokens[-1], modulePath
+
     # Class or file options. True if extension is found in
     def isKnownClassOrFile( self, name, suffices ):
         for i in suffices:
@@ -359,6 +396,105 @@ class rdesigneur:
                 "' not known." )
         return True
 
+    ################################################################
+    # Cache of the prototypes. The /library built from a given set of
+    # proto specs is saved with hdfutil.savetree and loaded back in
+    # place of the build when the specs, and everything they refer to,
+    # are unchanged.
+    ################################################################
+    def _protoCacheKey( self ):
+        h = hashlib.sha1()
+        specs = [ self.cellProtoList, self.chanProtoList,
+            self.spineProtoList, self.chemProtoList, self.temperature,
+            moose.__version__ ]
+        h.update( repr( specs ).encode( 'utf-8' ) )
+        for i in self.cellProtoList + self.chanProtoList + \
+                self.spineProtoList + self.chemProtoList:
+            for arg in i:
+                if not isinstance( arg, str ):
+                    continue
+                # Function protos: hash the source of the module that
+                # buildProtoFromFunction loads, or that defines the
+                # global function, so that the helpers it calls in the
+                # same module are covered. Helpers in other modules are
+                # not: clear the cache after changing them.
+                bracePos = arg.find( '()' )
+                if bracePos != -1:
+                    if arg.rfind( '.' ) != -1:
+                        moduleName, modulePath = self._protoFuncModule( arg )
+                        try:
+                            moduleFile, arg, description = imp.find_module(
+                                    moduleName, [modulePath] )
+                        except ImportError:
+                            continue
+                        if moduleFile:
+                            moduleFile.close()
+                    elif arg[:bracePos] in globals():
+                        module = inspect.getmodule( globals()[ arg[:bracePos] ] )
+                        src = inspect.getsource( module )
+                        h.update( src.encode( 'utf-8' ) )
+                        continue
+                if os.path.isfile( arg ):
+                    with open( arg, 'rb' ) as f:
+                        h.update( f.read() )
+        return h.hexdigest()
+
+    def _protoCacheFile( self, cache ):
+        if not cache:
+            return None
+        # Protos already in the library are used as they are.
+        if len( moose.wildcardFind( '/library/#' ) ) > 0:
+            return None
+        if cache is True:
+            cache = os.environ.get( 'MOOSE_RDESIGNEUR_CACHE',
+                os.path.join( os.path.expanduser( '~' ), '.cache', 'moose',
+                'rdesigneur' ) )
+        return os.path.join( cache, self._protoCacheKey() + '.h5' )
+
+    def _protoCacheNames( self ):
+        if len( self.cellProtoList ) == 0:
+            cellName = 'cell'
+        else:
+            cellName = self.cellProtoList[-1][1]
+        chemName = self.chemProtoList[-1][1] if self.chemProtoList else None
+        return cellName, chemName
+
+    def _loadProtosFromCache( self, fname ):
+        try:
+            import moose.hdfutil as hdfutil
+            with hdfutil.h5.File( fname, 'r' ) as f:
+                hdfutil.loadtree( f, '/library', reinit = False, clock = False )
+        except Exception as e:
+            print( "Warning: rdesigneur: could not load prototype cache "
+                    "'{}': {}".format( fname, e ) )
+            for i in moose.wildcardFind( '/library/#' ):
+                moose.delete( i )
+            return False
+        cellName, chemName = self._protoCacheNames()
+        self.elecid = moose.element( '/library/' + cellName )
+        self.elecid.buildSegmentTree()
+        if chemName:
+            self.chemid = moose.element( '/library/' + chemName )
+        return True
+
+    def _saveProtosToCache( self, fname ):
+        try:
+            import moose.hdfutil as hdfutil
+            d = os.path.dirname( fname )
+            if d and not os.path.isdir( d ):
+                os.makedirs( d )
+            # Written under another name and moved, so that runs sharing
+            # the cache never see a partial file.
+            tmp = '{}.{}.tmp'.format( fname, os.getpid() )
+            with hdfutil.h5.File( tmp, 'w' ) as f:
+                hdfutil.savetree( moose.element( '/library' ), f )
+            os.rename( tmp, fname )
+        except Exception as e:
+            print( "Warning: rdesigneur: could not save prototype cache "
+                    "'{}': {}".format( fname, e ) )
+            return False
+        return True
+
     ################################################################
     # Here are the functions to build the type-specific prototypes.
     ################################################################
@@ -711,6 +847,7 @@ class rdesigneur:
         graphs = moose.Neutral( self.modelPath + '/graphs' )
         dummy = moose.element( '/' )
         k = 0
+        streamDt = 0.0
         for i in self.plotList:
             pair = i.elecpath + ' ' + i.geom_expr
             dendCompts = self.elecid.compartmentsFromExpression[ pair ]
@@ -729,8 +866,12 @@ class rdesigneur:
                     self.wavePlotNames.append( [ tabname, i.title, k, scale, units, i ] )
                 else:
                     self.plotNames.append( [ tabname, i.title, k, scale, units, i.field, i.ymin, i.ymax ] )
-                if len( i.saveFile ) > 4 and i.saveFile[-4] == '.xml' or i.saveFile:
+                if i.saveFile:
                     self.saveNames.append( [ tabname, len(self.saveNames), scale, units, i ] )
+                    if i.streamDt > 0.0:
+                        self.plotStreams.append( PlotStream( self, self.saveNames[-1] ) )
+                        if streamDt == 0.0 or i.streamDt < streamDt:
+                            streamDt = i.streamDt
 
                 k += 1
                 if i.field == 'n' or i.field == 'conc' or i.field == 'volume' or i.field == 'Gbar':
@@ -747,6 +888,16 @@ class rdesigneur:
                 moose.connect( vtabs[q], 'requestOut', p, plotField )
                 q += 1
 
+        if streamDt > 0.0:
+            plotStreams[:] = self.plotStreams
+            pr = moose.PyRun( self.modelPath + '/streamPlots' )
+            pr.runString = '''
+import rdesigneur
+rdesigneur.updatePlotStreams()
+'''
+            moose.setClock( 29, streamDt )
+            moose.useClock( 29, pr.path, 'process' )
+
     def _buildMoogli( self ):
         knownFields = {
             'Vm':('CompartmentBase', 'getVm', 1000, 'Memb. Potential (mV)', -80.0, 40.0 ),
@@ -802,18 +953,19 @@ rdesigneur.rmoogli.updateMoogliViewer()
             plt.xlabel( "Time (s)" )
             plt.ylabel( i[4] )
             vtab = moose.vec( i[0] )
+            vecs = self._tableVectors( i[0] )
             if i[5] == 'spikeTime':
                 k = 0
                 tmax = moose.element( '/clock' ).currentTime
-                for j in vtab: # Plot a raster
-                    y = [k] * len( j.vector )
-                    plt.plot( j.vector * i[3], y, linestyle = 'None', marker = '.', markersize = 10 )
+                for j in vecs: # Plot a raster
+                    y = [k] * len( j )
+                    plt.plot( j * i[3], y, linestyle = 'None', marker = '.', markersize = 10 )
                     plt.xlim( 0, tmax )
                 
             else:
-                t = np.arange( 0, vtab[0].vector.size, 1 ) * vtab[0].dt
-                for j in vtab:
-                    plt.plot( t, j.vector * i[3] )
+                t = np.arange( 0, vecs[0].size, 1 ) * vtab[0].dt
+                for j in vecs:
+                    plt.plot( t, j * i[3] )
         if len( self.moogList ) or len( self.wavePlotNames ) > 0:
             plt.ion()
         # Here we build the plots and lines for the waveplots
@@ -825,6 +977,13 @@ rdesigneur.rmoogli.updateMoogliViewer()
         self._save()                                            
         
 
+    def _tableVectors( self, tabname ):
+        # Streamed tables are emptied as they go, their data is in the file.
+        for i in self.plotStreams:
+            if i.plotData[0] == tabname:
+                return i.vectors()
+        return [ v.vector for v in moose.vec( tabname ) ]
+
     def initWavePlots( self, startIndex ):
         self.frameDt = moose.element( '/clock' ).currentTime/self.numWaveFrames
         for wpn in range( len(self.wavePlotNames) ):
@@ -833,10 +992,13 @@ rdesigneur.rmoogli.updateMoogliViewer()
             if len( vtab ) < 2:
                 print( "Warning: Waveplot {} abandoned, only {} points".format( i[1], len( vtab ) ) )
                 continue
-            dFrame = len( vtab[0].vector ) // self.numWaveFrames
+            # One read per table, then every dFrame'th sample of all of
+            # them: rows of vpts are frames, columns are voxels.
+            data = np.array( self._tableVectors( i[0] ) )
+            dFrame = data.shape[1] // self.numWaveFrames
             if dFrame < 1:
                 dFrame = 1
-            vpts = np.array( [ [k.vector[j] for j in range( 0, len( k.vector ), dFrame ) ] for k in vtab] ).T * i[3]
+            vpts = data[:, ::dFrame].T * i[3]
             fig = plt.figure( i[2] + startIndex )
             ax = fig.add_subplot( 111 )
             plt.title( i[1] )
@@ -854,38 +1016,65 @@ rdesigneur.rmoogli.updateMoogliViewer()
             ax.set_ylim( mn, mx )
             line, = plt.plot( range( len( vtab ) ), vpts[0] )
             timeLabel = plt.text( len(vtab ) * 0.05, mn + 0.9*(mx-mn), 'time = 0' )
-            self.wavePlotNames[wpn].append( [fig, line, vpts, timeLabel] )
+            # The line and label change every frame, so they are drawn on
+            # their own over a saved copy of the rest of the axes.
+            line.set_animated( True )
+            timeLabel.set_animated( True )
             fig.canvas.draw()
+            background = None
+            if getattr( fig.canvas, 'supports_blit', False ):
+                background = fig.canvas.copy_from_bbox( ax.bbox )
+            self.wavePlotNames[wpn].append( [fig, line, vpts, timeLabel, ax, background] )
 
     def displayWavePlots( self ):
         for f in range( self.numWaveFrames ):
             for i in self.wavePlotNames:
-                wp = i[6]
-                if len( wp[2] ) > f:
-                    wp[1].set_ydata( wp[2][f] )
-                    wp[3].set_text( "time = {:.1f}".format(f*self.frameDt) )
-                    wp[0].canvas.draw()
+                if len( i ) < 7:
+                    continue
+                fig, line, vpts, timeLabel, ax, background = i[6]
+                if len( vpts ) > f:
+                    line.set_ydata( vpts[f] )
+                    timeLabel.set_text( "time = {:.1f}".format(f*self.frameDt) )
+                    if background is None:
+                        line.set_animated( False )
+                        timeLabel.set_animated( False )
+                        fig.canvas.draw()
+                    else:
+                        fig.canvas.restore_region( background )
+                        ax.draw_artist( line )
+                        ax.draw_artist( timeLabel )
+                        fig.canvas.blit( ax.bbox )
+                    fig.canvas.flush_events()
             #plt.pause(0.001)
+        # Leave the last frame on the figures.
+        for i in self.wavePlotNames:
+            if len( i ) >= 7:
+                i[6][1].set_animated( False )
+                i[6][3].set_animated( False )
+                i[6][0].canvas.draw_idle()
         
         #This calls the _save function which saves only if the filenames have been specified
 
     ################################################################
     # Here we get the time-series data and write to various formats
     ################################################################
-    #[TO DO] Add NSDF output function
     '''
     The original author of the functions -- [_savePlots(), _writeXML(), _writeCSV(), _save()] is
     Sarthak Sharma.
     Email address: sarthaks442@gmail.com
     Heavily modified by U.S. Bhalla
     '''
+    def _saveFileName( self, plotData ):
+        base, ext = os.path.splitext( plotData[4].saveFile )
+        return base + str( plotData[1] ) + ext
+
     def _writeXML( self, plotData, time, vtab ): 
         tabname = plotData[0]
         idx = plotData[1]
         scale = plotData[2]
         units = plotData[3]
         rp = plotData[4]
-        filename = rp.saveFile[:-4] + str(idx) + '.xml'
+        filename = self._saveFileName( plotData )
         root = etree.Element("TimeSeriesPlot")
         parameters = etree.SubElement( root, "parameters" )
         if self.params == None:
@@ -908,33 +1097,52 @@ rdesigneur.rmoogli.updateMoogliViewer()
         for t, v in zip( time, vtab ):
             p.append( etree.SubElement( title, "data"))
             p[-1].set( 'path', v.path )
-            p[-1].text = ''.join( str(round(y,res)) + ' ' for y in v.vector )
+            y = np.round( v.vector, res ).tolist()
+            p[-1].text = ' '.join( map( str, y ) ) + ' ' if y else ''
         tree = etree.ElementTree(root)
         tree.write(filename)
 
     def _writeCSV( self, plotData, time, vtab ): 
-        tabname = plotData[0]
-        idx = plotData[1]
-        scale = plotData[2]
-        units = plotData[3]
-        rp = plotData[4]
-        filename = rp.saveFile[:-4] + str(idx) + '.csv'
+        filename = self._saveFileName( plotData )
 
         header = ["time",]
         valMatrix = [time,]
         header.extend( [ v.path for v in vtab ] )
         valMatrix.extend( [ v.vector for v in vtab ] )
         nv = np.array( valMatrix ).T
-        with open(filename, 'wb') as f:
+        with open(filename, 'w') as f:
             writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
             writer.writerow(header)
-            for row in nv:
-                writer.writerow(row)
+            writer.writerows(nv)
+
+    def _writeNPZ( self, plotData, time, vtab ):
+        ''' Writes all tables of a plot with a single np.savez. Spike
+        times are ragged, so they are catenated and indexed by rowStart.
+        '''
+        rp = plotData[4]
+        vecs = [ v.vector for v in vtab ]
+        meta = dict( title = rp.title, field = rp.field, scale = plotData[2],
+            units = plotData[3], dt = vtab[0].dt,
+            paths = np.array( [ v.path for v in vtab ] ),
+            params = json.dumps( self.params, default = str ) )
+        if rp.field == 'spikeTime':
+            rowStart = np.cumsum( [0] + [ len( v ) for v in vecs ] )
+            np.savez( self._saveFileName( plotData ), rowStart = rowStart,
+                data = np.concatenate( vecs ), **meta )
+        else:
+            np.savez( self._saveFileName( plotData ), time = time,
+                data = np.array( vecs ), **meta )
+
+    def _writeHDF5( self, plotData, time, vtab ):
+        stream = PlotStream( self, plotData, clearTables = False )
+        stream.update()
+        stream.close()
 
     ##########****SAVING*****###############
 
 
     def _save( self ):
+        streams = dict( ( i.plotData[1], i ) for i in self.plotStreams )
         for i in self.saveNames:
             tabname = i[0]
             idx = i[1]
@@ -942,15 +1150,23 @@ rdesigneur.rmoogli.updateMoogliViewer()
             units = i[3]
             rp = i[4] # The rplot data structure, it has the setup info.
 
+            if idx in streams:  # Just append what is not yet written.
+                streams[idx].update()
+                streams[idx].close()
+                continue
             vtab = moose.vec( tabname )
             t = np.arange( 0, vtab[0].vector.size, 1 ) * vtab[0].dt
-            ftype = rp.filename[-4:]
+            ftype = os.path.splitext( rp.saveFile )[1]
             if ftype == '.xml':
                 self._writeXML( i, t, vtab )
             elif ftype == '.csv':
                 self._writeCSV( i, t, vtab )
+            elif ftype == '.npz':
+                self._writeNPZ( i, t, vtab )
+            elif ftype in hdf5FileTypes:
+                self._writeHDF5( i, t, vtab )
             else:
-                print("Save format '{}' not known, please use .csv or .xml".format( ftype ) )
+                print("Save format '{}' not known, please use one of {}".format( ftype, ', '.join( saveFileTypes ) ) )
 
     ################################################################
     # Here we set up the stims
@@ -1524,6 +1740,103 @@ rdesigneur.rmoogli.updateMoogliViewer()
 # Some helper classes, used to define argument lists.
 #######################################################################
 
+class PlotStream:
+    ''' Writes the tables of one saved plot to an HDF5 file, following the
+    NSDF layout: the samples of all sources go into one dataset
+    /data/uniform/<plot>/<field> with the time base, scale and units as
+    attributes, and the source paths into /map/uniform/<plot>. Spike times
+    go into one dataset per source under /data/event/<plot>/<field>.
+    Every update() appends the samples recorded since the last one, so the
+    file can be written incrementally during the run. With clearTables,
+    the tables are emptied once their samples are in the file, so that
+    each update only reads the new samples and the tables stay small over
+    a long run; vectors() then gives the data back from the file.
+    '''
+    def __init__( self, rdes, plotData, clearTables = True ):
+        self.rdes = rdes
+        self.plotData = plotData
+        self.clearTables = clearTables
+        self.file = None
+        self.time = None    # Simulation time of the last update.
+
+    def _open( self, vtab ):
+        import h5py
+        tabname, idx, scale, units, rp = self.plotData
+        name = tabname.split( '/' )[-1]
+        self.isEvent = ( rp.field == 'spikeTime' )
+        kind = 'event' if self.isEvent else 'uniform'
+        path = 'data/{}/{}/{}'.format( kind, name, rp.field )
+        fname = self.rdes._saveFileName( self.plotData )
+        if self.time is not None:   # Carry on with a closed file.
+            self.file = h5py.File( fname, 'a' )
+            self.data = self.file[path]
+            if self.isEvent:
+                self.events = [ self.data[str( i )] for i in range( len( vtab ) ) ]
+            return
+        self.file = h5py.File( fname, 'w' )
+        params = self.file.create_group( 'model/parameters' )
+        for pkey, pvalue in ( self.rdes.params or {} ).items():
+            params.attrs[ str( pkey ) ] = str( pvalue )
+        self.file.create_dataset( 'map/{}/{}'.format( kind, name ),
+                data = np.array( [ v.path for v in vtab ] ).astype( 'S' ) )
+        if self.isEvent:
+            self.data = self.file.create_group( path )
+            self.events = [ self.data.create_dataset( str( i ), shape = (0,),
+                maxshape = (None,), dtype = 'f8' ) for i in range( len( vtab ) ) ]
+        else:
+            self.data = self.file.create_dataset( path, shape = (len( vtab ), 0),
+                maxshape = (len( vtab ), None), dtype = 'f8', chunks = True )
+        attrs = self.data.attrs
+        attrs['title'] = rp.title
+        attrs['field'] = rp.field
+        attrs['unit'] = units
+        attrs['scale'] = scale
+        attrs['tstart'] = 0.0
+        attrs['dt'] = vtab[0].dt
+
+    def update( self ):
+        vtab = moose.vec( self.plotData[0] )
+        t = moose.element( '/clock' ).currentTime
+        if self.time is not None and t < self.time:
+            self.close()    # Tables were reinited, start afresh.
+            self.time = None
+        if self.file is None:
+            self._open( vtab )
+        self.time = t
+        vecs = [ v.vector for v in vtab ]
+        if self.isEvent:
+            for v, ds in zip( vecs, self.events ):
+                n0 = 0 if self.clearTables else len( ds )
+                if len( v ) > n0:
+                    n = len( ds )
+                    ds.resize( ( n + len( v ) - n0, ) )
+                    ds[n:] = v[n0:]
+        else:
+            # The tables of a plot are all on the same clock, so they
+            # have the same number of samples.
+            n0 = 0 if self.clearTables else self.data.shape[1]
+            n1 = min( len( v ) for v in vecs )
+            if n1 > n0:
+                n = self.data.shape[1]
+                self.data.resize( n + n1 - n0, axis = 1 )
+                self.data[:, n:] = np.array( [ v[n0:n1] for v in vecs ] )
+        if self.clearTables:
+            for v in vtab:
+                v.clearVec()
+        self.file.flush()
+
+    def vectors( self ):
+        ''' The samples of each table written so far, as from its vector. '''
+        self.update()
+        if self.isEvent:
+            return [ ds[:] for ds in self.events ]
+        return list( self.data[:] )
+
+    def close( self ):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
 class baseplot:
     def __init__( self,
             elecpath='soma', geom_expr='1', relpath='.', field='Vm' ):
@@ -1538,7 +1851,7 @@ class rplot( baseplot ):
         title = 'Membrane potential', 
         mode = 'time', 
         ymin = 0.0, ymax = 0.0, 
-        saveFile = "", saveResolution = 3, show = True ):
+        saveFile = "", saveResolution = 3, show = True, streamDt = 0.0 ):
         baseplot.__init__( self, elecpath, geom_expr, relpath, field )
         self.title = title
         self.mode = mode # Options: time, wave, wave_still, raster
@@ -1547,11 +1860,21 @@ class rplot( baseplot ):
         if len( saveFile ) < 5:
             self.saveFile = ""
         else:
-            f = saveFile.split('.')
-            if len(f) < 2 or ( f[-1] != 'xml' and f[-1] != 'csv' ):
-                raise BuildError( "rplot: Filetype is '{}', must be of type .xml or .csv.".format( f[-1] ) )
+            f = os.path.splitext( saveFile )[1]
+            if not f in saveFileTypes:
+                raise BuildError( "rplot: Filetype is '{}', must be one of {}.".format( f, ', '.join( saveFileTypes ) ) )
+            if f in hdf5FileTypes:
+                try:
+                    import h5py
+                except ImportError:
+                    raise BuildError( "rplot: Saving to '{}' needs h5py.".format( f ) )
+            if streamDt > 0.0 and not f in hdf5FileTypes:
+                raise BuildError( "rplot: Only {} files can be streamed.".format( ', '.join( hdf5FileTypes ) ) )
         self.saveFile = saveFile
         self.show = show
+        # Interval at which samples are appended to saveFile during the
+        # run. If 0 the file is written when the plots are displayed.
+        self.streamDt = streamDt
 
     def printme( self ):
         print( "{}, {}, {}, {}, {}, {}, {}, {}, {}, {}".format( 
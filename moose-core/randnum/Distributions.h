@@ -28,6 +28,9 @@ namespace moose {
     template<typename T=double>
         using MOOSE_NORMAL_DISTRIBUTION = moose::normal_distribution<T>;
 
+    template<typename T=unsigned long>
+        using MOOSE_POISSON_DISTRIBUTION = std::poisson_distribution<T>;
+
 }
 
 
@@ -71,5 +71,18 @@ double RNG::uniform( void )
     return dist_( rng_ );
 }
 
+/**
+ * @brief Return a Poisson distributed random number with the given mean.
+ *
+ * @param mean Mean, which must be positive.
+ *
+ * @return random number.
+ */
+unsigned long RNG::poisson( const double mean )
+{
+    MOOSE_POISSON_DISTRIBUTION<unsigned long> dist( mean );
+    return dist( rng_ );
+}
+
 }
 
@@ -55,6 +55,8 @@ class RNG
 
         double uniform( void );
 
+        unsigned long poisson( const double mean );
+
 
     private:
         /* ====================  DATA MEMBERS  ======================================= */
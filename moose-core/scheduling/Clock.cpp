@@ -32,9 +32,9 @@
  * 1. Assign times to each Tick. This is divided by dt_ and the rounded
  *         value is used for the integral multiple. Zero means the tick is not
  *         scheduled.
- * 2. The process call goes through all active ticks in order every
- *         timestep. Each Tick increments its counter and decides if it is
- *         time to fire.
+ * 2. The process call keeps the step at which each active tick is next
+ *         due, and jumps from one due step to the next. At each of them the
+ *         due ticks fire in order.
  * 4. The Reinit call goes through all active ticks in order, just once.
  * 5. We connect up the Ticks to their target objects.
  * 6. We begin the simulation by calling 'start' or 'step' on the Clock.
@@ -52,10 +52,6 @@
 #include "../utility/print_function.hpp"
 #include "Clock.h"
 
-#if PARALLELIZE_CLOCK_USING_CPP11_ASYNC
-#include <future>
-#endif
-
 // Declaration of some static variables.
 const unsigned int Clock::numTicks = 32;
 /// minimumDt is smaller than any known event on the scales MOOSE handles.
@@ -166,7 +162,8 @@ const Cinfo* Clock::initCinfo()
     static ReadOnlyValueFinfo< Clock, unsigned int > stride(
         "stride",
         "Number by which the simulation advances the current step on each cycle. "
-        "stride = smallest active timestep/smallest defined timestep.",
+        "stride = highest common factor of the active timesteps, in units of "
+        "the smallest defined timestep.",
         &Clock::getStride
     );
     static ReadOnlyValueFinfo< Clock, unsigned long > currentStep(
@@ -673,11 +670,23 @@ void Clock::innerReportClock() const
 // Core scheduling functions.
 /////////////////////////////////////////////////////////////////////
 
+/// Highest common factor of a and b.
+static unsigned int hcf( unsigned int a, unsigned int b )
+{
+    while ( b != 0 )
+    {
+        unsigned int t = a % b;
+        a = b;
+        b = t;
+    }
+    return a;
+}
+
 void Clock::buildTicks( const Eref& e )
 {
     activeTicks_.resize(0);
     activeTicksMap_.resize(0);
-    stride_ = ~0U;
+    stride_ = 0;
     for ( unsigned int i = 0; i < ticks_.size(); ++i )
     {
         if ( ticks_[i] > 0 &&
@@ -685,11 +694,12 @@ void Clock::buildTicks( const Eref& e )
         {
             activeTicks_.push_back( ticks_[i] );
             activeTicksMap_.push_back( i );
-            if ( ticks_[i] > 0 && stride_ > ticks_[i] )
-                stride_ = ticks_[i];
+            // Every tick is due on a multiple of the stride.
+            stride_ = hcf( ticks_[i], stride_ );
         }
     }
-    // Should really do the HCF of N numbers here to get the stride.
+    if ( stride_ == 0 )
+        stride_ = ~0U;
 }
 
 /**
@@ -720,80 +730,57 @@ void Clock::handleStep( const Eref& e, unsigned long numSteps )
     char now[80];
 
     buildTicks( e );
-    assert( currentStep_ == nSteps_ );
     assert( activeTicks_.size() == activeTicksMap_.size() );
-    nSteps_ += numSteps;
+    // currentStep_ is behind nSteps_ if the last run was stopped. Run for
+    // numSteps from where it stopped.
+    nSteps_ = currentStep_ + numSteps;
     runTime_ = nSteps_ * dt_;
-    for ( isRunning_ = (activeTicks_.size() > 0 );
-            isRunning_ && currentStep_ < nSteps_; currentStep_ += stride_ )
-    {
-        // Curr time is end of current step.
-        unsigned long endStep = currentStep_ + stride_;
-        currentTime_ = info_.currTime = dt_ * endStep;
-
-#if 0
 
-//#if PARALLELIZE_CLOCK_USING_CPP11_ASYNC
+    // Step at which each active tick is next due. Only the steps at which
+    // some tick is due are visited.
+    nextStep_.resize( activeTicks_.size() );
+    for ( unsigned int i = 0; i < activeTicks_.size(); ++i )
+        nextStep_[i] = ( currentStep_ / activeTicks_[i] + 1 ) * activeTicks_[i];
 
-        // NOTE: It does not produce very promising results. The challenge here
-        // is doing load-balancing.
-        // TODO: To start with, we can put one solver on one thread and everything
-        // else onto 1 thread. Each Hsove, Ksolve, and Gsolve can take its own
-        // thread and rest are on different threads.
+    // Progress is reported when the run crosses each 10%.
+    unsigned long lastDecile = nSteps_ > 0 ? 10 * currentStep_ / nSteps_ : 10;
 
-        unsigned int nTasks = activeTicks_.size( );
-        unsigned int numThreads_ = 3;
-        unsigned int blockSize = 1 + (nTasks / numThreads_);
-
-        for( unsigned int i = 0; i < numThreads_; ++i  )
+    for ( isRunning_ = (activeTicks_.size() > 0 );
+            isRunning_ && currentStep_ < nSteps_; )
+    {
+        // Curr time is end of current step.
+        unsigned long endStep = *min_element( nextStep_.begin(), nextStep_.end() );
+        if ( endStep > nSteps_ )
         {
-            std::async( std::launch::async, [this,blockSize,i,nTasks,endStep,e]
-            {
-                unsigned int mapI = i * blockSize;
-                // Get the block we want to run in paralle.
-                for( unsigned int ii = i * blockSize; ii < min((i+1) * blockSize, nTasks); ii++ )
-                {
-                    unsigned int j = activeTicks_[ ii ];
-                    if( endStep % j == 0  )
-                    {
-                        info_.dt = j * dt_;
-                        processVec( )[ activeTicksMap_[mapI] ]->send( e, &info_ );
-                    }
-                    mapI++;
-                }
-            }
-          );
+            // Nothing is due before the end of this run.
+            currentStep_ = nSteps_;
+            currentTime_ = info_.currTime = dt_ * nSteps_;
+            break;
         }
-#else
-        vector< unsigned int >::const_iterator k = activeTicksMap_.begin();
-        for ( vector< unsigned int>::iterator j =
-                    activeTicks_.begin(); j != activeTicks_.end(); ++j )
+        currentTime_ = info_.currTime = dt_ * endStep;
+
+        for ( unsigned int i = 0; i < activeTicks_.size(); ++i )
         {
-            if ( endStep % *j == 0 )
+            if ( nextStep_[i] == endStep )
             {
-                info_.dt = *j * dt_;
-                processVec()[*k]->send( e, &info_ );
+                info_.dt = activeTicks_[i] * dt_;
+                processVec()[ activeTicksMap_[i] ]->send( e, &info_ );
+                nextStep_[i] += activeTicks_[i];
             }
-            ++k;
         }
-#endif
+        currentStep_ = endStep;
 
         // When 10% of simulation is over, notify user when notify_ is set to
         // true.
-        if( notify_ )
+        if( notify_ && 10 * currentStep_ / nSteps_ > lastDecile )
         {
-            if( fmod(100 * currentTime_ / runTime_, 10.0) == 0.0 )
-            {
-                time( &rawtime );
-                timeinfo = localtime( &rawtime );
-                strftime(now, 80, "%c", timeinfo);
-                cout << "@ " << now << ": " << 100 * currentTime_ / runTime_
-                     << "% of total " << runTime_ << " seconds is over." << endl;
-            }
+            lastDecile = 10 * currentStep_ / nSteps_;
+            time( &rawtime );
+            timeinfo = localtime( &rawtime );
+            strftime(now, 80, "%c", timeinfo);
+            cout << "@ " << now << ": " << 10 * lastDecile
+                 << "% of total " << runTime_ << " seconds is over." << endl;
         }
-
-        if ( activeTicks_.size() == 0 )
-            currentTime_ = runTime_;
     }
 
     info_.dt = dt_;
@@ -162,6 +162,12 @@ class Clock
      */
     vector< unsigned int > activeTicksMap_;
 
+    /**
+     * Step at which each of the activeTicks_ is next due. The run jumps
+     * from one due step to the next, skipping steps where no tick fires.
+     */
+    vector< unsigned long > nextStep_;
+
     /**
      * This is the database of default scheduling. Assigns
      * classes to ticks. Filled in at Clock creation time.
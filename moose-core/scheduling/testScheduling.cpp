@@ -159,6 +159,7 @@ void testClock()
 	assert( cdata->activeTicks_[3] == 1 );
 	assert( cdata->activeTicks_[4] == 3 );
 	assert( cdata->activeTicks_[5] == 5 );
+	assert( cdata->stride_ == 1 );
 	cdata->handleStart( clocker, runtime, false );
 	assert( doubleEq( cdata->getCurrentTime(), runtime ) );
 	test.destroy();
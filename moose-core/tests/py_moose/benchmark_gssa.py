@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# benchmark_gssa.py ---
+# Event throughput of the Gsolve with the linear scan of propensities and
+# with the tree of partial sums (Gsolve.useSumTree), on rings of reversible
+# reactions of growing size and on kkit models.
+#
+#   python benchmark_gssa.py [runtime]
+
+from __future__ import print_function
+import os
+import sys
+import time
+import moose
+from test_gsolve_sumtree import make_ring
+
+sdir_ = os.path.dirname(os.path.realpath(__file__))
+examples_ = os.path.join(sdir_, '..', '..', '..', 'moose-examples')
+
+kkitModels = [
+    os.path.join(examples_, 'genesis', 'acc35.g'),
+    os.path.join(examples_, 'genesis', 'EGFR_MAPK_58.g'),
+    os.path.join(examples_, 'paper-2015', 'Fig4_ReacDiff', 'CaMKII_merged77.g'),
+    ]
+
+def build_ring(npools):
+    moose.Neutral('/model')
+    gsolve, pools = make_ring('/model/ring', npools, 100 * npools)
+    return gsolve
+
+def build_kkit(fname):
+    moose.loadModel(fname, '/model', 'gssa')
+    return moose.wildcardFind('/model/##[ISA=Gsolve]')[0]
+
+def run(build, arg, useSumTree, runtime):
+    moose.seed(1)
+    gsolve = build(arg)
+    gsolve.useSumTree = useSumTree
+    moose.reinit()
+    t0 = time.time()
+    moose.start(runtime)
+    t = time.time() - t0
+    events = sum(sum(gsolve.numFire[i]) for i in range(gsolve.numAllVoxels))
+    nrates = len(gsolve.numFire[0])
+    moose.delete('/model')
+    return nrates, events, t
+
+def main(runtime=10.0):
+    cases = [('ring %d' % n, build_ring, n) for n in (10, 100, 500, 2000)]
+    cases += [(os.path.basename(f), build_kkit, f) for f in kkitModels
+              if os.path.exists(f)]
+    print('%-22s %6s %14s %14s %8s' % ('model', 'rates', 'linear ev/s',
+        'tree ev/s', 'speedup'))
+    for name, build, arg in cases:
+        res = [run(build, arg, useSumTree, runtime) for useSumTree in (False, True)]
+        rate = [events / t if t > 0 else 0.0 for nrates, events, t in res]
+        print('%-22s %6d %14.0f %14.0f %8.2f' % (name, res[0][0], rate[0],
+            rate[1], rate[1] / rate[0] if rate[0] > 0 else 0.0))
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 10.0)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# benchmark_import.py ---
+# Startup time of `import moose`, over that of a bare interpreter, and over
+# that of `import numpy`, which moose needs in any case. Best of a few runs,
+# each in a fresh interpreter.
+#
+#   python benchmark_import.py [runs]
+
+from __future__ import print_function
+import os
+import sys
+import time
+import subprocess
+import moose
+
+def import_time(stmt, runs):
+    # Import the same moose as this process does.
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(os.path.dirname(
+        moose.__file__)), env.get('PYTHONPATH', '')])
+    best = float('inf')
+    for i in range(runs):
+        t0 = time.time()
+        subprocess.check_call([sys.executable, '-c', stmt], env=env)
+        best = min(best, time.time() - t0)
+    return best
+
+def main(runs=5):
+    bare = import_time('pass', runs)
+    numpy = import_time('import numpy', runs) - bare
+    t = import_time('import moose', runs) - bare
+    print('%-14s %10s' % ('import', 'time (s)'))
+    print('%-14s %10.4f' % ('numpy', numpy))
+    print('%-14s %10.4f' % ('moose', t))
+    return t, numpy
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
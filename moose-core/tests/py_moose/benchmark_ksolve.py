@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# benchmark_ksolve.py ---
+# Time spent by the Ksolve computing reaction velocities from the flat
+# rate terms (Ksolve.useFlatRates) and through a virtual call per
+# reaction, on kkit models. The solver steps are those of a real run, so
+# the difference is in the right hand side evaluations.
+#
+#   python benchmark_ksolve.py [runtime]
+
+from __future__ import print_function
+import os
+import sys
+import time
+import moose
+
+sdir_ = os.path.dirname(os.path.realpath(__file__))
+examples_ = os.path.join(sdir_, '..', '..', '..', 'moose-examples')
+
+kkitModels = [
+    os.path.join(examples_, 'genesis', 'acc35.g'),
+    os.path.join(examples_, 'genesis', 'EGFR_MAPK_58.g'),
+    os.path.join(examples_, 'paper-2015', 'Fig4_ReacDiff', 'CaMKII_merged77.g'),
+    ]
+
+def run(fname, useFlatRates, runtime):
+    moose.loadModel(fname, '/model', 'gsl')
+    ksolve = moose.wildcardFind('/model/##[ISA=Ksolve]')[0]
+    ksolve.useFlatRates = useFlatRates
+    moose.reinit()
+    t0 = time.time()
+    moose.start(runtime)
+    t = time.time() - t0
+    nrates = len(moose.wildcardFind('/model/##[ISA=ReacBase]')) + \
+        len(moose.wildcardFind('/model/##[ISA=EnzBase]'))
+    moose.delete('/model')
+    return nrates, t
+
+def main(runtime=1000.0):
+    print('%-34s %6s %10s %10s %8s' % ('model', 'reacs', 'virtual s',
+        'flat s', 'speedup'))
+    for fname in kkitModels:
+        if not os.path.exists(fname):
+            continue
+        res = [run(fname, useFlatRates, runtime) for useFlatRates in (False, True)]
+        print('%-34s %6d %10.3f %10.3f %8.2f' % (os.path.basename(fname),
+            res[0][0], res[0][1], res[1][1],
+            res[0][1] / res[1][1] if res[1][1] > 0 else 0.0))
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1000.0)
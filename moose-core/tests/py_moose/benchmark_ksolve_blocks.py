@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# benchmark_ksolve_blocks.py ---
+# Time for the Ksolve to integrate a dendrite of many voxels with a small
+# reaction network in each, voxel by voxel and in lock-step blocks of
+# voxels (Ksolve.voxelBlockSize).
+#
+#   python benchmark_ksolve_blocks.py [numVoxels [runtime]]
+
+from __future__ import print_function
+import sys
+import time
+import numpy as np
+import moose
+from test_ksolve_voxel_blocks import make_model
+
+def run(numVoxels, blockSize, runtime):
+    ksolve, pools = make_model('/model', blockSize, 1, numVoxels)
+    for i in range(10, 18):
+        moose.setClock(i, 0.1)
+    moose.reinit()
+    t0 = time.time()
+    moose.start(runtime)
+    t = time.time() - t0
+    n = np.array([p.vec.n for p in pools])
+    moose.delete('/model')
+    return n, t
+
+def main(numVoxels=10000, runtime=20.0):
+    print('%-10s %10s %8s %12s' % ('block', 'time s', 'speedup', 'max diff'))
+    ref, tref = run(numVoxels, 0, runtime)
+    print('%-10s %10.3f %8.2f %12.3g' % ('voxel', tref, 1.0, 0.0))
+    for blockSize in (16, 64, 256, 1024, numVoxels):
+        n, t = run(numVoxels, blockSize, runtime)
+        print('%-10d %10.3f %8.2f %12.3g' % (blockSize, t, tref / t,
+            np.abs(n - ref).max()))
+
+if __name__ == '__main__':
+    args = [float(x) for x in sys.argv[1:]]
+    main(*([int(args[0])] + args[1:]) if args else [])
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# benchmark_scheduler.py ---
+# Overhead of the Clock for the tick layouts set up by rdesigneur. Each tick
+# drives one empty Table, so the time measured is almost all scheduling.
+#
+#   python benchmark_scheduler.py [runtime]
+
+from __future__ import print_function
+import sys
+import time
+import moose
+
+# tick: dt, as in rdesigneur._configureClocks
+def rdesigneur_layout(elecDt=50e-6, elecPlotDt=0.1e-3, diffDt=0.01,
+        chemDt=0.1, funcDt=0.1e-3, chemPlotDt=1.0):
+    ticks = dict((i, elecDt) for i in range(0, 8))
+    ticks[8] = elecPlotDt
+    ticks[10] = diffDt
+    ticks.update((i, chemDt) for i in range(11, 18))
+    ticks[12] = funcDt
+    ticks[18] = chemPlotDt
+    return ticks
+
+layouts = [
+    ('multiscale', rdesigneur_layout()),
+    ('elec only', dict((i, 50e-6) for i in range(0, 9))),
+    # turnOffElec: the elec ticks are pushed out to 1e6 s.
+    ('chem only', rdesigneur_layout(elecDt=1e6, elecPlotDt=1e6, funcDt=0.1)),
+    ('coprime plots', { 0: 50e-6, 8: 0.3e-3, 9: 0.7e-3, 18: 1.1e-3 }),
+    ]
+
+def run(ticks, runtime):
+    moose.Neutral('/bench')
+    for tick, dt in ticks.items():
+        tab = moose.Table('/bench/t%d' % tick)
+        moose.setClock(tick, dt)
+        moose.useClock(tick, tab.path, 'process')
+    moose.reinit()
+    t0 = time.time()
+    moose.start(runtime)
+    t = time.time() - t0
+    clock = moose.element('/clock')
+    res = clock.currentStep, clock.stride, t
+    moose.delete('/bench')
+    return res
+
+def main(runtime=1.0):
+    print('%-14s %10s %8s %10s' % ('layout', 'steps', 'stride', 'time (s)'))
+    for name, ticks in layouts:
+        steps, stride, t = run(ticks, runtime)
+        print('%-14s %10d %8d %10.4f' % (name, steps, stride, t))
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# test_clock_stride.py ---
+# Ticks whose dts are not multiples of the smallest one must still fire on
+# time. The clock steps by the HCF of the active ticks.
+
+from __future__ import print_function
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+def active_hcf():
+    """HCF of the dts of all the ticks with targets, in seconds. Ticks
+    set up by other scripts in the same session count as well."""
+    clock = moose.element('/clock')
+    steps = [int(round(dt / clock.baseDt)) for i, dt in enumerate(clock.dts)
+             if dt > 0 and len(clock.neighbors['process%d' % i]) > 0]
+    return np.gcd.reduce(steps) * clock.baseDt
+
+def test_hcf_stride():
+    moose.Neutral('/s')
+    dts = {20: 2e-3, 21: 3e-3, 22: 7e-3}
+    tabs = {}
+    for tick, dt in dts.items():
+        tab = moose.Table('/s/t%d' % tick)
+        moose.connect(tab, 'requestOut', moose.element('/clock'),
+                'getCurrentTime')
+        moose.setClock(tick, dt)
+        moose.useClock(tick, tab.path, 'process')
+        tabs[tick] = tab
+    moose.reinit()
+    clock = moose.element('/clock')
+    # 1 ms if these are the only ticks in use.
+    assert np.isclose(clock.stride * clock.baseDt, active_hcf()), clock.stride
+    r = 1e-3 / (clock.stride * clock.baseDt)
+    assert np.isclose(r, round(r)), clock.stride
+
+    runtime = 0.5
+    moose.start(runtime / 2)
+    moose.start(runtime / 2)
+    assert np.isclose(clock.currentTime, runtime), clock.currentTime
+    for tick, dt in dts.items():
+        v = tabs[tick].vector
+        n = int(runtime / dt + 1e-9)
+        # Sample i is taken at the end of step i.
+        assert len(v) == n + 1, (tick, len(v), n)
+        assert np.allclose(v[1:], dt * np.arange(1, n + 1)), (tick, v)
+
+    # Ticks of 4 ms and 6 ms step by 2 ms, when on their own.
+    moose.delete(tabs[22])
+    moose.setClock(20, 4e-3)
+    moose.setClock(21, 6e-3)
+    moose.reinit()
+    assert np.isclose(clock.stride * clock.baseDt, active_hcf()), clock.stride
+    moose.start(0.1)
+    assert np.isclose(clock.currentTime, 0.1), clock.currentTime
+    assert len(tabs[20].vector) == 26, len(tabs[20].vector)
+    assert len(tabs[21].vector) == 17, len(tabs[21].vector)
+    moose.delete('/s')
+
+def main():
+    test_hcf_stride()
+
+if __name__ == '__main__':
+    main()
@@ -136,7 +136,8 @@ def test_diffusion_gsolve_dsolve():
     msg += 'a=%f b=%f, c=%f, d=%f' % (tuple(got))
     print(msg)
     print('Initial to final (b+c)=%f' % (float(btot2 + ctot2) / (btot + ctot )))
-    expected = np.array((1.00003087, 1.39036644, 0.92191184, 1.11427514))
+    # With moose.seed( 1 ), voxel i of the Gsolve is seeded with 1 + i.
+    expected = np.array((1.00001226, 1.39231407, 0.9215941, 1.11474443))
     error = got - expected
     rerror = np.abs( error ) / expected
     assert np.allclose(got, expected, atol=1e-3), "Got %s, expected %s" % (got, expected)
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import moose
 print( 'Using moose from %s. VERSION=%s' %  (moose.__file__, moose.__version__) )
+import os
+import tempfile
 import numpy as np
 import chan_proto
 import param_chan
@@ -203,7 +205,8 @@ def test_diffshell():
             for j, buf in enumerate(buftab[i]):
                 res[:, 4 + i * (difbuff_no + 1) + j + 1] = buf.vector
                 header += ' difshell_' + str(i) + '_difbuff_' + str(j)
-    np.savetxt(fname, res, header=header, comments='')
+    with tempfile.TemporaryDirectory() as d:
+        np.savetxt(os.path.join(d, fname), res, header=header, comments='')
 
 def main():
     test_diffshell()
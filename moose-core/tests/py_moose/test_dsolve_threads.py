@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# test_dsolve_threads.py ---
+# Diffusion of many species across two cylinders joined by a junction. The
+# Dsolve must give identical results with any number of threads.
+
+from __future__ import print_function
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+def build(nthreads, nspecies=12):
+    comps = []
+    for k, (x0, x1) in enumerate([(0, 20e-6), (20e-6, 40e-6)]):
+        c = moose.CylMesh('/model/c%d' % k)
+        c.r0 = c.r1 = 1e-6
+        c.x0, c.x1 = x0, x1
+        c.diffLength = 0.5e-6
+        pools = []
+        for s in range(nspecies):
+            p = moose.Pool('%s/p%d' % (c.path, s))
+            p.diffConst = 1e-12 * (s + 1)
+            pools.append(p)
+        r = moose.Reac(c.path + '/r')
+        r.Kf, r.Kb = 0.5, 0.1
+        moose.connect(r, 'sub', pools[0], 'reac')
+        moose.connect(r, 'prd', pools[1], 'reac')
+        ksolve = moose.Ksolve(c.path + '/ksolve')
+        dsolve = moose.Dsolve(c.path + '/dsolve')
+        dsolve.numThreads = nthreads
+        stoich = moose.Stoich(c.path + '/stoich')
+        stoich.compartment = c
+        stoich.ksolve = ksolve
+        stoich.dsolve = dsolve
+        stoich.path = c.path + '/##'
+        comps.append((dsolve, pools))
+    comps[0][0].buildMeshJunctions(comps[1][0])
+    for s, p in enumerate(comps[0][1]):
+        n = np.zeros(len(p.vec))
+        n[s] = 1000.0
+        p.vec.nInit = n
+    return comps
+
+def run(nthreads):
+    moose.Neutral('/model')
+    comps = build(nthreads)
+    moose.reinit()
+    moose.start(5)
+    assert comps[0][0].numThreads == nthreads
+    res = np.array([p.vec.n for dsolve, pools in comps for p in pools])
+    moose.delete('/model')
+    return res
+
+def test_dsolve_threads():
+    serial = run(1)
+    # Some of every species has crossed the junction.
+    assert (serial[12:].sum(axis=1) > 0).all(), serial[12:].sum(axis=1)
+    # Species which do not react are conserved.
+    total = serial[:12].sum(axis=1) + serial[12:].sum(axis=1)
+    assert np.allclose(total[2:], 1000.0, rtol=1e-2), total
+    for nthreads in (2, 3):
+        assert np.array_equal(serial, run(nthreads)), nthreads
+
+def main():
+    test_dsolve_threads()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# test_gsolve_sumtree.py ---
+# Gsolve picks reactions either by a linear scan of the propensities or
+# from a tree of partial sums. Both must sample the same process: a ring of
+# reversible reactions keeps equal numbers in every pool on average, and
+# fires at the rate set by those numbers.
+
+from __future__ import print_function
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+def make_ring(path, npools, ntotal, kf=1.0, kb=0.5):
+    """A ring of npools pools joined by reversible reactions, starting with
+    ntotal molecules spread evenly."""
+    compt = moose.CubeMesh(path)
+    compt.volume = 1e-18
+    pools = [moose.Pool('%s/p%d' % (path, i)) for i in range(npools)]
+    for i in range(npools):
+        r = moose.Reac('%s/r%d' % (path, i))
+        r.numKf, r.numKb = kf, kb
+        moose.connect(r, 'sub', pools[i], 'reac')
+        moose.connect(r, 'prd', pools[(i + 1) % npools], 'reac')
+    for p in pools:
+        p.nInit = ntotal // npools
+    gsolve = moose.Gsolve(path + '/gsolve')
+    stoich = moose.Stoich(path + '/stoich')
+    stoich.compartment = compt
+    stoich.ksolve = gsolve
+    stoich.path = path + '/##'
+    return gsolve, pools
+
+def run(useSumTree, npools=300, ntotal=30000, runtime=20.0):
+    moose.seed(10)
+    gsolve, pools = make_ring('/ring', npools, ntotal)
+    gsolve.useSumTree = useSumTree
+    assert gsolve.useSumTree == useSumTree
+    moose.reinit()
+    moose.start(runtime)
+    n = np.array([p.n for p in pools])
+    numFire = np.array(gsolve.numFire[0])
+    moose.delete('/ring')
+    return n, numFire
+
+def test_sum_tree():
+    npools, ntotal, runtime = 300, 30000, 20.0
+    # Every reaction fires at (kf + kb) * n on average.
+    expected = (1.0 + 0.5) * (ntotal // npools) * npools * runtime
+    fired = {}
+    for useSumTree in (False, True):
+        n, numFire = run(useSumTree, npools, ntotal, runtime)
+        assert n.sum() == ntotal, n.sum()
+        # Multinomial scatter about ntotal/npools, sd 10.
+        assert 7 < n.std() < 13, n.std()
+        assert len(numFire) == 2 * npools
+        assert abs(numFire.sum() / expected - 1) < 0.01, numFire.sum()
+        fired[useSumTree] = numFire
+    # The same process: forward reactions fire twice as often as backward.
+    for numFire in fired.values():
+        ratio = numFire[0::2].sum() / float(numFire[1::2].sum())
+        assert abs(ratio - 2.0) < 0.05, ratio
+
+def main():
+    test_sum_tree()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# test_gsolve_tauleap.py ---
+# Gsolve can advance reactions exactly, by tau-leaping, or by integrating
+# the reactions of abundant pools deterministically and firing the rest.
+# A fast A <==> B pair sets the rate at which a rare D is made, and D
+# decays to E. D should end up Poisson distributed about the same mean
+# whichever the method. Each voxel of the mesh is an independent run.
+
+from __future__ import print_function
+import time
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+numVoxels = 200
+
+def make_model(path):
+    compt = moose.CubeMesh(path)
+    compt.coords = [0, 0, 0, numVoxels * 1e-6, 1e-6, 1e-6, 1e-6, 1e-6, 1e-6]
+    a = moose.Pool(path + '/a')
+    b = moose.Pool(path + '/b')
+    d = moose.Pool(path + '/d')
+    e = moose.Pool(path + '/e')
+    ab = moose.Reac(path + '/ab')
+    ab.numKf, ab.numKb = 1.0, 1.0
+    moose.connect(ab, 'sub', a, 'reac')
+    moose.connect(ab, 'prd', b, 'reac')
+    # a makes d without being used up.
+    make = moose.Reac(path + '/make')
+    make.numKf, make.numKb = 1e-3, 0.0
+    moose.connect(make, 'sub', a, 'reac')
+    moose.connect(make, 'prd', a, 'reac')
+    moose.connect(make, 'prd', d, 'reac')
+    decay = moose.Reac(path + '/decay')
+    decay.numKf, decay.numKb = 0.1, 0.0
+    moose.connect(decay, 'sub', d, 'reac')
+    moose.connect(decay, 'prd', e, 'reac')
+    gsolve = moose.Gsolve(path + '/gsolve')
+    stoich = moose.Stoich(path + '/stoich')
+    stoich.compartment = compt
+    stoich.ksolve = gsolve
+    stoich.path = path + '/##'
+    moose.vec(a).nInit = 2000
+    moose.vec(b).nInit = 2000
+    moose.vec(d).nInit = 0
+    return gsolve, a, b, d
+
+def run(method, runtime=50.0):
+    # Each voxel is seeded with the global seed plus its index.
+    moose.seed(11)
+    gsolve, a, b, d = make_model('/model')
+    gsolve.method = method
+    moose.reinit()
+    t0 = time.time()
+    moose.start(runtime)
+    t = time.time() - t0
+    na, nb, nd = [np.array(moose.vec(x).n) for x in (a, b, d)]
+    numFire = np.array([gsolve.numFire[i] for i in range(numVoxels)])
+    moose.delete('/model')
+    return na, nb, nd, numFire, t
+
+def test_methods():
+    runtime = 50.0
+    # d is made at 1e-3 * 2000 per sec and decays at 0.1 per sec.
+    mean = 20.0 * (1 - np.exp(-0.1 * runtime))
+    for method in ('gssa', 'tauLeap', 'hybrid'):
+        na, nb, nd, numFire, t = run(method, runtime)
+        print('%-8s d = %.2f +- %.2f, %.3f s' % (method, nd.mean(),
+            nd.std(), t))
+        assert len(na) == numVoxels
+        assert np.allclose(na + nb, 4000), (na + nb)
+        assert abs(na.mean() - 2000) < 20, na.mean()
+        # d stays stochastic and integral, in every method.
+        assert np.array_equal(nd, np.round(nd))
+        assert abs(nd.mean() - mean) < 1.5, nd.mean()
+        assert 0.6 < nd.var() / nd.mean() < 1.5, nd.var()
+        # ab forward, ab backward, make, decay.
+        fired = numFire.sum(axis=0)
+        assert abs(fired[2] / (2.0 * runtime * numVoxels) - 1) < 0.03, fired
+        assert abs(fired[0] / float(fired[1]) - 1) < 0.01, fired
+        if method != 'hybrid':
+            assert np.array_equal(na, np.round(na))
+
+def test_method_field():
+    gsolve = moose.Gsolve('/gs')
+    assert gsolve.method == 'gssa'
+    gsolve.method = 'TAULEAP'
+    assert gsolve.method == 'tauLeap'
+    gsolve.method = 'hybrid'
+    assert gsolve.method == 'hybrid'
+    gsolve.epsilon = 0.01
+    assert gsolve.epsilon == 0.01
+    gsolve.epsilon = 2.0
+    assert gsolve.epsilon == 0.01
+    assert gsolve.numCritical == 10
+    assert gsolve.hybridThreshold == 100.0
+    moose.delete(gsolve)
+
+def main():
+    test_method_field()
+    test_methods()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# test_hsolve_network.py ---
+# A ring of spiking cells, each with its own HSolve. Advancing the HSolves in
+# parallel must give the same traces as advancing them one by one.
+
+from __future__ import print_function
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+EREST = -0.065
+
+def make_channel(path, gbar, ek, xparams, xpower, yparams=None):
+    chan = moose.HHChannel(path)
+    chan.Ek, chan.Gbar, chan.Xpower = ek, gbar, xpower
+    moose.element(path + '/gateX').setupAlpha(xparams + [3000, -0.1, 0.05])
+    if yparams:
+        chan.Ypower = 1
+        moose.element(path + '/gateY').setupAlpha(yparams + [3000, -0.1, 0.05])
+    return chan
+
+def make_cell(path):
+    # Squid axon soma.
+    cell = moose.Neutral(path)
+    soma = moose.Compartment(path + '/soma')
+    soma.Cm, soma.Rm, soma.Ra = 1e-11, 1e8, 1e6
+    soma.Em = soma.initVm = EREST
+    na = make_channel(path + '/soma/na', 1.2e-6, 0.05,
+            [1e5 * (0.025 + EREST), -1e5, -1.0, -0.025 - EREST, -0.01,
+                4e3, 0.0, 0.0, -EREST, 0.018], 3,
+            [70.0, 0.0, 0.0, -EREST, 0.02,
+                1e3, 0.0, 1.0, -0.03 - EREST, -0.01])
+    k = make_channel(path + '/soma/k', 3.6e-7, -0.077,
+            [1e4 * (0.01 + EREST), -1e4, -1.0, -0.01 - EREST, -0.01,
+                125.0, 0.0, 0.0, -EREST, 0.08], 4)
+    for chan in (na, k):
+        moose.connect(soma, 'channel', chan, 'channel')
+    syn = moose.SynChan(path + '/soma/syn')
+    syn.Gbar, syn.Ek, syn.tau1, syn.tau2 = 1e-8, 0.0, 1e-3, 2e-3
+    moose.connect(soma, 'channel', syn, 'channel')
+    sh = moose.SimpleSynHandler(path + '/soma/syn/sh')
+    moose.connect(sh, 'activationOut', syn, 'activation')
+    sh.synapse.num = 1
+    sh.synapse[0].delay, sh.synapse[0].weight = 2e-3, 1.0
+    sg = moose.SpikeGen(path + '/soma/sg')
+    sg.threshold, sg.refractT = 0.0, 5e-3
+    moose.connect(soma, 'VmOut', sg, 'Vm')
+    return soma, sh, sg
+
+def run(nthreads, ncells=8):
+    moose.Neutral('/net')
+    cells = [make_cell('/net/c%d' % i) for i in range(ncells)]
+    for i, (soma, sh, sg) in enumerate(cells):
+        moose.connect(sg, 'spikeOut', cells[(i + 1) % ncells][1].synapse[0],
+                'addSpike')
+    cells[0][0].inject = 2e-10
+    tabs = []
+    for i, (soma, sh, sg) in enumerate(cells):
+        tab = moose.Table('/net/vm%d' % i)
+        moose.connect(tab, 'requestOut', soma, 'getVm')
+        tabs.append(tab)
+        hs = moose.HSolve('/net/c%d/hsolve' % i)
+        hs.dt = 25e-6
+        hs.numThreads = nthreads
+        hs.target = soma.path
+    for i in range(8):
+        moose.setClock(i, 25e-6)
+    moose.reinit()
+    moose.start(0.1)
+    vm = np.array([t.vector for t in tabs])
+    moose.delete('/net')
+    return vm
+
+def test_parallel_hsolve():
+    serial = run(1)
+    # Activity must travel around the ring.
+    assert (serial.max(axis=1) > 0).all(), serial.max(axis=1)
+    parallel = run(4)
+    assert np.array_equal(serial, parallel), abs(serial - parallel).max()
+
+def main():
+    test_parallel_hsolve()
+
+if __name__ == '__main__':
+    main()
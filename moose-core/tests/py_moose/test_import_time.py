@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Keep `import moose` light. Heavy optional subsystems (server,
+# SBML/NML2 support, matplotlib) must only be loaded when they are used. The
+# time is checked against that of `import numpy` on the same machine, not
+# against a fixed limit; benchmark_import.py prints both.
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+script_ = '''
+import sys, json, logging
+import moose
+heavy = ['moose.server', 'moose.model_utils', 'moose.plot_utils'
+    , 'matplotlib', 'sympy']
+print(json.dumps(dict(loaded=[m for m in heavy if m in sys.modules]
+    , handlers=len(logging.getLogger().handlers))))
+'''
+
+def run_import():
+    # Import the same moose as this process does.
+    import moose
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(os.path.dirname(
+        moose.__file__)), env.get('PYTHONPATH', '')])
+    with tempfile.TemporaryDirectory() as cwd:
+        out = subprocess.check_output([sys.executable, '-c', script_]
+                , cwd=cwd, env=env)
+        res = json.loads(out.decode('utf-8').strip().split('\n')[-1])
+        res['files'] = os.listdir(cwd)
+    return res
+
+def test_import_is_lazy():
+    res = run_import()
+    assert res['loaded'] == [], res
+    # No logging configuration and no log file in cwd.
+    assert res['handlers'] == 0, res
+    assert res['files'] == [], res
+
+def test_import_time():
+    from benchmark_import import main as benchmark
+    t, numpy = benchmark(3)
+    # matplotlib alone takes several times as long as numpy.
+    assert t < 5 * numpy, (t, numpy)
+
+def test_lazy_names():
+    import moose
+    assert moose.serve is moose.server.serve
+    assert callable(moose.mooseReadSBML)
+    assert 'mergeChemModel' in dir(moose)
+    assert callable(moose.utils.plotTables)
+    assert 'plotTables' in moose.utils.__all__
+    assert 'setupTable' in moose.utils.__all__
+    try:
+        moose.thisDoesNotExist
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError('AttributeError is not raised')
+
+def main():
+    test_import_is_lazy()
+    test_import_time()
+    test_lazy_names()
+
+if __name__ == '__main__':
+    main()
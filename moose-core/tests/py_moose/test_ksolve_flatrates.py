@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# test_ksolve_flatrates.py ---
+# Ksolve computes the reaction velocities from rate terms compiled into
+# flat arrays, unless useFlatRates is False. Both must give bitwise the
+# same trajectories, on reactions of every order and on enzymes, and after
+# rates or volumes are changed during a run.
+
+from __future__ import print_function
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+def make_model(path, useFlatRates):
+    compt = moose.CubeMesh(path)
+    compt.coords = [0, 0, 0, 4e-6, 1e-6, 1e-6, 1e-6, 1e-6, 1e-6]
+    a, b, c, d, e, s, p = [moose.Pool('%s/%s' % (path, x)) for x in 'abcdesp']
+    moose.BufPool(path + '/buf')
+    # First, second and third order, and a reversible with two products.
+    reacs = []
+    for name, subs, prds, kf, kb in (('r1', [a], [b], 0.2, 0.1),
+            ('r2', [a, b], [c], 0.5, 0.05),
+            ('r3', [b, b, c], [d], 0.3, 0.0),
+            ('r4', [d], [a, e], 0.1, 0.2),
+            ('r5', [moose.element(path + '/buf')], [e], 0.05, 0.01)):
+        r = moose.Reac('%s/%s' % (path, name))
+        for x in subs:
+            moose.connect(r, 'sub', x, 'reac')
+        for x in prds:
+            moose.connect(r, 'prd', x, 'reac')
+        r.Kf, r.Kb = kf, kb
+        reacs.append(r)
+    mm = moose.MMenz(path + '/e/mm')
+    mm.Km, mm.kcat = 0.5, 2.0
+    moose.connect(e, 'nOut', mm, 'enzDest')
+    moose.connect(mm, 'sub', s, 'reac')
+    moose.connect(mm, 'prd', p, 'reac')
+    enz = moose.Enz(path + '/c/enz')
+    enz.Km, enz.kcat = 0.2, 1.0
+    moose.connect(c, 'reac', enz, 'enz')
+    moose.connect(enz, 'sub', p, 'reac')
+    moose.connect(enz, 'prd', s, 'reac')
+    moose.connect(enz, 'cplx', moose.Pool(path + '/c/enz/cplx'), 'reac')
+    ksolve = moose.Ksolve(path + '/ksolve')
+    ksolve.useFlatRates = useFlatRates
+    assert ksolve.useFlatRates == useFlatRates
+    stoich = moose.Stoich(path + '/stoich')
+    stoich.compartment = compt
+    stoich.ksolve = ksolve
+    stoich.path = path + '/##'
+    for x, conc in zip((a, b, c, d, e, s), (1.0, 0.5, 0.2, 0.1, 0.05, 2.0)):
+        moose.vec(x).concInit = [conc * (1 + 0.1 * i) for i in range(4)]
+    moose.element(path + '/buf').concInit = 0.3
+    return reacs, [a, b, c, d, e, s, p]
+
+def run(useFlatRates, runtime=20.0):
+    reacs, pools = make_model('/model', useFlatRates)
+    moose.reinit()
+    moose.start(runtime)
+    for r in reacs:
+        r.Kf = r.Kf * 2
+    moose.start(runtime)
+    n = np.array([moose.vec(x).n for x in pools])
+    moose.delete('/model')
+    return n
+
+def test_flat_rates():
+    flat = run(True)
+    virtual = run(False)
+    assert flat.shape == (7, 4)
+    # The model has moved off its initial state in every voxel.
+    assert flat[-1].min() > 0
+    assert np.array_equal(flat, virtual), np.abs(flat - virtual).max()
+
+def run_rescaled(useFlatRates, ratio):
+    # Neuron rescales the volumes of spine voxels this way.
+    reacs, pools = make_model('/model', useFlatRates)
+    moose.reinit()
+    moose.start(1.0)
+    moose.element('/model/stoich').scaleBufsAndRates(0, ratio)
+    moose.start(10.0)
+    n = np.array([moose.vec(x).n for x in pools])
+    moose.delete('/model')
+    return n
+
+def test_flat_rates_rescaled():
+    flat = run_rescaled(True, 8.0)
+    virtual = run_rescaled(False, 8.0)
+    assert np.array_equal(flat, virtual), np.abs(flat - virtual).max()
+    # Only voxel 0 is rescaled.
+    same = run_rescaled(False, 1.0)
+    assert not np.allclose(flat[:, 0], same[:, 0])
+    assert np.array_equal(flat[:, 1:], same[:, 1:])
+
+def main():
+    test_flat_rates()
+    test_flat_rates_rescaled()
+
+if __name__ == '__main__':
+    main()
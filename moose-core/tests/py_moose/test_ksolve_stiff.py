@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# test_ksolve_stiff.py ---
+# Implicit Ksolve methods use the analytic Jacobian of the reactions to
+# take large steps on stiff models. Robertson's reactions have rates
+# spanning nine orders of magnitude; check them against the reference
+# solution, and check a model with enzymes against the explicit method.
+
+from __future__ import print_function
+import time
+import contextlib
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+# Robertson (1966): reference values from Hairer and Wanner, and Hindmarsh.
+robertsonRef = {
+    0.4: (9.851721e-1, 3.386395e-5, 1.479409e-2),
+    4.0: (9.055186e-1, 2.240476e-5, 9.445913e-2),
+    40.0: (7.158271e-1, 9.185535e-6, 2.841637e-1),
+    400.0: (4.505187e-1, 3.222901e-6, 5.494781e-1),
+    4000.0: (1.831984e-1, 8.942371e-7, 8.168007e-1),
+}
+
+def make_robertson(path, method):
+    compt = moose.CubeMesh(path)
+    compt.volume = 1e-18
+    a, b, c = [moose.Pool('%s/%s' % (path, x)) for x in 'abc']
+    a.nInit = 1.0
+    r1 = moose.Reac(path + '/r1')
+    moose.connect(r1, 'sub', a, 'reac')
+    moose.connect(r1, 'prd', b, 'reac')
+    r2 = moose.Reac(path + '/r2')
+    moose.connect(r2, 'sub', b, 'reac')
+    moose.connect(r2, 'sub', b, 'reac')
+    moose.connect(r2, 'prd', b, 'reac')
+    moose.connect(r2, 'prd', c, 'reac')
+    r3 = moose.Reac(path + '/r3')
+    moose.connect(r3, 'sub', b, 'reac')
+    moose.connect(r3, 'sub', c, 'reac')
+    moose.connect(r3, 'prd', a, 'reac')
+    moose.connect(r3, 'prd', c, 'reac')
+    # Rates in # units depend on the order, so set them once connected.
+    for r, kf in ((r1, 0.04), (r2, 3e7), (r3, 1e4)):
+        r.numKf, r.numKb = kf, 0
+    ksolve = moose.Ksolve(path + '/ksolve')
+    ksolve.method = method
+    assert ksolve.method == method, ksolve.method
+    stoich = moose.Stoich(path + '/stoich')
+    stoich.compartment = compt
+    stoich.ksolve = ksolve
+    stoich.path = path + '/##'
+    return ksolve, (a, b, c)
+
+@contextlib.contextmanager
+def chem_clocks(dt):
+    # The clock dts are global, so put back the old ones afterwards.
+    clock = moose.element('/clock')
+    ticks = range(10, 20)
+    old = [clock.tickDt[i] for i in ticks]
+    for i in ticks:
+        moose.setClock(i, dt)
+    try:
+        yield
+    finally:
+        for i, x in zip(ticks, old):
+            moose.setClock(i, x)
+
+def run_robertson(method, runtime):
+    ksolve, pools = make_robertson('/rob', method)
+    ret = {}
+    try:
+        with chem_clocks(0.1):
+            moose.reinit()
+            t0 = time.time()
+            for t in sorted(robertsonRef):
+                if t > runtime:
+                    break
+                moose.start(t - moose.element('/clock').currentTime)
+                ret[t] = np.array([p.n for p in pools])
+            t = time.time() - t0
+    finally:
+        moose.delete('/rob')
+    return ret, t
+
+def test_robertson():
+    res, t = run_robertson('rosenbrock4', 4000.0)
+    for tt, ref in robertsonRef.items():
+        assert np.allclose(res[tt], ref, rtol=2e-3, atol=0), (tt, res[tt], ref)
+    # The explicit method is held to tiny steps throughout.
+    res, t = run_robertson('rosenbrock4', 400.0)
+    res, tExplicit = run_robertson('rk5', 400.0)
+    print('400 s of Robertson: rosenbrock4 %.3f s, rk5 %.3f s' % (t, tExplicit))
+    assert t * 5 < tExplicit, (t, tExplicit)
+
+def make_enz(path, method):
+    compt = moose.CubeMesh(path)
+    compt.volume = 1e-18
+    e, s, p, x = [moose.Pool('%s/%s' % (path, n)) for n in 'espx']
+    e.concInit, s.concInit, x.concInit = 0.001, 0.1, 0.05
+    mm = moose.MMenz(path + '/e/mm')
+    mm.Km, mm.kcat = 0.02, 5.0
+    moose.connect(e, 'nOut', mm, 'enzDest')
+    moose.connect(mm, 'sub', s, 'reac')
+    moose.connect(mm, 'prd', p, 'reac')
+    cplx = moose.Enz(path + '/x/enz')
+    cplx.Km, cplx.kcat = 0.01, 2.0
+    moose.connect(moose.element(path + '/x'), 'reac', cplx, 'enz')
+    moose.connect(cplx, 'sub', p, 'reac')
+    moose.connect(cplx, 'prd', s, 'reac')
+    moose.Pool(path + '/x/enz/cplx')
+    moose.connect(cplx, 'cplx', moose.element(path + '/x/enz/cplx'), 'reac')
+    r = moose.Reac(path + '/r')
+    r.Kf, r.Kb = 1e3, 0.5
+    moose.connect(r, 'sub', s, 'reac')
+    moose.connect(r, 'sub', x, 'reac')
+    moose.connect(r, 'prd', e, 'reac')
+    ksolve = moose.Ksolve(path + '/ksolve')
+    ksolve.method = method
+    ksolve.epsAbs, ksolve.epsRel = 1e-9, 1e-9
+    stoich = moose.Stoich(path + '/stoich')
+    stoich.compartment = compt
+    stoich.ksolve = ksolve
+    stoich.path = path + '/##'
+    return [e, s, p, x]
+
+def run_enz(method):
+    pools = make_enz('/enz', method)
+    try:
+        with chem_clocks(0.1):
+            moose.reinit()
+            moose.start(20.0)
+            n = np.array([q.n for q in pools])
+    finally:
+        moose.delete('/enz')
+    return n
+
+def test_enzymes():
+    implicit = run_enz('rosenbrock4')
+    explicit = run_enz('rk5')
+    assert np.allclose(implicit, explicit, rtol=1e-4), (implicit, explicit)
+
+def test_clocks_restored():
+    clock = moose.element('/clock')
+    old = list(clock.dts)
+    with chem_clocks(0.05):
+        assert clock.tickDt[10] == 0.05
+    assert list(clock.dts) == old
+
+def main():
+    test_robertson()
+    test_enzymes()
+    test_clocks_restored()
+
+if __name__ == '__main__':
+    main()
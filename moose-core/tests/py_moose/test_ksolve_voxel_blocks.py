@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# test_ksolve_voxel_blocks.py ---
+# Ksolve can integrate runs of voxels in lock step as one system
+# (Ksolve.voxelBlockSize). A bistable wave travels down a diffusive
+# cylinder, and a few reactions of every kind run under it. The result must
+# match that of integrating the voxels one by one, for blocks that do and
+# do not divide the cylinder, on one thread and on two, and after the
+# volume of a voxel is changed during the run.
+
+from __future__ import print_function
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+def make_model(path, blockSize, nthreads, nvoxels=300):
+    compt = moose.CylMesh(path)
+    compt.r0 = compt.r1 = 1e-6
+    compt.x1 = nvoxels * 1e-6
+    compt.diffLength = 1e-6
+    c = moose.Pool(path + '/c')
+    c.diffConst = 1e-11
+    buf = moose.BufPool(path + '/buf')
+    buf.nInit = 1
+    # Rate set by a function of c, as in the rxd example: a FuncReac term.
+    wave = moose.Reac(path + '/wave')
+    wave.Kb = 0
+    func = moose.Function(path + '/wave/func')
+    func.expr = '(1 - x0) * (0.3 - x0)'
+    func.x.num = 1
+    moose.connect(wave, 'sub', c, 'reac')
+    moose.connect(wave, 'prd', buf, 'reac')
+    moose.connect(func, 'valueOut', wave, 'setNumKf')
+    moose.connect(c, 'nOut', func.x[0], 'input')
+    # c drives a small network by mass action and an MM enzyme.
+    a, b, d = [moose.Pool('%s/%s' % (path, x)) for x in 'abd']
+    a.diffConst = 1e-13
+    for name, subs, prds, kf, kb in (('ca', [c], [c, a], 0.5, 0.0),
+            ('ab', [a], [b], 0.2, 0.1),
+            ('abd', [a, b], [d], 0.1, 0.01)):
+        r = moose.Reac('%s/%s' % (path, name))
+        for x in subs:
+            moose.connect(r, 'sub', x, 'reac')
+        for x in prds:
+            moose.connect(r, 'prd', x, 'reac')
+        r.numKf, r.numKb = kf, kb
+    mm = moose.MMenz(path + '/c/mm')
+    mm.numKm, mm.kcat = 1.0, 0.2
+    moose.connect(c, 'nOut', mm, 'enzDest')
+    moose.connect(mm, 'sub', d, 'reac')
+    moose.connect(mm, 'prd', b, 'reac')
+    ksolve = moose.Ksolve(path + '/ksolve')
+    ksolve.epsAbs, ksolve.epsRel = 1e-9, 1e-9
+    ksolve.numThreads = nthreads
+    ksolve.voxelBlockSize = blockSize
+    dsolve = moose.Dsolve(path + '/dsolve')
+    stoich = moose.Stoich(path + '/stoich')
+    stoich.compartment = compt
+    stoich.ksolve = ksolve
+    stoich.dsolve = dsolve
+    stoich.path = path + '/##'
+    x = np.arange(nvoxels)
+    c.vec.nInit = (x < 0.2 * nvoxels).astype(float)
+    return ksolve, [c, a, b, d]
+
+def run(blockSize, nthreads=1, runtime=20.0, rescale=None):
+    ksolve, pools = make_model('/model', blockSize, nthreads)
+    assert ksolve.voxelBlockSize == blockSize
+    for i in range(10, 18):
+        moose.setClock(i, 0.1)
+    moose.reinit()
+    if rescale:
+        # Rescale the volume of a voxel halfway, as Neuron does for spines.
+        moose.start(runtime / 2)
+        moose.element('/model/stoich').scaleBufsAndRates(*rescale)
+        moose.start(runtime / 2)
+    else:
+        moose.start(runtime)
+    n = np.array([p.vec.n for p in pools])
+    busy = np.array(ksolve.threadBusyTime)
+    moose.delete('/model')
+    return n, busy
+
+def test_voxel_blocks():
+    ref, busy = run(0)
+    c, a, b, d = ref
+    # The wave front has moved on, and made a, b and d behind it.
+    assert 0.23 < c.mean() < 0.9, c.mean()
+    assert d.max() > 0.01, d.max()
+    for blockSize, nthreads in ((64, 1), (300, 1), (64, 2), (7, 2)):
+        n, busy = run(blockSize, nthreads)
+        assert len(busy) == nthreads and (busy > 0).all(), busy
+        assert np.allclose(n, ref, rtol=1e-5, atol=1e-8), \
+            (blockSize, np.abs(n - ref).max())
+
+def test_voxel_blocks_rescaled():
+    ref, busy = run(0, rescale=(5, 8.0))
+    n, busy = run(64, rescale=(5, 8.0))
+    assert np.allclose(n, ref, rtol=1e-5, atol=1e-8), np.abs(n - ref).max()
+    same, busy = run(64)
+    assert not np.allclose(n[:, 5], same[:, 5], rtol=1e-3)
+
+def main():
+    test_voxel_blocks()
+    test_voxel_blocks_rescaled()
+
+if __name__ == '__main__':
+    main()
@@ -234,8 +234,31 @@ class TestDelete(unittest.TestCase):
             print(self.oid.name)
 
 class TestFieldAccess(unittest.TestCase):
+    def setUp(self):
+        self.comp = moose.Compartment('/testFieldAccess')
+
     def testSetGet(self):
-        pass
+        self.comp.Vm = -0.065
+        self.assertAlmostEqual(self.comp.Vm, -0.065)
+        self.assertAlmostEqual(self.comp.getField('Vm'), -0.065)
+        self.comp.setField('Cm', 1e-9)
+        self.assertAlmostEqual(self.comp.Cm, 1e-9)
+
+    def testRepeatedAccessAcrossObjects(self):
+        # Field descriptors are cached per class; make sure they are not
+        # confused between objects and classes.
+        other = moose.Pool('/testFieldAccessPool')
+        for ii in range(10):
+            self.comp.Vm = ii * 1e-3
+            other.nInit = ii
+            self.assertAlmostEqual(self.comp.Vm, ii * 1e-3)
+            self.assertAlmostEqual(other.nInit, ii)
+
+    def testUnknownField(self):
+        with self.assertRaises(AttributeError):
+            self.comp.noSuchField
+        with self.assertRaises(AttributeError):
+            self.comp.noSuchField = 1.0
 
 if __name__ == '__main__':
     print('PyMOOSE Regression Tests:')
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Test the job scheduler and result cache of moose.server.
+
+import os
+import io
+import time
+import socket
+import tarfile
+import tempfile
+import threading
+import moose.server as ms
+
+def make_job(script):
+    # Write a tar file with a single __main__.py in its own directory like
+    # moose.server does for a received payload.
+    tfile = os.path.join(tempfile.mkdtemp(), 'data.tar.bz2')
+    txt = script.encode('utf-8')
+    with tarfile.open(tfile, 'w:bz2') as tf:
+        info = tarfile.TarInfo('__main__.py')
+        info.size = len(txt)
+        tf.addfile(info, io.BytesIO(txt))
+    return tfile
+
+def drain(conn):
+    # Read whatever the job sends so that it never blocks on send.
+    def _read():
+        while True:
+            try:
+                if not conn.recv(4096):
+                    break
+            except socket.error:
+                break
+    t = threading.Thread(target=_read)
+    t.daemon = True
+    t.start()
+
+def test_scheduler():
+    cwd = os.getcwd()
+    sched = ms.JobScheduler(max_jobs=1)
+    a, b = socket.socketpair()
+    drain(b)
+    slow = sched.submit(make_job('import time\ntime.sleep(60)\n'), a)
+    queued = sched.submit(make_job('print(1)\n'), a)
+    t0 = time.time()
+    while slow.status != 'running' and time.time() - t0 < 10:
+        time.sleep(0.05)
+    assert slow.status == 'running', slow.status
+    assert sched.stats()['queued'] == 1, sched.stats()
+
+    # Cancel the queued job first so the worker never starts it.
+    assert sched.cancel(queued.id)
+    assert sched.cancel(slow.id)
+    assert slow.done.wait(10)
+    assert queued.done.wait(10)
+    assert slow.status == 'cancelled'
+    assert queued.status == 'cancelled'
+    assert queued.started is None
+    assert not sched.cancel(slow.id)
+
+    job = sched.submit(make_job('print(1)\n'), a)
+    assert job.done.wait(60)
+    assert job.status == 'done', job.result
+    stats = sched.stats()
+    assert stats['submitted'] == 3, stats
+    assert stats['cancelled'] == 2, stats
+    assert stats['done'] == 1, stats
+
+    # Jobs must not change the working directory of the server.
+    assert os.getcwd() == cwd
+    sched.shutdown()
+    a.close()
+
+def test_result_cache():
+    cache = ms.ResultCache(tempfile.mkdtemp(), max_bytes=1000)
+    a, b = socket.socketpair()
+    k1 = cache.key(b'payload1')
+    assert k1 == cache.key(b'payload1')
+    assert k1 != cache.key(b'payload2')
+    assert not cache.replay(k1, a)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    rec = cache.recorder(k1, a)
+    ms.send_msg('hello', rec)
+    cache.store(k1, rec)
+    cache.discard(rec)
+    sent = b.recv(1024)
+    assert cache.replay(k1, a)
+    assert b.recv(1024) == sent
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A large entry evicts the least recently used one.
+    k2 = cache.key(b'payload2')
+    rec = cache.recorder(k2, a)
+    os.utime(cache.path(k1), (0, 0))
+    ms.send_msg('x'*980, rec)
+    cache.store(k2, rec)
+    assert not os.path.exists(cache.path(k1))
+    assert os.path.exists(cache.path(k2))
+    a.close()
+    b.close()
+
+def main():
+    test_scheduler()
+    test_result_cache()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# test_solver_thread_pool.py ---
+# Ksolve and Gsolve voxels advanced on the shared thread pool must give the
+# same result as the serial solver.
+
+from __future__ import print_function
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+def make_model(solver, nthreads, nvoxels=40):
+    moose.seed(10)
+    compt = moose.CylMesh('/model')
+    compt.r0 = compt.r1 = 1e-7
+    compt.x1 = 1e-6
+    compt.diffLength = compt.x1 / nvoxels
+    a = moose.Pool('/model/a')
+    b = moose.Pool('/model/b')
+    r = moose.Reac('/model/r')
+    r.Kf, r.Kb = 0.2, 0.1
+    moose.connect(r, 'sub', a, 'reac')
+    moose.connect(r, 'prd', b, 'reac')
+    if solver == 'gssa':
+        s = moose.Gsolve('/model/solve')
+    else:
+        s = moose.Ksolve('/model/solve')
+    s.numThreads = nthreads
+    stoich = moose.Stoich('/model/stoich')
+    stoich.compartment = compt
+    stoich.ksolve = s
+    stoich.path = '/model/##'
+    a.vec.nInit = 100.0 + np.arange(nvoxels)
+    return s, a
+
+def run(solver, nthreads):
+    s, a = make_model(solver, nthreads)
+    moose.reinit()
+    moose.start(20)
+    res = np.array(a.vec.n), s.numThreads, np.array(s.threadBusyTime)
+    moose.delete('/model')
+    return res
+
+def check(solver):
+    n1, _, busy1 = run(solver, 1)
+    n2, nt, busy2 = run(solver, 2)
+    assert len(busy1) == 1 and busy1[0] > 0, busy1
+    assert nt == 2 and len(busy2) == 2, (nt, busy2)
+    assert (busy2 > 0).all(), busy2
+    assert np.array_equal(n1, n2), (n1, n2)
+
+def test_ksolve_thread_pool():
+    check('gsl')
+
+def test_gsolve_thread_pool():
+    check('gssa')
+
+def main():
+    test_ksolve_thread_pool()
+    test_gsolve_thread_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# test_sparsemsg_csr.py ---
+# Fill a SparseMsg from numpy CSR arrays, assign synaptic weights and delays
+# in one call and read the matrix back as CSR.
+
+from __future__ import print_function
+import numpy as np
+import moose
+print('Using moose from %s' % moose.__file__)
+
+def make_network(nsrc=30, ntgt=20):
+    moose.Neutral('/net')
+    src = moose.RandSpike('/net/src', nsrc)
+    syn = moose.SimpleSynHandler('/net/syn', ntgt)
+    msg = moose.connect(src, 'spikeOut', moose.vec(syn.path + '/synapse'),
+            'addSpike', 'Sparse')
+    return moose.element(msg), syn
+
+def random_csr(nrows, ncols, p=0.2, seed=7):
+    rng = np.random.RandomState(seed)
+    dense = rng.uniform(size=(nrows, ncols)) < p
+    rowStart = np.concatenate(([0], np.cumsum(dense.sum(axis=1))))
+    colIndex = np.nonzero(dense)[1]
+    return rowStart.astype(np.int64), colIndex.astype(np.int64)
+
+def test_csr_fill():
+    msg, syn = make_network()
+    rowStart, colIndex = random_csr(30, 20)
+    msg.csrFill(np.concatenate((rowStart, colIndex)))
+    assert msg.numEntries == len(colIndex), msg.numEntries
+    assert np.array_equal(msg.rowStart, rowStart)
+    assert np.array_equal(msg.columnIndex, colIndex)
+    # Same matrix and synapses as connectionList, which uses pairFill.
+    rows = np.repeat(np.arange(30), np.diff(rowStart))
+    nsyn = np.array(syn.vec.numSynapses)
+    fieldIndex = np.array(msg.matrixEntry)
+    msg.connectionList = np.concatenate((rows, colIndex))
+    assert np.array_equal(msg.connectionList, np.concatenate((rows, colIndex)))
+    assert np.array_equal(syn.vec.numSynapses, nsyn)
+    assert np.array_equal(msg.matrixEntry, fieldIndex)
+    for t in range(20):
+        n = (colIndex == t).sum()
+        assert list(fieldIndex[colIndex == t]) == list(range(n))
+
+    # Explicit field indices are kept.
+    fieldIndex = np.zeros(len(colIndex), dtype=np.uint32)
+    for t in range(20):
+        fieldIndex[colIndex == t] = np.arange((colIndex == t).sum())[::-1]
+    msg.csrFill(np.concatenate((rowStart, colIndex, fieldIndex)))
+    assert np.array_equal(msg.matrixEntry, fieldIndex)
+
+    # Bad input leaves the matrix alone.
+    msg.csrFill(np.concatenate((rowStart, colIndex[:-1])))
+    assert msg.numEntries == len(colIndex)
+    moose.delete('/net')
+
+def test_target_field():
+    msg, syn = make_network()
+    rowStart, colIndex = random_csr(30, 20, p=0.5)
+    msg.csrFill(np.concatenate((rowStart, colIndex)))
+    n = msg.numEntries
+    weight = np.linspace(0.1, 1.0, n)
+    delay = np.linspace(1e-3, 5e-3, n)
+    msg.targetField['weight'] = weight
+    msg.targetField['delay'] = delay
+    assert np.allclose(msg.targetField['weight'], weight)
+    assert np.allclose(msg.targetField['delay'], delay)
+    fieldIndex = msg.matrixEntry
+    for k in (0, n // 2, n - 1):
+        s = moose.element('%s/synapse[%d]' % (syn.vec[int(colIndex[k])].path,
+            fieldIndex[k]))
+        assert np.isclose(s.weight, weight[k]), (k, s.weight)
+        assert np.isclose(s.delay, delay[k]), (k, s.delay)
+    moose.delete('/net')
+
+def main():
+    test_csr_fill()
+    test_target_field()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# moose.start releases the GIL; moose.startAsync runs the simulation in the
+# background.
+
+import time
+import asyncio
+import threading
+import numpy as np
+import moose
+print( '[INFO] Using moose form %s' % moose.__file__ )
+
+def make_model():
+    # Enough compartments to keep the simulation busy for a while.
+    comp = moose.vec( '/model', 500, 0, 'Compartment' )
+    comp.Rm, comp.Cm, comp.Em = 1e8, 1e-10, -0.065
+    comp.inject = np.linspace( 0, 1e-10, 500 )
+    for i in range(10):
+        moose.setClock( i, 1e-4 )
+    moose.reinit()
+
+def test_gil_released():
+    make_model()
+    count = [0]
+    done = threading.Event()
+    def spin():
+        while not done.is_set():
+            count[0] += 1
+    t = threading.Thread( target=spin )
+    t.start()
+    t0 = time.time()
+    moose.start( 0.5 )
+    elapsed = time.time() - t0
+    done.set()
+    t.join()
+    print( 'moose.start took %.3f s; other thread counted %d' % (elapsed
+        , count[0]) )
+    assert count[0] > 1000, count
+    moose.delete( '/model' )
+
+def test_start_async():
+    make_model()
+    pyrun = moose.PyRun( '/pyrun' )
+    pyrun.initString = 'nrun = 0'
+    pyrun.runString = 'nrun += 1\noutput = nrun'
+    tab = moose.Table( '/pyrun/tab' )
+    moose.connect( pyrun, 'output', tab, 'input' )
+    moose.setClock( pyrun.tick, 0.1 )
+    moose.reinit()
+
+    f = moose.startAsync( 1.0 )
+    times = []
+    while not f.done():
+        times.append( f.currentTime )
+        time.sleep( 0.01 )
+    assert f.result() == moose.element('/clock').currentTime
+    assert np.isclose( f.result(), 1.0 ), f.result()
+    assert f.progress == 1.0
+    assert f.currentStep > 0
+    assert times == sorted(times), times
+    # PyRun ran in the simulation thread.
+    assert len(tab.vector) >= 10, tab.vector
+    assert tab.vector[-1] >= 10, tab.vector
+
+    # Only one simulation at a time, even when started together.
+    errors = []
+    def start():
+        try:
+            futures.append( moose.startAsync( 0.5 ) )
+        except RuntimeError as e:
+            errors.append( e )
+    futures = []
+    threads = [ threading.Thread( target=start ) for i in range(4) ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(futures) == 1 and len(errors) == 3, (futures, errors)
+    futures[0].result()
+
+    # Cancel stops the simulation which can then continue.
+    f = moose.startAsync( 100.0 )
+    time.sleep( 0.2 )
+    assert f.running()
+    assert f.cancel()
+    try:
+        f.result( 30 )
+    except Exception as e:
+        assert f.cancelled(), e
+    stopped = moose.element('/clock').currentTime
+    assert 1.5 < stopped < 101.5, stopped
+    assert not moose.isRunning()
+    moose.start( 0.5 )
+    assert np.isclose( moose.element('/clock').currentTime, stopped + 0.5 )
+
+    # Awaitable from a coroutine.
+    async def run():
+        return await moose.startAsync( 0.5 )
+    t = asyncio.get_event_loop().run_until_complete( run() )
+    assert np.isclose( t, stopped + 1.0 ), t
+    moose.delete( '/model' )
+    moose.delete( '/pyrun' )
+
+def main():
+    test_gil_released()
+    test_start_async()
+
+if __name__ == '__main__':
+    main()
@@ -20,6 +20,7 @@ import numpy as np
 import time
 import os
 import sys
+import tempfile
 print('[INFO] Using moose form %s' % moose.__file__)
 
 all_done_ = False
@@ -67,6 +68,10 @@ def test_sanity( ):
     assert st.numTables == 1
 
 def test_streamer( ):
+    with tempfile.TemporaryDirectory( ) as d:
+        run_streamer( os.path.join( d, 'streamer_test.csv' ) )
+
+def run_streamer( outfile ):
     compt = moose.CubeMesh( '/compt' )
     assert compt
     r = moose.Reac( '/compt/r' )
@@ -82,10 +87,6 @@ def test_streamer( ):
     r.Kf = 0.1
     r.Kb = 0.01
 
-    outfile = 'streamer_test.csv'
-    if os.path.exists(outfile):
-        os.remove(outfile)
-
     tabA = moose.Table2( '/compt/a/tab' )
     tabB = moose.Table2( '/compt/tabB' )
     tabC = moose.Table2( '/compt/tabB/tabC' )
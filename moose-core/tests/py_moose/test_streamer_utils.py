@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Test decoding of SocketStreamer binary frames.
+
+import struct
+import numpy as np
+import moose.streamer_utils as mu
+
+def columns_frame(cols):
+    payload = struct.pack('<II', len(cols), 0)
+    for cid, name, dt in cols:
+        name = name.encode('utf-8')
+        payload += struct.pack('<IId', cid, len(name), dt) + name
+    return mu.encode_frame(mu.FRAME_COLUMNS, payload)
+
+def data_frame(blocks):
+    payload = struct.pack('<II', len(blocks), 0)
+    for cid, tv in blocks:
+        tv = np.asarray(tv, dtype='<f8')
+        payload += struct.pack('<IIQ', cid, 0, len(tv)) + tv.tobytes()
+    return mu.encode_frame(mu.FRAME_DATA, payload)
+
+def test_decode_chunks():
+    a = np.array([[0.0, 1.0], [0.1, 2.0], [0.2, 3.0]])
+    b = np.array([[0.0, -1.0]])
+    data = columns_frame([(0, '/a', 0.1), (1, '/b', 0.5)])
+    data += data_frame([(0, a[:2]), (1, b)]) + data_frame([(0, a[2:])])
+
+    # Feed byte by byte; frames are only decoded once complete.
+    dec = mu.StreamDecoder()
+    batches = []
+    for i in range(len(data)):
+        batches += dec.feed(data[i:i+1])
+    assert len(batches) == 2, batches
+    assert dec.columns == {0: ('/a', 0.1), 1: ('/b', 0.5)}
+    assert np.array_equal(batches[0]['/a'], a[:2])
+    assert np.array_equal(batches[0]['/b'], b)
+
+    res = mu.decode_data(data)
+    assert np.array_equal(res['/a'], a)
+    assert np.array_equal(res['/b'], b)
+
+def test_large_frame():
+    # A frame much larger than the chunks it arrives in, followed by the
+    # start of the next one. The buffer must stay resizable, and the arrays
+    # decoded must not share memory with it.
+    big = np.column_stack((np.arange(100000) * 0.1, np.arange(100000.0)))
+    data = columns_frame([(0, '/big', 0.1)]) + data_frame([(0, big)])
+    data += data_frame([(0, big[:1])])
+    dec = mu.StreamDecoder()
+    batches = []
+    for i in range(0, len(data) - 10, 4096):
+        batches += dec.feed(data[i:min(i + 4096, len(data) - 10)])
+    assert len(batches) == 1, len(batches)
+    assert len(dec._buffer) < 4096 + mu.HEADER_SIZE, len(dec._buffer)
+    batches += dec.feed(data[len(data) - 10:])
+    assert len(batches) == 2 and len(dec._buffer) == 0
+    assert np.array_equal(batches[0]['/big'], big)
+    assert np.array_equal(batches[1]['/big'], big[:1])
+
+def test_bad_magic():
+    try:
+        mu.split_frames(b'XXXX' + b'\0' * 12)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('bad magic accepted')
+
+def main():
+    test_decode_chunks()
+    test_large_frame()
+    test_bad_magic()
+
+if __name__ == '__main__':
+    main()
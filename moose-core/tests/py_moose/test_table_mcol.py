@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Stream Table data to mcol files and read them back with np.memmap while the
+# simulation is still running.
+
+import os
+import tempfile
+import numpy as np
+import moose
+import moose.streamer_utils as mu
+print( '[INFO] Using moose form %s' % moose.__file__ )
+
+def make_model():
+    compt = moose.CubeMesh( '/compt' )
+    r = moose.Reac( '/compt/r' )
+    a = moose.Pool( '/compt/a' )
+    a.concInit = 1
+    b = moose.Pool( '/compt/b' )
+    moose.connect( r, 'sub', a, 'reac' )
+    moose.connect( r, 'prd', b, 'reac' )
+    r.Kf = 0.1
+    r.Kb = 0.01
+    tabs = []
+    for p in [a, b]:
+        t = moose.Table2( '%s/tab' % p.path )
+        moose.connect( t, 'requestOut', p, 'getConc' )
+        tabs.append(t)
+    return tabs
+
+def test_table():
+    tabA, tabB = make_model()
+    ref = moose.Table2( '/compt/a/ref' )
+    moose.connect( ref, 'requestOut', '/compt/a', 'getConc' )
+    outfile = os.path.join( tempfile.mkdtemp(), 'a.mcol' )
+    tabA.outfile = outfile
+    assert tabA.format == 'mcol', tabA.format
+    moose.reinit()
+
+    tf = mu.TableFile( outfile )
+    assert tf.columns == ['time', '/compt/a/tab'], tf.columns
+    dt = moose.element('/clock').tickDt[18]
+    assert tf.dt['time'] == dt, tf.dt
+    assert len(tf) == 1
+
+    # Rows written so far are visible while the simulation is running.
+    moose.start( 10 )
+    n = tf.refresh()
+    assert n > 1, n
+    assert np.allclose( np.diff(tf['time']), dt )
+    moose.start( 10 )
+    assert tf.refresh() > n
+    # Same values as a table which keeps its data in memory.
+    ref = moose.element( '/compt/a/ref' ).vector
+    assert np.allclose( tf['/compt/a/tab'], ref[:len(tf)] )
+    moose.delete( '/compt' )
+
+def test_streamer():
+    tabA, tabB = make_model()
+    outfile = os.path.join( tempfile.mkdtemp(), 's.mcol' )
+    st = moose.Streamer( '/compt/streamer' )
+    st.outfile = outfile
+    assert st.format == 'mcol'
+    st.addTables( [tabA, tabB] )
+    moose.reinit()
+    moose.start( 20 )
+
+    tf = mu.TableFile( outfile )
+    assert tf.columns[0] == 'time'
+    assert len(tf.columns) == 3, tf.columns
+    assert len(tf) > 1
+    a, b = tf.data[:, 1], tf.data[:, 2]
+    assert a[0] == 1.0 and b[0] == 0.0, (a, b)
+    assert (np.diff(a) < 0).all() and (np.diff(b) > 0).all(), (a, b)
+    assert np.allclose( tf.tail(2), tf.data[-2:] )
+    moose.delete( '/compt' )
+
+def write_mcol( filename, order, mark, columns, dt, data ):
+    # Same layout as StreamerBase::writeToMCOLFile, in the given byte order.
+    import struct
+    cols = b''.join( struct.pack( order + 'dI', dt, len(c) ) + c.encode()
+            for c in columns )
+    offset = -( -(16 + len(cols)) // 8 ) * 8
+    head = struct.pack( order + '4sHHII', b'MCOL', 1, mark, len(columns), offset )
+    head = (head + cols).ljust( offset, b'\0' )
+    with open( filename, 'wb' ) as f:
+        f.write( head + np.asarray( data, dtype=order + 'f8' ).tobytes() )
+
+def test_byte_order():
+    data = np.arange( 6.0 ).reshape( 3, 2 )
+    d = tempfile.mkdtemp()
+    # Written on a big-endian host; and by a writer without the byte order
+    # mark, which is little-endian.
+    for order, mark in [('>', 1), ('<', 1), ('<', 0)]:
+        outfile = os.path.join( d, 'b.mcol' )
+        write_mcol( outfile, order, mark, ['time', 'x'], 0.5, data )
+        tf = mu.TableFile( outfile )
+        assert tf.order == order, (tf.order, order)
+        assert tf.columns == ['time', 'x'] and tf.dt['x'] == 0.5, tf.dt
+        assert np.array_equal( tf.data, data ), tf.data
+
+def main():
+    test_table()
+    test_streamer()
+    test_byte_order()
+
+if __name__ == '__main__':
+    main()
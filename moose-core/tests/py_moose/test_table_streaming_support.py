@@ -16,6 +16,7 @@ __status__           = "Development"
 
 import os
 import sys
+import tempfile
 import moose
 import numpy as np
 print( '[INFO] Using moose form %s' % moose.__file__ )
@@ -28,6 +29,16 @@ def print_table( table ):
     print( msg )
 
 def test( ):
+    # The tables write relative to the working directory.
+    cwd = os.getcwd( )
+    with tempfile.TemporaryDirectory( ) as d:
+        os.chdir( d )
+        try:
+            run_tables( )
+        finally:
+            os.chdir( cwd )
+
+def run_tables( ):
     compt = moose.CubeMesh( '/compt' )
     r = moose.Reac( '/compt/r' )
     a = moose.Pool( '/compt/a' )
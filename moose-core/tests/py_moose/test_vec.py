@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import numpy as np
 import moose
 
 def test_vec():
@@ -6,5 +7,107 @@ def test_vec():
     bar = moose.vec('/foo1')
     assert len(bar) == 500
 
+def test_vec_field_array():
+    comp = moose.vec('/comp_arr', n=100, dtype='Compartment')
+    comp.Vm = np.arange(100) * 1e-3
+    vm = comp.Vm
+    assert isinstance(vm, np.ndarray)
+    assert vm.dtype == np.float64
+    assert np.allclose(vm, np.arange(100) * 1e-3)
+
+    out = np.zeros(100)
+    res = comp.getFieldArray('Vm', out=out)
+    assert res is out
+    assert np.allclose(out, vm)
+    assert np.allclose(comp.getFieldArray('Vm'), vm)
+
+def test_vec_field_array_errors():
+    comp = moose.vec('/comp_arr_err', n=10, dtype='Compartment')
+    for bad in (np.zeros(9), np.zeros(10, dtype=np.int32), np.zeros(20)[::2]):
+        try:
+            comp.getFieldArray('Vm', out=bad)
+        except (TypeError, ValueError):
+            pass
+        else:
+            assert False, 'bad `out` buffer accepted'
+    try:
+        comp.getFieldArray('path')
+    except TypeError:
+        pass
+    else:
+        assert False, 'non-numeric field returned as array'
+
+def test_vec_set_from_buffer():
+    pools = moose.vec('/pool_buf', n=50, dtype='Pool')
+    conc = np.linspace(0, 1, 50)
+    pools.concInit = conc
+    assert np.allclose(pools.concInit, conc)
+    pools.concInit = memoryview(conc[::-1].copy())
+    assert np.allclose(pools.concInit, conc[::-1])
+    # Scalars are broadcast.
+    pools.concInit = 0.5
+    assert np.allclose(pools.concInit, 0.5)
+    pools.concInit = np.float32(0.25)
+    assert np.allclose(pools.concInit, 0.25)
+    try:
+        pools.concInit = np.ones(49)
+    except IndexError:
+        pass
+    else:
+        assert False, 'length mismatch accepted'
+
+def test_set_from_buffer_casting():
+    # Integers may go to unsigned fields, floats are not truncated.
+    gens = moose.vec('/pulse_buf', n=4, dtype='PulseGen')
+    gens.trigMode = np.array([0, 1, 2, 1])
+    assert list(gens.trigMode) == [0, 1, 2, 1]
+    mesh = moose.CubeMesh('/cube_buf')
+    mesh.surface = np.array([0, 1, 2])
+    assert list(mesh.surface) == [0, 1, 2]
+    for obj, field, bad in ((gens, 'trigMode', np.array([0.5, 1, 2, 1])),
+            (gens, 'trigMode', 1.5), (mesh, 'surface', np.array([0.5]))):
+        try:
+            setattr(obj, field, bad)
+        except TypeError:
+            pass
+        else:
+            assert False, 'float array truncated into an integer field'
+
+def test_element_list_field_array():
+    compts = [moose.Compartment('/elist_c%d' % i) for i in range(20)]
+    for i, c in enumerate(compts):
+        c.Vm = i * 1e-3
+    pools = moose.vec('/elist_pool', n=5, dtype='Pool')
+    pools.nInit = np.arange(5)
+    assert np.allclose(moose.getFieldArray(compts, 'Vm'), np.arange(20) * 1e-3)
+    out = np.zeros(5)
+    res = moose.getFieldArray(pools, 'nInit', out=out)
+    assert res is out
+    assert np.allclose(out, np.arange(5))
+    for bad in (['/elist_c0'], compts + list(pools)):
+        try:
+            moose.getFieldArray(bad, 'Vm')
+        except (TypeError, AttributeError):
+            pass
+        else:
+            assert False, 'bad element list accepted'
+    try:
+        moose.getFieldArray(compts, 'Vm', out=np.zeros(19))
+    except ValueError:
+        pass
+    else:
+        assert False, 'bad `out` buffer accepted'
+    try:
+        moose.getFieldArray(compts, '')
+    except ValueError:
+        pass
+    else:
+        assert False, 'empty field name accepted'
+
 if __name__ == '__main__':
     test_vec()
+    test_vec_field_array()
+    test_vec_field_array_errors()
+    test_vec_set_from_buffer()
+    test_set_from_buffer_casting()
+    test_element_list_field_array()
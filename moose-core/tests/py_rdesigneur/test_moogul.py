@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# test_moogul.py ---
+# The moogul 3-D view reads its values in one call per frame and colours
+# them through a lookup table. Check it against the colormap itself.
+
+from __future__ import print_function
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import moose
+import rdesigneur as rd
+print('Using moose from %s' % moose.__file__)
+
+def test_moogul_neuron():
+    rdes = rd.rdesigneur(
+        cellProto = [['ballAndStick', 'soma', 10e-6, 10e-6, 2e-6, 200e-6, 20]],
+        stimList = [['soma', '1', '.', 'inject', '(t>0.01) * 2e-10']],
+        moogList = [['#', '1', '.', 'Vm', 'Membrane potential', -0.1, 0.05]],
+    )
+    rdes.buildModel()
+    viewer = rdes.moogNames[0]
+    neuron = viewer.drawables_[0]
+    compts = moose.wildcardFind('/model/elec/#[ISA=CompartmentBase]')
+    assert len(neuron.activeObjs) == len(compts) == 21
+    for c, seg in zip(compts, neuron.activeCoords):
+        assert np.allclose(seg, np.array([[c.z0, c.x0, c.y0],
+            [c.z, c.x, c.y]]) * 1e6)
+    viewer.firstDraw()
+    moose.reinit()
+    moose.start(0.02)
+    viewer.updateValues()
+    vm = np.array([c.Vm for c in compts])
+    assert np.allclose(neuron.val, vm * neuron.fieldScale)
+    cmap = plt.get_cmap(neuron.colormap)
+    scaled = (neuron.val - neuron.valMin) / (neuron.valMax - neuron.valMin)
+    assert np.allclose(neuron.rgba, cmap(scaled), atol=1.0 / cmap.N)
+    plt.close('all')
+    moose.delete('/model')
+
+def main():
+    test_moogul_neuron()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# test_rdesigneur_cache.py ---
+# Prototypes loaded from the rdesigneur cache must match the ones built
+# from the specs, including ChannelML channels and kkit chemistry, and a
+# model built from them must run.
+
+from __future__ import print_function
+import os
+import io
+import sys
+import tempfile
+import contextlib
+import numpy as np
+import moose
+import moose.hdfutil as hdfutil
+import rdesigneur as rd
+print('Using moose from %s' % moose.__file__)
+
+sdir_ = os.path.dirname(os.path.realpath(__file__))
+chanFile = os.path.join(sdir_, '..', 'support', '_neuroml', 'cells_channels',
+        'kdr.xml')
+chemFile = os.path.join(sdir_, '..', 'py_moose', 'OSC_diff_vols.g')
+
+def make(cache, dendLen=100e-6):
+    out = io.StringIO() if sys.version_info[0] > 2 else io.BytesIO()
+    with contextlib.redirect_stdout(out):
+        rdes = rd.rdesigneur(
+            cellProto = [['ballAndStick', 'soma', 10e-6, 10e-6, 2e-6, dendLen, 5]],
+            chanProto = [['make_HH_Na()', 'Na'], ['make_HH_K()', 'K'],
+                [chanFile]],
+            chemProto = [[chemFile, 'chem']],
+            chanDistrib = [['Na', 'soma', 'Gbar', '1200'],
+                ['K', 'soma', 'Gbar', '360']],
+            stimList = [['soma', '1', '.', 'inject', '(t>0.005) * 1e-9']],
+            plotList = [['soma', '1', '.', 'Vm', 'Soma potential']],
+            cache = cache,
+            benchmark = True,
+            verbose = False,
+        )
+    return rdes, out.getvalue()
+
+def snapshot(fname):
+    """Save /library with hdfutil and return all its datasets."""
+    with hdfutil.h5.File(fname, 'w') as f:
+        hdfutil.savetree(moose.element('/library'), f)
+    ret = {}
+    with hdfutil.h5.File(fname, 'r') as f:
+        def visit(name, obj):
+            if isinstance(obj, hdfutil.h5.Dataset) and not name.startswith('clock'):
+                ret[name] = [np.asarray(x).tolist() for x in obj[()]]
+        f.visititems(visit)
+    return ret
+
+def clear_library():
+    for obj in moose.wildcardFind('/library/#'):
+        moose.delete(obj)
+
+def test_proto_cache():
+    with tempfile.TemporaryDirectory() as d, \
+            tempfile.TemporaryDirectory() as d2:
+        check_proto_cache(d, d2)
+
+def check_proto_cache(d, d2):
+    rdes, out = make(d)
+    assert 'Prototypes built and cached' in out, out
+    assert len(os.listdir(d)) == 1, os.listdir(d)
+    built = snapshot(os.path.join(d2, 'built.h5'))
+    assert moose.exists('/library/kdr') and moose.exists('/library/chem')
+    clear_library()
+
+    rdes, out = make(d)
+    assert 'Prototypes loaded from cache' in out, out
+    assert rdes.elecid.path == '/library[0]/soma[0]'
+    assert rdes.chemid.path == '/library[0]/chem[0]'
+    loaded = snapshot(os.path.join(d2, 'loaded.h5'))
+    assert sorted(loaded) == sorted(built)
+    for path in built:
+        # Derived fields such as Compartment.length are recomputed from
+        # the restored ones, so may differ in the last bit.
+        b, l = built[path], loaded[path]
+        if len(b) and isinstance(b[0], float):
+            assert np.allclose(l, b, rtol=1e-12, atol=0), path
+        else:
+            assert l == b, path
+    clear_library()
+
+    # Another spec is another entry.
+    rdes, out = make(d, dendLen=200e-6)
+    assert 'Prototypes built and cached' in out, out
+    assert len(os.listdir(d)) == 2, os.listdir(d)
+    clear_library()
+
+    # The model runs off the cached protos.
+    rdes, out = make(d)
+    assert 'Prototypes loaded from cache' in out, out
+    rdes.buildModel()
+    moose.reinit()
+    moose.start(0.02)
+    vm = moose.element('/model/graphs/plot0').vector
+    assert vm.max() > 0.0, vm.max()
+    moose.delete('/model')
+
+def test_func_module_key():
+    # A 'path/module.func()' proto is keyed by the module it loads,
+    # wherever it is run from.
+    rdes, out = make(None)
+    clear_library()
+    with tempfile.TemporaryDirectory() as d:
+        modFile = os.path.join(d, 'chans.py')
+        with open(modFile, 'w') as f:
+            f.write('def make(name):\n    pass\n')
+        rdes.chanProtoList = [[os.path.join(d, 'chans.make()'), 'X']]
+        key = rdes._protoCacheKey()
+        cwd = os.getcwd()
+        try:
+            os.chdir(d)
+            assert rdes._protoCacheKey() == key
+        finally:
+            os.chdir(cwd)
+        with open(modFile, 'a') as f:
+            f.write('# changed\n')
+        assert rdes._protoCacheKey() != key
+
+def main():
+    test_proto_cache()
+    test_func_module_key()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# test_rdesigneur_save.py ---
+# Plots saved by rdesigneur as npz and HDF5 (NSDF layout), both at the end
+# and streamed during the run, must hold the same data as the tables.
+# A single model carries all the plots: rebuilding an HSolve model in the
+# same process is not safe.
+
+from __future__ import print_function
+import os
+import json
+import tempfile
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import moose
+import rdesigneur as rd
+print('Using moose from %s' % moose.__file__)
+
+def build(d):
+    rdes = rd.rdesigneur(
+        cellProto = [['ballAndStick', 'soma', 10e-6, 10e-6, 2e-6, 100e-6, 5]],
+        stimList = [['soma', '1', '.', 'inject', '(t>0.01) * 2e-10']],
+        plotList = [
+            ['#', '1', '.', 'Vm', 'Membrane potential', 'time',
+                0.0, 0.0, os.path.join(d, 'vm.npz'), 3, True],
+            ['soma', '1', '.', 'Vm', 'Soma potential', 'time',
+                0.0, 0.0, os.path.join(d, 'soma.h5'), 3, True],
+            ['#', '1', '.', 'Vm', 'Streamed potential', 'time',
+                0.0, 0.0, os.path.join(d, 'vm.nsdf'), 3, True, 0.01],
+        ],
+        params = {'stim': 2e-10},
+    )
+    rdes.buildModel()
+    moose.reinit()
+    return rdes
+
+def tables(plot):
+    return np.array([t.vector for t in moose.vec('/model/graphs/' + plot)])
+
+def check_stream(fname, n=None):
+    # The streamed tables are emptied as they go; plot0 has the same sources.
+    import h5py
+    assert len(tables('plot2')[0]) < 101
+    with h5py.File(fname, 'r') as f:
+        ds = f['data/uniform/plot2/Vm']
+        if n is None:
+            assert np.array_equal(ds[()], tables('plot0'))
+        else:
+            assert ds.shape[0] == 6 and n[0] <= ds.shape[1] <= n[1], ds.shape
+            assert np.array_equal(ds[()], tables('plot0')[:, :ds.shape[1]])
+        return ds.shape
+
+def check_npz(d):
+    f = np.load(os.path.join(d, 'vm0.npz'))
+    assert np.array_equal(f['data'], tables('plot0'))
+    assert f['data'].shape == (6, 501), f['data'].shape
+    assert np.isclose(f['dt'], 1e-4)
+    assert np.allclose(f['time'], np.arange(501) * 1e-4)
+    assert str(f['units']) == 'Memb. Potential (mV)'
+    assert json.loads(str(f['params'])) == {'stim': 2e-10}
+    assert list(f['paths']) == [t.path for t in moose.vec('/model/graphs/plot0')]
+
+def check_hdf5(d):
+    import h5py
+    with h5py.File(os.path.join(d, 'soma1.h5'), 'r') as f:
+        ds = f['data/uniform/plot1/Vm']
+        assert np.array_equal(ds[()], tables('plot1'))
+        assert ds.shape == (1, 501), ds.shape
+        assert np.isclose(ds.attrs['dt'], 1e-4)
+        assert ds.attrs['scale'] == 1000
+        paths = [p.decode() for p in f['map/uniform/plot1'][()]]
+        assert paths == [t.path for t in moose.vec('/model/graphs/plot1')]
+        assert f['model/parameters'].attrs['stim'] == '2e-10'
+
+def test_save():
+    with tempfile.TemporaryDirectory() as d:
+        rdes = build(d)
+        fname = os.path.join(d, 'vm2.nsdf')
+        moose.start(0.025)
+        # Data up to the last stream update is already on disk.
+        check_stream(fname, (200, 251))
+        moose.start(0.025)
+        rdes.display(block=False)
+        plt.close('all')
+        check_stream(fname)
+        check_npz(d)
+        check_hdf5(d)
+        # A reinit starts the streamed file afresh.
+        moose.reinit()
+        moose.start(0.01)
+        rdes.display(block=False)
+        plt.close('all')
+        assert check_stream(fname) == (6, 101)
+        moose.delete('/model')
+
+def main():
+    test_save()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# test_rdesigneur_waveplot.py ---
+# Wave plots take their frames from the tables in one pass and draw them by
+# blitting. Check the frames against the tables and time a long dendrite.
+
+from __future__ import print_function
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import moose
+import rdesigneur as rd
+print('Using moose from %s' % moose.__file__)
+
+def test_wave_plot(numSeg=1000):
+    rdes = rd.rdesigneur(
+        cellProto = [['ballAndStick', 'soma', 10e-6, 10e-6, 2e-6, 1000e-6, numSeg]],
+        stimList = [['soma', '1', '.', 'inject', '(t>0.002) * 2e-10']],
+        plotList = [['#', '1', '.', 'Vm', 'Membrane potential', 'wave']],
+        verbose = False,
+    )
+    rdes.buildModel()
+    moose.reinit()
+    moose.start(0.02)
+    t0 = time.time()
+    rdes.initWavePlots(0)
+    rdes.displayWavePlots()
+    t = time.time() - t0
+    print('%d frames of %d voxels in %.3f s' % (rdes.numWaveFrames,
+        numSeg + 1, t))
+
+    fig, line, vpts, timeLabel, ax, background = rdes.wavePlotNames[0][6]
+    vtab = moose.vec('/model/graphs/plot0')
+    dFrame = len(vtab[0].vector) // rdes.numWaveFrames
+    expected = np.array([[k.vector[j] for j in range(0, len(k.vector), dFrame)]
+        for k in vtab]).T * 1000
+    assert vpts.shape == (101, numSeg + 1), vpts.shape
+    assert np.array_equal(vpts, expected)
+    # The last frame is left on the figure.
+    assert np.array_equal(line.get_ydata(), vpts[rdes.numWaveFrames - 1])
+    assert not line.get_animated()
+    assert t < 10.0, t
+    plt.close('all')
+    moose.delete('/model')
+
+def main():
+    test_wave_plot()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# test_hdfutil.py ---
+# Checkpoint a model with moose.hdfutil and resume it.
+
+from __future__ import print_function
+import os
+import tempfile
+import numpy as np
+import moose
+import moose.hdfutil as hu
+print('using moose from: %s' % moose.__file__)
+
+def make_chem():
+    compt = moose.CubeMesh('/model')
+    compt.volume = 1e-18
+    a = moose.Pool('/model/a')
+    b = moose.Pool('/model/b')
+    a.concInit = 1.0
+    r = moose.Reac('/model/r')
+    r.Kf, r.Kb = 0.1, 0.05
+    moose.connect(r, 'sub', a, 'reac')
+    moose.connect(r, 'prd', b, 'reac')
+    ksolve = moose.Ksolve('/model/ksolve')
+    stoich = moose.Stoich('/model/stoich')
+    stoich.compartment = compt
+    stoich.ksolve = ksolve
+    stoich.path = '/model/##'
+
+def counts():
+    return [moose.element('/model/%s' % x).n for x in 'ab']
+
+def test_resume_chem():
+    make_chem()
+    moose.reinit()
+    moose.start(10)
+    fname = hu.savestate(os.path.join(tempfile.mkdtemp(), 'chem.h5'))
+    moose.start(10)
+    expected = counts()
+
+    # Fork from the checkpoint in the same model.
+    assert hu.restorestate(fname) == 10.0
+    moose.start(10)
+    assert np.allclose(counts(), expected), (counts(), expected)
+
+    # Rebuild the model from the checkpoint alone.
+    moose.delete('/model')
+    hu.restorestate(fname)
+    assert moose.element('/model/a').className == 'ZombiePool'
+    moose.start(10)
+    assert np.allclose(counts(), expected), (counts(), expected)
+    moose.delete('/model')
+
+def test_rebuild_network():
+    moose.Neutral('/net')
+    comp = moose.vec('/net/c', 4, 0, 'Compartment')
+    comp.Vm = np.arange(4.0) * -0.01
+    syn = moose.vec('/net/syn', 4, 0, 'SimpleSynHandler')
+    sg = moose.vec('/net/sg', 4, 0, 'SpikeGen')
+    msg = moose.connect(sg, 'spikeOut', moose.vec('/net/syn/synapse'),
+                        'addSpike', 'Sparse')
+    msg.setRandomConnectivity(0.5, 42)
+    weights = []
+    for i in range(4):
+        s = syn[i].synapse
+        s.weight = np.arange(len(s)) + 0.5
+        weights.append(list(s.weight))
+    tab = moose.Table('/net/tab')
+    tab.vector = [1.0, 2.0, 3.0]
+    moose.connect(tab, 'requestOut', comp[1], 'getVm')
+    conn = msg.connectionList
+
+    fname = hu.savestate(os.path.join(tempfile.mkdtemp(), 'net.h5'))
+    moose.delete('/net')
+    hu.restorestate(fname, reinit=False)
+
+    syn = moose.vec('/net/syn')
+    assert [list(syn[i].synapse.weight) for i in range(4)] == weights
+    assert np.allclose(moose.vec('/net/c').Vm, np.arange(4.0) * -0.01)
+    assert list(moose.element('/net/tab').vector) == [1.0, 2.0, 3.0]
+    msgs = moose.element('/net/sg').msgOut
+    assert len(msgs) == 1 and msgs[0].className == 'SparseMsg'
+    assert list(msgs[0].connectionList) == list(conn)
+    moose.delete('/net')
+
+def main():
+    test_resume_chem()
+    test_rebuild_network()
+
+if __name__ == '__main__':
+    main()
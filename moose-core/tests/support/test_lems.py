@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Vectorised evaluation of LEMS ComponentType rates used by NML2Reader.
+
+from __future__ import print_function, division
+import numpy as np
+import moose.neuroml2.lems as lems
+
+class Obj(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+def component(name, derived, conditional=[], constants=[]):
+    dvs = [Obj(name=n, value=v) for n, v in derived]
+    cdvs = [Obj(name=n, Case=[Obj(condition=c, value=v) for c, v in cases])
+            for n, cases in conditional]
+    return Obj(name=name, Constant=[Obj(name=n, value=v) for n, v in constants],
+            Dynamics=[Obj(DerivedVariable=dvs, ConditionalDerivedVariable=cdvs)])
+
+def test_linoid():
+    # HH sodium m alpha with the singularity at -40 mV handled by a case.
+    ct = component('alpha_m',
+            [('V', '(v - vShift) / VOLT')],
+            [('r', [('(V + 0.040) .neq. 0', '1e5 * (V + 0.040) / (1 - exp(-(V + 0.040) / 0.010))'),
+                (None, '1e3')])],
+            [('VOLT', '1V')])
+    rate = lems.evaluate_rate(ct, 'v', {'vShift': '0mV', 'temperature': 300},
+            -0.1, 0.05, 151)
+    v = np.linspace(-0.1, 0.05, 151)
+    with np.errstate(all='ignore'):
+        expected = 1e5 * (v + 0.04) / (1 - np.exp(-(v + 0.04) / 0.01))
+    expected[np.isclose(v, -0.04, atol=1e-12) & ~np.isfinite(expected)] = 1e3
+    assert np.allclose(rate, expected), (rate, expected)
+    assert not rate.flags.writeable
+
+    # A second evaluation comes from the cache.
+    assert lems.evaluate_rate(ct, 'v', {'vShift': '0mV', 'temperature': 300},
+            -0.1, 0.05, 151) is rate
+
+def test_conditions():
+    ct = component('step', [('x', '1 + (v .gt. 0.5 .and. v .leq. 1.5) * v^2')])
+    x = lems.evaluate_rate(ct, 'v', {}, 0, 2, 5)
+    assert np.allclose(x, [1, 1, 2, 3.25, 1]), x
+
+    # Concentrations are clipped at zero.
+    ct = component('conc', [('t', 'ca * 2')])
+    t = lems.evaluate_rate(ct, 'ca', {}, -1, 1, 3)
+    assert np.allclose(t, [0, 0, 2]), t
+
+def main():
+    test_linoid()
+    test_conditions()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+/***
+ *    Description:  A pool of long-lived worker threads shared by solvers.
+ *
+ *         Author:  Dilawar Singh <dilawars@ncbs.res.in>
+ *   Organization:  NCBS Bangalore
+ *
+ *        License:  GNU GPL2
+ */
+
+#include <algorithm>
+#include <chrono>
+
+#include "ThreadPool.h"
+
+using namespace std;
+
+namespace moose
+{
+
+// Set in pool threads. A parallelFor called from f runs serially instead of
+// waiting for the pool it is running on.
+static thread_local bool inPool_ = false;
+
+ThreadPool& ThreadPool::instance()
+{
+    static ThreadPool pool;
+    return pool;
+}
+
+ThreadPool::ThreadPool():
+    job_( nullptr ),
+    jobSize_( 0 ),
+    grain_( 1 ),
+    next_( 0 ),
+    participants_( 0 ),
+    pending_( 0 ),
+    generation_( 0 ),
+    stop_( false )
+{
+}
+
+ThreadPool::~ThreadPool()
+{
+    {
+        lock_guard<mutex> lk( mutex_ );
+        stop_ = true;
+    }
+    startCv_.notify_all();
+    for( auto& t : workers_ )
+        t.join();
+}
+
+size_t ThreadPool::numWorkers() const
+{
+    return workers_.size();
+}
+
+void ThreadPool::addWorkers( size_t n )
+{
+    // Workers have slots 1..n; the calling thread is slot 0.
+    for( size_t i = workers_.size(); i < n; i++ )
+        workers_.push_back( thread( &ThreadPool::workerLoop, this, i + 1 ) );
+}
+
+void ThreadPool::workerLoop( size_t slot )
+{
+    inPool_ = true;
+    unsigned long seen = 0;
+    while( true )
+    {
+        {
+            unique_lock<mutex> lk( mutex_ );
+            startCv_.wait( lk, [this, slot, &seen]() {
+                    return stop_ || ( generation_ != seen && slot < participants_ );
+                    } );
+            if( stop_ )
+                return;
+            seen = generation_;
+        }
+
+        runChunks( slot );
+
+        {
+            lock_guard<mutex> lk( mutex_ );
+            if( --pending_ == 0 )
+                doneCv_.notify_one();
+        }
+    }
+}
+
+void ThreadPool::runChunks( size_t slot )
+{
+    auto t0 = chrono::steady_clock::now();
+    while( true )
+    {
+        size_t begin = next_.fetch_add( grain_ );
+        if( begin >= jobSize_ )
+            break;
+        size_t end = min( begin + grain_, jobSize_ );
+        for( size_t i = begin; i < end; i++ )
+            (*job_)( i );
+    }
+    busy_[slot] = chrono::duration<double>( chrono::steady_clock::now() - t0 ).count();
+}
+
+void ThreadPool::parallelFor( size_t n, size_t numThreads
+        , const function<void(size_t)>& f, vector<double>* busy )
+{
+    numThreads = max( (size_t)1, min( numThreads, n ) );
+    if( busy && busy->size() < numThreads )
+        busy->resize( numThreads, 0.0 );
+
+    if( numThreads == 1 || inPool_ )
+    {
+        auto t0 = chrono::steady_clock::now();
+        for( size_t i = 0; i < n; i++ )
+            f( i );
+        if( busy )
+            (*busy)[0] += chrono::duration<double>(
+                    chrono::steady_clock::now() - t0 ).count();
+        return;
+    }
+
+    lock_guard<mutex> call( callMutex_ );
+    {
+        lock_guard<mutex> lk( mutex_ );
+        addWorkers( numThreads - 1 );
+        job_ = &f;
+        jobSize_ = n;
+        // Small chunks balance the load; a few per thread keep the counter
+        // from becoming a bottleneck.
+        grain_ = max( (size_t)1, n / ( 4 * numThreads ) );
+        next_ = 0;
+        busy_.assign( numThreads, 0.0 );
+        participants_ = numThreads;
+        pending_ = numThreads - 1;
+        generation_++;
+    }
+    startCv_.notify_all();
+
+    inPool_ = true;
+    runChunks( 0 );
+    inPool_ = false;
+
+    unique_lock<mutex> lk( mutex_ );
+    doneCv_.wait( lk, [this]() { return pending_ == 0; } );
+    participants_ = 0;
+    job_ = nullptr;
+    if( busy )
+        for( size_t i = 0; i < numThreads; i++ )
+            (*busy)[i] += busy_[i];
+}
+
+}
@@ -0,0 +1,91 @@
+/***
+ *    Description:  A pool of long-lived worker threads shared by solvers.
+ *
+ *         Author:  Dilawar Singh <dilawars@ncbs.res.in>
+ *   Organization:  NCBS Bangalore
+ *
+ *        License:  GNU GPL2
+ */
+
+#ifndef  ThreadPool_INC
+#define  ThreadPool_INC
+
+#include <vector>
+#include <thread>
+#include <mutex>
+#include <atomic>
+#include <functional>
+#include <condition_variable>
+
+namespace moose
+{
+
+/**
+ * @brief Solvers (Ksolve, Gsolve) advance their voxels on every timestep.
+ * Launching threads on every step costs more than the work for small
+ * systems; instead all solvers share this pool whose threads live as long
+ * as the process.
+ *
+ * parallelFor runs f(i) for i in [0, n) using the calling thread and upto
+ * numThreads - 1 workers. Indices are handed out in small chunks from a
+ * shared counter, so threads which finish early take work from the slower
+ * ones.
+ */
+class ThreadPool
+{
+public:
+    /* The pool shared by all solvers. */
+    static ThreadPool& instance();
+
+    ~ThreadPool();
+
+    /**
+     * @brief Call f(i) for all i in [0, n) on numThreads threads and wait
+     * for them to finish.
+     *
+     * @param busy If not null, busy[t] is incremented by the seconds thread
+     * t spent calling f. Thread 0 is the calling thread. The vector is
+     * resized to numThreads if it is smaller.
+     */
+    void parallelFor( size_t n, size_t numThreads
+            , const std::function<void(size_t)>& f
+            , std::vector<double>* busy = nullptr
+            );
+
+    /* Number of worker threads started so far. */
+    size_t numWorkers() const;
+
+private:
+    ThreadPool();
+    ThreadPool( const ThreadPool& );
+    ThreadPool& operator=( const ThreadPool& );
+
+    void addWorkers( size_t n );
+    void workerLoop( size_t slot );
+    void runChunks( size_t slot );
+
+    std::vector<std::thread> workers_;
+
+    // Serializes parallelFor calls.
+    std::mutex callMutex_;
+
+    std::mutex mutex_;
+    std::condition_variable startCv_;
+    std::condition_variable doneCv_;
+
+    // Current job.
+    const std::function<void(size_t)>* job_;
+    size_t jobSize_;
+    size_t grain_;
+    std::atomic<size_t> next_;
+    size_t participants_;
+    size_t pending_;
+    unsigned long generation_;
+    std::vector<double> busy_;
+
+    bool stop_;
+};
+
+}
+
+#endif   /* ----- #ifndef ThreadPool_INC  ----- */